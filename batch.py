@@ -0,0 +1,251 @@
+"""
+AutoDrama 다중 제목 배치 실행
+여러 제목을 Phase 단위로 나란히 진행하며 LLM 호출을 하나의 배치로 묶어 생성
+
+- 제목마다 파이프라인(main.main)을 별도 스레드에서 실행
+- LLM 엔진은 BatchingBackend로 전환: 실행 중인 제목들의 요청이 모이면 한 번에 생성
+  (Outline 전체 → Hook 전체 → Hook 이미지 프롬프트 전체 → Parts 전체 → ...)
+- 이미지 / TTS / Whisper / FFmpeg 자원 세마포어와 GPU 상주 관리자는 제목 간 공유
+  (LLM은 배치 내내 GPU에 고정: 중간에 내리면 배치 백엔드와 배치 전체 LLM 통계를 가진 엔진이 닫힘)
+- 종료 후 제목별 지연 시간, LLM 배치 크기, 합계 tok/s를 batch_report.json으로 기록
+
+실행:
+    python batch.py "제목 1" "제목 2" ...
+    python batch.py --file titles.txt      # 한 줄에 제목 하나 (또는 JSONL: "제목" / {"title": "..."})
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional
+
+
+def read_titles(path: str) -> List[str]:
+    """
+    제목 목록 파일 읽기 (빈 줄 무시)
+
+    한 줄이 JSON 문자열이나 {"title": ...} 객체면 파싱하고, 아니면 줄 전체를 제목으로 사용합니다.
+
+    Raises:
+        ValueError: 제목이 없는 JSON 객체 줄이 있는 경우
+    """
+    titles = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                value = json.loads(line)
+            except json.JSONDecodeError:
+                value = line
+            if isinstance(value, dict):
+                value = value.get("title")
+                if not value:
+                    raise ValueError(f"{path}:{line_no}: title is required")
+            titles.append(str(value).strip())
+    return titles
+
+
+def run_title(
+    title: str,
+    resume: bool = False,
+    semaphores: Optional[Dict[str, threading.Semaphore]] = None,
+    residency: Any = None
+) -> Dict[str, Any]:
+    """기본 제목 실행 함수: main.main() (LLM 통계는 배치 단위로 집계하므로 제목별 초기화 안 함)"""
+    from main import main
+    return main(title, resume=resume, semaphores=semaphores, residency=residency, reset_llm_stats=False)
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def run_batch(
+    titles: List[str],
+    config: Dict[str, Any],
+    resume: bool = False,
+    run_fn: Callable[..., Dict[str, Any]] = run_title,
+    engine: Any = None,
+    report_path: Optional[str] = None,
+    residency: Any = None
+) -> Dict[str, Any]:
+    """
+    여러 제목을 동시에 실행하고 배치 리포트 반환
+
+    Args:
+        titles: 제목 리스트
+        config: 설정 dict (batch / scheduler / residency 섹션 사용)
+        resume: 제목별 --resume 여부
+        run_fn: (title, resume, semaphores, residency) → metadata dict
+        engine: LLM 엔진 (없으면 get_llm_engine 싱글톤)
+        report_path: 리포트 저장 경로 (없으면 {output.base_dir}/batch_report_<시각>.json)
+        residency: 제목 간 공유할 GPU 모델 상주 관리자 (없으면 설정에 따라 생성)
+
+    Returns:
+        리포트 dict (제목별 결과 / 지연 시간 분포 / LLM 배치 통계 / 합계 tok/s)
+
+    Raises:
+        ValueError: 제목이 없거나, LLM을 GPU에 고정한 채로 다른 모델이 예산에 들어가지 않는 경우
+    """
+    titles = [title.strip() for title in titles if title and title.strip()]
+    if not titles:
+        raise ValueError("at least one title is required")
+
+    batch_config = config.get("batch", {}) or {}
+    max_titles = max(int(batch_config.get("max_titles", 16)), 1)
+
+    if engine is None:
+        from pipeline.llm import get_llm_engine
+        engine = get_llm_engine(config_path="config.yaml")
+    engine.reset_run_stats()
+
+    if residency is None and (config.get("residency", {}) or {}).get("enabled", False):
+        from pipeline.residency import create_residency_manager
+        residency = create_residency_manager(config)
+
+    # LLM은 배치가 끝날 때까지 GPU에 고정 (사용 중 표시 → 내릴 후보에서 제외)
+    # 중간에 언로드되면 enable_batching한 엔진이 닫히고 다음 get_llm_engine은 배치 없는 새 엔진을 만들어,
+    # 이후 제목은 배치 없이 실행되고 batch_report.json의 LLM 통계도 사라짐
+    pin_llm = residency is not None and "llm" in residency.models
+    if pin_llm:
+        llm_mb = residency.models["llm"].gpu_mb
+        too_large = [
+            name for name, model in residency.models.items()
+            if name != "llm" and model.gpu_mb + llm_mb > residency.gpu_budget_mb
+        ]
+        if too_large:
+            raise ValueError(
+                f"Models {too_large} do not fit in GPU budget ({residency.gpu_budget_mb:.0f}MB) "
+                f"next to the pinned LLM ({llm_mb:.0f}MB) during a batch"
+            )
+        residency.acquire(["llm"])
+
+    # 아직 끝나지 않은 제목 수 (동시 실행 상한 이내에서 배치에 모일 요청 수)
+    remaining = [len(titles)]
+    remaining_lock = threading.Lock()
+    batching = engine.enable_batching(
+        window_sec=batch_config.get("window_sec", 1.0),
+        max_batch=batch_config.get("max_batch", 64),
+        active=min(len(titles), max_titles)
+    )
+
+    # LLM 외 자원은 제목 간 공유 (LLM은 BatchingBackend가 한 번에 하나의 배치만 생성)
+    resource_limits = (config.get("scheduler", {}) or {}).get("resources", {}) or {}
+    semaphores = {
+        resource: threading.BoundedSemaphore(max(int(limit), 1))
+        for resource, limit in resource_limits.items()
+        if resource != "llm"
+    }
+
+    def run_one(title: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result = {"title": title, "status": "completed", "error": None}
+        try:
+            metadata = run_fn(title, resume, semaphores, residency) or {}
+            result["output_dir"] = metadata.get("output_dir")
+            result["main_video"] = metadata.get("main_video")
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = f"{type(e).__name__}: {e}"
+            print(f"✗ [{title}] {result['error']}")
+        finally:
+            result["latency_sec"] = round(time.perf_counter() - started, 2)
+            # 끝난 제목은 더 이상 요청하지 않으므로 남은 제목 수만큼만 모아서 생성
+            with remaining_lock:
+                remaining[0] -= 1
+                batching.set_active(min(remaining[0], max_titles))
+        return result
+
+    started_at = datetime.now()
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(titles), max_titles), thread_name_prefix="title") as executor:
+            results = list(executor.map(run_one, titles))
+    finally:
+        engine.disable_batching()
+        if pin_llm:
+            residency.release(["llm"])
+        if residency is not None:
+            residency.unload_all()
+    wall_sec = time.perf_counter() - started
+
+    telemetry = engine.telemetry.summary()
+    output_tokens = sum(stats["output_tokens"] for stats in telemetry.values())
+    llm_busy_sec = sum(batch["wall_sec"] for batch in batching.batches)
+    batch_sizes = [batch["prompts"] for batch in batching.batches]
+    latencies = [result["latency_sec"] for result in results]
+
+    report = {
+        "created_at": started_at.isoformat(),
+        "titles": results,
+        "completed": sum(1 for result in results if result["status"] == "completed"),
+        "failed": sum(1 for result in results if result["status"] == "failed"),
+        "wall_sec": round(wall_sec, 2),
+        "latency_sec": {
+            "p50": _percentile(latencies, 0.5),
+            "p90": _percentile(latencies, 0.9),
+            "max": max(latencies)
+        },
+        "llm_batches": {
+            "count": len(batch_sizes),
+            "avg_prompts": round(sum(batch_sizes) / len(batch_sizes), 2) if batch_sizes else 0,
+            "max_prompts": max(batch_sizes, default=0),
+            "busy_sec": round(llm_busy_sec, 2)
+        },
+        "llm_output_tokens": output_tokens,
+        # 배치 전체 출력 토큰 / 전체 시간, LLM 생성 중 시간 기준
+        "aggregate_tok_per_sec": round(output_tokens / wall_sec, 1) if wall_sec > 0 else None,
+        "llm_busy_tok_per_sec": round(output_tokens / llm_busy_sec, 1) if llm_busy_sec > 0 else None,
+        "llm_telemetry": telemetry
+    }
+
+    if report_path is None:
+        base_dir = (config.get("output", {}) or {}).get("base_dir", "./outputs")
+        report_path = str(Path(base_dir) / f"batch_report_{started_at.strftime('%Y%m%d_%H%M%S')}.json")
+    Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    engine.telemetry.write_jsonl(str(Path(report_path).with_suffix(".llm_calls.jsonl")))
+    report["report_path"] = report_path
+
+    print("=" * 60)
+    print(f"✓ Batch finished: {report['completed']}/{len(titles)} titles in {wall_sec:.1f}s")
+    for result in results:
+        mark = "✓" if result["status"] == "completed" else "✗"
+        print(f"  {mark} {result['latency_sec']:>8.1f}s  {result['title']}")
+    print(
+        f"  LLM: {len(batch_sizes)} batches (avg {report['llm_batches']['avg_prompts']} prompts), "
+        f"{output_tokens} output tokens, {report['aggregate_tok_per_sec']} tok/s aggregate"
+    )
+    print(f"  Report: {report_path}")
+    print("=" * 60)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AutoDrama 다중 제목 배치 실행 (LLM 호출을 제목 간 배치로 묶음)")
+    parser.add_argument("titles", nargs="*", help="드라마 제목들")
+    parser.add_argument("--file", help="제목 목록 파일 (한 줄에 하나, JSONL 가능)")
+    parser.add_argument("--resume", action="store_true", help="제목별로 변경되지 않은 Phase 건너뛰기")
+    parser.add_argument("--report", default=None, help="리포트 저장 경로")
+    args = parser.parse_args()
+
+    titles = list(args.titles)
+    if args.file:
+        titles += read_titles(args.file)
+    if not titles:
+        parser.error("제목 또는 --file이 필요합니다")
+
+    from main import load_config
+
+    report = run_batch(titles, load_config(), resume=args.resume, report_path=args.report)
+    exit(0 if report["failed"] == 0 else 1)
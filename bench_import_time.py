@@ -0,0 +1,125 @@
+"""
+Import 시간 벤치마크 (python -X importtime 기반)
+오케스트레이션 계층(main / server / 작업 큐 / 프롬프트 도구)이 가벼운지 확인
+
+- 모듈별로 새 인터프리터에서 `python -X importtime -c "import <모듈>"`을 여러 번 실행하여
+  누적 import 시간의 최솟값을 예산(ms)과 비교
+- 무거운 엔진 모듈(torch / diffusers / TTS / whisper_ctranslate2 / vllm)이 import되면 실패
+- 가장 오래 걸린 하위 모듈을 함께 출력 (예산 초과 원인 추적용)
+
+실행: python bench_import_time.py [--runs 5] [--top 8]
+      (예산 초과 또는 무거운 모듈 import 시 종료 코드 1 → CI에서 사용)
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+
+ROOT = Path(__file__).resolve().parent
+
+# 모델 계산에만 필요한 무거운 모듈 (해당 Phase에서만 import)
+HEAVY_MODULES = ["torch", "diffusers", "TTS", "whisper_ctranslate2", "vllm", "transformers"]
+
+# 모듈별 누적 import 시간 예산 (ms, 최솟값 기준)
+IMPORT_BUDGETS_MS = {
+    "main": 500,
+    "server": 500,
+    "utils.job_queue": 300,
+    "pipeline.llm": 400,
+    "pipeline.image": 150,
+    "pipeline.tts": 150,
+    "pipeline.subtitle": 150,
+    "test_outline": 500,
+}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    -X importtime 출력 파싱
+
+    Returns:
+        [(모듈 이름, self μs, cumulative μs)] (들여쓰기 제거)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append((name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+def measure_import(module: str) -> Dict[str, Any]:
+    """
+    새 인터프리터에서 모듈 import 1회 측정
+
+    Returns:
+        {"cumulative_ms", "heavy": 로드된 무거운 모듈 리스트, "rows": 파싱 결과}
+    """
+    code = (
+        f"import sys, json; import {module}; "
+        f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(ROOT), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-1:] or [""]
+        raise RuntimeError(f"import {module} failed: {tail[0]}")
+
+    rows = parse_importtime(result.stderr)
+    cumulative_us = next((cumulative for name, _, cumulative in rows if name == module), 0)
+    return {
+        "cumulative_ms": cumulative_us / 1000,
+        "heavy": json.loads(result.stdout.strip().splitlines()[-1]),
+        "rows": rows
+    }
+
+
+def run_benchmark(runs: int = 5, top: int = 8, budgets: Dict[str, float] = None) -> bool:
+    """
+    예산 대상 모듈 전체 측정 + 결과 표 출력
+
+    Returns:
+        모든 모듈이 예산 이내이고 무거운 모듈을 import하지 않으면 True
+    """
+    budgets = budgets or IMPORT_BUDGETS_MS
+    ok = True
+
+    print(f"{'module':<20} {'min ms':>8} {'budget':>8}  heavy modules")
+    for module, budget_ms in budgets.items():
+        samples = [measure_import(module) for _ in range(runs)]
+        best = min(samples, key=lambda sample: sample["cumulative_ms"])
+        heavy = best["heavy"]
+        passed = best["cumulative_ms"] <= budget_ms and not heavy
+        ok = ok and passed
+
+        mark = "✓" if passed else "✗"
+        print(f"{module:<20} {best['cumulative_ms']:>8.1f} {budget_ms:>8.0f}  {', '.join(heavy) or '-'}  {mark}")
+
+        if not passed:
+            slowest = sorted(best["rows"], key=lambda row: row[1], reverse=True)[:top]
+            for name, self_us, _ in slowest:
+                print(f"    {self_us / 1000:>7.1f} ms  {name}")
+
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="오케스트레이션 모듈 import 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=5, help="모듈별 측정 횟수 (최솟값 사용)")
+    parser.add_argument("--top", type=int, default=8, help="예산 초과 시 출력할 느린 하위 모듈 수")
+    args = parser.parse_args()
+
+    passed = run_benchmark(runs=args.runs, top=args.top)
+    print()
+    print("✓ import budget OK" if passed else "✗ import budget exceeded")
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,144 @@
+"""
+JSON 추출기 마이크로 벤치마크
+기존 extract_first_json(문자 단위 괄호 카운트) vs JsonObjectScanner
+
+약 30k자 outline 응답(문자열 값 안에 '{' / '}' 포함)을 기준으로
+- 전체 텍스트 1회 추출
+- 스트리밍처럼 chunk 단위 feed
+의 소요 시간과 추출 정확도를 비교합니다.
+
+실행: python bench_json_scanner.py
+"""
+
+import json
+import time
+from typing import Callable
+
+from utils.json_scanner import JsonObjectScanner
+
+
+def legacy_extract_first_json(text: str) -> str:
+    """기존 LLMEngine.extract_first_json 구현 (비교용)"""
+    text = text.replace('\ufeff', '')
+
+    start = text.find("{")
+    if start == -1:
+        raise ValueError("JSON start '{' not found")
+
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == "{":
+            depth += 1
+        elif text[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i+1]
+
+    raise ValueError("JSON not properly closed")
+
+
+def scanner_extract_first_json(text: str) -> str:
+    """JsonObjectScanner 기반 추출 (전체 텍스트 1회 feed)"""
+    text = text.replace('\ufeff', '')
+
+    scanner = JsonObjectScanner()
+    end = scanner.feed(text)
+    if scanner.start is None:
+        raise ValueError("JSON start '{' not found")
+    if end is None:
+        raise ValueError("JSON not properly closed")
+    return text[scanner.start:end]
+
+
+def scanner_extract_chunked(text: str, chunk_size: int = 8) -> str:
+    """스트리밍 시뮬레이션: chunk_size 문자씩 feed"""
+    scanner = JsonObjectScanner()
+    for i in range(0, len(text), chunk_size):
+        if scanner.feed(text[i:i + chunk_size]) is not None:
+            break
+    if scanner.end is None:
+        raise ValueError("JSON not properly closed")
+    return text[scanner.start:scanner.end]
+
+
+def build_outline_response(target_chars: int = 30000) -> str:
+    """문자열 값 안에 괄호/따옴표가 섞인 합성 outline 응답 생성"""
+    line = "그녀는 문을 열며 말했다. \"{이건 끝이 아니야}\" 그리고 조용히 웃었다. "
+    characters = [
+        {
+            "name": f"인물{i}",
+            "role": "조연",
+            "description": line * 3,
+            "emotional_arc": {"start": "불안", "journey": "불안 → 분노 → 수용", "end": "평온"},
+        }
+        for i in range(6)
+    ]
+    outline = {
+        "title": "벤치마크 {드라마}",
+        "characters": characters,
+        "part_breakdown": [],
+    }
+
+    part = 1
+    while len(json.dumps(outline, ensure_ascii=False)) < target_chars:
+        outline["part_breakdown"].append({
+            "part": part % 4 + 1,
+            "summary": line * 8,
+            "must_include": ["괄호가 닫히지 않은 메모 {", "반전 단서"],
+            "open_threads": ["\\\"이스케이프\\\" 된 인용", "중첩 {a: {b}}"],
+        })
+        part += 1
+
+    body = json.dumps(outline, ensure_ascii=False, indent=2)
+    # 모델이 흔히 붙이는 서두와 중복 출력
+    return "다음은 요청하신 개요입니다:\n" + body + "\n\n" + body[:500]
+
+
+def bench(fn: Callable[[str], str], text: str, repeat: int) -> float:
+    """평균 소요 시간(ms) - 추출 실패(ValueError)도 한 번의 시도로 계산"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        try:
+            fn(text)
+        except ValueError:
+            pass
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def describe(fn: Callable[[str], str], text: str, expected: str) -> str:
+    try:
+        extracted = fn(text)
+    except ValueError as e:
+        return f"실패 ({e})"
+    if extracted == expected:
+        return "정확"
+    return f"오추출 ({len(extracted):,}자 / 기대 {len(expected):,}자)"
+
+
+def main(repeat: int = 50) -> None:
+    text = build_outline_response()
+    expected = text[text.index("{"):text.index("\n\n")]
+    assert json.loads(expected)
+
+    print("=" * 60)
+    print("JSON 추출기 마이크로 벤치마크")
+    print(f"  응답 길이: {len(text):,}자 / 반복: {repeat}회")
+    print("=" * 60)
+
+    cases = [
+        ("legacy (문자 단위 카운트)", legacy_extract_first_json),
+        ("scanner (전체 feed)", scanner_extract_first_json),
+        ("scanner (8자 chunk feed)", scanner_extract_chunked),
+    ]
+
+    for name, fn in cases:
+        elapsed = bench(fn, text, repeat)
+        print(f"  {name:<28} {elapsed:8.3f} ms  → {describe(fn, text, expected)}")
+
+    assert scanner_extract_first_json(text) == expected
+    assert scanner_extract_chunked(text) == expected
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Stage 워커(프로세스) vs 스레드 풀 벤치마크
+Phase 8-10처럼 Hook / Main의 TTS·자막 작업을 2개씩 동시에 돌릴 때의 총 소요 시간 비교
+
+- 작업: GIL을 잡는 순수 Python 루프 (Coqui TTS 텍스트 처리 / synthesize_long_text 청크 루프 모사)
+  + 모델 로드 비용 (스레드 풀은 프로세스 안 싱글톤, Stage 워커는 워커 안 싱글톤 → 둘 다 1회)
+- thread: ThreadPoolExecutor(max_workers=2)에서 tts / whisper 작업 실행
+- process: StageWorker("tts") / StageWorker("whisper")에 같은 작업 전달 (워커는 미리 warm-up)
+
+CPU 코어가 1개인 환경에서는 두 방식 모두 직렬화되므로 차이가 거의 없습니다.
+
+실행: python bench_stage_workers.py [--work 3000000] [--rounds 3]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pipeline.stage_workers import StageWorker
+
+
+_loaded_models = {}
+
+
+def load_model(stage: str) -> None:
+    """모델 로드 모사 (프로세스당 1회)"""
+    if stage not in _loaded_models:
+        time.sleep(0.2)
+        _loaded_models[stage] = True
+
+
+def stage_job(stage: str, work: int) -> int:
+    """GIL을 잡는 작업 하나 (텍스트 처리 / 청크 루프 모사)"""
+    load_model(stage)
+    total = 0
+    for i in range(work):
+        total = (total + i * i) % 1000003
+    return total
+
+
+def run_threads(jobs, work: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda stage: stage_job(stage, work), jobs))
+    return time.perf_counter() - started
+
+
+def run_processes(workers, jobs, work: int) -> float:
+    started = time.perf_counter()
+    futures = [workers[stage].submit("bench_stage_workers:stage_job", stage, work) for stage in jobs]
+    for future in futures:
+        future.result()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stage 워커 vs 스레드 풀 벤치마크")
+    parser.add_argument("--work", type=int, default=3_000_000, help="작업당 루프 횟수")
+    parser.add_argument("--rounds", type=int, default=3, help="측정 반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    # Hook TTS / Main TTS / Hook 자막 / Main 자막
+    jobs = ["tts", "tts", "whisper", "whisper"]
+    print(f"CPU cores: {os.cpu_count()}, jobs: {jobs}, work: {args.work:,}")
+
+    # 스레드 풀: 모델 로드는 첫 라운드에서 1회 (이후 재사용)
+    thread_times = [run_threads(jobs, args.work) for _ in range(args.rounds)]
+
+    workers = {
+        stage: StageWorker(stage, warmup=("bench_stage_workers:load_model", {"stage": stage}), log=lambda m: None)
+        for stage in ("tts", "whisper")
+    }
+    try:
+        # 워커 시작 + warm-up (프로세스 생성 비용은 상주 프로세스에서 1회)
+        started = time.perf_counter()
+        for stage, worker in workers.items():
+            worker.run("bench_stage_workers:stage_job", stage, 1)
+        startup_sec = time.perf_counter() - started
+
+        process_times = [run_processes(workers, jobs, args.work) for _ in range(args.rounds)]
+    finally:
+        for worker in workers.values():
+            worker.stop()
+
+    thread_best, process_best = min(thread_times), min(process_times)
+    print(f"{'mode':<10} {'best (s)':>9} {'rounds':>24}")
+    print(f"{'thread':<10} {thread_best:>9.2f}   {', '.join(f'{t:.2f}' for t in thread_times)}")
+    print(f"{'process':<10} {process_best:>9.2f}   {', '.join(f'{t:.2f}' for t in process_times)}")
+    print(f"worker startup + warm-up (one-time): {startup_sec:.2f}s")
+    print(f"speedup: x{thread_best / process_best:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,26 +4,32 @@ AutoDrama - 제목만 입력하면 2시간 드라마 자동 생성
 """
 
 import yaml
-import json
-import asyncio
+import argparse
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Callable
 
 # 프롬프트 모듈
-from prompts.outline_v2_final import generate_outline_prompt
-from prompts.hook import generate_hook_prompt
-from prompts.part_v3 import generate_part_v3_prompt
-from prompts.hook_images import generate_hook_images_prompt
-from prompts.main_images import generate_main_images_prompt
+from prompts.outline_v2_final import generate_outline_prompt, OUTLINE_JSON_SCHEMA
+from prompts.hook import generate_hook_prompt, HOOK_TARGET_CHARS
+from prompts.part_v3 import (
+    generate_part_v3_prompt,
+    generate_part_continuation_instruction,
+    get_part_length_target,
+    get_word_count_range,
+    score_part_text,
+    split_part_opening,
+    generate_seam_repair_prompt,
+    validate_seam_repair
+)
+from prompts.hook_images import generate_hook_images_prompt, HOOK_IMAGES_JSON_SCHEMA
+from prompts.main_images import generate_main_images_prompt, MAIN_IMAGES_JSON_SCHEMA
 
 # 파이프라인 모듈 (신규 API)
-from pipeline.llm import get_llm_engine
-from pipeline.image import get_image_generator, generate_images
-from pipeline.tts import generate_tts
-from pipeline.subtitle import generate_subtitles
-from pipeline.video import compile_video
+# 이미지 / TTS / Whisper 엔진(torch, diffusers, TTS, whisper_ctranslate2)은 해당 Phase에서 import
+# → --help, resume으로 건너뛰는 Phase, 프롬프트만 쓰는 도구는 무거운 모듈을 로드하지 않음
+from pipeline.llm import LLMEngine, get_llm_engine, llm_engine_loaded
+from pipeline.video import compile_video, concat_videos
 
 # 유틸리티
 from utils.file_utils import (
@@ -32,7 +38,11 @@ from utils.file_utils import (
     create_output_dirs
 )
 from utils.logger import setup_logger, PhaseLogger
-from utils.context_generator import create_part_context
+from utils.profiler import PhaseProfiler, format_profile_table, profiling_settings
+from pipeline.scheduler import Phase, PhaseScheduler
+from pipeline.residency import ResidencyManager, create_residency_manager
+from utils.run_manifest import RunManifest
+from utils.context_generator import create_part_context, create_bridge_context, create_part_excerpt
 
 
 def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
@@ -60,41 +70,89 @@ def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
         return yaml.safe_load(f)
 
 
-def main(title: str) -> None:
+def build_pipeline(
+    title: str,
+    config: Dict[str, Any],
+    dirs: Dict[str, Path],
+    phase_logger: PhaseLogger,
+    resume: bool = False,
+    on_phase_done: Optional[Callable[[str], None]] = None,
+    semaphores: Optional[Dict[str, Any]] = None,
+    residency: Optional[ResidencyManager] = None
+) -> PhaseScheduler:
     """
-    메인 파이프라인 실행
+    파이프라인 Phase 그래프 구성
 
-    Args:
-        title: 드라마 제목
-    """
-    config = load_config()
+    각 Phase는 필요한 산출물(inputs)과 만드는 산출물(outputs)을 선언하며,
+    스케줄러는 의존성이 준비된 Phase부터 동시에 실행합니다.
+    (예: Hook 이미지/TTS/자막/영상은 Parts 생성과 겹쳐서 진행)
 
-    # 로거 설정
-    logger = setup_logger(
-        log_file=config["logging"]["file"],
-        level=config["logging"]["level"]
-    )
-    phase_logger = PhaseLogger(logger)
+    streaming_media.enabled면 Part 1-4를 Part별 Phase로 나누어, 검증을 통과한 Part부터
+    TTS → 자막 → 세그먼트 영상을 만들고 마지막에 stream copy로 이어붙입니다.
+    (Part 2-4 생성 중에 앞 Part의 음성/자막 작업이 진행됨)
 
-    start_time = datetime.now()
-    logger.info("=" * 60)
-    logger.info(f"AutoDrama Pipeline Started: {title}")
-    logger.info("=" * 60)
+    speculative_parts.enabled면 Part 2-4 프롬프트를 이전 Part 대본 대신 Outline의 bridge_to_next로 만들어
+    한 배치로 동시 생성하고, 실제 이전 Part 끝에 맞춰 Part 2-4의 도입부만 다시 씁니다. (seam repair)
 
-    # 출력 디렉토리 생성
-    dirs = create_output_dirs(title, config["output"]["base_dir"])
-    logger.info(f"Output directory: {dirs['base']}")
+    Phase 완료마다 출력 디렉토리의 run_manifest.json에 입력 해시와 출력 파일 해시를 기록하며,
+    resume=True면 입력(+ 관련 설정)과 출력 파일이 그대로인 Phase는 건너뜁니다.
 
-    try:
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # Phase 1: Outline 생성 (1.0분)
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    Args:
+        title: 드라마 제목 (run(initial={"title": title})로 전달)
+        config: 설정 dict
+        dirs: create_output_dirs 결과
+        phase_logger: Phase 로거
+        resume: 변경되지 않은 Phase 건너뛰기 여부
+        on_phase_done: Phase 완료마다 Phase 이름으로 호출할 함수
+        semaphores: 다른 제목과 공유할 자원별 세마포어 (batch.py)
+        residency: 다른 제목과 공유할 GPU 모델 상주 관리자 (없으면 설정에 따라 생성)
+
+    Returns:
+        PhaseScheduler (run() 호출 전)
+    """
+    # Prefix cache 레이아웃 (공통 지시문/설계 문서를 Part 프롬프트 앞에 고정)
+    prefix_cache_layout = bool((config.get("llm_prefix_cache", {}) or {}).get("enabled", False))
+
+    scheduler_config = config.get("scheduler", {}) or {}
+
+    # GPU 모델 상주 관리 (예산 안에서 대기 중인 Phase 순서에 따라 로드 / CPU 오프로드 / 언로드)
+    if residency is None and (config.get("residency", {}) or {}).get("enabled", False):
+        residency = create_residency_manager(config, log=phase_logger.info)
+
+    scheduler = PhaseScheduler(
+        resource_limits=scheduler_config.get("resources", {"llm": 1, "gpu": 2, "image": 1, "tts": 1, "whisper": 1, "ffmpeg": 2}),
+        max_workers=scheduler_config.get("max_workers", 4),
+        log=phase_logger.info,
+        manifest=RunManifest(dirs['base']),
+        resume=resume,
+        on_phase_done=on_phase_done,
+        residency=residency,
+        semaphores=semaphores
+    )
+
+    # 설정 fingerprint (바뀌면 해당 Phase부터 재실행)
+    llm_fingerprint = {
+        "model": (config.get("models", {}) or {}).get("llm"),
+        "params": config.get("llm"),
+        "seed": (config.get("llm_cache", {}) or {}).get("seed"),
+        "prefix_cache_layout": prefix_cache_layout
+    }
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # Phase 1: Outline 생성 (1.0분)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    def outline_phase(title: str) -> Dict[str, Any]:
         phase_logger.start_phase(1, "Outline Generation")
 
         llm = get_llm_engine(config_path="config.yaml")
 
         outline_prompt = generate_outline_prompt(title)
-        outline_data = llm.call_llm(outline_prompt, phase="outline")
+        outline_data = llm.call_llm(
+            outline_prompt,
+            phase="outline",
+            json_schema=OUTLINE_JSON_SCHEMA,
+            label="outline"
+        )
 
         # Outline 검증 및 보정
         from prompts.outline_v2_final import validate_outline
@@ -106,36 +164,54 @@ def main(title: str) -> None:
         phase_logger.info(f"Characters: {len(outline_data.get('characters', []))}")
         phase_logger.info(f"Parts: {len(outline_data.get('part_breakdown', []))}")
         phase_logger.end_phase(1, "Outline Generation")
+        return outline_data
 
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # Phase 2: Hook 생성 (0.3분)
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # Phase 2: Hook 생성 (0.3분)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    def hook_phase(outline_data: Dict[str, Any]) -> str:
         phase_logger.start_phase(2, "Hook Generation")
 
+        llm = get_llm_engine(config_path="config.yaml")
+
+        # Hook(약 500자)은 단독 생성 → 끝나는 즉시 Hook 이미지 / TTS / 자막 / 영상 Phase 시작
+        # (Part 1과 한 배치로 묶으면 Part 1 디코딩이 끝날 때까지 hook_text가 나오지 않음)
         hook_prompt = generate_hook_prompt(title, outline_data["outline_full"])
-        hook_text = llm.call_llm_text(hook_prompt, phase="hook")
+        hook_text = llm.call_llm_text(hook_prompt, "hook", label="hook", target_chars=HOOK_TARGET_CHARS)
         save_text(hook_text, f"{dirs['hook']}/hook.txt")
 
         phase_logger.info(f"Hook generated: {len(hook_text)} chars")
         phase_logger.end_phase(2, "Hook Generation")
+        return hook_text
 
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # Phase 3: Hook Images Prompts (0.5분)
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # Phase 3: Hook Images Prompts (0.5분)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    def hook_images_prompts_phase(hook_text: str) -> Dict[str, Any]:
         phase_logger.start_phase(3, "Hook Images Prompts")
 
+        llm = get_llm_engine(config_path="config.yaml")
+
         hook_images_prompt = generate_hook_images_prompt(hook_text)
-        hook_images_data = llm.call_llm(hook_images_prompt, phase="outline")
+        hook_images_data = llm.call_llm(
+            hook_images_prompt,
+            phase="outline",
+            json_schema=HOOK_IMAGES_JSON_SCHEMA,
+            label="hook_images"
+        )
         save_json(hook_images_data, f"{dirs['hook']}/image_prompts.json")
 
         phase_logger.info(f"Hook image prompts: {hook_images_data['total_scenes']} scenes")
         phase_logger.end_phase(3, "Hook Images Prompts")
+        return hook_images_data
 
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # Phase 4: Hook Images 생성 (0.8분)
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # Phase 4: Hook Images 생성 (0.8분)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    def hook_images_phase(hook_images_data: Dict[str, Any]) -> List[str]:
         phase_logger.start_phase(4, "Hook Images Generation")
 
+        from pipeline.image import get_image_generator
         image_gen = get_image_generator()
         hook_image_paths = image_gen.generate_from_json(
             hook_images_data['scenes'],
@@ -145,89 +221,279 @@ def main(title: str) -> None:
 
         phase_logger.info(f"Hook images generated: {len(hook_image_paths)} images")
         phase_logger.end_phase(4, "Hook Images Generation")
+        return hook_image_paths
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # Phase 5: Parts 1-4 생성 (순차 + Context) (2.5분)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    from prompts.part_v3 import validate_part_text
+    from utils.context_generator import sanitize_context
+
+    def generate_part(llm, part_num: int, outline_data: Dict[str, Any], context: Optional[Dict[str, Any]]):
+        """Part 생성 (n-best 후보 중 validate_part_text 기준 최선 선택) → (프롬프트, 대본)"""
+        phase_logger.info(f"Generating Part {part_num}...")
+
+        # Part V3 프롬프트 생성
+        part_prompt = generate_part_v3_prompt(
+            part_number=part_num,
+            outline_data=outline_data,
+            context=context,
+            prefix_cache_layout=prefix_cache_layout
+        )
 
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # Phase 5: Parts 1-4 생성 (순차 + Context) (2.5분)
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+        # LLM 호출
+        part_text = llm.call_llm_text(
+            part_prompt,
+            "parts",
+            score_fn=lambda text, n=part_num: score_part_text(text, n),
+            label=f"part{part_num}",
+            target_chars=get_word_count_range(outline_data, part_num)[1]
+        )
+        return part_prompt, part_text
+
+    def finalize_part(llm, part_num: int, outline_data: Dict[str, Any], part_prompt: str, part_text: str) -> str:
+        """Part 검증 + 분량 부족 시 이어쓰기 + 저장 → 최종 대본"""
+        is_valid, warnings, stats = validate_part_text(part_text, part_num)
+
+        # 분량 부족 → 전체 재생성 대신 부족한 분량만 이어쓰기 (최대 word_count_range[1]자)
+        target_min, _ = get_part_length_target(part_num)
+        if stats.get('length', 0) < target_min:
+            _, word_count_end = get_word_count_range(outline_data, part_num)
+            phase_logger.info(f"Part {part_num} is short ({len(part_text)} < {target_min} chars), continuing...")
+            llm.telemetry.reject(f"part{part_num}", "length")
+            continuation = llm.continue_text(
+                part_prompt,
+                part_text,
+                generate_part_continuation_instruction(part_num, outline_data, len(part_text), word_count_end),
+                max_chars=word_count_end,
+                label=f"part{part_num}_continue"
+            )
+            if continuation:
+                part_text += continuation
+                is_valid, warnings, stats = validate_part_text(part_text, part_num)
+                phase_logger.info(f"Part {part_num} continued: +{len(continuation)} chars")
+
+        if warnings:
+            for warning in warnings:
+                phase_logger.warning(f"Part {part_num}: {warning}")
+
+        phase_logger.info(f"Part {part_num} stats: {stats.get('length', 0)} chars, dialogue {stats.get('dialogue_ratio', 0):.1f}%")
+
+        prefix_stats = llm.prefix_cache_stats.get(f"part{part_num}")
+        if prefix_stats:
+            phase_logger.info(
+                f"Part {part_num} prefix cache: {prefix_stats['cached_tokens']}/{prefix_stats['prompt_tokens']} "
+                f"prompt tokens reused ({prefix_stats['hit_rate']:.0%})"
+            )
+
+        # Part 저장
+        save_text(part_text, f"{dirs['main']}/part{part_num}.txt")
+        phase_logger.info(f"Part {part_num} completed: {len(part_text)} chars")
+        return part_text
+
+    def build_part_context(part_num: int, part_text: str, outline_data: Dict[str, Any]) -> Dict[str, Any]:
+        """다음 Part를 위한 Context 생성 + 안전화 + 저장"""
+        phase_logger.info(f"Creating context for Part {part_num + 1}...")
+        context = create_part_context(
+            part_text=part_text,
+            part_number=part_num,
+            outline_data=outline_data
+        )
+        # Context 안전화
+        context = sanitize_context(context)
+
+        # Context 저장 (디버깅용)
+        save_json(context, f"{dirs['main']}/part{part_num}_context.json")
+        phase_logger.info(f"Context created: {len(context.get('summary', ''))} chars summary")
+        return context
+
+    def parts_phase(outline_data: Dict[str, Any]) -> Dict[str, Any]:
         phase_logger.start_phase(5, "Parts 1-4 Generation (Sequential with Context)")
 
+        llm = get_llm_engine(config_path="config.yaml")
+
         parts_text = []
         current_context = None
 
         # 순차 생성 (Part 1 → 2 → 3 → 4)
-        from prompts.part_v3 import validate_part_text
-        from utils.context_generator import sanitize_context
-
         for part_num in range(1, 5):
-            phase_logger.info(f"Generating Part {part_num}...")
+            part_prompt, part_text = generate_part(llm, part_num, outline_data, current_context)
+            part_text = finalize_part(llm, part_num, outline_data, part_prompt, part_text)
+            parts_text.append(part_text)
 
-            # Part V3 프롬프트 생성
-            part_prompt = generate_part_v3_prompt(
-                part_number=part_num,
-                outline_data=outline_data,
-                context=current_context
-            )
+            # Part 1-3은 다음 Part를 위한 Context 생성
+            if part_num < 4:
+                current_context = build_part_context(part_num, part_text, outline_data)
 
-            # LLM 호출
-            part_text = llm.call_llm_text(part_prompt, "parts")
-            parts_text.append(part_text)
+        # Main 전체 병합
+        main_full = "\n\n".join(parts_text)
+        save_text(main_full, f"{dirs['main']}/main_full.txt")
 
-            # Part 검증
-            is_valid, warnings, stats = validate_part_text(part_text, part_num)
-            if warnings:
-                for warning in warnings:
-                    phase_logger.warning(f"Part {part_num}: {warning}")
+        phase_logger.info(f"All parts generated: {len(main_full)} chars total")
+        phase_logger.end_phase(5, "Parts 1-4 Generation")
+        return {"parts_text": parts_text, "main_full": main_full}
+
+    # 스트리밍 모드: Part 하나가 검증을 통과하는 즉시 TTS → 자막 → 세그먼트 영상으로 넘김
+    def make_part_phase(part_num: int):
+        def part_phase(outline_data: Dict[str, Any], **inputs) -> Dict[str, Any]:
+            number = f"5.{part_num}"
+            phase_logger.start_phase(number, f"Part {part_num} Generation")
+
+            llm = get_llm_engine(config_path="config.yaml")
+
+            context = inputs[f"part{part_num - 1}_context"] if part_num > 1 else None
+            part_prompt, part_text = generate_part(llm, part_num, outline_data, context)
+
+            part_text = finalize_part(llm, part_num, outline_data, part_prompt, part_text)
+            if part_num == 4:
+                # 산출물이 하나(part4_script)인 Phase는 값을 그대로 반환
+                phase_logger.end_phase(number, f"Part {part_num} Generation")
+                return part_text
+            result = {
+                f"part{part_num}_script": part_text,
+                f"part{part_num}_context": build_part_context(part_num, part_text, outline_data)
+            }
+
+            phase_logger.end_phase(number, f"Part {part_num} Generation")
+            return result
+        return part_phase
+
+    def parts_merge_phase(**inputs) -> Dict[str, Any]:
+        parts_text = [inputs[f"part{n}_script"] for n in range(1, 5)]
+        main_full = "\n\n".join(parts_text)
+        save_text(main_full, f"{dirs['main']}/main_full.txt")
+        phase_logger.info(f"All parts generated: {len(main_full)} chars total")
+        return {"parts_text": parts_text, "main_full": main_full}
+
+    # 병렬(speculative) 모드: Part 2-4를 Outline의 bridge_to_next로 한 배치에 동시 생성 후 이음새만 수정
+    speculative_config = config.get("speculative_parts", {}) or {}
+
+    def repair_seams(llm, outline_data: Dict[str, Any], parts_text: List[str]) -> List[str]:
+        """Part 2-4 도입부를 실제 이전 Part 끝에 맞춰 다시 쓰기 (한 배치, 검증 실패 시 원문 유지)"""
+        seam_paragraphs = speculative_config.get("seam_paragraphs", 3)
+        seam_max_chars = speculative_config.get("seam_max_chars", 1500)
+        tail_chars = speculative_config.get("seam_context_chars", 1200)
+
+        splits, prompts = [], []
+        for part_num in range(2, 5):
+            opening, rest = split_part_opening(parts_text[part_num - 1], seam_paragraphs, seam_max_chars)
+            splits.append((opening, rest))
+            prompts.append(generate_seam_repair_prompt(
+                part_num, outline_data, parts_text[part_num - 2][-tail_chars:], opening, rest[:tail_chars // 2]
+            ))
+
+        repaired_openings = llm.call_llm_text_many(
+            prompts,
+            "seam_repair",
+            labels=[f"part{n}_seam" for n in range(2, 5)],
+            target_chars=[int(len(opening) * 1.3) for opening, _ in splits]
+        )
 
-            phase_logger.info(f"Part {part_num} stats: {stats.get('length', 0)} chars, dialogue {stats.get('dialogue_ratio', 0):.1f}%")
+        repaired_parts = list(parts_text)
+        report = []
+        for part_num, (opening, rest), repaired in zip(range(2, 5), splits, repaired_openings):
+            ok, reason = validate_seam_repair(opening, repaired)
+            if ok:
+                # 원래 도입부의 끝 공백(문단 구분)을 유지
+                separator = opening[len(opening.rstrip()):]
+                repaired_parts[part_num - 1] = repaired.strip() + separator + rest
+                phase_logger.info(f"Part {part_num} seam repaired: {len(opening)} → {len(repaired.strip())} chars")
+            else:
+                llm.telemetry.reject(f"part{part_num}_seam", reason)
+                phase_logger.warning(f"Part {part_num} seam repair rejected ({reason}), keeping original opening")
+            report.append({
+                "part": part_num,
+                "accepted": ok,
+                "reason": reason,
+                "original_opening": opening,
+                "repaired_opening": repaired.strip()
+            })
+
+        save_json(report, f"{dirs['main']}/seam_repairs.json")
+        return repaired_parts
+
+    def speculative_parts_phase(outline_data: Dict[str, Any]) -> Dict[str, Any]:
+        phase_logger.start_phase(5, "Parts 1-4 Generation (Speculative Parallel)")
 
-            # Part 저장
-            save_text(part_text, f"{dirs['main']}/part{part_num}.txt")
-            phase_logger.info(f"Part {part_num} completed: {len(part_text)} chars")
+        llm = get_llm_engine(config_path="config.yaml")
 
-            # Part 1-3은 다음 Part를 위한 Context 생성
-            if part_num < 4:
-                phase_logger.info(f"Creating context for Part {part_num + 1}...")
-                current_context = create_part_context(
-                    part_text=part_text,
-                    part_number=part_num,
-                    outline_data=outline_data
-                )
-                # Context 안전화
-                current_context = sanitize_context(current_context)
+        # Part 2-4 프롬프트: 이전 Part 대본 대신 Outline의 연결 정보로 만든 context 사용 (Part 1까지 한 배치)
+        part_prompts = {1: generate_part_v3_prompt(
+            part_number=1,
+            outline_data=outline_data,
+            context=None,
+            prefix_cache_layout=prefix_cache_layout
+        )}
+        for part_num in range(2, 5):
+            bridge_context = sanitize_context(create_bridge_context(part_num - 1, outline_data))
+            save_json(bridge_context, f"{dirs['main']}/part{part_num - 1}_bridge_context.json")
+            part_prompts[part_num] = generate_part_v3_prompt(
+                part_number=part_num,
+                outline_data=outline_data,
+                context=bridge_context,
+                prefix_cache_layout=prefix_cache_layout
+            )
 
-                # Context 저장 (디버깅용)
-                save_json(current_context, f"{dirs['main']}/part{part_num}_context.json")
-                phase_logger.info(f"Context created: {len(current_context.get('summary', ''))} chars summary")
+        phase_logger.info("Generating Parts 1-4 in one batch...")
+        drafts = llm.call_llm_text_many(
+            [part_prompts[n] for n in range(1, 5)],
+            "parts",
+            score_fns=[lambda text, n=n: score_part_text(text, n) for n in range(1, 5)],
+            labels=[f"part{n}" for n in range(1, 5)],
+            target_chars=[get_word_count_range(outline_data, n)[1] for n in range(1, 5)]
+        )
+
+        # 분량 부족분 이어쓰기 (Part 끝이 확정되어야 다음 Part 이음새를 맞출 수 있음)
+        parts_text = [
+            finalize_part(llm, part_num, outline_data, part_prompts[part_num], part_text)
+            for part_num, part_text in zip(range(1, 5), drafts)
+        ]
+
+        parts_text = repair_seams(llm, outline_data, parts_text)
+        for part_num in range(2, 5):
+            save_text(parts_text[part_num - 1], f"{dirs['main']}/part{part_num}.txt")
 
-        # Main 전체 병합
         main_full = "\n\n".join(parts_text)
         save_text(main_full, f"{dirs['main']}/main_full.txt")
 
         phase_logger.info(f"All parts generated: {len(main_full)} chars total")
         phase_logger.end_phase(5, "Parts 1-4 Generation")
 
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # Phase 6: Main Images Prompts (0.6분)
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+        result = {"parts_text": parts_text, "main_full": main_full}
+        result.update({f"part{n}_script": parts_text[n - 1] for n in range(1, 5)})
+        return result
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # Phase 6: Main Images Prompts (0.6분)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    def main_images_prompts_phase(parts_text: List[str]) -> Dict[str, Any]:
         phase_logger.start_phase(6, "Main Images Prompts")
 
-        main_images_prompt = generate_main_images_prompt(
-            parts_text[0] if len(parts_text) > 0 else "",
-            parts_text[1] if len(parts_text) > 1 else "",
-            parts_text[2] if len(parts_text) > 2 else "",
-            parts_text[3] if len(parts_text) > 3 else ""
+        llm = get_llm_engine(config_path="config.yaml")
+
+        # Part 대본 전체(약 5만 자)는 context 한도를 넘으므로 Part별 고른 발췌 사용
+        excerpts = [create_part_excerpt(text) for text in parts_text] + [""] * (4 - len(parts_text))
+        main_images_prompt = generate_main_images_prompt(*excerpts[:4])
+        main_images_data = llm.call_llm(
+            main_images_prompt,
+            phase="outline",
+            json_schema=MAIN_IMAGES_JSON_SCHEMA,
+            label="main_images"
         )
-        main_images_data = llm.call_llm(main_images_prompt, phase="outline")
         save_json(main_images_data, f"{dirs['main']}/image_prompts.json")
 
         phase_logger.info(f"Main image prompts: {main_images_data['total_scenes']} scenes")
         phase_logger.end_phase(6, "Main Images Prompts")
+        return main_images_data
 
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # Phase 7: Main Images 생성 (2.0분)
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # Phase 7: Main Images 생성 (2.0분)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    def main_images_phase(main_images_data: Dict[str, Any]) -> List[str]:
         phase_logger.start_phase(7, "Main Images Generation")
 
+        from pipeline.image import get_image_generator
+        image_gen = get_image_generator()
         main_image_paths = image_gen.generate_from_json(
             main_images_data['scenes'],
             str(dirs['main_images']),
@@ -236,97 +502,319 @@ def main(title: str) -> None:
 
         phase_logger.info(f"Main images generated: {len(main_image_paths)} images")
         phase_logger.end_phase(7, "Main Images Generation")
-
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # Phase 8: TTS 생성 (병렬 처리) (1.5분)
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        phase_logger.start_phase(8, "TTS Generation (Parallel)")
-
-        hook_audio_path = f"{dirs['hook']}/hook_audio.wav"
-        main_audio_path = f"{dirs['main']}/main_audio.wav"
-
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            future_hook_tts = executor.submit(
-                generate_tts,
-                hook_text,
-                hook_audio_path,
-                config["tts"]["model"]
-            )
-
-            future_main_tts = executor.submit(
-                generate_tts,
-                main_full,
-                main_audio_path,
-                config["tts"]["model"]
-            )
-
-            hook_audio = future_hook_tts.result()
-            main_audio = future_main_tts.result()
-
-        phase_logger.info("TTS generation completed")
-        phase_logger.end_phase(8, "TTS Generation")
-
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # Phase 9: Subtitle 생성 (1.5분)
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        phase_logger.start_phase(9, "Subtitle Generation")
-
-        hook_subtitle_path = f"{dirs['hook']}/hook_subtitles.srt"
-        main_subtitle_path = f"{dirs['main']}/main_subtitles.srt"
-
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            future_hook_sub = executor.submit(
-                generate_subtitles,
-                hook_audio,
-                hook_subtitle_path,
-                config["whisper"]["model"]
+        return main_image_paths
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # Phase 8-10: TTS → Subtitle → Video (Hook / Main 각각)
+    # Hook 쪽은 Hook 대본/이미지만 준비되면 Parts 생성과 겹쳐서 진행
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # Stage 워커: TTS / Whisper를 모델이 상주하는 별도 프로세스에서 실행 (GIL 경합 없이 Hook/Main 동시 처리)
+    stage_workers = None
+    if (config.get("stage_workers", {}) or {}).get("enabled", False):
+        from pipeline.stage_workers import get_stage_workers
+        stage_workers = get_stage_workers(config)
+
+    def make_tts_phase(kind: str, number: str, text_key: str, audio_path: str):
+        def tts_phase(**inputs) -> str:
+            phase_logger.start_phase(number, f"{kind.title()} TTS Generation")
+            if stage_workers is not None and "tts" in stage_workers:
+                audio = stage_workers.run("tts", "pipeline.tts:generate_tts", inputs[text_key], audio_path, config["tts"]["model"])
+            else:
+                from pipeline.tts import generate_tts
+                audio = generate_tts(inputs[text_key], audio_path, config["tts"]["model"])
+            phase_logger.end_phase(number, f"{kind.title()} TTS Generation")
+            return audio
+        return tts_phase
+
+    def make_subtitle_phase(kind: str, number: str, subtitle_path: str):
+        def subtitle_phase(**inputs) -> str:
+            phase_logger.start_phase(number, f"{kind.title()} Subtitle Generation")
+            if stage_workers is not None and "whisper" in stage_workers:
+                subtitle = stage_workers.run(
+                    "whisper", "pipeline.subtitle:generate_subtitles",
+                    inputs[f"{kind}_audio"], subtitle_path, config["whisper"]["model"]
+                )
+            else:
+                from pipeline.subtitle import generate_subtitles
+                subtitle = generate_subtitles(inputs[f"{kind}_audio"], subtitle_path, config["whisper"]["model"])
+            phase_logger.end_phase(number, f"{kind.title()} Subtitle Generation")
+            return subtitle
+        return subtitle_phase
+
+    def phase_models(name: str) -> List[str]:
+        """이 프로세스에서 GPU에 올릴 모델 (Stage 워커 프로세스의 모델은 residency 대상 아님)"""
+        return [] if stage_workers is not None and name in stage_workers else [name]
+
+    def make_video_phase(kind: str, number: str, images_dir: str, video_path: str, images_data_key: str):
+        def video_phase(**inputs) -> str:
+            phase_logger.start_phase(number, f"{kind.title()} Video Compilation")
+            images_data = inputs[images_data_key]
+            if kind.startswith("part"):
+                # Part 세그먼트는 해당 Part 장면만 사용 (표시 시간은 세그먼트 오디오 길이에 맞춤)
+                images_data = {"scenes": [
+                    {key: value for key, value in scene.items() if key != "duration"}
+                    for scene in images_data["scenes"] if scene.get("part") == kind
+                ]}
+                if not images_data["scenes"]:
+                    raise ValueError(f"No main image scenes for {kind}")
+            video = compile_video(
+                images_dir,
+                inputs[f"{kind}_audio"],
+                inputs[f"{kind}_subtitle"],
+                video_path,
+                images_data
             )
+            phase_logger.end_phase(number, f"{kind.title()} Video Compilation")
+            return video
+        return video_phase
+
+    def make_concat_phase(segment_keys: List[str], video_path: str):
+        def concat_phase(**inputs) -> str:
+            phase_logger.start_phase("10b", "Main Video Concatenation (stream copy)")
+            video = concat_videos([inputs[key] for key in segment_keys], video_path)
+            phase_logger.end_phase("10b", "Main Video Concatenation (stream copy)")
+            return video
+        return concat_phase
+
+    scheduler.add(Phase(
+        "outline", outline_phase,
+        inputs=["title"], outputs=["outline_data"], resources=["llm"], models=["llm"], number="1",
+        files=[f"{dirs['base']}/outline.json"], fingerprint=llm_fingerprint
+    ))
+    scheduler.add(Phase(
+        "hook", hook_phase,
+        inputs=["outline_data"], outputs=["hook_text"], resources=["llm"], models=["llm"], number="2",
+        files=[f"{dirs['hook']}/hook.txt"], fingerprint=llm_fingerprint
+    ))
+    scheduler.add(Phase(
+        "hook_images_prompts", hook_images_prompts_phase,
+        inputs=["hook_text"], outputs=["hook_images_data"], resources=["llm"], models=["llm"], number="3",
+        files=[f"{dirs['hook']}/image_prompts.json"], fingerprint=llm_fingerprint
+    ))
+    scheduler.add(Phase(
+        "hook_images", hook_images_phase,
+        inputs=["hook_images_data"], outputs=["hook_image_paths"], resources=["gpu", "image"], models=["image"], number="4",
+        files=[dirs['hook_images']], fingerprint=config.get("image")
+    ))
+    streaming = bool((config.get("streaming_media", {}) or {}).get("enabled", False))
+    speculative = bool(speculative_config.get("enabled", False))
+    # Part 생성은 짧은 Hook 쪽 LLM Phase(Hook / Hook 이미지 프롬프트)가 끝난 뒤 시작
+    # → LLM이 긴 Part를 디코딩하는 동안 Hook 이미지 / TTS / 자막 / 영상이 진행됨
+    parts_after = ["hook_images_prompts"]
+    if speculative:
+        # Part 1-4가 한 Phase에서 동시에 끝남 (스트리밍 모드면 Part별 TTS/영상은 그대로 Part 단위)
+        scheduler.add(Phase(
+            "parts", speculative_parts_phase,
+            inputs=["outline_data"],
+            outputs=[f"part{n}_script" for n in range(1, 5)] if streaming else ["parts_text", "main_full"],
+            resources=["llm"], models=["llm"], number="5", after=parts_after,
+            files=[f"{dirs['main']}/part{n}.txt" for n in range(1, 5)]
+            + [f"{dirs['main']}/part{n}_bridge_context.json" for n in range(1, 4)]
+            + [f"{dirs['main']}/seam_repairs.json", f"{dirs['main']}/main_full.txt"],
+            fingerprint=dict(llm_fingerprint, speculative_parts=speculative_config)
+        ))
+        if streaming:
+            scheduler.add(Phase(
+                "parts_merge", parts_merge_phase,
+                inputs=[f"part{n}_script" for n in range(1, 5)], outputs=["parts_text", "main_full"], number="5",
+                files=[f"{dirs['main']}/main_full.txt"]
+            ))
+    elif streaming:
+        for part_num in range(1, 5):
+            part_inputs = ["outline_data"] + ([f"part{part_num - 1}_context"] if part_num > 1 else [])
+            part_outputs = [f"part{part_num}_script"] + ([f"part{part_num}_context"] if part_num < 4 else [])
+            scheduler.add(Phase(
+                f"part{part_num}", make_part_phase(part_num),
+                inputs=part_inputs, outputs=part_outputs, resources=["llm"], models=["llm"], number=f"5.{part_num}",
+                after=parts_after if part_num == 1 else [],
+                files=[f"{dirs['main']}/part{part_num}.txt"]
+                + ([f"{dirs['main']}/part{part_num}_context.json"] if part_num < 4 else []),
+                fingerprint=llm_fingerprint
+            ))
+        scheduler.add(Phase(
+            "parts_merge", parts_merge_phase,
+            inputs=[f"part{n}_script" for n in range(1, 5)], outputs=["parts_text", "main_full"], number="5",
+            files=[f"{dirs['main']}/main_full.txt"]
+        ))
+    else:
+        scheduler.add(Phase(
+            "parts", parts_phase,
+            inputs=["outline_data"],
+            outputs=["parts_text", "main_full"],
+            resources=["llm"], models=["llm"], number="5", after=parts_after,
+            files=[f"{dirs['main']}/part{n}.txt" for n in range(1, 5)]
+            + [f"{dirs['main']}/part{n}_context.json" for n in range(1, 4)]
+            + [f"{dirs['main']}/main_full.txt"],
+            fingerprint=llm_fingerprint
+        ))
+    scheduler.add(Phase(
+        "main_images_prompts", main_images_prompts_phase,
+        inputs=["parts_text"], outputs=["main_images_data"], resources=["llm"], models=["llm"], number="6",
+        files=[f"{dirs['main']}/image_prompts.json"], fingerprint=llm_fingerprint
+    ))
+    scheduler.add(Phase(
+        "main_images", main_images_phase,
+        inputs=["main_images_data"], outputs=["main_image_paths"], resources=["gpu", "image"], models=["image"], number="7",
+        files=[dirs['main_images']], fingerprint=config.get("image")
+    ))
+
+    # (종류, Phase 번호 접미사, 대본 산출물, 이미지 디렉토리 키)
+    # 스트리밍 모드에서 Main은 Part별 세그먼트로 만들고 마지막에 이어붙임
+    media_targets = [("hook", "a", "hook_text", "hook_images")]
+    if streaming:
+        media_targets += [(f"part{n}", f"b{n}", f"part{n}_script", "main_images") for n in range(1, 5)]
+    else:
+        media_targets += [("main", "b", "main_full", "main_images")]
+
+    for kind, suffix, text_key, images_key in media_targets:
+        out_dir = dirs["hook" if kind == "hook" else "main"]
+        audio_path = f"{out_dir}/{kind}_audio.wav"
+        subtitle_path = f"{out_dir}/{kind}_subtitles.srt"
+        video_path = f"{out_dir}/{kind}_video.mp4"
+        images_data_key = "main_images_data" if kind.startswith("part") else f"{kind}_images_data"
+        image_paths_key = "main_image_paths" if kind.startswith("part") else f"{kind}_image_paths"
+        scheduler.add(Phase(
+            f"{kind}_tts", make_tts_phase(kind, f"8{suffix}", text_key, audio_path),
+            inputs=[text_key], outputs=[f"{kind}_audio"], resources=["gpu", "tts"], models=phase_models("tts"), number=f"8{suffix}",
+            files=[audio_path], fingerprint=config.get("tts")
+        ))
+        scheduler.add(Phase(
+            f"{kind}_subtitles", make_subtitle_phase(kind, f"9{suffix}", subtitle_path),
+            inputs=[f"{kind}_audio"], outputs=[f"{kind}_subtitle"], resources=["gpu", "whisper"], models=phase_models("whisper"), number=f"9{suffix}",
+            files=[subtitle_path], fingerprint=config.get("whisper")
+        ))
+        # 이미지 파일은 디렉토리로 전달되므로 image_paths는 완료 순서 보장용 입력
+        scheduler.add(Phase(
+            f"{kind}_video", make_video_phase(kind, f"10{suffix}", str(dirs[images_key]), video_path, images_data_key),
+            inputs=[f"{kind}_audio", f"{kind}_subtitle", images_data_key, image_paths_key],
+            outputs=[f"{kind}_video"], resources=["ffmpeg"], number=f"10{suffix}",
+            files=[video_path], fingerprint=config.get("ffmpeg")
+        ))
+
+    if streaming:
+        main_video_path = f"{dirs['main']}/main_video.mp4"
+        scheduler.add(Phase(
+            "main_video", make_concat_phase([f"part{n}_video" for n in range(1, 5)], main_video_path),
+            inputs=[f"part{n}_video" for n in range(1, 5)], outputs=["main_video"], resources=["ffmpeg"], number="10b",
+            files=[main_video_path]
+        ))
+
+    return scheduler
+
+
+def _stage_worker_stats(config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Stage 워커별 처리 작업 수 / 작업 시간 (비활성화 시 None)"""
+    if not (config.get("stage_workers", {}) or {}).get("enabled", False):
+        return None
+    from pipeline.stage_workers import get_stage_workers
+    return get_stage_workers(config).stats()
+
+
+def main(
+    title: str,
+    resume: bool = False,
+    on_phase_done: Optional[Callable[[str], None]] = None,
+    semaphores: Optional[Dict[str, Any]] = None,
+    residency: Optional[ResidencyManager] = None,
+    reset_llm_stats: bool = True,
+    dry_run: bool = False,
+    profile: bool = False
+) -> Dict[str, Any]:
+    """
+    메인 파이프라인 실행
 
-            future_main_sub = executor.submit(
-                generate_subtitles,
-                main_audio,
-                main_subtitle_path,
-                config["whisper"]["model"]
-            )
+    Args:
+        title: 드라마 제목
+        resume: True면 이전 실행의 run_manifest.json 기준으로 변경되지 않은 Phase를 건너뜀
+        on_phase_done: Phase 완료마다 Phase 이름으로 호출할 함수 (작업 큐 진행 기록용)
+        semaphores: 다른 제목과 공유할 자원별 세마포어 (batch.py 다중 제목 실행용)
+        residency: 다른 제목과 공유할 GPU 모델 상주 관리자
+        reset_llm_stats: 시작 시 LLM 통계 초기화 여부 (여러 제목이 동시에 실행되면 False)
+        dry_run: True면 LLM / 이미지 / TTS / Whisper를 결정적 stub으로 바꿔 실행 (FFmpeg은 실제 실행)
+            Phase별 타이밍 표를 출력하고 dry_run_timings.json에 저장
+        profile: True면 Phase별 CPU 시간 / 최대 RSS / 스택 샘플을 기록 (config의 profiling.enabled로도 켬)
+            profile/*.collapsed와 profile_summary.json을 metadata.json 옆에 저장
+
+    Returns:
+        metadata dict (output_dir / hook_video / main_video 포함)
+
+    Raises:
+        RuntimeError: dry_run인데 ffmpeg / ffprobe가 없는 경우
+    """
+    config = load_config()
 
-            hook_subtitle = future_hook_sub.result()
-            main_subtitle = future_main_sub.result()
+    if dry_run:
+        from pipeline.dry_run import check_ffmpeg, install_stub_engines, prepare_dry_run_config
+        check_ffmpeg()
+        config = prepare_dry_run_config(config)
+        install_stub_engines(config)
 
-        phase_logger.info("Subtitles generated")
-        phase_logger.end_phase(9, "Subtitle Generation")
+    # 로거 설정
+    logger = setup_logger(
+        log_file=config["logging"]["file"],
+        level=config["logging"]["level"]
+    )
 
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # Phase 10: Video 합성 (1.0분)
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        phase_logger.start_phase(10, "Video Compilation")
+    # Phase별 프로파일러: start_phase / end_phase 구간마다 CPU 시간, RSS, 스택 샘플 기록
+    profiler = None
+    profiling = profiling_settings(config)
+    if profile or profiling["enabled"]:
+        profiler = PhaseProfiler(interval_ms=profiling["interval_ms"], max_depth=profiling["max_depth"])
+        profiler.start()
+    phase_logger = PhaseLogger(logger, profiler=profiler)
 
-        hook_video_path = f"{dirs['hook']}/hook_video.mp4"
-        main_video_path = f"{dirs['main']}/main_video.mp4"
+    start_time = datetime.now()
+    logger.info("=" * 60)
+    logger.info(f"AutoDrama Pipeline Started: {title}" + (" (resume)" if resume else ""))
+    logger.info("=" * 60)
 
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            future_hook_video = executor.submit(
-                compile_video,
-                str(dirs['hook_images']),
-                hook_audio,
-                hook_subtitle,
-                hook_video_path,
-                hook_images_data
-            )
+    # 출력 디렉토리 생성
+    dirs = create_output_dirs(title, config["output"]["base_dir"])
+    logger.info(f"Output directory: {dirs['base']}")
 
-            future_main_video = executor.submit(
-                compile_video,
-                str(dirs['main_images']),
-                main_audio,
-                main_subtitle,
-                main_video_path,
-                main_images_data
-            )
+    # 상주 프로세스(server.py)에서는 엔진이 이미 로드되어 있으므로 이전 제목의 LLM 통계를 초기화
+    if reset_llm_stats and llm_engine_loaded():
+        get_llm_engine(config_path="config.yaml").reset_run_stats()
 
-            hook_video = future_hook_video.result()
-            main_video = future_main_video.result()
+    try:
+        # Phase 1-10: 의존성 그래프 실행 (준비된 Phase부터 동시 실행)
+        scheduler = build_pipeline(
+            title, config, dirs, phase_logger,
+            resume=resume, on_phase_done=on_phase_done, semaphores=semaphores, residency=residency
+        )
 
-        phase_logger.info("Videos compiled")
-        phase_logger.end_phase(10, "Video Compilation")
+        # LLM 통계는 엔진 객체에 남으므로 residency가 LLM을 내리기 직전에 엔진 참조를 보존
+        # (종료 후 get_llm_engine을 부르면 내려간 72B 모델을 통계 때문에 다시 로드하게 됨)
+        unloaded_llms: List[LLMEngine] = []
+
+        def keep_llm_engine() -> None:
+            if llm_engine_loaded():
+                unloaded_llms.append(get_llm_engine(config_path="config.yaml"))
+
+        track_llm = reset_llm_stats and scheduler.residency is not None and "llm" in scheduler.residency.models
+        if track_llm:
+            scheduler.residency.add_unload_hook("llm", keep_llm_engine)
+        try:
+            artifacts = scheduler.run(initial={"title": title})
+        finally:
+            if track_llm:
+                scheduler.residency.remove_unload_hook("llm", keep_llm_engine)
+
+        hook_video = artifacts["hook_video"]
+        main_video = artifacts["main_video"]
+
+        # resume으로 LLM Phase를 모두 건너뛰었으면 LLM 엔진을 로드하지 않음
+        llm_ran = any(
+            "llm" in phase.resources and name not in scheduler.skipped
+            for name, phase in scheduler.phases.items()
+        )
+        # 여러 제목이 엔진을 공유하는 배치 실행에서는 LLM 통계를 batch_report.json에 한 번만 기록
+        llm = None
+        if llm_ran and reset_llm_stats:
+            if llm_engine_loaded():
+                llm = get_llm_engine(config_path="config.yaml")
+            elif unloaded_llms:
+                llm = unloaded_llms[-1]
 
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 완료
@@ -339,33 +827,121 @@ def main(title: str) -> None:
             "created_at": start_time.isoformat(),
             "completed_at": end_time.isoformat(),
             "duration_minutes": round(elapsed, 1),
+            "output_dir": str(dirs['base']),
             "hook_video": hook_video,
             "main_video": main_video,
+            "phase_timings": scheduler.summary(),
+            "critical_path": scheduler.critical_path,
+            "resumed_phases": scheduler.skipped,
+            "gpu_residency": scheduler.residency.summary() if scheduler.residency else None,
+            "stage_workers": _stage_worker_stats(config),
+            "dry_run": dry_run,
             "status": "completed"
         }
+        if llm is not None:
+            metadata.update({
+                "llm_cache": llm.cache_stats(),
+                "llm_json_stats": llm.json_phase_stats,
+                "llm_prefix_cache": llm.prefix_cache_stats,
+                "llm_budget": llm.budget_decisions(),
+                "llm_telemetry": llm.telemetry.summary()
+            })
+
+        # Dry-run: 모델을 뺀 나머지(JSON 저장 / 프롬프트 조립 / context / FFmpeg) Phase별 소요 시간 (ms 단위)
+        if dry_run:
+            from pipeline.dry_run import format_timing_table, phase_timings, write_timings
+            timings = phase_timings(scheduler.timings)
+            metadata["dry_run_timings"] = write_timings(
+                f"{dirs['base']}/dry_run_timings.json", timings, scheduler.critical_path
+            )
+
+        # 프로파일: Phase별 collapsed stack + 요약 (모델 연산 / subprocess 대기 / Python 오버헤드 비율)
+        if profiler is not None:
+            profiler.stop()
+            metadata["profile"] = profiler.write(dirs["base"])
 
         save_json(metadata, f"{dirs['base']}/metadata.json")
 
+        # LLM 호출별 지표 (JSONL) + 실행 간 비교용 phase별 집계 이력
+        telemetry_config = config.get("llm_telemetry", {}) or {}
+        if llm is not None:
+            llm.telemetry.write_jsonl(f"{dirs['base']}/llm_calls.jsonl")
+            if telemetry_config.get("history_path"):
+                llm.telemetry.append_history(telemetry_config["history_path"], {
+                    "title": title,
+                    "created_at": start_time.isoformat(),
+                    "model": llm.model_id,
+                    "backend": llm.backend.name
+                })
+
         logger.info("=" * 60)
         logger.info(f"✓ Pipeline Completed!")
         logger.info(f"  Total time: {elapsed:.1f} minutes")
         logger.info(f"  Output: {dirs['base']}")
         logger.info(f"  Hook video: {hook_video}")
         logger.info(f"  Main video: {main_video}")
+        if scheduler.skipped:
+            logger.info(f"  Resumed: {len(scheduler.skipped)} phases skipped")
+        if llm is not None:
+            if llm.cache_stats():
+                logger.info(f"  LLM cache: {llm.cache_stats()}")
+            for phase, stats in metadata["llm_telemetry"].items():
+                logger.info(
+                    f"  LLM {phase}: {stats['calls']} calls, {stats['output_tokens']} output tokens, "
+                    f"ttft avg {stats['ttft_avg_sec']}s, {stats['decode_tok_per_sec']} tok/s, "
+                    f"rejections {stats['rejections']}"
+                )
         logger.info("=" * 60)
 
+        if dry_run:
+            logger.info("Dry-run phase timings (* = critical path):\n" + format_timing_table(timings, scheduler.critical_path))
+        if profiler is not None:
+            logger.info("Phase profile (! = failed):\n" + format_profile_table(profiler.summary()))
+        return metadata
+
     except Exception as e:
         logger.error(f"Pipeline failed: {e}", exc_info=True)
         raise
 
+    finally:
+        if profiler is not None:
+            profiler.stop()
+        if dry_run:
+            from pipeline.dry_run import reset_stub_engines
+            reset_stub_engines()
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AutoDrama - 2시간 드라마 자동 생성")
+    parser.add_argument("title", nargs="?", help="드라마 제목 (생략 시 입력 프롬프트)")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="이전 실행의 run_manifest.json 기준으로 입력/출력이 그대로인 Phase는 건너뛰고 이어서 실행"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="GPU 모델 대신 결정적 stub 엔진으로 실행 (FFmpeg은 실제 실행, Phase별 타이밍 표 출력)"
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="--dry-run 결과를 비교할 이전 dry_run_timings.json (느려진 Phase가 있으면 종료 코드 1)"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Phase별 CPU 시간 / 최대 RSS / 스택 샘플 기록 (profile/*.collapsed, profile_summary.json)"
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("AutoDrama - 2시간 드라마 자동 생성 시스템")
     print("=" * 60)
     print()
 
-    title = input("제목을 입력하세요: ").strip()
+    title = (args.title or input("제목을 입력하세요: ")).strip()
 
     if not title:
         print("❌ 제목을 입력해주세요.")
@@ -377,9 +953,24 @@ if __name__ == "__main__":
     print()
 
     try:
-        main(title)
+        metadata = main(title, resume=args.resume, dry_run=args.dry_run, profile=args.profile)
         print()
         print("✓ 완료! 영상이 생성되었습니다.")
+
+        # Dry-run 타이밍을 이전 결과와 비교 (CI 회귀 검사)
+        if args.dry_run and args.baseline:
+            from pipeline.dry_run import compare_timings, dry_run_settings
+            settings = dry_run_settings(load_config())
+            current = load_json(metadata["dry_run_timings"])["phases"]
+            regressions = compare_timings(
+                current, load_json(args.baseline)["phases"],
+                ratio=settings["regression_ratio"], min_sec=settings["regression_min_sec"]
+            )
+            for regression in regressions:
+                print(f"✗ Slower than baseline: {regression}")
+            if regressions:
+                exit(1)
+            print(f"✓ No phase slower than baseline ({args.baseline})")
     except KeyboardInterrupt:
         print("\n\n❌ 사용자가 중단했습니다.")
         exit(1)
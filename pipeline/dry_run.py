@@ -0,0 +1,579 @@
+"""
+Dry-run 모듈
+GPU 모델 없이 파이프라인 전체를 실행하는 결정적 stub 엔진 (오케스트레이션 오버헤드 측정용)
+
+- LLM: 프롬프트 종류별 고정 응답 (Outline / Hook / Part / 이미지 프롬프트 JSON / 이어쓰기 / 이음새 수정)
+- 이미지: 프롬프트 해시로 색을 정한 단색 PNG
+- TTS: 텍스트 길이에 비례하는 사인파 WAV (문장 분할 / 청크 병합(FFmpeg)은 실제 코드 그대로)
+- Whisper: 오디오 길이를 일정 간격으로 나눈 합성 자막
+- 영상 합성 / 이어붙이기는 실제 FFmpeg 실행
+
+stub은 각 엔진 모듈의 싱글톤 자리에 설치되므로 Phase 코드(JSON 저장, 프롬프트 조립,
+context 생성, FFmpeg 명령 조립)는 실제 실행과 같은 경로로 측정됩니다.
+"""
+
+import copy
+import hashlib
+import json
+import re
+import shutil
+import struct
+import time
+import wave
+import zlib
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Any, List, Optional
+
+from pipeline.llm_backends import Completion, LLMBackend
+from pipeline.tts import TTSEngine
+
+
+# dry_run 설정 기본값
+DRY_RUN_DEFAULTS = {
+    "base_dir": "./outputs/dry_run",
+    "image_width": 256,
+    "image_height": 256,
+    "audio_chars_per_sec": 250,
+    "sample_rate": 16000,
+    "subtitle_segment_sec": 3.0,
+    "regression_ratio": 1.5,
+    "regression_min_sec": 0.5
+}
+
+
+# ============================================
+# 파일 생성 (PNG / WAV)
+# ============================================
+
+def write_solid_png(path: str, width: int, height: int, rgb: tuple) -> str:
+    """
+    단색 RGB PNG 저장 (Pillow 없이 zlib으로 인코딩)
+
+    Args:
+        path: 출력 경로
+        width, height: 크기 (픽셀)
+        rgb: (r, g, b) 0-255
+
+    Returns:
+        저장된 경로
+    """
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    # 행마다 필터 바이트(0) + 픽셀
+    row = b"\x00" + bytes(rgb) * width
+    png = (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(row * height, 6))
+        + chunk(b"IEND", b"")
+    )
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(png)
+    return path
+
+
+def write_sine_wav(path: str, seconds: float, sample_rate: int = 16000, frequency: int = 400) -> str:
+    """
+    16-bit mono 사인파 WAV 저장
+
+    한 주기 샘플을 반복해서 쓰므로 길이와 무관하게 빠릅니다.
+    (sample_rate가 frequency로 나누어떨어지지 않으면 가장 가까운 주기 길이 사용)
+
+    Args:
+        path: 출력 경로
+        seconds: 길이 (초)
+        sample_rate: 샘플링 레이트
+        frequency: 주파수 (Hz)
+
+    Returns:
+        저장된 경로
+    """
+    import math
+
+    period = max(int(round(sample_rate / frequency)), 2)
+    cycle = b"".join(
+        struct.pack("<h", int(8000 * math.sin(2 * math.pi * i / period)))
+        for i in range(period)
+    )
+    total = int(seconds * sample_rate)
+    frames = cycle * (total // period) + cycle[:(total % period) * 2]
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(frames)
+    return path
+
+
+def wav_duration(path: str) -> float:
+    """WAV 길이 (초)"""
+    with wave.open(path, 'rb') as f:
+        return f.getnframes() / float(f.getframerate())
+
+
+# ============================================
+# Stub LLM
+# ============================================
+
+# 대본 문장 재료 (문장마다 번호가 들어가 반복률 검증을 통과)
+_PLACES = ["오래된 부엌", "시골 마당", "병원 복도", "버스 정류장", "장독대 옆", "낡은 다락방", "시장 골목", "강가 둑길"]
+_ACTIONS = [
+    "빛바랜 일기장을 조심스럽게 펼쳤습니다",
+    "창밖으로 저무는 해를 한참 바라보았습니다",
+    "떨리는 손으로 낡은 편지를 다시 읽었습니다",
+    "말없이 따뜻한 보리차를 한 잔 따랐습니다",
+    "오래전 그날의 기억을 천천히 떠올렸습니다",
+    "가족사진 속 얼굴들을 하나씩 쓰다듬었습니다"
+]
+_LINES = ["그때 그 일을 아직 기억하세요", "이제는 말해야 할 것 같아요", "미안하다는 말을 못 했어요", "괜찮다, 다 지나간 일이다"]
+
+
+def script_text(label: str, n_chars: int) -> str:
+    """
+    번호가 붙은 한국어 문장으로 n_chars자 이상의 대본 생성 (결정적, 중국어 / 영어 없음)
+
+    Args:
+        label: 대본 구분용 접두어 (예: "1부")
+        n_chars: 최소 길이 (자)
+
+    Returns:
+        대본 텍스트 (문단 구분 포함)
+    """
+    paragraphs, sentences, length, i = [], [], 0, 0
+    while length < n_chars:
+        place = _PLACES[i % len(_PLACES)]
+        action = _ACTIONS[(i // len(_PLACES)) % len(_ACTIONS)]
+        if i % 12 == 11:
+            # 대사 비율 5-10% 수준
+            sentence = f"\"{_LINES[i % len(_LINES)]}.\" {label} {i + 1}번째 장면에서 조용히 말했습니다."
+        else:
+            sentence = f"{label} {i + 1}번째 장면, {place}에서 주인공은 {action}."
+        sentences.append(sentence)
+        length += len(sentence) + 1
+        i += 1
+        if len(sentences) == 6:
+            paragraphs.append(" ".join(sentences))
+            length += 1
+            sentences = []
+    if sentences:
+        paragraphs.append(" ".join(sentences))
+    return "\n\n".join(paragraphs)
+
+
+def stub_outline(title: str) -> Dict[str, Any]:
+    """validate_outline을 통과하는 고정 Outline"""
+    from prompts.part_v3 import get_part_length_target
+
+    parts = []
+    for n in range(1, 5):
+        target_min, target_max = get_part_length_target(n)
+        parts.append({
+            "part": n,
+            "title": f"{n}부",
+            "time_range_minutes": [(n - 1) * 30, n * 30],
+            "word_count_range": [target_min, target_max],
+            "primary_goal": f"{n}부에서 일기장의 비밀에 한 걸음 다가간다",
+            "conflict_intensity": 3 + n,
+            "must_include": [f"{n}부 핵심 장면"],
+            "must_avoid": ["과도한 폭력"],
+            "must_resolve": [f"{n}부 갈등 정리"],
+            "open_threads": [f"{n}부에서 남은 질문"],
+            "ending_hook": f"{n}부 마지막에 새로운 사실이 드러난다",
+            "key_revelations": [f"{n}부에서 밝혀지는 사실"],
+            "bridge_to_next": {
+                "connector_dialogue": "없음" if n == 4 else f"\"{n + 1}부에서 다 말해줄게.\"",
+                "carry_over_summary": f"{n + 1}부로 이어지는 감정" if n < 4 else ""
+            }
+        })
+
+    return {
+        "meta": {
+            "title": title, "genre": "가족드라마", "tone": "따뜻함", "target_emotion": "감동",
+            "audience_age": "50-80", "duration_minutes": 120, "part_count": 4
+        },
+        "consistency_anchors": ["일기장의 의미", "주인공의 목표", "감정선의 방향", "장르와 톤"],
+        "global_conflict_arc": {"start": "평온", "rise": "의심", "peak": "진실", "fall": "화해", "end": "새 평온"},
+        "emotional_anchors": ["1부: 그리움", "2부: 혼란", "3부: 절정", "4부: 평온"],
+        "characters": [
+            {
+                "id": "char_001", "name": "김순자", "age": 72, "role": "주인공", "archetype": "어머니",
+                "core_trait": "다정함", "voice_type": "elderly_female",
+                "emotional_arc": {"start": "그리움", "journey": "용기", "end": "평온"},
+                "relationships": {"char_002": "딸"}, "key_motivation": "가족의 화해"
+            },
+            {
+                "id": "char_002", "name": "이민정", "age": 45, "role": "딸", "archetype": "조력자",
+                "core_trait": "고집", "voice_type": "adult_female",
+                "emotional_arc": {"start": "원망", "journey": "이해", "end": "화해"},
+                "relationships": {"char_001": "어머니"}, "key_motivation": "진실"
+            }
+        ],
+        "story_spine": {"setup": "일기장 발견", "climax": "비밀 고백", "resolution": "화해"},
+        "key_scenes": [
+            {"scene_id": f"s{n}", "part": n, "title": f"{n}부 핵심 장면", "location": _PLACES[n], "core_action": "고백"}
+            for n in range(1, 5)
+        ],
+        "thematic_threads": {"main_theme": "용서", "symbolic_objects": {"일기장": "숨겨진 마음"}},
+        "narrative_rules": {"pov": "3인칭", "dialogue_ratio": "5-10%", "core_forbidden": ["막장 전개"]},
+        "part_breakdown": parts,
+        "outline_full": f"「{title}」 설계 문서. " + script_text("개요", 1500)
+    }
+
+
+def stub_image_scenes(part_names: List[str], counts: List[int], seconds_per_scene: float, extra: Dict[str, Any]) -> Dict[str, Any]:
+    """이미지 프롬프트 JSON (장면마다 index / part / timestamp / prompt)"""
+    scenes = []
+    for part, count in zip(part_names, counts):
+        for _ in range(count):
+            index = len(scenes)
+            scene = {
+                "index": index,
+                "part": part,
+                "text_reference": f"{part} 장면 {index}",
+                "timestamp": round(index * seconds_per_scene, 2),
+                "description": f"{_PLACES[index % len(_PLACES)]} 장면",
+                "mood": "warm",
+                "prompt": f"korean drama still, scene {index}, {part}, soft light"
+            }
+            scene.update(extra)
+            scenes.append(scene)
+    return {"scenes": scenes, "total_scenes": len(scenes)}
+
+
+class StubLLMBackend(LLMBackend):
+    """
+    프롬프트 종류별 고정 응답 백엔드 (결정적, GPU 불필요)
+
+    ReplayBackend와 달리 fixture 없이 프롬프트 표식(【훅 대본】, 【이어쓰기】 등)과 phase로
+    응답을 만들며, 응답은 각 단계 검증(validate_outline / validate_part_text / validate_seam_repair)을 통과합니다.
+    """
+
+    name = "stub"
+
+    def __init__(self, hook_scene_sec: float = 0.4):
+        """
+        Args:
+            hook_scene_sec: Hook 이미지 장면당 표시 시간 (초, dry-run 오디오 길이에 맞춤)
+        """
+        super().__init__(model_id="stub")
+        self.hook_scene_sec = hook_scene_sec
+
+    def respond(self, prompt: str, phase: Optional[str]) -> str:
+        """
+        프롬프트 → 응답 텍스트
+
+        Raises:
+            KeyError: 알 수 없는 프롬프트
+        """
+        from prompts.hook import HOOK_TARGET_CHARS
+        from prompts.part_v3 import get_part_length_target
+
+        if "【이어쓰기】" in prompt:
+            match = re.search(r"약 ([\d,]+)자를 더", prompt)
+            missing = int(match.group(1).replace(",", "")) if match else 500
+            return script_text("이어서", missing)
+
+        if phase == "seam_repair":
+            # 도입부를 그대로 돌려줌 (길이 비율 1.0)
+            match = re.search(r"도입부 \(다시 쓸 부분\)】\n━+\n(.*?)\n\n━+\n【도입부 바로 다음", prompt, re.S)
+            if match is None:
+                raise KeyError(f"No seam opening in prompt: {prompt[:80]!r}")
+            return match.group(1)
+
+        if "【훅 대본】" in prompt:
+            data = stub_image_scenes(["hook"], [5], self.hook_scene_sec, {"duration": self.hook_scene_sec})
+            return json.dumps(data, ensure_ascii=False)
+
+        if "【Part 1-4 요약】" in prompt:
+            data = stub_image_scenes(
+                ["part1", "part2", "part3", "part4"], [4, 4, 4, 3], 10.0, {"position": "middle"}
+            )
+            return json.dumps(data, ensure_ascii=False)
+
+        if phase == "hook":
+            return script_text("훅", HOOK_TARGET_CHARS - 40)
+
+        if phase == "parts":
+            match = re.search(r"지금 바로 Part (\d) 대본을 작성하세요", prompt)
+            if match is None:
+                raise KeyError(f"No part number in prompt: {prompt[:80]!r}")
+            part_number = int(match.group(1))
+            target_min, target_max = get_part_length_target(part_number)
+            return script_text(f"{part_number}부", (target_min + target_max) // 2)
+
+        if phase == "outline":
+            match = re.search(r"【제목】\s*\n(.+)", prompt)
+            return json.dumps(stub_outline(match.group(1).strip() if match else "드라이런"), ensure_ascii=False)
+
+        raise KeyError(f"No stub response for phase {phase}: {prompt[:80]!r}")
+
+    def generate_many(
+        self,
+        prompts: List[str],
+        params_list: List[Dict[str, Any]],
+        phases: Optional[List[Optional[str]]] = None
+    ) -> List[List[Completion]]:
+        phases = phases or [None] * len(prompts)
+        results = []
+        for prompt, params, phase in zip(prompts, params_list, phases):
+            text = self.respond(prompt, phase)
+            completion = Completion(
+                text=text,
+                prompt_tokens=self.count_tokens(prompt),
+                output_tokens=self.count_tokens(text),
+                finish_reason="stop",
+                ttft_sec=0.0,
+                latency_sec=0.0
+            )
+            results.append([completion] * params.get('n', 1))
+        return results
+
+
+# ============================================
+# Stub 이미지 / TTS / Whisper
+# ============================================
+
+class StubImageGenerator:
+    """단색 PNG 생성기 (ImageGenerator.generate_from_json과 같은 파일 이름)"""
+
+    GPU_MEMORY_MB = 0
+
+    def __init__(self, width: int = 256, height: int = 256):
+        self.width = width
+        self.height = height
+
+    def generate_from_json(
+        self,
+        scenes_data: List[dict],
+        output_dir: str,
+        num_inference_steps: int = 4,
+        width: Optional[int] = None,
+        height: Optional[int] = None
+    ) -> List[str]:
+        paths = []
+        for scene in scenes_data:
+            # 프롬프트 해시 → 색 (같은 프롬프트는 같은 이미지)
+            rgb = tuple(hashlib.sha256(scene['prompt'].encode('utf-8')).digest()[:3])
+            path = str(Path(output_dir) / f"scene_{scene['index']:03d}.png")
+            paths.append(write_solid_png(path, width or self.width, height or self.height, rgb))
+        return paths
+
+
+class StubTTSEngine(TTSEngine):
+    """
+    사인파 TTS 엔진
+
+    synthesize만 바꾸고 synthesize_long_text(문장 분할 / 청크 / FFmpeg 병합)는 실제 구현을 사용합니다.
+    """
+
+    GPU_MEMORY_MB = 0
+
+    def __init__(self, chars_per_sec: float = 250, sample_rate: int = 16000):
+        # TTSEngine.__init__은 torch / TTS를 로드하므로 호출하지 않음
+        self.device = "cpu"
+        self.chars_per_sec = chars_per_sec
+        self.sample_rate = sample_rate
+
+    def offload(self) -> None:
+        pass
+
+    def onload(self) -> None:
+        pass
+
+    def synthesize(
+        self,
+        text: str,
+        output_path: str,
+        speaker: Optional[str] = None,
+        language: Optional[str] = None
+    ) -> str:
+        if not text or not text.strip():
+            raise ValueError("TTS 생성 실패: 텍스트가 비어있습니다")
+        seconds = max(len(text) / self.chars_per_sec, 0.2)
+        return write_sine_wav(output_path, seconds, self.sample_rate)
+
+
+class StubTranscriber:
+    """오디오 길이를 segment_sec 간격으로 나눈 합성 자막 (whisper_ctranslate2.Transcriber.transcribe 형식)"""
+
+    def __init__(self, segment_sec: float = 3.0):
+        self.segment_sec = segment_sec
+
+    def transcribe(self, audio_path: str, language: str = "ko", **kwargs):
+        duration = wav_duration(audio_path)
+        segments = []
+        start = 0.0
+        while start < duration:
+            end = min(start + self.segment_sec, duration)
+            segments.append(SimpleNamespace(start=start, end=end, text=f"자막 {len(segments) + 1}"))
+            start = end
+        return segments, SimpleNamespace(language=language, language_probability=1.0)
+
+
+# ============================================
+# 설치 / 설정 / 타이밍
+# ============================================
+
+def dry_run_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """config의 dry_run 섹션 + 기본값"""
+    return {**DRY_RUN_DEFAULTS, **(config.get("dry_run", {}) or {})}
+
+
+def prepare_dry_run_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    dry-run용 설정 사본
+
+    출력 디렉토리를 dry_run.base_dir로 바꾸고, stub과 맞지 않는 설정(GPU 상주 관리 / Stage 워커 프로세스)과
+    LLM 응답 캐시(실행마다 같은 경로를 측정), 실행 간 LLM 지표 이력 기록을 끕니다.
+    """
+    config = copy.deepcopy(config)
+    settings = dry_run_settings(config)
+    config.setdefault("output", {})["base_dir"] = settings["base_dir"]
+    for section in ("residency", "stage_workers", "llm_cache"):
+        config[section] = dict(config.get(section, {}) or {}, enabled=False)
+    config["llm_telemetry"] = dict(config.get("llm_telemetry", {}) or {}, history_path=None)
+    return config
+
+
+def check_ffmpeg() -> None:
+    """
+    Raises:
+        RuntimeError: ffmpeg / ffprobe가 PATH에 없는 경우
+    """
+    missing = [tool for tool in ("ffmpeg", "ffprobe") if shutil.which(tool) is None]
+    if missing:
+        raise RuntimeError(f"--dry-run requires {' / '.join(missing)} on PATH")
+
+
+def install_stub_engines(config: Dict[str, Any]) -> None:
+    """
+    LLM / 이미지 / TTS / Whisper 싱글톤을 stub으로 교체
+
+    get_llm_engine / get_image_generator / get_tts_engine / get_whisper_model이 stub을 반환합니다.
+    (reset_stub_engines로 원래 상태로)
+
+    LLMEngine은 설정 파일 경로로 초기화되므로 prepare_dry_run_config 결과를
+    {dry_run.base_dir}/dry_run_config.yaml로 저장해서 넘깁니다. (토큰 예산 / 스트리밍 / guided decoding 설정은 그대로)
+
+    Args:
+        config: prepare_dry_run_config 결과
+    """
+    import yaml
+    import pipeline.llm as llm_module
+    import pipeline.image as image_module
+    import pipeline.tts as tts_module
+    import pipeline.subtitle as subtitle_module
+
+    settings = dry_run_settings(config)
+
+    config_path = Path(settings["base_dir"]) / "dry_run_config.yaml"
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(config_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, allow_unicode=True, sort_keys=False)
+
+    llm_module._llm_engine = llm_module.LLMEngine(
+        config_path=str(config_path),
+        backend=StubLLMBackend(hook_scene_sec=0.4)
+    )
+    image_module._image_generator = StubImageGenerator(settings["image_width"], settings["image_height"])
+    tts_module._tts_engine = StubTTSEngine(settings["audio_chars_per_sec"], settings["sample_rate"])
+    subtitle_module._whisper_model = StubTranscriber(settings["subtitle_segment_sec"])
+
+
+def reset_stub_engines() -> None:
+    """stub 싱글톤 제거 (다음 호출에서 실제 엔진 로드)"""
+    from pipeline.llm import reset_llm_engine
+    from pipeline.image import reset_image_generator
+    from pipeline.tts import reset_tts_engine
+    from pipeline.subtitle import reset_whisper_model
+
+    reset_llm_engine()
+    reset_image_generator()
+    reset_tts_engine()
+    reset_whisper_model()
+
+
+def phase_timings(timings: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """
+    스케줄러 timings(perf_counter) → Phase별 시작 오프셋 / 소요 시간 (초, ms 단위 반올림)
+
+    PhaseScheduler.summary()는 0.01초 단위라 stub 실행의 짧은 Phase를 구분하기 어렵습니다.
+    """
+    if not timings:
+        return {}
+    origin = min(t["start"] for t in timings.values())
+    rows = {
+        name: {"start_sec": round(t["start"] - origin, 3), "duration_sec": round(t["end"] - t["start"], 3)}
+        for name, t in timings.items()
+        if "end" in t
+    }
+    return dict(sorted(rows.items(), key=lambda item: item[1]["start_sec"]))
+
+
+def format_timing_table(timings: Dict[str, Dict[str, float]], critical_path: Optional[List[str]] = None) -> str:
+    """
+    Phase별 타이밍 표 (critical path Phase는 * 표시)
+
+    Args:
+        timings: phase_timings 결과
+        critical_path: critical path Phase 이름 목록
+
+    Returns:
+        여러 줄 문자열
+    """
+    critical = set(critical_path or [])
+    width = max([len(name) for name in timings] + [5])
+    lines = [f"{'phase':<{width}}  {'start':>8}  {'duration':>9}", "-" * (width + 21)]
+    for name, t in timings.items():
+        mark = " *" if name in critical else ""
+        lines.append(f"{name:<{width}}  {t['start_sec']:>7.3f}s  {t['duration_sec']:>8.3f}s{mark}")
+    if timings:
+        wall = max(t["start_sec"] + t["duration_sec"] for t in timings.values())
+        busy = sum(t["duration_sec"] for t in timings.values())
+        lines.append("-" * (width + 21))
+        lines.append(f"{'wall':<{width}}  {'':>8}  {wall:>8.3f}s")
+        lines.append(f"{'busy':<{width}}  {'':>8}  {busy:>8.3f}s")
+    return "\n".join(lines)
+
+
+def compare_timings(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    ratio: float = 1.5,
+    min_sec: float = 0.5
+) -> List[str]:
+    """
+    기준 타이밍 대비 느려진 Phase 목록
+
+    소요 시간이 기준의 ratio배를 넘고 차이가 min_sec 이상인 Phase만 회귀로 봅니다.
+    (짧은 Phase의 측정 잡음 무시, 기준에 없는 Phase는 비교하지 않음)
+
+    Returns:
+        회귀 설명 문자열 리스트 (없으면 [])
+    """
+    regressions = []
+    for name, t in current.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["duration_sec"], t["duration_sec"]
+        if after > before * ratio and after - before >= min_sec:
+            regressions.append(f"{name}: {before:.3f}s → {after:.3f}s (x{after / before if before else float('inf'):.1f})")
+    return regressions
+
+
+def write_timings(path: str, timings: Dict[str, Dict[str, float]], critical_path: List[str]) -> str:
+    """dry_run_timings.json 저장 (--baseline 비교용)"""
+    data = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "phases": timings,
+        "critical_path": critical_path
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
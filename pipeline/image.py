@@ -1,14 +1,10 @@
 """
 이미지 생성 모듈
 SDXL Lightning을 사용한 고속 이미지 생성
+
+torch / diffusers는 ImageGenerator 생성 시점에 import합니다. (모듈 import는 가벼움)
 """
 
-import torch
-from diffusers import (
-    StableDiffusionXLPipeline,
-    EulerDiscreteScheduler,
-    AutoencoderKL
-)
 from pathlib import Path
 from typing import List, Optional
 import os
@@ -21,11 +17,14 @@ class ImageGenerator:
     4-8 steps로 고품질 이미지 생성
     """
 
+    # SDXL + fp16 VAE GPU 점유량 추정치 (residency 관리용)
+    GPU_MEMORY_MB = 8000
+
     def __init__(
         self,
         model_id: str = "ByteDance/SDXL-Lightning",
         device: str = "cuda",
-        torch_dtype=torch.float16,
+        torch_dtype=None,
         enable_xformers: bool = True,
         enable_cpu_offload: bool = False
     ):
@@ -35,10 +34,20 @@ class ImageGenerator:
         Args:
             model_id: HuggingFace 모델 ID
             device: 디바이스 (cuda/cpu)
-            torch_dtype: 데이터 타입 (float16 권장)
+            torch_dtype: 데이터 타입 (None이면 torch.float16)
             enable_xformers: xFormers 메모리 최적화
             enable_cpu_offload: CPU 오프로딩 (VRAM 부족 시)
         """
+        import torch
+        from diffusers import (
+            StableDiffusionXLPipeline,
+            EulerDiscreteScheduler,
+            AutoencoderKL
+        )
+
+        if torch_dtype is None:
+            torch_dtype = torch.float16
+
         print(f"Loading SDXL Lightning from {model_id}...")
 
         self.device = device
@@ -86,6 +95,18 @@ class ImageGenerator:
 
         print("✓ SDXL Lightning loaded successfully!")
 
+    def offload(self) -> None:
+        """파이프라인을 CPU로 이동 (GPU 메모리 반환, onload()로 복귀)"""
+        import torch
+
+        self.pipe.to("cpu")
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def onload(self) -> None:
+        """오프로드한 파이프라인을 다시 GPU로"""
+        self.pipe.to(self.device)
+
     def generate_single(
         self,
         prompt: str,
@@ -115,6 +136,7 @@ class ImageGenerator:
         # Generator
         generator = None
         if seed is not None:
+            import torch
             generator = torch.Generator(device=self.device).manual_seed(seed)
 
         print(f"Generating image: {Path(output_path).name}")
@@ -183,6 +205,7 @@ class ImageGenerator:
             print(f"\n[Batch {i//batch_size + 1}/{(total-1)//batch_size + 1}] Generating {len(batch_prompts)} images...")
 
             # Generator
+            import torch
             generator = torch.Generator(device=self.device).manual_seed(seed + i)
 
             # 배치 생성
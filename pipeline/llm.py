@@ -1,31 +1,513 @@
 """
 LLM 모듈 (72B 최적화 + 안정화 로직 강화)
-vLLM을 사용한 Qwen 2.5 72B AWQ 모델 추론
+vLLM을 사용한 Qwen 2.5 72B AWQ 모델 추론 (백엔드: pipeline/llm_backends.py)
 """
+import gc
 import json
 import yaml
 import re
 import time
-from vllm import LLM, SamplingParams
-from typing import Dict, Any, Optional, List
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Callable, Optional, List, Tuple, Union
 import os
 
+from pipeline.llm_backends import BatchingBackend, Completion, LLMBackend, create_backend
+from utils.json_repair import repair_json
+from utils.json_scanner import JsonObjectScanner
+
+
+# JSON 모드 stop 시퀀스 (첫 JSON 닫힌 뒤 중복 출력 방지)
+JSON_STOP_SEQUENCES = ["\n以上", "\nThis", "}\n이", "</s>", "}\n\n"]
+
+# 문장 종료 위치 (종결 부호 + 닫는 따옴표)
+_SENTENCE_END = re.compile(r'[.?!…]["\'”’]?')
+
+
+def _trim_to_sentence(text: str, max_chars: int) -> str:
+    """max_chars 이내에서 마지막 완결 문장까지 자르기 (문장 경계가 없으면 그대로 절단)"""
+    if len(text) <= max_chars:
+        return text
+
+    cut = text[:max_chars]
+    ends = [m.end() for m in _SENTENCE_END.finditer(cut)]
+    return cut[:ends[-1]] if ends else cut
+
+
+class ResponseCache:
+    """
+    LLM 응답 디스크 캐시 (content-addressed, LRU)
+
+    키 = sha256(프롬프트 + 샘플링 파라미터 + seed + 모델 ID)
+    항목마다 하나의 JSON 파일로 저장하며, 전체 크기가 max_size_mb를 넘으면
+    가장 오래 사용되지 않은 항목부터 삭제합니다.
+    """
+
+    def __init__(self, cache_dir: str, max_size_mb: float = 512):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리
+            max_size_mb: 최대 캐시 크기 (MB)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        # 사용 시각(mtime) 순 인덱스: key -> size
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        entries = sorted(self.cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for path in entries:
+            self._index[path.stem] = path.stat().st_size
+        self._total_size = sum(self._index.values())
+
+    @staticmethod
+    def make_key(prompt: str, params: Dict[str, Any], model_id: str) -> str:
+        """프롬프트 + 파라미터(seed 포함) + 모델 ID 해시"""
+        payload = json.dumps(
+            {"prompt": prompt, "params": params, "model": model_id},
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """캐시 조회 (hit 시 LRU 순서 갱신, n-best 후보 전체 반환)"""
+        with self._lock:
+            path = self.cache_dir / f"{key}.json"
+            if key not in self._index or not path.exists():
+                self._index.pop(key, None)
+                self.misses += 1
+                return None
+
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    texts = json.load(f)['texts']
+            except (OSError, ValueError, KeyError):
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            os.utime(path, None)
+            self._index.move_to_end(key)
+            self.hits += 1
+            return texts
+
+    def put(self, key: str, texts: List[str]) -> None:
+        """캐시 저장 (원자적 쓰기 후 용량 초과분 LRU 삭제)"""
+        with self._lock:
+            path = self.cache_dir / f"{key}.json"
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"texts": texts}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+            self._total_size -= self._index.pop(key, 0)
+            size = path.stat().st_size
+            self._index[key] = size
+            self._total_size += size
+
+            while self._total_size > self.max_size_bytes and len(self._index) > 1:
+                oldest = next(iter(self._index))
+                self._remove(oldest)
+
+    def discard(self, key: str) -> None:
+        """항목 삭제 (검증에 실패한 응답이 재실행 시 재사용되지 않도록)"""
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        self._total_size -= self._index.pop(key, 0)
+        try:
+            (self.cache_dir / f"{key}.json").unlink()
+        except FileNotFoundError:
+            pass
+
+    def reset_stats(self) -> None:
+        """hit/miss 카운터 초기화 (캐시 항목은 유지)"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """hit/miss 통계"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": len(self._index),
+            "size_mb": round(self._total_size / 1024 / 1024, 2)
+        }
+
+
+class StreamMonitor:
+    """
+    스트리밍 출력 점진 검사기
+
+    토큰이 들어올 때마다 delta만 검사하여
+    - 중국어(CJK) drift → 즉시 중단
+    - JSON 모드: '{' 없이 긴 서두 / 괄호 불균형 → 즉시 중단
+    - JSON 모드: 첫 최상위 객체가 닫히면 → 생성 종료
+    """
+
+    CONTINUE = "continue"
+    CHINESE = "chinese"
+    INVALID_JSON = "invalid_json"
+    JSON_CLOSED = "json_closed"
+
+    def __init__(
+        self,
+        json_mode: bool = False,
+        chinese_threshold: int = 5,
+        max_json_preamble_chars: int = 200
+    ):
+        """
+        Args:
+            json_mode: JSON 종료/손상 검사 여부
+            chinese_threshold: 허용 CJK 문자 수 (초과 시 중단, detect_chinese와 동일 기준)
+            max_json_preamble_chars: '{' 이전에 허용할 최대 문자 수
+        """
+        self.json_mode = json_mode
+        self.chinese_threshold = chinese_threshold
+        self.max_json_preamble_chars = max_json_preamble_chars
+
+        self.chinese_chars = 0
+        self.position = 0
+        self._scanner = JsonObjectScanner()
+
+    def feed(self, delta: str) -> str:
+        """
+        새로 생성된 텍스트 조각 검사
+
+        Returns:
+            CONTINUE / CHINESE / INVALID_JSON / JSON_CLOSED
+        """
+        self.chinese_chars += sum(1 for c in delta if '\u4e00' <= c <= '\u9fff')
+        if self.chinese_chars > self.chinese_threshold:
+            return self.CHINESE
+
+        self.position += len(delta)
+        if not self.json_mode:
+            return self.CONTINUE
+
+        if self._scanner.feed(delta) is not None:
+            return self.JSON_CLOSED
+
+        if self._scanner.stray_close:
+            return self.INVALID_JSON
+
+        if self._scanner.start is None and self.position > self.max_json_preamble_chars:
+            return self.INVALID_JSON
+
+        return self.CONTINUE
+
+    @property
+    def json_start(self) -> Optional[int]:
+        """첫 '{' 위치"""
+        return self._scanner.start
+
+    @property
+    def json_end(self) -> Optional[int]:
+        """첫 최상위 객체 종료 위치"""
+        return self._scanner.end
+
+
+class TokenBudgetPlanner:
+    """
+    호출별 max_tokens 결정기 (KV cache 예약량 최소화 + context overflow 방지)
+
+    - 프롬프트 토큰 수는 모델 토크나이저로 계산
+    - 목표 분량(자)이 있으면 한국어 chars/token 추정치로 출력 토큰 수 환산 (+ 여유분)
+    - 목표 분량이 없으면 phase 설정의 max_tokens 사용
+    - 어떤 경우에도 max_model_len - 프롬프트 토큰을 넘지 않음
+    """
+
+    def __init__(
+        self,
+        max_model_len: int,
+        count_tokens: Callable[[str], int],
+        chars_per_token: float = 1.4,
+        safety_margin: float = 1.15,
+        min_output_tokens: int = 256
+    ):
+        """
+        Args:
+            max_model_len: 모델 최대 context 길이 (프롬프트 + 출력)
+            count_tokens: 토큰 수 계산 함수 (모델 토크나이저)
+            chars_per_token: 한국어 평균 문자/토큰 비율 추정치
+            safety_margin: 목표 분량 환산 시 곱할 여유 비율
+            min_output_tokens: 최소 max_tokens
+        """
+        self.max_model_len = max_model_len
+        self.count_tokens = count_tokens
+        self.chars_per_token = chars_per_token
+        self.safety_margin = safety_margin
+        self.min_output_tokens = min_output_tokens
+
+        self.decisions: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def estimate_tokens(self, chars: int, chars_per_token: Optional[float] = None) -> int:
+        """목표 분량(자) → 출력 토큰 수 추정 (여유분 포함)"""
+        ratio = chars_per_token or self.chars_per_token
+        return int(chars / ratio * self.safety_margin) + 1
+
+    def plan(
+        self,
+        prompt: str,
+        configured_max_tokens: int,
+        target_chars: Optional[int] = None,
+        label: str = "generate",
+        chars_per_token: Optional[float] = None
+    ) -> int:
+        """
+        max_tokens 결정 + 로그 기록
+
+        Args:
+            prompt: 프롬프트
+            configured_max_tokens: phase 설정의 max_tokens
+            target_chars: 목표 출력 분량 (자, 없으면 설정값 사용)
+            label: 로그/통계용 이름
+            chars_per_token: 이 호출에만 적용할 문자/토큰 비율 (실측값 등)
+
+        Returns:
+            max_tokens
+
+        Raises:
+            ValueError: 프롬프트가 너무 길어 최소 출력 토큰도 확보할 수 없는 경우
+        """
+        prompt_tokens = self.count_tokens(prompt)
+        available = self.max_model_len - prompt_tokens
+        if available < self.min_output_tokens:
+            raise ValueError(
+                f"[{label}] Prompt too long: {prompt_tokens} tokens "
+                f"(max_model_len={self.max_model_len}, min_output_tokens={self.min_output_tokens})"
+            )
+
+        if target_chars:
+            desired = self.estimate_tokens(target_chars, chars_per_token)
+            source = f"target {target_chars} chars"
+        else:
+            desired = configured_max_tokens
+            source = "config"
+
+        max_tokens = max(self.min_output_tokens, min(desired, available))
+
+        decision = {
+            "label": label,
+            "prompt_tokens": prompt_tokens,
+            "target_chars": target_chars,
+            "configured_max_tokens": configured_max_tokens,
+            "desired_tokens": desired,
+            "available_tokens": available,
+            "max_tokens": max_tokens
+        }
+        with self._lock:
+            self.decisions.append(decision)
+
+        capped = " (capped by context)" if desired > available else ""
+        print(
+            f"[budget] {label}: prompt={prompt_tokens} tokens, {source} → "
+            f"max_tokens={max_tokens} (configured={configured_max_tokens}, available={available}){capped}"
+        )
+        return max_tokens
+
+    def reset(self) -> None:
+        """결정 기록 초기화 (실행(제목)별 통계용)"""
+        with self._lock:
+            self.decisions = []
+
+
+class LLMTelemetry:
+    """
+    LLM 호출별 지표 기록 (생성 요청 1건 = 레코드 1개)
+
+    레코드: label, phase, 재시도 인덱스, prompt/출력/prefix cache 토큰 수,
+    TTFT, 전체 지연, 디코딩 속도(tok/s), finish_reason, 거절 사유
+    거절 사유는 생성 후 검증 단계에서 reject()로 채웁니다 ("chinese" / "json" / "length").
+    토큰 예산을 넘는 프롬프트는 생성 없이 "prompt_too_long" 레코드로 남습니다.
+    """
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        label: str,
+        phase: Optional[str],
+        attempt: int,
+        completions: List[Completion],
+        wall_sec: float,
+        mode: str,
+        ttft_sec: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        생성 요청 1건 기록 + 로그 출력
+
+        Args:
+            label: 호출 이름
+            phase: 단계 (집계 키, 없으면 label)
+            attempt: 재시도 인덱스 (0부터)
+            completions: 요청의 후보 리스트 (n-best, 캐시 응답이면 빈 리스트)
+            wall_sec: 호출 측에서 측정한 소요 시간 (백엔드 latency가 없을 때 사용)
+            mode: "stream" / "batch" / "cached" / "rejected" (토큰 예산 초과로 생성하지 않음)
+            ttft_sec: 호출 측에서 측정한 TTFT (스트리밍, 없으면 백엔드 값)
+
+        Returns:
+            레코드 dict
+        """
+        first = completions[0] if completions else None
+        output_tokens = sum(c.output_tokens for c in completions)
+        latency = first.latency_sec if first is not None and first.latency_sec is not None else wall_sec
+        if ttft_sec is None and first is not None:
+            ttft_sec = first.ttft_sec
+
+        # 디코딩 속도: 첫 토큰 이후 구간 기준 (TTFT를 모르면 전체 지연 기준)
+        decode_sec = latency - (ttft_sec or 0.0)
+        tok_per_sec = output_tokens / decode_sec if output_tokens and decode_sec > 0 else None
+
+        record = {
+            "time": round(time.time(), 3),
+            "label": label,
+            "phase": phase or label,
+            "attempt": attempt,
+            "mode": mode,
+            "n": len(completions),
+            "prompt_tokens": first.prompt_tokens if first is not None else 0,
+            "output_tokens": output_tokens,
+            "cached_tokens": first.cached_tokens if first is not None else 0,
+            "ttft_sec": round(ttft_sec, 3) if ttft_sec is not None else None,
+            "latency_sec": round(latency, 3),
+            "decode_tok_per_sec": round(tok_per_sec, 1) if tok_per_sec is not None else None,
+            "finish_reason": first.finish_reason if first is not None else None,
+            "rejected": None
+        }
+        with self._lock:
+            self.records.append(record)
+
+        if mode not in ("cached", "rejected"):
+            ttft = f"{record['ttft_sec']:.2f}s" if record['ttft_sec'] is not None else "n/a"
+            speed = f"{record['decode_tok_per_sec']:.1f} tok/s" if tok_per_sec is not None else "n/a"
+            print(
+                f"[{label}] Telemetry: prompt={record['prompt_tokens']} output={output_tokens} tokens, "
+                f"ttft={ttft}, latency={latency:.2f}s, {speed}, finish={record['finish_reason']}"
+            )
+        return record
+
+    def reject(self, label: str, cause: str) -> None:
+        """
+        label의 가장 최근 (거절되지 않은) 레코드에 거절 사유 기록
+
+        JSON 실패라도 max_tokens에 걸려 잘린 응답이면 "length"로 기록합니다.
+        """
+        with self._lock:
+            for record in reversed(self.records):
+                if record["label"] != label or record["rejected"] is not None:
+                    continue
+                if cause == "json" and record["finish_reason"] == "length":
+                    cause = "length"
+                record["rejected"] = cause
+                return
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """phase별 집계 (metadata.json / 실행 이력용)"""
+        with self._lock:
+            records = list(self.records)
+
+        summary: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            stats = summary.setdefault(record["phase"], {
+                "calls": 0,
+                "cached": 0,
+                "retries": 0,
+                "prompt_tokens": 0,
+                "output_tokens": 0,
+                "cached_tokens": 0,
+                "latency_sec": 0.0,
+                "ttft_sec": [],
+                "decode": [0, 0.0],
+                "finish_reasons": {},
+                "rejections": {}
+            })
+            stats["calls"] += 1
+            if record["attempt"] > 0:
+                stats["retries"] += 1
+            if record["rejected"]:
+                stats["rejections"][record["rejected"]] = stats["rejections"].get(record["rejected"], 0) + 1
+            if record["mode"] == "cached":
+                stats["cached"] += 1
+                continue
+            if record["mode"] == "rejected":
+                continue
+
+            stats["prompt_tokens"] += record["prompt_tokens"]
+            stats["output_tokens"] += record["output_tokens"]
+            stats["cached_tokens"] += record["cached_tokens"]
+            stats["latency_sec"] += record["latency_sec"]
+            if record["ttft_sec"] is not None:
+                stats["ttft_sec"].append(record["ttft_sec"])
+            if record["decode_tok_per_sec"]:
+                stats["decode"][0] += record["output_tokens"]
+                stats["decode"][1] += record["output_tokens"] / record["decode_tok_per_sec"]
+            reason = record["finish_reason"] or "unknown"
+            stats["finish_reasons"][reason] = stats["finish_reasons"].get(reason, 0) + 1
+
+        for stats in summary.values():
+            ttfts = sorted(stats.pop("ttft_sec"))
+            decode_tokens, decode_sec = stats.pop("decode")
+            stats["latency_sec"] = round(stats["latency_sec"], 2)
+            stats["ttft_avg_sec"] = round(sum(ttfts) / len(ttfts), 3) if ttfts else None
+            stats["ttft_max_sec"] = ttfts[-1] if ttfts else None
+            stats["decode_tok_per_sec"] = round(decode_tokens / decode_sec, 1) if decode_sec > 0 else None
+        return summary
+
+    def write_jsonl(self, path: str) -> None:
+        """호출별 레코드를 JSONL로 저장"""
+        with self._lock:
+            records = list(self.records)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def append_history(self, path: str, run_info: Dict[str, Any]) -> None:
+        """실행 단위 phase별 집계를 이력 JSONL에 추가 (실행 간 처리량 회귀 비교용)"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(dict(run_info, phases=self.summary()), ensure_ascii=False) + "\n")
+
 
 class LLMEngine:
     """
-    vLLM 기반 LLM 엔진
-    Qwen2.5-72B-AWQ 모델 최적화
+    LLM 엔진 (기본: vLLM + Qwen2.5-72B-AWQ)
+    생성은 llm_backend 설정의 백엔드(vllm / openai / replay)에 위임합니다.
     """
 
+    # vllm 백엔드 GPU 점유량 추정치 (AWQ 가중치 ~36-40GB, residency 관리용)
+    GPU_MEMORY_MB = 40000
+
     def __init__(
         self,
         config_path: str = "config.yaml",
         model_path: Optional[str] = None,
         max_model_len: int = 12288,
         tensor_parallel_size: int = 1,
-        gpu_memory_utilization: float = 0.88
+        gpu_memory_utilization: Optional[float] = None,
+        backend: Optional[LLMBackend] = None
     ):
-        """LLM 엔진 초기화"""
+        """
+        LLM 엔진 초기화
+
+        Args:
+            gpu_memory_utilization: vLLM GPU 메모리 비율 (None이면 residency 설정 또는 0.88)
+            backend: 생성 백엔드 (없으면 config의 llm_backend 설정으로 생성)
+        """
         # Config 로드
         if os.path.exists(config_path):
             with open(config_path, 'r', encoding='utf-8') as f:
@@ -47,24 +529,275 @@ class LLMEngine:
         if model_path is None:
             model_path = self.config['models']['llm']
 
-        print(f"Loading vLLM model: {model_path}")
-        print(f"  - max_model_len: {max_model_len}")
-        print(f"  - tensor_parallel_size: {tensor_parallel_size}")
-
-        # vLLM 엔진 초기화
-        self.llm = LLM(
-            model=model_path,
-            download_dir=self.config['models'].get('cache_dir'),
-            tensor_parallel_size=tensor_parallel_size,
-            quantization="awq",
-            max_model_len=max_model_len,
-            enforce_eager=False,
-            enable_chunked_prefill=True,
-            gpu_memory_utilization=gpu_memory_utilization,
-            trust_remote_code=True
+        # residency 관리 시 다른 모델(SDXL / TTS / Whisper) 자리를 남기도록 vLLM 선점 비율 축소
+        if gpu_memory_utilization is None:
+            residency_config = self.config.get('residency', {}) or {}
+            gpu_memory_utilization = 0.88
+            if residency_config.get('enabled', False):
+                gpu_memory_utilization = residency_config.get('llm_gpu_memory_utilization', gpu_memory_utilization)
+
+        # Automatic prefix caching (공통 프롬프트 prefix의 prefill/KV cache 재사용)
+        enable_prefix_caching = bool((self.config.get('llm_prefix_cache', {}) or {}).get('enabled', False))
+
+        # 생성 백엔드 초기화 (vLLM은 이 시점에만 import)
+        if backend is None:
+            backend = create_backend(
+                self.config,
+                model_path=model_path,
+                max_model_len=max_model_len,
+                tensor_parallel_size=tensor_parallel_size,
+                gpu_memory_utilization=gpu_memory_utilization,
+                enable_prefix_caching=enable_prefix_caching
+            )
+        self.backend = backend
+
+        self.model_id = backend.model_id
+        self.max_model_len = max_model_len
+
+        # JSON 단계별 재시도/낭비 토큰/소요 시간 통계 (guided decoding 효과 측정용)
+        self.json_phase_stats: Dict[str, Dict[str, Any]] = {}
+
+        # 호출 이름(label)별 prefix cache 재사용 토큰 통계
+        self.prefix_cache_stats: Dict[str, Dict[str, Any]] = {}
+
+        # 호출별 토큰 수 / TTFT / 디코딩 속도 / 거절 사유
+        self.telemetry = LLMTelemetry()
+
+        # 응답 캐시 (동일 프롬프트/파라미터/seed/모델 → 재생성 생략)
+        cache_config = self.config.get('llm_cache', {}) or {}
+        self.seed = cache_config.get('seed')
+        self.response_cache: Optional[ResponseCache] = None
+        if cache_config.get('enabled', False):
+            self.response_cache = ResponseCache(
+                cache_dir=cache_config.get('dir', './llm_cache'),
+                max_size_mb=cache_config.get('max_size_mb', 512)
+            )
+            print(f"  - response cache: {self.response_cache.cache_dir} ({self.response_cache.stats()['entries']} entries)")
+
+        # 토큰 예산 (프롬프트 토큰 + 목표 분량 → 호출별 max_tokens)
+        budget_config = self.config.get('llm_budget', {}) or {}
+        self.budget_planner: Optional[TokenBudgetPlanner] = None
+        if budget_config.get('enabled', False):
+            self.budget_planner = TokenBudgetPlanner(
+                max_model_len=max_model_len,
+                count_tokens=self.count_tokens,
+                chars_per_token=budget_config.get('chars_per_token', 1.4),
+                safety_margin=budget_config.get('safety_margin', 1.15),
+                min_output_tokens=budget_config.get('min_output_tokens', 256)
+            )
+            print(f"  - token budget: {self.budget_planner.chars_per_token} chars/token, margin x{self.budget_planner.safety_margin}")
+
+    def _normalize_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """파라미터 dict에 기본값을 채워 정규화 (백엔드 요청 + 캐시 키 공용)"""
+        stop = params.get('stop')
+        if stop is None:
+            stop = ["\n以上", "\nThis", "</s>", "}\n이"]
+
+        return {
+            'temperature': params.get('temperature', 0.7),
+            'max_tokens': params.get('max_tokens', 4096),
+            'top_p': params.get('top_p', 0.92),
+            'top_k': params.get('top_k', 40),
+            'repetition_penalty': params.get('repetition_penalty', 1.13),
+            'stop': list(stop),
+            'presence_penalty': params.get('presence_penalty', 0.0),
+            'frequency_penalty': params.get('frequency_penalty', 0.0),
+            'seed': params.get('seed'),
+            'n': params.get('n', 1),
+            'json_schema': params.get('json_schema')
+        }
+
+    def _attempt_seed(self, attempt: int) -> Optional[int]:
+        """재시도마다 다른 seed (seed 고정 시 같은 실패 응답 반복 방지)"""
+        if self.seed is None:
+            return None
+        return self.seed + attempt
+
+    def _cache_key(self, prompt: str, params: Dict[str, Any]) -> str:
+        return ResponseCache.make_key(prompt, self._normalize_params(params), self.model_id)
+
+    def discard_cached(self, prompt: str, params: Dict[str, Any]) -> None:
+        """검증에 실패한 응답을 캐시에서 제거"""
+        if self.response_cache is not None:
+            self.response_cache.discard(self._cache_key(prompt, params))
+
+    def generate_stream(
+        self,
+        prompt: str,
+        params: Dict[str, Any],
+        json_mode: bool = False,
+        use_cache: bool = True,
+        label: Optional[str] = None,
+        phase: Optional[str] = None,
+        attempt: int = 0
+    ) -> Tuple[str, str]:
+        """
+        스트리밍 생성 + 조기 중단
+
+        백엔드 스트림의 새 토큰마다 StreamMonitor로 검사합니다.
+        중국어 drift나 복구 불가능한 JSON이 감지되면 스트림을 닫아 요청을 즉시 abort하고,
+        JSON 모드에서는 첫 최상위 객체가 닫히는 순간 생성을 종료합니다.
+
+        Args:
+            prompt: 프롬프트
+            params: 파라미터 dict (generate_many와 동일)
+            json_mode: JSON 종료/손상 검사 여부
+            use_cache: 응답 캐시 사용 여부
+            label: prefix cache / telemetry 통계용 이름
+            phase: 단계 (백엔드 동시성 제한 + telemetry 집계용)
+            attempt: 재시도 인덱스 (telemetry 기록용)
+
+        Returns:
+            (생성된 텍스트, 종료 사유)
+            종료 사유: "finished" / "cached" / "json_closed" / "chinese" / "invalid_json"
+        """
+        cache = self.response_cache if use_cache else None
+        key = None
+        if cache is not None:
+            key = self._cache_key(prompt, params)
+            cached = cache.get(key)
+            if cached is not None:
+                print("[cache] 1/1 responses served from cache")
+                self.telemetry.record(label or "generate", phase, attempt, [], 0.0, mode="cached")
+                return cached[0], "cached"
+
+        stream_config = self.config.get('llm_streaming', {}) or {}
+        monitor = StreamMonitor(
+            json_mode=json_mode,
+            chinese_threshold=stream_config.get('chinese_threshold', 5),
+            max_json_preamble_chars=stream_config.get('max_json_preamble_chars', 200)
         )
 
-        print("✓ vLLM model loaded successfully!")
+        stream = self.backend.stream(prompt, self._normalize_params(params), phase=phase)
+
+        text = ""
+        reason = "finished"
+        last_snapshot: Optional[Completion] = None
+        started = time.perf_counter()
+        ttft_sec = None
+        try:
+            for snapshot in stream:
+                last_snapshot = snapshot
+                if ttft_sec is None and snapshot.text:
+                    ttft_sec = time.perf_counter() - started
+                status = monitor.feed(snapshot.text[len(text):])
+                text = snapshot.text
+
+                if status != StreamMonitor.CONTINUE:
+                    reason = status
+                    break
+        finally:
+            # 조기 종료 시 백엔드 요청 abort
+            stream.close()
+
+        if last_snapshot is not None:
+            self._record_prefix_hit(label, last_snapshot)
+            self.telemetry.record(
+                label or "generate", phase, attempt, [last_snapshot],
+                time.perf_counter() - started, mode="stream", ttft_sec=ttft_sec
+            )
+
+        if reason == StreamMonitor.JSON_CLOSED:
+            text = text[:monitor.json_end]
+
+        if reason in (StreamMonitor.CHINESE, StreamMonitor.INVALID_JSON):
+            print(f"✗ Stream aborted at {len(text)} chars: {reason}")
+        elif cache is not None:
+            cache.put(key, [text])
+
+        return text, reason
+
+    def _streaming_enabled(self) -> bool:
+        return bool((self.config.get('llm_streaming', {}) or {}).get('enabled', False))
+
+    def _plan_max_tokens(
+        self,
+        prompt: str,
+        params: Dict[str, Any],
+        target_chars: Optional[int] = None,
+        label: Optional[str] = None,
+        chars_per_token: Optional[float] = None,
+        phase: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        토큰 예산 적용 (비활성화 시 params 그대로 반환)
+
+        프롬프트가 너무 길면 생성 없이 거절 레코드("prompt_too_long")를 남기고 ValueError를 다시 올립니다.
+        """
+        if self.budget_planner is None:
+            return params
+
+        label = label or "generate"
+        planned = dict(params)
+        try:
+            planned['max_tokens'] = self.budget_planner.plan(
+                prompt,
+                params.get('max_tokens', 4096),
+                target_chars=target_chars,
+                label=label,
+                chars_per_token=chars_per_token
+            )
+        except ValueError:
+            self.telemetry.record(label, phase, 0, [], 0.0, mode="rejected")
+            self.telemetry.reject(label, "prompt_too_long")
+            raise
+        return planned
+
+    def budget_decisions(self) -> Optional[List[Dict[str, Any]]]:
+        """토큰 예산 결정 기록 (비활성화 시 None)"""
+        if self.budget_planner is None:
+            return None
+        return list(self.budget_planner.decisions)
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """응답 캐시 hit/miss 통계 (캐시 비활성화 시 None)"""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.stats()
+
+    def reset_run_stats(self) -> None:
+        """
+        실행(제목)별 통계 초기화
+
+        상주 프로세스(server.py)에서 엔진을 재사용할 때 이전 제목의 telemetry / JSON 통계 /
+        prefix cache 통계 / 토큰 예산 기록 / 캐시 hit·miss가 다음 제목 metadata에 섞이지 않도록 합니다.
+        """
+        self.json_phase_stats = {}
+        self.prefix_cache_stats = {}
+        self.telemetry = LLMTelemetry()
+        if self.budget_planner is not None:
+            self.budget_planner.reset()
+        if self.response_cache is not None:
+            self.response_cache.reset_stats()
+
+    def close(self) -> None:
+        """백엔드 종료 (vLLM은 GPU 메모리 반환, 이후 생성 호출 불가)"""
+        self.backend.close()
+
+    def enable_batching(self, window_sec: float = 1.0, max_batch: int = 64, active: int = 1) -> BatchingBackend:
+        """
+        여러 스레드(제목)의 동시 호출을 하나의 배치로 모으는 백엔드로 전환 (batch.py용)
+
+        Args:
+            window_sec: 첫 요청 후 다른 제목의 요청을 기다리는 최대 시간 (초)
+            max_batch: 한 배치의 최대 프롬프트 수
+            active: 동시에 실행 중인 제목 수
+
+        Returns:
+            BatchingBackend (set_active / batches 기록 접근용)
+        """
+        if not isinstance(self.backend, BatchingBackend):
+            self.backend = BatchingBackend(self.backend, window_sec=window_sec, max_batch=max_batch, active=active)
+        else:
+            self.backend.window_sec = window_sec
+            self.backend.max_batch = max_batch
+            self.backend.set_active(active)
+        return self.backend
+
+    def disable_batching(self) -> None:
+        """enable_batching 이전 백엔드로 복구"""
+        if isinstance(self.backend, BatchingBackend):
+            self.backend = self.backend.inner
 
     def generate_text(
         self,
@@ -76,45 +809,182 @@ class LLMEngine:
         repetition_penalty: float = 1.13,
         stop: Optional[List[str]] = None,
         presence_penalty: float = 0.0,
-        frequency_penalty: float = 0.0
+        frequency_penalty: float = 0.0,
+        seed: Optional[int] = None,
+        use_cache: bool = True
     ) -> str:
         """텍스트 생성 (72B 최적화 파라미터)"""
-        if stop is None:
-            stop = ["\n以上", "\nThis", "</s>", "}\n이"]
+        params = {
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'top_p': top_p,
+            'top_k': top_k,
+            'repetition_penalty': repetition_penalty,
+            'stop': stop,
+            'presence_penalty': presence_penalty,
+            'frequency_penalty': frequency_penalty,
+            'seed': seed
+        }
+        return self.generate_many([prompt], [params], use_cache=use_cache)[0]
+
+    def generate_many(
+        self,
+        prompts: List[str],
+        per_prompt_params: List[Dict[str, Any]],
+        use_cache: bool = True,
+        labels: Optional[List[Optional[str]]] = None,
+        phases: Optional[List[Optional[str]]] = None,
+        attempts: Optional[List[int]] = None
+    ) -> List[str]:
+        """
+        여러 프롬프트를 하나의 vLLM generate 호출로 배치 생성
+
+        프롬프트마다 별도의 샘플링 파라미터를 사용하며,
+        vLLM continuous batching으로 한 번에 스케줄링됩니다.
+        응답 캐시에 있는 프롬프트는 생성하지 않고 캐시에서 반환합니다.
+
+        Args:
+            prompts: 프롬프트 리스트
+            per_prompt_params: 프롬프트별 파라미터 dict 리스트
+                (max_tokens, temperature, top_p, top_k, repetition_penalty,
+                 stop, presence_penalty, frequency_penalty, seed)
+            use_cache: 응답 캐시 사용 여부
+            labels: 프롬프트별 prefix cache / telemetry 통계용 이름
+            phases: 프롬프트별 단계 (백엔드 동시성 제한 + telemetry 집계용)
+            attempts: 프롬프트별 재시도 인덱스 (telemetry 기록용)
 
-        sampling_params = SamplingParams(
-            temperature=temperature,
-            max_tokens=max_tokens,
-            top_p=top_p,
-            top_k=top_k,
-            repetition_penalty=repetition_penalty,
-            stop=stop,
-            presence_penalty=presence_penalty,
-            frequency_penalty=frequency_penalty
+        Returns:
+            생성된 텍스트 리스트 (입력 순서 유지)
+        """
+        candidates = self.generate_candidates_many(
+            prompts, per_prompt_params, use_cache=use_cache, labels=labels, phases=phases, attempts=attempts
         )
+        return [texts[0] for texts in candidates]
+
+    def generate_candidates_many(
+        self,
+        prompts: List[str],
+        per_prompt_params: List[Dict[str, Any]],
+        use_cache: bool = True,
+        labels: Optional[List[Optional[str]]] = None,
+        phases: Optional[List[Optional[str]]] = None,
+        attempts: Optional[List[int]] = None
+    ) -> List[List[str]]:
+        """
+        배치 생성 (프롬프트별 n-best 후보 반환)
+
+        파라미터의 'n'만큼 후보를 한 번의 요청으로 샘플링합니다.
+        후보들은 prefill을 공유하므로 순차 재시도보다 훨씬 저렴합니다.
+
+        Args:
+            prompts: 프롬프트 리스트
+            per_prompt_params: 프롬프트별 파라미터 dict 리스트 (generate_many + n)
+            use_cache: 응답 캐시 사용 여부
+            labels: 프롬프트별 prefix cache / telemetry 통계용 이름
+            phases: 프롬프트별 단계 (백엔드 동시성 제한 + telemetry 집계용)
+            attempts: 프롬프트별 재시도 인덱스 (telemetry 기록용)
+
+        Returns:
+            프롬프트별 후보 텍스트 리스트 (입력 순서 유지)
+        """
+        if len(prompts) != len(per_prompt_params):
+            raise ValueError(
+                f"prompts({len(prompts)})와 per_prompt_params({len(per_prompt_params)}) 수가 일치해야 합니다"
+            )
+        if not prompts:
+            return []
+
+        labels = labels or [None] * len(prompts)
+        phases = phases or [None] * len(prompts)
+        attempts = attempts or [0] * len(prompts)
 
-        outputs = self.llm.generate([prompt], sampling_params)
-        return outputs[0].outputs[0].text
+        cache = self.response_cache if use_cache else None
+        results: List[Optional[List[str]]] = [None] * len(prompts)
+        keys: List[Optional[str]] = [None] * len(prompts)
+        pending = []
+
+        for i, (prompt, params) in enumerate(zip(prompts, per_prompt_params)):
+            if cache is not None:
+                keys[i] = self._cache_key(prompt, params)
+                cached = cache.get(keys[i])
+                if cached is not None:
+                    results[i] = cached
+                    self.telemetry.record(labels[i] or "generate", phases[i], attempts[i], [], 0.0, mode="cached")
+                    continue
+            pending.append(i)
+
+        if cache is not None and len(pending) < len(prompts):
+            print(f"[cache] {len(prompts) - len(pending)}/{len(prompts)} responses served from cache")
+
+        if pending:
+            started = time.perf_counter()
+            outputs = self.backend.generate_many(
+                [prompts[i] for i in pending],
+                [self._normalize_params(per_prompt_params[i]) for i in pending],
+                phases=[phases[i] for i in pending]
+            )
+            wall_sec = time.perf_counter() - started
+
+            for i, completions in zip(pending, outputs):
+                results[i] = [completion.text for completion in completions]
+                self._record_prefix_hit(labels[i], completions[0])
+                self.telemetry.record(labels[i] or "generate", phases[i], attempts[i], completions, wall_sec, mode="batch")
+                if cache is not None:
+                    cache.put(keys[i], results[i])
+
+        return results
+
+    def _record_prefix_hit(self, label: Optional[str], completion: Completion) -> None:
+        """prefix cache로 재사용된 prompt 토큰 수 누적 + 로그 출력"""
+        label = label or "generate"
+        prompt_tokens = completion.prompt_tokens
+        cached_tokens = completion.cached_tokens
+
+        stats = self.prefix_cache_stats.setdefault(label, {
+            "requests": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "hit_rate": 0.0
+        })
+        stats["requests"] += 1
+        stats["prompt_tokens"] += prompt_tokens
+        stats["cached_tokens"] += cached_tokens
+        if stats["prompt_tokens"]:
+            stats["hit_rate"] = round(stats["cached_tokens"] / stats["prompt_tokens"], 3)
+
+        print(f"[{label}] Prefix cache: {cached_tokens}/{prompt_tokens} prompt tokens reused")
+
+    def rank_candidates(
+        self,
+        candidates: List[str],
+        score_fn: Optional[Callable[[str], Any]] = None
+    ) -> List[int]:
+        """
+        n-best 후보 정렬 (좋은 순서의 인덱스 리스트)
+
+        1순위: 중국어 미포함, 2순위: score_fn 점수 (기본: 길이)
+        """
+        def key(idx: int):
+            text = candidates[idx]
+            score = score_fn(text) if score_fn is not None else len(text)
+            return (not self.detect_chinese(text), score)
+
+        return sorted(range(len(candidates)), key=key, reverse=True)
 
     def extract_first_json(self, text: str) -> str:
-        """첫 번째 JSON만 추출 (중복 출력 방지)"""
+        """첫 번째 JSON만 추출 (중복 출력 방지, 문자열 내부 괄호 무시)"""
         # UTF-8 BOM 제거
         text = text.replace('\ufeff', '')
 
-        start = text.find("{")
-        if start == -1:
-            raise ValueError("JSON start '{' not found")
+        scanner = JsonObjectScanner()
+        end = scanner.feed(text)
 
-        depth = 0
-        for i in range(start, len(text)):
-            if text[i] == "{":
-                depth += 1
-            elif text[i] == "}":
-                depth -= 1
-                if depth == 0:
-                    return text[start:i+1]
+        if scanner.start is None:
+            raise ValueError("JSON start '{' not found")
+        if end is None:
+            raise ValueError("JSON not properly closed")
 
-        raise ValueError("JSON not properly closed")
+        return text[scanner.start:end]
 
     def clean_json_string(self, json_str: str) -> str:
         """JSON 문자열 정리 (invalid escape 제거)"""
@@ -136,99 +1006,325 @@ class LLMEngine:
         chinese_chars = sum(1 for c in text if '\u4e00' <= c <= '\u9fff')
         return chinese_chars > 5
 
-    def call_llm(self, prompt: str, phase: str, max_retry: int = 3) -> Dict[str, Any]:
+    def get_phase_params(self, phase: str, json_mode: bool = True) -> Dict[str, Any]:
         """
-        LLM 호출 (JSON 모드) - 재시도 로직 포함
+        Phase별 생성 파라미터 반환 (72B 최적화)
 
         Args:
-            prompt: 프롬프트
             phase: 단계 ("outline", "hook", "parts")
-            max_retry: 최대 재시도 횟수
+            json_mode: JSON 모드 여부 (텍스트 모드는 config에 없는 phase에 범용 기본값 사용)
 
         Returns:
-            JSON 파싱된 결과
+            파라미터 dict
         """
-        # Phase별 파라미터 로드 (72B 최적화)
+        if not json_mode:
+            if phase in self.config['llm']:
+                return dict(self.config['llm'][phase])
+            return {'temperature': 0.7, 'max_tokens': 4096, 'top_p': 0.92, 'top_k': 40, 'repetition_penalty': 1.13}
+
         if phase == "outline":
-            params = self.config['llm'].get('outline', {
+            return dict(self.config['llm'].get('outline', {
                 'temperature': 0.65,
                 'max_tokens': 7000,
                 'top_p': 0.92,
                 'top_k': 40,
                 'repetition_penalty': 1.13
-            })
+            }))
         elif phase == "hook":
-            params = self.config['llm'].get('hook', {
+            return dict(self.config['llm'].get('hook', {
                 'temperature': 0.75,
                 'max_tokens': 2048,
                 'top_p': 0.92,
                 'top_k': 40,
                 'repetition_penalty': 1.13
-            })
+            }))
         else:
-            params = self.config['llm'].get('parts', {
+            return dict(self.config['llm'].get('parts', {
                 'temperature': 0.70,
                 'max_tokens': 5000,
                 'top_p': 0.92,
                 'top_k': 40,
                 'repetition_penalty': 1.13
-            })
+            }))
 
-        for attempt in range(max_retry):
+    def parse_json_response(self, response_text: str) -> Dict[str, Any]:
+        """
+        LLM 응답에서 첫 번째 JSON을 추출하고 파싱 (실패 시 로컬 복구 포함)
+
+        Raises:
+            ValueError: JSON 경계를 찾지 못한 경우
+            json.JSONDecodeError: JSON 파싱 및 복구 실패 시
+        """
+        return self.parse_json_with_repairs(response_text)[0]
+
+    def parse_json_with_repairs(self, response_text: str) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        JSON 추출 → 정리 → 파싱, 파싱 실패 시 재생성 전에 로컬 복구 시도
+
+        trailing comma, 이스케이프 안 된 내부 따옴표, max_tokens 절단 등을
+        repair_json으로 결정적으로 복구합니다.
+
+        Returns:
+            (파싱 결과, 적용된 복구 항목 리스트)
+
+        Raises:
+            ValueError: JSON 시작 '{'를 찾지 못한 경우
+            json.JSONDecodeError: 복구 후에도 파싱 실패 시 (원래 오류)
+        """
+        try:
+            json_candidate = self.extract_first_json(response_text)
+        except ValueError:
+            # 닫히지 않은 JSON (max_tokens 절단) → 복구 단계에서 괄호를 닫음
+            start = response_text.find("{")
+            if start == -1:
+                raise
+            json_candidate = response_text[start:]
+
+        json_candidate = self.clean_json_string(json_candidate)
+
+        try:
+            return json.loads(json_candidate), []
+        except json.JSONDecodeError as e:
+            repaired, repairs = repair_json(json_candidate)
             try:
-                print(f"\n[{phase}] Attempt {attempt + 1}/{max_retry}")
-
-                # 1. LLM 생성
-                response_text = self.generate_text(
-                    prompt=prompt,
-                    max_tokens=params.get('max_tokens', 4096),
-                    temperature=params.get('temperature', 0.7),
-                    top_p=params.get('top_p', 0.92),
-                    top_k=params.get('top_k', 40),
-                    repetition_penalty=params.get('repetition_penalty', 1.13),
-                    stop=["\n以上", "\nThis", "}\n이", "</s>", "}\n\n"]
-                )
-
-                print(f"[{phase}] Raw response: {len(response_text)} chars")
-                print(f"[{phase}] Preview: {response_text[:300]}")
-
-                # 2. 중국어 감지
-                if self.detect_chinese(response_text):
-                    print(f"✗ [{phase}] Chinese detected, retrying...")
-                    time.sleep(1)
-                    continue
+                result = json.loads(repaired)
+            except json.JSONDecodeError:
+                raise e from None
 
-                # 3. JSON 추출
-                json_candidate = self.extract_first_json(response_text)
-                json_candidate = self.clean_json_string(json_candidate)
+            print(f"✓ JSON repaired locally ({', '.join(repairs)})")
+            return result, repairs
 
-                # 4. JSON 파싱
-                result = json.loads(json_candidate)
-                print(f"✓ [{phase}] JSON parsed successfully!")
-                return result
+    def call_llm(
+        self,
+        prompt: str,
+        phase: str,
+        max_retry: int = 3,
+        use_cache: bool = True,
+        json_schema: Optional[Dict[str, Any]] = None,
+        label: Optional[str] = None,
+        n_candidates: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        LLM 호출 (JSON 모드) - 재시도 로직 포함
 
-            except json.JSONDecodeError as e:
-                print(f"✗ [{phase}] JSON decode error: {e}")
-                if attempt < max_retry - 1:
-                    print(f"   Retrying in 2 seconds...")
-                    time.sleep(2)
-                else:
-                    print("----- RAW TEXT -----")
-                    print(response_text)
-                    print("--------------------")
-                    raise
+        Args:
+            prompt: 프롬프트
+            phase: 단계 ("outline", "hook", "parts")
+            max_retry: 최대 재시도 횟수
+            use_cache: 응답 캐시 사용 여부
+            json_schema: JSON 스키마 (llm_guided_decoding.enabled 시 vLLM guided decoding 적용)
+            label: 로그/통계용 이름 (기본: phase)
+            n_candidates: 한 번에 샘플링할 후보 수 (기본: phase 설정의 n_candidates, 없으면 1)
 
-            except Exception as e:
-                print(f"✗ [{phase}] Error: {e}")
-                if attempt < max_retry - 1:
-                    print(f"   Retrying in 2 seconds...")
-                    time.sleep(2)
-                else:
-                    raise
+        Returns:
+            JSON 파싱된 결과
+        """
+        params = self.get_phase_params(phase, json_mode=True)
+        label = label or phase
+        params['n'] = n_candidates or params.get('n_candidates', 1)
+        guided = json_schema is not None and self._guided_decoding_enabled()
+
+        start_time = time.time()
+        wasted_tokens = 0
+        attempts = 0
+        success = False
+        repairs: List[str] = []
+
+        try:
+            # 프롬프트 초과(ValueError)도 finally에서 실패로 집계
+            params = self._plan_max_tokens(prompt, params, label=label, phase=phase)
+            if guided:
+                params['json_schema'] = json_schema
+
+            for attempt in range(max_retry):
+                attempts = attempt + 1
+                try:
+                    print(f"\n[{label}] Attempt {attempt + 1}/{max_retry}")
+
+                    # 1. LLM 생성
+                    call_params = dict(params, stop=JSON_STOP_SEQUENCES, seed=self._attempt_seed(attempt))
+
+                    # n-best: 후보 n개를 한 번에 생성 → 유효한 JSON 중 최선 선택
+                    if call_params['n'] > 1:
+                        candidates = self.generate_candidates_many(
+                            [prompt], [call_params], use_cache=use_cache, labels=[label], phases=[phase],
+                            attempts=[attempt]
+                        )[0]
+                        result, rejected = self._select_json_candidate(candidates, label)
+                        wasted_tokens += sum(self.count_tokens(text) for text in rejected)
+                        if result is None:
+                            print(f"✗ [{label}] No valid JSON among {len(candidates)} candidates, retrying...")
+                            all_chinese = all(self.detect_chinese(text) for text in candidates)
+                            self.telemetry.reject(label, "chinese" if all_chinese else "json")
+                            self.discard_cached(prompt, call_params)
+                            continue
+                        success = True
+                        return result
+
+                    if self._streaming_enabled():
+                        response_text, stream_reason = self.generate_stream(
+                            prompt, call_params, json_mode=True, use_cache=use_cache, label=label, phase=phase,
+                            attempt=attempt
+                        )
+                    else:
+                        response_text = self.generate_many(
+                            [prompt], [call_params], use_cache=use_cache, labels=[label], phases=[phase],
+                            attempts=[attempt]
+                        )[0]
+                        stream_reason = "finished"
+
+                    print(f"[{label}] Raw response: {len(response_text)} chars")
+                    print(f"[{label}] Preview: {response_text[:300]}")
+
+                    # 스트리밍 조기 중단 (JSON 손상) → 대기 없이 즉시 재시도
+                    if stream_reason == StreamMonitor.INVALID_JSON:
+                        print(f"✗ [{label}] Broken JSON stream aborted, retrying...")
+                        self.telemetry.reject(label, "json")
+                        wasted_tokens += self.count_tokens(response_text)
+                        continue
+
+                    # 2. 중국어 감지
+                    if stream_reason == StreamMonitor.CHINESE or self.detect_chinese(response_text):
+                        print(f"✗ [{label}] Chinese detected, retrying...")
+                        self.telemetry.reject(label, "chinese")
+                        wasted_tokens += self.count_tokens(response_text)
+                        self.discard_cached(prompt, call_params)
+                        if stream_reason != StreamMonitor.CHINESE:
+                            time.sleep(1)
+                        continue
+
+                    # 3. JSON 추출 + 4. JSON 파싱 (실패 시 로컬 복구)
+                    result, repairs = self.parse_json_with_repairs(response_text)
+                    print(f"✓ [{label}] JSON parsed successfully!")
+                    success = True
+                    return result
+
+                except json.JSONDecodeError as e:
+                    print(f"✗ [{label}] JSON decode error: {e}")
+                    self.telemetry.reject(label, "json")
+                    wasted_tokens += self.count_tokens(response_text)
+                    self.discard_cached(prompt, call_params)
+                    if attempt < max_retry - 1:
+                        print(f"   Retrying in 2 seconds...")
+                        time.sleep(2)
+                    else:
+                        print("----- RAW TEXT -----")
+                        print(response_text)
+                        print("--------------------")
+                        raise
+
+                except Exception as e:
+                    print(f"✗ [{label}] Error: {e}")
+                    if isinstance(e, ValueError):
+                        # JSON 추출 실패 (생성 자체가 실패한 경우는 기록할 레코드가 없음)
+                        self.telemetry.reject(label, "json")
+                    self.discard_cached(prompt, call_params)
+                    if attempt < max_retry - 1:
+                        print(f"   Retrying in 2 seconds...")
+                        time.sleep(2)
+                    else:
+                        raise
+
+            raise RuntimeError(f"Failed to generate valid JSON after {max_retry} attempts")
+
+        finally:
+            self._record_json_stats(
+                label,
+                attempts=attempts,
+                wasted_tokens=wasted_tokens,
+                wall_time=time.time() - start_time,
+                guided=guided,
+                success=success,
+                repairs=repairs
+            )
 
-        raise RuntimeError(f"Failed to generate valid JSON after {max_retry} attempts")
+    def _select_json_candidate(
+        self,
+        candidates: List[str],
+        label: str
+    ) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """
+        n-best 후보 중 중국어가 없고 JSON 파싱에 성공한 최선(가장 긴) 후보 선택
+
+        Returns:
+            (파싱 결과 또는 None, 버려진 후보 리스트)
+        """
+        rejected = []
+        for idx in self.rank_candidates(candidates):
+            text = candidates[idx]
+            if self.detect_chinese(text):
+                print(f"✗ [{label}] Candidate {idx + 1}/{len(candidates)}: Chinese detected")
+                rejected.append(text)
+                continue
+            try:
+                result = self.parse_json_response(text)
+            except (json.JSONDecodeError, ValueError) as e:
+                print(f"✗ [{label}] Candidate {idx + 1}/{len(candidates)}: {e}")
+                rejected.append(text)
+                continue
+
+            print(f"✓ [{label}] Candidate {idx + 1}/{len(candidates)} selected ({len(text)} chars)")
+            return result, [candidates[i] for i in range(len(candidates)) if i != idx]
+
+        return None, rejected
+
+    def _guided_decoding_enabled(self) -> bool:
+        return bool((self.config.get('llm_guided_decoding', {}) or {}).get('enabled', False))
+
+    def count_tokens(self, text: str) -> int:
+        """모델 토크나이저 기준 토큰 수"""
+        if not text:
+            return 0
+        return self.backend.count_tokens(text)
+
+    def _record_json_stats(
+        self,
+        label: str,
+        attempts: int,
+        wasted_tokens: int,
+        wall_time: float,
+        guided: bool,
+        success: bool,
+        repairs: Optional[List[str]] = None
+    ) -> None:
+        """JSON 단계 통계 누적 + 로그 출력"""
+        stats = self.json_phase_stats.setdefault(label, {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,
+            "failures": 0,
+            "wasted_tokens": 0,
+            "wall_time_sec": 0.0,
+            "guided": guided,
+            "repairs": {}
+        })
+        stats["calls"] += 1
+        stats["attempts"] += attempts
+        stats["retries"] += max(attempts - 1, 0)
+        stats["failures"] += 0 if success else 1
+        stats["wasted_tokens"] += wasted_tokens
+        stats["wall_time_sec"] = round(stats["wall_time_sec"] + wall_time, 2)
+        stats["guided"] = guided
+        for repair in repairs or []:
+            stats["repairs"][repair] = stats["repairs"].get(repair, 0) + 1
 
-    def call_llm_text(self, prompt: str, phase: str, max_retry: int = 2) -> str:
+        print(
+            f"[{label}] JSON stats: attempts={attempts}, retries={max(attempts - 1, 0)}, "
+            f"wasted_tokens={wasted_tokens}, wall_time={wall_time:.1f}s, guided={guided}, "
+            f"repairs={repairs or []}"
+        )
+
+    def call_llm_text(
+        self,
+        prompt: str,
+        phase: str,
+        max_retry: int = 2,
+        use_cache: bool = True,
+        n_candidates: Optional[int] = None,
+        score_fn: Optional[Callable[[str], Any]] = None,
+        label: Optional[str] = None,
+        target_chars: Optional[int] = None
+    ) -> str:
         """
         LLM 호출 (텍스트 모드) - 재시도 로직 포함
 
@@ -236,42 +1332,64 @@ class LLMEngine:
             prompt: 프롬프트
             phase: 단계
             max_retry: 최대 재시도 횟수
+            use_cache: 응답 캐시 사용 여부
+            n_candidates: 한 번에 샘플링할 후보 수 (기본: phase 설정의 n_candidates, 없으면 1)
+            score_fn: 후보 점수 함수 (클수록 좋음, 기본: 길이)
+            label: 로그/통계용 이름 (기본: phase)
+            target_chars: 목표 분량 (자, 토큰 예산 활성화 시 max_tokens 산정에 사용)
 
         Returns:
             생성된 텍스트
         """
-        if phase in self.config['llm']:
-            params = self.config['llm'][phase]
-        else:
-            params = {'temperature': 0.7, 'max_tokens': 4096, 'top_p': 0.92, 'top_k': 40, 'repetition_penalty': 1.13}
+        params = self.get_phase_params(phase, json_mode=False)
+        label = label or phase
+        params['n'] = n_candidates or params.get('n_candidates', 1)
+        params = self._plan_max_tokens(prompt, params, target_chars=target_chars, label=label, phase=phase)
 
         for attempt in range(max_retry):
             try:
-                print(f"\n[{phase}] Text generation attempt {attempt + 1}/{max_retry}")
+                print(f"\n[{label}] Text generation attempt {attempt + 1}/{max_retry}")
 
-                response_text = self.generate_text(
-                    prompt=prompt,
-                    max_tokens=params.get('max_tokens', 4096),
-                    temperature=params.get('temperature', 0.7),
-                    top_p=params.get('top_p', 0.92),
-                    top_k=params.get('top_k', 40),
-                    repetition_penalty=params.get('repetition_penalty', 1.13)
-                )
+                call_params = dict(params, seed=self._attempt_seed(attempt))
+                if call_params['n'] > 1:
+                    # n-best: 후보 n개를 한 번에 생성 → 중국어 없는 최고 점수 후보 선택
+                    candidates = self.generate_candidates_many(
+                        [prompt], [call_params], use_cache=use_cache, labels=[label], phases=[phase],
+                        attempts=[attempt]
+                    )[0]
+                    best = self.rank_candidates(candidates, score_fn)[0]
+                    response_text = candidates[best]
+                    stream_reason = "finished"
+                    print(f"[{label}] Candidate {best + 1}/{len(candidates)} selected")
+                elif self._streaming_enabled():
+                    response_text, stream_reason = self.generate_stream(
+                        prompt, call_params, json_mode=False, use_cache=use_cache, label=label, phase=phase,
+                        attempt=attempt
+                    )
+                else:
+                    response_text = self.generate_many(
+                        [prompt], [call_params], use_cache=use_cache, labels=[label], phases=[phase],
+                        attempts=[attempt]
+                    )[0]
+                    stream_reason = "finished"
 
                 # 중국어 감지
-                if self.detect_chinese(response_text):
-                    print(f"✗ [{phase}] Chinese detected, retrying...")
+                if stream_reason == StreamMonitor.CHINESE or self.detect_chinese(response_text):
+                    print(f"✗ [{label}] Chinese detected, retrying...")
+                    self.telemetry.reject(label, "chinese")
+                    self.discard_cached(prompt, call_params)
                     if attempt < max_retry - 1:
-                        time.sleep(1)
+                        if stream_reason != StreamMonitor.CHINESE:
+                            time.sleep(1)
                         continue
                     else:
-                        print(f"⚠ [{phase}] Warning: Chinese detected but no retries left")
+                        print(f"⚠ [{label}] Warning: Chinese detected but no retries left")
 
-                print(f"✓ [{phase}] Text generated: {len(response_text)} chars")
+                print(f"✓ [{label}] Text generated: {len(response_text)} chars")
                 return response_text
 
             except Exception as e:
-                print(f"✗ [{phase}] Error: {e}")
+                print(f"✗ [{label}] Error: {e}")
                 if attempt < max_retry - 1:
                     time.sleep(2)
                 else:
@@ -279,6 +1397,270 @@ class LLMEngine:
 
         raise RuntimeError(f"Failed to generate text after {max_retry} attempts")
 
+    def continue_text(
+        self,
+        prompt: str,
+        existing_text: str,
+        instruction: str,
+        max_chars: int,
+        phase: str = "parts",
+        tail_chars: int = 1500,
+        max_retry: int = 2,
+        use_cache: bool = True,
+        label: Optional[str] = None
+    ) -> str:
+        """
+        이어쓰기 - 기존 텍스트 뒤에 부족한 분량만 생성
+
+        원래 프롬프트 + 이어쓰기 지시 + 기존 텍스트 마지막 tail_chars자 순서로 조립하여
+        모델이 tail 바로 뒤부터 이어서 쓰도록 합니다. 원래 프롬프트 부분은 prefix cache로 재사용됩니다.
+
+        Args:
+            prompt: 기존 텍스트를 생성한 원래 프롬프트
+            existing_text: 지금까지 생성된 텍스트
+            instruction: 이어쓰기 지시문
+            max_chars: 이어 붙인 뒤 전체 최대 길이 (자)
+            phase: 단계 (샘플링 파라미터)
+            tail_chars: 프롬프트에 넣을 기존 텍스트 마지막 부분 길이 (자)
+            max_retry: 최대 재시도 횟수 (중국어 감지 시)
+            use_cache: 응답 캐시 사용 여부
+            label: 로그/통계용 이름 (기본: "{phase}_continue")
+
+        Returns:
+            이어 쓴 텍스트만 (existing_text + 반환값 ≤ max_chars, 실패 시 "")
+        """
+        label = label or f"{phase}_continue"
+        missing_chars = max_chars - len(existing_text)
+        if missing_chars <= 0:
+            return ""
+
+        continuation_prompt = f"{prompt}\n\n{instruction}\n\n{existing_text[-tail_chars:]}"
+
+        # 기존 텍스트의 실제 문자/토큰 비율로 부족 분량만큼만 max_tokens 설정
+        sample = existing_text[-4000:]
+        sample_tokens = self.count_tokens(sample)
+        chars_per_token = len(sample) / sample_tokens if sample_tokens else None
+        params = self.get_phase_params(phase, json_mode=False)
+        if chars_per_token:
+            params['max_tokens'] = max(64, int(missing_chars / chars_per_token * 1.1) + 1)
+        params = self._plan_max_tokens(
+            continuation_prompt, params, target_chars=missing_chars, label=label, chars_per_token=chars_per_token,
+            phase=phase
+        )
+
+        print(
+            f"\n[{label}] Continuing from {len(existing_text)} chars: "
+            f"+{missing_chars} chars (max_tokens={params['max_tokens']})"
+        )
+
+        for attempt in range(max_retry):
+            call_params = dict(params, seed=self._attempt_seed(attempt))
+            continuation = self.generate_many(
+                [continuation_prompt], [call_params], use_cache=use_cache, labels=[label], phases=[phase],
+                attempts=[attempt]
+            )[0]
+
+            if self.detect_chinese(continuation):
+                print(f"✗ [{label}] Chinese detected, retrying...")
+                self.telemetry.reject(label, "chinese")
+                self.discard_cached(continuation_prompt, call_params)
+                continue
+
+            if existing_text and not existing_text[-1].isspace() and continuation[:1] not in ("", "\n", " "):
+                continuation = " " + continuation
+            continuation = _trim_to_sentence(continuation, missing_chars)
+
+            print(f"✓ [{label}] Continuation generated: {len(continuation)} chars")
+            return continuation
+
+        print(f"⚠ [{label}] Continuation failed after {max_retry} attempts, keeping original text")
+        return ""
+
+    def call_llm_many(
+        self,
+        prompts: List[str],
+        phases: Union[str, List[str]],
+        max_retry: int = 3,
+        use_cache: bool = True,
+        json_schemas: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        LLM 배치 호출 (JSON 모드)
+
+        모든 프롬프트를 하나의 배치로 생성한 뒤, 실패한 프롬프트만 모아서
+        다음 배치로 재시도합니다. 중국어 감지와 JSON 추출은 결과마다 개별 적용됩니다.
+
+        Args:
+            prompts: 프롬프트 리스트
+            phases: 단계 (단일 문자열이면 모든 프롬프트에 적용)
+            max_retry: 프롬프트별 최대 재시도 횟수
+            use_cache: 응답 캐시 사용 여부
+            json_schemas: 프롬프트별 JSON 스키마 (llm_guided_decoding.enabled 시 적용)
+
+        Returns:
+            JSON 파싱된 결과 리스트 (입력 순서 유지)
+        """
+        if isinstance(phases, str):
+            phases = [phases] * len(prompts)
+        if json_schemas is None or not self._guided_decoding_enabled():
+            json_schemas = [None] * len(prompts)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(prompts)
+        errors: Dict[int, Exception] = {}
+        pending = list(range(len(prompts)))
+
+        base_params = [
+            self._plan_max_tokens(
+                prompts[i], self.get_phase_params(phases[i], json_mode=True), label=f"{phases[i]}#{i}", phase=phases[i]
+            )
+            for i in pending
+        ]
+
+        for attempt in range(max_retry):
+            if not pending:
+                break
+
+            print(f"\n[batch] Attempt {attempt + 1}/{max_retry}: {len(pending)} prompts")
+
+            params_list = []
+            for i in pending:
+                params = dict(base_params[i])
+                params['stop'] = JSON_STOP_SEQUENCES
+                params['seed'] = self._attempt_seed(attempt)
+                if json_schemas[i] is not None:
+                    params['json_schema'] = json_schemas[i]
+                params_list.append(params)
+
+            responses = self.generate_many(
+                [prompts[i] for i in pending],
+                params_list,
+                use_cache=use_cache,
+                labels=[f"{phases[i]}#{i}" for i in pending],
+                phases=[phases[i] for i in pending],
+                attempts=[attempt] * len(pending)
+            )
+
+            failed = []
+            for i, call_params, response_text in zip(pending, params_list, responses):
+                phase = phases[i]
+                cause = "json"
+                try:
+                    if self.detect_chinese(response_text):
+                        cause = "chinese"
+                        raise ValueError("Chinese detected")
+
+                    results[i] = self.parse_json_response(response_text)
+                    print(f"✓ [{phase}#{i}] JSON parsed successfully!")
+
+                except (json.JSONDecodeError, ValueError) as e:
+                    print(f"✗ [{phase}#{i}] {e}")
+                    self.telemetry.reject(f"{phase}#{i}", cause)
+                    self.discard_cached(prompts[i], call_params)
+                    errors[i] = e
+                    failed.append(i)
+
+            pending = failed
+
+        if pending:
+            details = ", ".join(f"#{i} {phases[i]}: {errors[i]}" for i in pending)
+            raise RuntimeError(f"Failed to generate valid JSON after {max_retry} attempts ({details})")
+
+        return results
+
+    def call_llm_text_many(
+        self,
+        prompts: List[str],
+        phases: Union[str, List[str]],
+        max_retry: int = 2,
+        use_cache: bool = True,
+        score_fns: Optional[List[Optional[Callable[[str], Any]]]] = None,
+        labels: Optional[List[str]] = None,
+        target_chars: Optional[List[Optional[int]]] = None
+    ) -> List[str]:
+        """
+        LLM 배치 호출 (텍스트 모드)
+
+        중국어가 감지된 프롬프트만 다음 배치로 재시도하며,
+        재시도가 남지 않으면 경고 후 마지막 결과를 그대로 반환합니다.
+        phase 설정에 n_candidates가 있으면 프롬프트별 n-best 중 최선을 선택합니다.
+
+        Args:
+            prompts: 프롬프트 리스트
+            phases: 단계 (단일 문자열이면 모든 프롬프트에 적용)
+            max_retry: 프롬프트별 최대 재시도 횟수
+            use_cache: 응답 캐시 사용 여부
+            score_fns: 프롬프트별 n-best 후보 점수 함수 (클수록 좋음, 기본: 길이)
+            labels: 프롬프트별 로그/통계용 이름 (기본: "phase#index")
+            target_chars: 프롬프트별 목표 분량 (자, 토큰 예산 활성화 시 max_tokens 산정에 사용)
+
+        Returns:
+            생성된 텍스트 리스트 (입력 순서 유지)
+        """
+        if isinstance(phases, str):
+            phases = [phases] * len(prompts)
+        if score_fns is None:
+            score_fns = [None] * len(prompts)
+        if labels is None:
+            labels = [f"{phase}#{i}" for i, phase in enumerate(phases)]
+        if target_chars is None:
+            target_chars = [None] * len(prompts)
+
+        results: List[Optional[str]] = [None] * len(prompts)
+        pending = list(range(len(prompts)))
+
+        base_params = [
+            self._plan_max_tokens(
+                prompts[i],
+                self.get_phase_params(phases[i], json_mode=False),
+                target_chars=target_chars[i],
+                label=labels[i],
+                phase=phases[i]
+            )
+            for i in pending
+        ]
+
+        for attempt in range(max_retry):
+            if not pending:
+                break
+
+            print(f"\n[batch] Text generation attempt {attempt + 1}/{max_retry}: {len(pending)} prompts")
+
+            params_list = []
+            for i in pending:
+                params = dict(base_params[i])
+                params['n'] = params.get('n_candidates', 1)
+                params['seed'] = self._attempt_seed(attempt)
+                params_list.append(params)
+
+            candidates_list = self.generate_candidates_many(
+                [prompts[i] for i in pending],
+                params_list,
+                use_cache=use_cache,
+                labels=[labels[i] for i in pending],
+                phases=[phases[i] for i in pending],
+                attempts=[attempt] * len(pending)
+            )
+
+            failed = []
+            for i, call_params, candidates in zip(pending, params_list, candidates_list):
+                response_text = candidates[self.rank_candidates(candidates, score_fns[i])[0]]
+                results[i] = response_text
+
+                if self.detect_chinese(response_text):
+                    self.telemetry.reject(labels[i], "chinese")
+                    if attempt < max_retry - 1:
+                        print(f"✗ [{labels[i]}] Chinese detected, retrying...")
+                        self.discard_cached(prompts[i], call_params)
+                        failed.append(i)
+                        continue
+                    print(f"⚠ [{labels[i]}] Warning: Chinese detected but no retries left")
+
+                print(f"✓ [{labels[i]}] Text generated: {len(response_text)} chars")
+
+            pending = failed
+
+        return results
+
 
 # 싱글톤 패턴
 _llm_engine = None
@@ -292,7 +1674,20 @@ def get_llm_engine(config_path: str = "config.yaml") -> LLMEngine:
     return _llm_engine
 
 
+def llm_engine_loaded() -> bool:
+    """LLM 엔진 싱글톤이 이미 로드되었는지 여부 (로드하지 않고 확인)"""
+    return _llm_engine is not None
+
+
 def reset_llm_engine():
-    """LLM 엔진 리셋 (테스트용)"""
+    """
+    LLM 엔진 종료 + 싱글톤 리셋
+
+    백엔드를 명시적으로 닫아(vLLM: 분산 상태 해제 → 엔진 삭제 → CUDA 캐시 반환) GPU 메모리를 돌려받습니다.
+    """
     global _llm_engine
-    _llm_engine = None
+    engine, _llm_engine = _llm_engine, None
+    if engine is not None:
+        engine.close()
+        del engine
+        gc.collect()
@@ -0,0 +1,957 @@
+"""
+LLM 백엔드 모듈
+LLMEngine이 사용하는 생성 백엔드 (vLLM / OpenAI 호환 HTTP / Replay)
+
+- vllm: 프로세스 내 vLLM 엔진 (GPU 필요, vllm은 이 백엔드 생성 시에만 import)
+- openai: OpenAI 호환 /v1/completions 서버 (공유 vLLM 서버 등)
+- replay: 기록된 응답을 지연 시간만 흉내 내어 반환 (GPU 없이 파이프라인 실행/프로파일링)
+
+모든 백엔드는 LLMEngine._normalize_params 형식의 파라미터 dict를 받습니다.
+(temperature, max_tokens, top_p, top_k, repetition_penalty, stop,
+ presence_penalty, frequency_penalty, seed, n, json_schema)
+"""
+
+import gc
+import hashlib
+import http.client
+import itertools
+import json
+import queue
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+
+# 토크나이저가 없는 백엔드의 한국어 평균 문자/토큰 비율 추정치
+APPROX_CHARS_PER_TOKEN = 1.4
+
+
+def prompt_key(prompt: str) -> str:
+    """Replay fixture 키 (프롬프트 sha256)"""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+
+class Completion:
+    """
+    생성 결과 하나 (n-best 후보 하나)
+
+    스트리밍 중에는 누적 스냅샷으로 사용되며, 완료 전까지 finish_reason은 None입니다.
+    ttft_sec / latency_sec는 백엔드가 측정할 수 있을 때만 채워집니다 (없으면 None).
+    """
+
+    def __init__(
+        self,
+        text: str,
+        prompt_tokens: int = 0,
+        output_tokens: int = 0,
+        cached_tokens: int = 0,
+        finish_reason: Optional[str] = None,
+        ttft_sec: Optional[float] = None,
+        latency_sec: Optional[float] = None
+    ):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.output_tokens = output_tokens
+        self.cached_tokens = cached_tokens
+        self.finish_reason = finish_reason
+        self.ttft_sec = ttft_sec
+        self.latency_sec = latency_sec
+
+    def __repr__(self) -> str:
+        return (
+            f"Completion({len(self.text)} chars, prompt_tokens={self.prompt_tokens}, "
+            f"output_tokens={self.output_tokens}, finish_reason={self.finish_reason})"
+        )
+
+
+class LLMBackend:
+    """
+    LLM 백엔드 인터페이스
+
+    하위 클래스는 generate_many를 구현해야 하며,
+    토큰 단위 스트리밍이 가능하면 stream, 토크나이저가 있으면 count_tokens를 재정의합니다.
+    """
+
+    name = "base"
+
+    def __init__(self, model_id: str = ""):
+        self.model_id = model_id
+
+    def generate(self, prompt: str, params: Dict[str, Any], phase: Optional[str] = None) -> List[Completion]:
+        """
+        단일 프롬프트 생성
+
+        Args:
+            prompt: 프롬프트
+            params: 파라미터 dict
+            phase: 단계 이름 (동시성 제한 등 백엔드별 정책에 사용)
+
+        Returns:
+            후보 리스트 (params['n']개)
+        """
+        return self.generate_many([prompt], [params], phases=[phase])[0]
+
+    def generate_many(
+        self,
+        prompts: List[str],
+        params_list: List[Dict[str, Any]],
+        phases: Optional[List[Optional[str]]] = None
+    ) -> List[List[Completion]]:
+        """
+        배치 생성
+
+        Returns:
+            프롬프트별 후보 리스트 (입력 순서 유지)
+        """
+        raise NotImplementedError
+
+    def stream(
+        self,
+        prompt: str,
+        params: Dict[str, Any],
+        phase: Optional[str] = None
+    ) -> Iterator[Completion]:
+        """
+        스트리밍 생성 (n=1)
+
+        누적 스냅샷을 yield하며, 호출 측이 generator를 닫으면(close) 생성을 중단합니다.
+        기본 구현은 전체 생성 후 한 번에 반환합니다.
+        """
+        yield self.generate(prompt, params, phase=phase)[0]
+
+    def count_tokens(self, text: str) -> int:
+        """토큰 수 (기본: 문자 수 기반 추정)"""
+        if not text:
+            return 0
+        return int(len(text) / APPROX_CHARS_PER_TOKEN) + 1
+
+    def close(self) -> None:
+        """리소스 해제 (기본: 없음)"""
+
+
+class VLLMBackend(LLMBackend):
+    """
+    프로세스 내 vLLM 엔진 백엔드 (Qwen2.5-72B-AWQ)
+    """
+
+    name = "vllm"
+
+    def __init__(
+        self,
+        model_path: str,
+        download_dir: Optional[str] = None,
+        max_model_len: int = 12288,
+        tensor_parallel_size: int = 1,
+        gpu_memory_utilization: float = 0.88,
+        enable_prefix_caching: bool = False
+    ):
+        """vLLM 엔진 초기화"""
+        super().__init__(model_id=model_path)
+
+        # vllm은 GPU 환경에서만 필요 → 이 백엔드를 만들 때만 import
+        from vllm import LLM
+
+        print(f"Loading vLLM model: {model_path}")
+        print(f"  - max_model_len: {max_model_len}")
+        print(f"  - tensor_parallel_size: {tensor_parallel_size}")
+        print(f"  - enable_prefix_caching: {enable_prefix_caching}")
+
+        self.llm = LLM(
+            model=model_path,
+            download_dir=download_dir,
+            tensor_parallel_size=tensor_parallel_size,
+            quantization="awq",
+            max_model_len=max_model_len,
+            enforce_eager=False,
+            enable_chunked_prefill=True,
+            enable_prefix_caching=enable_prefix_caching,
+            gpu_memory_utilization=gpu_memory_utilization,
+            trust_remote_code=True
+        )
+        self._request_counter = itertools.count()
+
+        print("✓ vLLM model loaded successfully!")
+
+    def _sampling_params(self, params: Dict[str, Any]):
+        """파라미터 dict → vLLM SamplingParams 변환 (json_schema → guided decoding)"""
+        from vllm import SamplingParams
+        from vllm.sampling_params import GuidedDecodingParams
+
+        params = dict(params)
+        json_schema = params.pop('json_schema', None)
+        if json_schema is not None:
+            params['guided_decoding'] = GuidedDecodingParams(json=json_schema)
+        return SamplingParams(**params)
+
+    @staticmethod
+    def _to_completions(output) -> List[Completion]:
+        """vLLM RequestOutput → Completion 리스트"""
+        prompt_tokens = len(output.prompt_token_ids or [])
+        cached_tokens = getattr(output, 'num_cached_tokens', None) or 0
+
+        # RequestMetrics (arrival → 첫 토큰 → 완료 시각)
+        ttft_sec = latency_sec = None
+        metrics = getattr(output, 'metrics', None)
+        if metrics is not None and metrics.arrival_time:
+            if metrics.first_token_time:
+                ttft_sec = metrics.first_token_time - metrics.arrival_time
+            if metrics.finished_time:
+                latency_sec = metrics.finished_time - metrics.arrival_time
+
+        return [
+            Completion(
+                text=completion.text,
+                prompt_tokens=prompt_tokens,
+                output_tokens=len(completion.token_ids),
+                cached_tokens=cached_tokens,
+                finish_reason=completion.finish_reason,
+                ttft_sec=ttft_sec,
+                latency_sec=latency_sec
+            )
+            for completion in output.outputs
+        ]
+
+    def generate_many(
+        self,
+        prompts: List[str],
+        params_list: List[Dict[str, Any]],
+        phases: Optional[List[Optional[str]]] = None
+    ) -> List[List[Completion]]:
+        outputs = self.llm.generate(prompts, [self._sampling_params(p) for p in params_list])
+        return [self._to_completions(output) for output in outputs]
+
+    def stream(
+        self,
+        prompt: str,
+        params: Dict[str, Any],
+        phase: Optional[str] = None
+    ) -> Iterator[Completion]:
+        """vLLM 엔진을 step 단위로 구동하며 새 토큰마다 누적 스냅샷 반환"""
+        engine = self.llm.llm_engine
+        request_id = f"stream-{next(self._request_counter)}"
+        engine.add_request(request_id, prompt, self._sampling_params(params))
+
+        finished = False
+        try:
+            while engine.has_unfinished_requests():
+                for output in engine.step():
+                    if output.request_id != request_id:
+                        continue
+                    finished = output.finished
+                    yield self._to_completions(output)[0]
+                    if finished:
+                        return
+        finally:
+            if not finished:
+                engine.abort_request(request_id)
+
+    def count_tokens(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self.llm.get_tokenizer().encode(text, add_special_tokens=False))
+
+    def close(self) -> None:
+        """
+        vLLM 엔진 종료 (GPU 메모리 반환)
+
+        참조만 끊으면 worker / NCCL 분산 상태가 남아 KV cache와 가중치가 GPU에 그대로 남으므로
+        분산 상태 해제 → 엔진 삭제 → gc → CUDA 캐시 반환 순서로 정리합니다.
+        """
+        llm, self.llm = getattr(self, "llm", None), None
+        if llm is None:
+            return
+
+        from vllm.distributed.parallel_state import destroy_distributed_environment, destroy_model_parallel
+        destroy_model_parallel()
+        destroy_distributed_environment()
+
+        engine = getattr(llm, "llm_engine", None)
+        if engine is not None and hasattr(engine, "model_executor"):
+            del engine.model_executor
+        del llm, engine
+        gc.collect()
+
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        print("✓ vLLM engine shut down")
+
+
+class _ConnectionPool:
+    """
+    keep-alive HTTP 연결 풀 (스레드 안전)
+
+    요청이 끝난 연결을 반납받아 재사용하므로 호출마다 TCP/TLS 연결을 새로 맺지 않습니다.
+    """
+
+    def __init__(self, base_url: str, size: int, timeout: float):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.https = parsed.scheme == "https"
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or (443 if self.https else 80)
+        self.path_prefix = parsed.path.rstrip('/')
+        self.size = size
+        self.timeout = timeout
+
+        self.created = 0
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            self.created += 1
+        connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def release(self, connection: http.client.HTTPConnection, reusable: bool = True) -> None:
+        if reusable and self._idle.qsize() < self.size:
+            self._idle.put(connection)
+        else:
+            connection.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class OpenAIBackend(LLMBackend):
+    """
+    OpenAI 호환 /v1/completions 클라이언트 백엔드 (공유 vLLM 서버용)
+
+    - keep-alive 연결 풀 재사용
+    - phase별 동시 요청 수 제한 (phase_concurrency, 없는 phase는 "default")
+    - SSE 스트리밍 (스트림을 닫으면 연결을 끊어 서버 측 요청도 abort)
+    - 429 / 5xx / 연결 오류는 지수 백오프로 재요청
+    - vLLM 서버 확장 파라미터(top_k, repetition_penalty, guided_json) 전송
+
+    중국어 감지/JSON 재시도는 LLMEngine(call_llm / call_llm_text)에서 동일하게 처리됩니다.
+    """
+
+    name = "openai"
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        api_key: Optional[str] = None,
+        timeout: float = 600.0,
+        pool_size: int = 8,
+        phase_concurrency: Optional[Dict[str, int]] = None,
+        max_http_retries: int = 2,
+        use_tokenize_endpoint: bool = True
+    ):
+        """
+        Args:
+            base_url: 서버 주소 (예: http://localhost:8000/v1)
+            model: 서버에 로드된 모델 이름
+            api_key: API 키 (없으면 Authorization 헤더 생략)
+            timeout: 요청 타임아웃 (초)
+            pool_size: 유지할 keep-alive 연결 수
+            phase_concurrency: phase별 최대 동시 요청 수 (예: {"outline": 1, "parts": 4, "default": 8})
+            max_http_retries: 일시적 HTTP 오류 재요청 횟수
+            use_tokenize_endpoint: vLLM 서버 /tokenize로 토큰 수 계산 (실패 시 문자 수 추정)
+        """
+        super().__init__(model_id=model)
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_http_retries = max_http_retries
+        self.use_tokenize_endpoint = use_tokenize_endpoint
+
+        self.pool = _ConnectionPool(self.base_url, size=pool_size, timeout=timeout)
+        prefix = self.pool.path_prefix
+        self._completions_path = f"{prefix}/completions"
+        # /tokenize는 vLLM 서버 루트 경로 (/v1 밖)
+        self._tokenize_path = f"{prefix[:-3] if prefix.endswith('/v1') else prefix}/tokenize"
+
+        self.phase_concurrency = dict(phase_concurrency or {})
+        self.phase_concurrency.setdefault("default", pool_size)
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._semaphores_lock = threading.Lock()
+
+        print(f"Using OpenAI-compatible server: {self.base_url} ({model})")
+        print(f"  - pool_size: {pool_size}, phase_concurrency: {self.phase_concurrency}")
+
+    def _semaphore(self, phase: Optional[str]) -> threading.BoundedSemaphore:
+        key = phase if phase in self.phase_concurrency else "default"
+        with self._semaphores_lock:
+            if key not in self._semaphores:
+                self._semaphores[key] = threading.BoundedSemaphore(self.phase_concurrency[key])
+            return self._semaphores[key]
+
+    def _request_body(self, prompt: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        body = {
+            "model": self.model,
+            "prompt": prompt,
+            "max_tokens": params.get('max_tokens', 4096),
+            "temperature": params.get('temperature', 0.7),
+            "top_p": params.get('top_p', 0.92),
+            "n": params.get('n', 1),
+            "stop": params.get('stop') or None,
+            "presence_penalty": params.get('presence_penalty', 0.0),
+            "frequency_penalty": params.get('frequency_penalty', 0.0),
+            # vLLM 서버 확장 파라미터
+            "top_k": params.get('top_k', 40),
+            "repetition_penalty": params.get('repetition_penalty', 1.13)
+        }
+        if params.get('seed') is not None:
+            body["seed"] = params['seed']
+        if params.get('json_schema') is not None:
+            body["guided_json"] = params['json_schema']
+        return body
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def _request(
+        self,
+        path: str,
+        body: Dict[str, Any]
+    ) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """
+        POST 요청 (일시적 오류 재요청 포함)
+
+        Returns:
+            (연결, 응답) - 호출 측이 응답을 다 읽은 뒤 pool.release 해야 함
+
+        Raises:
+            RuntimeError: 재요청 후에도 실패한 경우
+        """
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        last_error = ""
+
+        for attempt in range(self.max_http_retries + 1):
+            if attempt > 0:
+                time.sleep(0.5 * 2 ** (attempt - 1))
+
+            connection = self.pool.acquire()
+            try:
+                connection.request("POST", path, body=data, headers=self._headers())
+                response = connection.getresponse()
+            except (http.client.HTTPException, OSError) as e:
+                # 서버가 닫은 keep-alive 연결 등
+                connection.close()
+                last_error = f"{type(e).__name__}: {e}"
+                continue
+
+            if response.status in self.RETRY_STATUSES:
+                response.read()
+                self.pool.release(connection, reusable=not response.will_close)
+                last_error = f"HTTP {response.status}"
+                continue
+
+            if response.status >= 400:
+                detail = response.read().decode('utf-8', errors='replace')[:300]
+                self.pool.release(connection, reusable=not response.will_close)
+                raise RuntimeError(f"{path} failed: HTTP {response.status} {detail}")
+
+            return connection, response
+
+        raise RuntimeError(f"{path} failed after {self.max_http_retries + 1} tries ({last_error})")
+
+    def _post_json(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        connection, response = self._request(path, body)
+        try:
+            return json.loads(response.read().decode('utf-8'))
+        finally:
+            self.pool.release(connection, reusable=not response.will_close)
+
+    @staticmethod
+    def _to_completions(response: Dict[str, Any]) -> List[Completion]:
+        """/v1/completions 응답 → Completion 리스트 (choice index 순)"""
+        usage = response.get("usage") or {}
+        choices = sorted(response.get("choices", []), key=lambda c: c.get("index", 0))
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        output_tokens = usage.get("completion_tokens", 0) // max(len(choices), 1)
+
+        return [
+            Completion(
+                text=choice.get("text", ""),
+                prompt_tokens=prompt_tokens,
+                output_tokens=output_tokens,
+                cached_tokens=cached_tokens,
+                finish_reason=choice.get("finish_reason")
+            )
+            for choice in choices
+        ]
+
+    def generate(self, prompt: str, params: Dict[str, Any], phase: Optional[str] = None) -> List[Completion]:
+        with self._semaphore(phase):
+            started = time.perf_counter()
+            completions = self._to_completions(self._post_json(self._completions_path, self._request_body(prompt, params)))
+
+        # 비스트리밍 응답은 TTFT를 알 수 없으므로 전체 지연만 기록
+        latency_sec = time.perf_counter() - started
+        for completion in completions:
+            completion.latency_sec = latency_sec
+        return completions
+
+    def generate_many(
+        self,
+        prompts: List[str],
+        params_list: List[Dict[str, Any]],
+        phases: Optional[List[Optional[str]]] = None
+    ) -> List[List[Completion]]:
+        phases = phases or [None] * len(prompts)
+        if len(prompts) == 1:
+            return [self.generate(prompts[0], params_list[0], phase=phases[0])]
+
+        # 프롬프트별 파라미터가 다르므로 요청을 동시에 보내 서버의 continuous batching에 맡김
+        with ThreadPoolExecutor(max_workers=len(prompts)) as executor:
+            return list(executor.map(self.generate, prompts, params_list, phases))
+
+    def stream(
+        self,
+        prompt: str,
+        params: Dict[str, Any],
+        phase: Optional[str] = None
+    ) -> Iterator[Completion]:
+        """SSE 스트리밍 (data: {...} 이벤트마다 누적 스냅샷 반환)"""
+        body = self._request_body(prompt, dict(params, n=1))
+        body["stream"] = True
+        body["stream_options"] = {"include_usage": True}
+
+        with self._semaphore(phase):
+            connection, response = self._request(self._completions_path, body)
+            text = ""
+            chunks = 0
+            usage: Dict[str, Any] = {}
+            finish_reason = None
+            completed = False
+            try:
+                while True:
+                    line = response.readline()
+                    if not line:
+                        break
+                    line = line.decode('utf-8').strip()
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        completed = True
+                        break
+
+                    event = json.loads(data)
+                    usage = event.get("usage") or usage
+                    for choice in event.get("choices") or []:
+                        finish_reason = choice.get("finish_reason") or finish_reason
+                        delta = choice.get("text", "")
+                        if delta:
+                            text += delta
+                            chunks += 1
+                            yield Completion(text=text, prompt_tokens=usage.get("prompt_tokens", 0), output_tokens=chunks)
+
+                yield Completion(
+                    text=text,
+                    prompt_tokens=usage.get("prompt_tokens", 0),
+                    output_tokens=usage.get("completion_tokens") or chunks,
+                    cached_tokens=(usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0,
+                    finish_reason=finish_reason or "stop"
+                )
+            finally:
+                if completed:
+                    response.read()
+                    self.pool.release(connection, reusable=not response.will_close)
+                else:
+                    # 조기 종료 → 연결을 끊어 서버가 요청을 abort하도록 함
+                    connection.close()
+
+    def count_tokens(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.use_tokenize_endpoint:
+            try:
+                return self._post_json(self._tokenize_path, {"model": self.model, "prompt": text})["count"]
+            except (RuntimeError, KeyError, ValueError) as e:
+                print(f"⚠ /tokenize unavailable ({e}), using character-based estimate")
+                self.use_tokenize_endpoint = False
+        return super().count_tokens(text)
+
+    def close(self) -> None:
+        """유휴 연결 정리"""
+        self.pool.close()
+
+
+class ReplayBackend(LLMBackend):
+    """
+    기록된 응답 재생 백엔드 (결정적, GPU 불필요)
+
+    fixture 파일(JSONL)의 각 줄:
+    - {"prompt_sha256": "...", "texts": [...]}  → 동일 프롬프트에 정확히 대응
+    - {"match": "부분 문자열", "texts": [...]}   → 프롬프트에 부분 문자열이 있으면 대응 (먼저 나온 줄 우선)
+
+    ttft_sec / tokens_per_sec로 첫 토큰 지연과 디코딩 속도를 흉내 냅니다.
+    """
+
+    name = "replay"
+
+    def __init__(
+        self,
+        fixtures_path: str,
+        ttft_sec: float = 0.0,
+        tokens_per_sec: float = 0.0,
+        stream_chunk_chars: int = 16
+    ):
+        """
+        Args:
+            fixtures_path: fixture JSONL 파일 경로
+            ttft_sec: 첫 토큰까지의 지연 (초)
+            tokens_per_sec: 디코딩 속도 (0이면 지연 없음)
+            stream_chunk_chars: 스트리밍 시 한 번에 반환할 문자 수
+        """
+        super().__init__(model_id=f"replay:{Path(fixtures_path).name}")
+        self.fixtures_path = fixtures_path
+        self.ttft_sec = ttft_sec
+        self.tokens_per_sec = tokens_per_sec
+        self.stream_chunk_chars = stream_chunk_chars
+
+        self.exact: Dict[str, List[str]] = {}
+        self.patterns: List[tuple] = []
+        with open(fixtures_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                fixture = json.loads(line)
+                if "prompt_sha256" in fixture:
+                    self.exact[fixture["prompt_sha256"]] = fixture["texts"]
+                elif "match" in fixture:
+                    self.patterns.append((fixture["match"], fixture["texts"]))
+
+        print(f"Using replay backend: {fixtures_path} ({len(self.exact)} exact, {len(self.patterns)} patterns)")
+
+    def _lookup(self, prompt: str, n: int) -> List[str]:
+        texts = self.exact.get(prompt_key(prompt))
+        if texts is None:
+            for pattern, pattern_texts in self.patterns:
+                if pattern in prompt:
+                    texts = pattern_texts
+                    break
+        if not texts:
+            raise KeyError(f"No replay fixture for prompt {prompt_key(prompt)[:12]}: {prompt[:80]!r}")
+
+        # n-best 요청 시 기록된 후보를 순환
+        return [texts[i % len(texts)] for i in range(n)]
+
+    def _decode_time(self, tokens: int) -> float:
+        return tokens / self.tokens_per_sec if self.tokens_per_sec > 0 else 0.0
+
+    def _completions(self, prompt: str, params: Dict[str, Any]) -> List[Completion]:
+        max_tokens = params.get('max_tokens', 4096)
+        completions = []
+        for text in self._lookup(prompt, params.get('n', 1)):
+            output_tokens = self.count_tokens(text)
+            finish_reason = "stop"
+            if output_tokens > max_tokens:
+                # max_tokens 절단 재현
+                text = text[:int(max_tokens * APPROX_CHARS_PER_TOKEN)]
+                output_tokens = max_tokens
+                finish_reason = "length"
+            completions.append(Completion(
+                text=text,
+                prompt_tokens=self.count_tokens(prompt),
+                output_tokens=output_tokens,
+                finish_reason=finish_reason,
+                ttft_sec=self.ttft_sec,
+                latency_sec=self.ttft_sec + self._decode_time(output_tokens)
+            ))
+        return completions
+
+    def generate_many(
+        self,
+        prompts: List[str],
+        params_list: List[Dict[str, Any]],
+        phases: Optional[List[Optional[str]]] = None
+    ) -> List[List[Completion]]:
+        results = [self._completions(prompt, params) for prompt, params in zip(prompts, params_list)]
+
+        # 배치는 동시에 디코딩되므로 가장 긴 출력 기준으로 대기
+        longest = max((c.output_tokens for completions in results for c in completions), default=0)
+        time.sleep(self.ttft_sec + self._decode_time(longest))
+        return results
+
+    def stream(
+        self,
+        prompt: str,
+        params: Dict[str, Any],
+        phase: Optional[str] = None
+    ) -> Iterator[Completion]:
+        completion = self._completions(prompt, dict(params, n=1))[0]
+        time.sleep(self.ttft_sec)
+
+        text = completion.text
+        step = max(self.stream_chunk_chars, 1)
+        for end in range(step, len(text) + step, step):
+            partial = text[:end]
+            chunk_tokens = self.count_tokens(partial[-step:])
+            time.sleep(self._decode_time(chunk_tokens))
+            done = end >= len(text)
+            yield Completion(
+                text=partial,
+                prompt_tokens=completion.prompt_tokens,
+                output_tokens=completion.output_tokens if done else self.count_tokens(partial),
+                finish_reason=completion.finish_reason if done else None
+            )
+
+
+class RecordingBackend(LLMBackend):
+    """
+    다른 백엔드의 응답을 Replay fixture(JSONL)로 기록하는 래퍼
+    """
+
+    def __init__(self, inner: LLMBackend, record_path: str):
+        super().__init__(model_id=inner.model_id)
+        self.inner = inner
+        self.name = inner.name
+        self.record_path = Path(record_path)
+        self.record_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        print(f"  - recording responses to: {self.record_path}")
+
+    def _record(self, prompt: str, texts: List[str]) -> None:
+        line = json.dumps({"prompt_sha256": prompt_key(prompt), "texts": texts}, ensure_ascii=False)
+        with self._lock:
+            with open(self.record_path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+
+    def generate_many(
+        self,
+        prompts: List[str],
+        params_list: List[Dict[str, Any]],
+        phases: Optional[List[Optional[str]]] = None
+    ) -> List[List[Completion]]:
+        results = self.inner.generate_many(prompts, params_list, phases=phases)
+        for prompt, completions in zip(prompts, results):
+            self._record(prompt, [c.text for c in completions])
+        return results
+
+    def stream(
+        self,
+        prompt: str,
+        params: Dict[str, Any],
+        phase: Optional[str] = None
+    ) -> Iterator[Completion]:
+        inner = self.inner.stream(prompt, params, phase=phase)
+        snapshot = None
+        try:
+            for snapshot in inner:
+                yield snapshot
+        finally:
+            inner.close()
+        # 조기 중단된 스트림은 기록하지 않음 (generator close 시 여기에 도달하지 않음)
+        if snapshot is not None:
+            self._record(prompt, [snapshot.text])
+
+    def count_tokens(self, text: str) -> int:
+        return self.inner.count_tokens(text)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class BatchingBackend(LLMBackend):
+    """
+    여러 스레드의 generate_many 요청을 모아 하나의 배치로 생성하는 래퍼 (다중 제목 배치 실행용)
+
+    제목별 파이프라인은 각자 LLM을 한 번에 하나씩만 호출하므로, 혼자 실행하면 72B 모델이
+    시퀀스 하나만 디코딩합니다. 이 래퍼는 active 제목 수만큼 요청이 모이거나 window_sec이
+    지나면 모인 요청을 inner.generate_many 한 번으로 보냅니다. (Outline 전체 → Hook 전체 → ...)
+    한 번에 하나의 배치만 생성하며, 스트리밍 요청도 배치에 합류시켜 완료 후 한 번에 반환합니다.
+    """
+
+    def __init__(self, inner: LLMBackend, window_sec: float = 1.0, max_batch: int = 64, active: int = 1):
+        """
+        Args:
+            inner: 실제 생성 백엔드
+            window_sec: 첫 요청 도착 후 다른 요청을 기다리는 최대 시간 (초)
+            max_batch: 한 배치의 최대 프롬프트 수
+            active: 요청을 보낼 수 있는 호출자(제목) 수 (이만큼 모이면 즉시 생성)
+        """
+        super().__init__(model_id=inner.model_id)
+        self.inner = inner
+        self.name = inner.name
+        self.window_sec = window_sec
+        self.max_batch = max_batch
+        self.active = active
+
+        # 배치별 기록: {"requests", "prompts", "wall_sec"}
+        self.batches: List[Dict[str, Any]] = []
+
+        self._condition = threading.Condition()
+        self._waiting: List[Dict[str, Any]] = []
+        self._flushing = False
+
+    def set_active(self, active: int) -> None:
+        """호출자 수 변경 (제목 완료 시 감소 → 남은 제목만으로 배치 구성)"""
+        with self._condition:
+            self.active = max(active, 1)
+            self._condition.notify_all()
+
+    def _ready(self) -> bool:
+        if not self._waiting or self._flushing:
+            return False
+        prompts = sum(len(request["prompts"]) for request in self._waiting)
+        waited = time.monotonic() - self._waiting[0]["arrived"]
+        return len(self._waiting) >= self.active or prompts >= self.max_batch or waited >= self.window_sec
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        batch, prompts = [], 0
+        while self._waiting and (not batch or prompts + len(self._waiting[0]["prompts"]) <= self.max_batch):
+            request = self._waiting.pop(0)
+            batch.append(request)
+            prompts += len(request["prompts"])
+        return batch
+
+    def _run_batch(self, batch: List[Dict[str, Any]]) -> None:
+        prompts = [prompt for request in batch for prompt in request["prompts"]]
+        params_list = [params for request in batch for params in request["params_list"]]
+        phases = [phase for request in batch for phase in request["phases"]]
+
+        started = time.perf_counter()
+        try:
+            results = self.inner.generate_many(prompts, params_list, phases=phases)
+            error = None
+        except Exception as e:
+            results, error = None, e
+        wall_sec = time.perf_counter() - started
+
+        offset = 0
+        for request in batch:
+            count = len(request["prompts"])
+            request["results"] = results[offset:offset + count] if results is not None else None
+            request["error"] = error
+            offset += count
+
+        print(f"[batch] {len(prompts)} prompts from {len(batch)} callers in {wall_sec:.1f}s")
+        self.batches.append({"requests": len(batch), "prompts": len(prompts), "wall_sec": round(wall_sec, 3)})
+
+    def generate_many(
+        self,
+        prompts: List[str],
+        params_list: List[Dict[str, Any]],
+        phases: Optional[List[Optional[str]]] = None
+    ) -> List[List[Completion]]:
+        request = {
+            "prompts": list(prompts),
+            "params_list": list(params_list),
+            "phases": list(phases or [None] * len(prompts)),
+            "arrived": time.monotonic(),
+            "results": None,
+            "error": None,
+            "done": False
+        }
+
+        with self._condition:
+            self._waiting.append(request)
+            self._condition.notify_all()
+
+            while not request["done"]:
+                if not self._ready():
+                    timeout = None
+                    if self._waiting and not self._flushing:
+                        timeout = max(self._waiting[0]["arrived"] + self.window_sec - time.monotonic(), 0.001)
+                    self._condition.wait(timeout)
+                    continue
+
+                # 이 스레드가 모인 요청을 대표로 생성 (락 밖에서)
+                batch = self._take_batch()
+                self._flushing = True
+                self._condition.release()
+                try:
+                    self._run_batch(batch)
+                finally:
+                    self._condition.acquire()
+                    self._flushing = False
+                    for done in batch:
+                        done["done"] = True
+                    self._condition.notify_all()
+
+        if request["error"] is not None:
+            raise request["error"]
+        return request["results"]
+
+    def count_tokens(self, text: str) -> int:
+        return self.inner.count_tokens(text)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def create_backend(
+    config: Dict[str, Any],
+    model_path: Optional[str] = None,
+    max_model_len: int = 12288,
+    tensor_parallel_size: int = 1,
+    gpu_memory_utilization: float = 0.88,
+    enable_prefix_caching: bool = False
+) -> LLMBackend:
+    """
+    config['llm_backend'] 설정으로 백엔드 생성
+
+    Args:
+        config: 전체 설정 dict
+        model_path: vLLM 모델 경로 (기본: config['models']['llm'])
+        max_model_len, tensor_parallel_size, gpu_memory_utilization, enable_prefix_caching: vLLM 옵션
+
+    Returns:
+        LLMBackend
+    """
+    backend_config = config.get('llm_backend', {}) or {}
+    backend_type = backend_config.get('type', 'vllm')
+
+    if backend_type == 'vllm':
+        backend: LLMBackend = VLLMBackend(
+            model_path=model_path or config['models']['llm'],
+            download_dir=config['models'].get('cache_dir'),
+            max_model_len=max_model_len,
+            tensor_parallel_size=tensor_parallel_size,
+            gpu_memory_utilization=gpu_memory_utilization,
+            enable_prefix_caching=enable_prefix_caching
+        )
+    elif backend_type == 'openai':
+        openai_config = backend_config.get('openai', {}) or {}
+        backend = OpenAIBackend(
+            base_url=openai_config.get('base_url', 'http://localhost:8000/v1'),
+            model=openai_config.get('model') or model_path or config['models']['llm'],
+            api_key=openai_config.get('api_key'),
+            timeout=openai_config.get('timeout', 600.0),
+            pool_size=openai_config.get('pool_size', 8),
+            phase_concurrency=openai_config.get('phase_concurrency'),
+            max_http_retries=openai_config.get('max_http_retries', 2),
+            use_tokenize_endpoint=openai_config.get('use_tokenize_endpoint', True)
+        )
+    elif backend_type == 'replay':
+        replay_config = backend_config.get('replay', {}) or {}
+        backend = ReplayBackend(
+            fixtures_path=replay_config['fixtures_path'],
+            ttft_sec=replay_config.get('ttft_sec', 0.0),
+            tokens_per_sec=replay_config.get('tokens_per_sec', 0.0),
+            stream_chunk_chars=replay_config.get('stream_chunk_chars', 16)
+        )
+    else:
+        raise ValueError(f"Unknown llm_backend.type: {backend_type} (vllm / openai / replay)")
+
+    record_path = backend_config.get('record_path')
+    if record_path and backend_type != 'replay':
+        backend = RecordingBackend(backend, record_path)
+
+    return backend
@@ -0,0 +1,388 @@
+"""
+GPU 메모리 상주(residency) 관리 모듈
+LLM / 이미지 / TTS / Whisper 모델을 GPU 예산 안에서 로드 / CPU 오프로드 / 언로드
+
+- 각 모델은 GPU 점유량(gpu_mb)과 재로드 비용(load_cost_sec, onload_cost_sec)을 선언
+- Phase 실행 전 acquire()로 필요한 모델을 GPU에 올리고, 자리가 부족하면 다른 모델을 내림
+- 내릴 모델은 스케줄러가 알려주는 대기 중 Phase 순서(upcoming)를 보고
+  "재로드 비용 / 다음 사용까지의 거리"가 가장 작은 모델부터 선택
+  (다시 쓰이지 않는 모델은 비용 0 → 가장 먼저 언로드)
+- 다시 쓰일 모델은 오프로드가 가능하고 CPU 예산이 남으면 CPU로, 아니면 언로드
+"""
+
+import gc
+import threading
+from typing import Dict, Any, Callable, List, Optional
+
+
+class ResidentModel:
+    """
+    상주 관리 대상 모델 하나
+
+    state: "unloaded" → (load) → "gpu" ⇄ (offload / onload) ⇄ "cpu"
+    loading: load / onload 진행 중 (관리자 lock 밖에서 실행, 그동안 GPU 자리는 예약된 것으로 계산)
+    unloading: 진행 중인 내리기 동작 "offload" / "unload" (lock 밖에서 실행, 끝날 때까지 GPU 자리 차지)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        gpu_mb: float,
+        load: Callable[[], Any],
+        unload: Callable[[], None],
+        offload: Optional[Callable[[], None]] = None,
+        onload: Optional[Callable[[], None]] = None,
+        cpu_mb: Optional[float] = None,
+        load_cost_sec: float = 30.0,
+        onload_cost_sec: float = 3.0
+    ):
+        """
+        Args:
+            name: 모델 이름 (Phase.models에서 참조)
+            gpu_mb: GPU 점유량 (MB)
+            load: 디스크에서 GPU로 로드
+            unload: 메모리에서 완전히 해제
+            offload: GPU → CPU 이동 (없으면 오프로드 불가, 언로드만)
+            onload: CPU → GPU 이동
+            cpu_mb: 오프로드 시 CPU 메모리 점유량 (기본: gpu_mb)
+            load_cost_sec: 언로드 상태에서 다시 올리는 비용
+            onload_cost_sec: CPU에서 다시 올리는 비용
+        """
+        self.name = name
+        self.gpu_mb = float(gpu_mb)
+        self.cpu_mb = float(cpu_mb if cpu_mb is not None else gpu_mb)
+        self.load = load
+        self.unload = unload
+        self.offload = offload
+        self.onload = onload
+        self.load_cost_sec = load_cost_sec
+        self.onload_cost_sec = onload_cost_sec
+
+        self.state = "unloaded"
+        self.in_use = 0
+        self.loading = False
+        self.unloading: Optional[str] = None
+        self.unload_hooks: List[Callable[[], None]] = []
+
+    @property
+    def can_offload(self) -> bool:
+        return self.offload is not None and self.onload is not None
+
+    def reload_cost(self, cpu_available: bool) -> float:
+        """지금 GPU에서 내렸다가 다시 올릴 때의 비용 (초)"""
+        if self.can_offload and cpu_available:
+            return self.onload_cost_sec
+        return self.load_cost_sec
+
+    def __repr__(self) -> str:
+        return f"ResidentModel({self.name}: {self.state}, {self.gpu_mb:.0f}MB)"
+
+
+class ResidencyManager:
+    """
+    GPU 예산 내 모델 배치 관리 (스레드 안전)
+
+    Example:
+        >>> manager = ResidencyManager(gpu_budget_mb=48000, cpu_budget_mb=32000)
+        >>> manager.register(ResidentModel("image", 8000, load_image, unload_image, offload_image, onload_image))
+        >>> manager.acquire(["image"], upcoming=["tts", "whisper", "image"])
+        >>> ...  # 이미지 생성
+        >>> manager.release(["image"])
+    """
+
+    def __init__(
+        self,
+        gpu_budget_mb: float,
+        cpu_budget_mb: Optional[float] = None,
+        log: Callable[[str], None] = print
+    ):
+        """
+        Args:
+            gpu_budget_mb: 모델에 쓸 수 있는 GPU 메모리 (MB)
+            cpu_budget_mb: 오프로드에 쓸 수 있는 CPU 메모리 (None이면 제한 없음)
+            log: 로그 출력 함수
+        """
+        self.gpu_budget_mb = float(gpu_budget_mb)
+        self.cpu_budget_mb = cpu_budget_mb
+        self.log = log
+
+        self.models: Dict[str, ResidentModel] = {}
+        self.events: List[Dict[str, Any]] = []
+        self._condition = threading.Condition()
+
+    def register(self, model: ResidentModel) -> None:
+        """
+        모델 등록
+
+        Raises:
+            ValueError: 이름이 중복되거나 모델 하나가 GPU 예산보다 큰 경우
+        """
+        if model.name in self.models:
+            raise ValueError(f"Duplicate model: {model.name}")
+        if model.gpu_mb > self.gpu_budget_mb:
+            raise ValueError(f"Model '{model.name}' ({model.gpu_mb:.0f}MB) exceeds GPU budget ({self.gpu_budget_mb:.0f}MB)")
+        self.models[model.name] = model
+
+    def gpu_used_mb(self) -> float:
+        """GPU에 있는 모델(내리는 중 포함) + 로드 예약"""
+        return sum(m.gpu_mb for m in self.models.values() if m.state == "gpu" or m.loading)
+
+    def cpu_used_mb(self) -> float:
+        return sum(m.cpu_mb for m in self.models.values() if m.state == "cpu" or m.unloading == "offload")
+
+    def _cpu_fits(self, model: ResidentModel) -> bool:
+        if self.cpu_budget_mb is None:
+            return True
+        return self.cpu_used_mb() + model.cpu_mb <= self.cpu_budget_mb
+
+    def _record(self, action: str, model: ResidentModel) -> None:
+        self.events.append({"action": action, "model": model.name, "gpu_used_mb": self.gpu_used_mb()})
+        self.log(f"[residency] {action} {model.name} (GPU {self.gpu_used_mb():.0f}/{self.gpu_budget_mb:.0f}MB)")
+
+    def _choose_victim(self, candidates: List[ResidentModel], upcoming: List[str]) -> ResidentModel:
+        """재로드 비용 / (다음 사용까지 거리 + 1) 이 가장 작은 모델 (다시 안 쓰이면 0)"""
+        def score(model: ResidentModel) -> float:
+            if model.name not in upcoming:
+                return 0.0
+            distance = upcoming.index(model.name)
+            return model.reload_cost(self._cpu_fits(model)) / (distance + 1)
+        return min(candidates, key=lambda m: (score(m), -m.gpu_mb))
+
+    def _unload(self, model: ResidentModel) -> None:
+        for hook in list(model.unload_hooks):
+            hook()
+        model.unload()
+
+    def _evict(self, model: ResidentModel) -> None:
+        """lock 밖에서 실행 (동작은 lock 안에서 model.unloading에 정해 둠)"""
+        if model.unloading == "offload":
+            model.offload()
+        else:
+            self._unload(model)
+            _free_gpu_memory()
+
+    def add_unload_hook(self, name: str, hook: Callable[[], None]) -> None:
+        """모델을 메모리에서 내리기 직전에 호출할 함수 등록 (예: LLM 통계를 가진 엔진 참조 보존)"""
+        with self._condition:
+            self.models[name].unload_hooks.append(hook)
+
+    def remove_unload_hook(self, name: str, hook: Callable[[], None]) -> None:
+        with self._condition:
+            if hook in self.models[name].unload_hooks:
+                self.models[name].unload_hooks.remove(hook)
+
+    def acquire(self, names: List[str], upcoming: Optional[List[str]] = None) -> None:
+        """
+        모델들을 GPU에 올리고 사용 중으로 표시 (필요한 모델 전체가 들어갈 때까지 대기)
+
+        자리 계산 / 내릴 모델 선택은 lock 안에서, 오래 걸리는 offload / unload / load / onload는 lock 밖에서 실행합니다.
+        (그동안 다른 Phase는 이미 GPU에 있는 모델로 acquire / release 가능, 로드 중이거나 내리는 중인 모델을 요청하면 완료까지 대기)
+
+        Args:
+            names: 필요한 모델 이름 리스트
+            upcoming: 이후 Phase들이 쓸 모델 이름 (실행 예정 순서, 중복 허용)
+
+        Raises:
+            KeyError: 등록되지 않은 모델
+            ValueError: 필요한 모델 합계가 GPU 예산보다 큰 경우
+        """
+        names = list(dict.fromkeys(names))
+        for name in names:
+            if name not in self.models:
+                raise KeyError(f"Unknown model: {name}")
+        upcoming = list(upcoming or [])
+        requested = [self.models[name] for name in names]
+        if sum(m.gpu_mb for m in requested) > self.gpu_budget_mb:
+            raise ValueError(f"Models {names} do not fit in GPU budget ({self.gpu_budget_mb:.0f}MB)")
+
+        with self._condition:
+            while True:
+                # 다른 Phase가 로드 중이거나 내리는 중인 모델은 끝날 때까지 대기
+                if any(m.loading or m.unloading for m in requested):
+                    self._condition.wait()
+                    continue
+
+                missing_mb = sum(m.gpu_mb for m in requested if m.state != "gpu")
+                free_mb = self.gpu_budget_mb - self.gpu_used_mb()
+
+                candidates = [
+                    m for m in self.models.values()
+                    if m.state == "gpu" and m.in_use == 0 and not m.loading and not m.unloading and m.name not in names
+                ]
+                evictable_mb = sum(m.gpu_mb for m in candidates)
+                # 이미 GPU에 있으면 자리 계산 불필요 (내리는 중인 모델과 로드 예약이 함께 잡혀 free_mb가 음수일 수 있음)
+                if missing_mb == 0 or missing_mb <= free_mb + evictable_mb:
+                    break
+                # 다른 Phase가 사용 중인 모델이 끝나기를 기다림
+                self._condition.wait()
+
+            # 내릴 모델 선택 + 동작(offload / unload) 예약 (실제로 내리는 것은 lock 밖)
+            victims: List[ResidentModel] = []
+            while missing_mb > 0 and missing_mb > free_mb + sum(m.gpu_mb for m in victims):
+                victim = self._choose_victim(candidates, upcoming)
+                candidates.remove(victim)
+                offload = victim.name in upcoming and victim.can_offload and self._cpu_fits(victim)
+                victim.unloading = "offload" if offload else "unload"
+                victims.append(victim)
+
+            # GPU 자리 예약 + 사용 중 표시 (로드 중인 모델은 내릴 후보에서 제외됨)
+            pending = [m for m in requested if m.state != "gpu"]
+            for model in pending:
+                model.loading = True
+            for model in requested:
+                model.in_use += 1
+
+        evicted: List[ResidentModel] = []
+        loaded: List[ResidentModel] = []
+        try:
+            for victim in victims:
+                self._evict(victim)
+                evicted.append(victim)
+            for model in pending:
+                if model.state == "cpu":
+                    model.onload()
+                else:
+                    model.load()
+                loaded.append(model)
+        finally:
+            with self._condition:
+                for model in pending:
+                    model.loading = False
+                for victim in victims:
+                    action, victim.unloading = victim.unloading, None
+                    if victim in evicted:
+                        victim.state = "cpu" if action == "offload" else "unloaded"
+                        self._record(action, victim)
+                for model in loaded:
+                    action = "onload" if model.state == "cpu" else "load"
+                    model.state = "gpu"
+                    self._record(action, model)
+                if len(loaded) < len(pending):
+                    # 내리기 / 로드 실패 → 사용 표시 취소 (이미 올라간 모델은 GPU에 그대로)
+                    for model in requested:
+                        model.in_use = max(model.in_use - 1, 0)
+                self._condition.notify_all()
+
+    def release(self, names: List[str]) -> None:
+        """사용 완료 표시 (GPU에는 그대로 두고, 자리가 필요할 때 내림)"""
+        with self._condition:
+            for name in dict.fromkeys(names):
+                model = self.models[name]
+                model.in_use = max(model.in_use - 1, 0)
+            self._condition.notify_all()
+
+    def unload_all(self) -> None:
+        """사용 중이 아닌 모든 모델 해제"""
+        with self._condition:
+            for model in self.models.values():
+                if model.state != "unloaded" and model.in_use == 0 and not model.loading and not model.unloading:
+                    self._unload(model)
+                    model.state = "unloaded"
+                    self._record("unload", model)
+            _free_gpu_memory()
+
+    def summary(self) -> Dict[str, Any]:
+        """load/offload/onload/unload 횟수와 모델별 현재 상태"""
+        counts: Dict[str, int] = {}
+        for event in self.events:
+            counts[event["action"]] = counts.get(event["action"], 0) + 1
+        return {
+            "actions": counts,
+            "states": {name: model.state for name, model in self.models.items()}
+        }
+
+
+def _free_gpu_memory() -> None:
+    """언로드 후 Python 참조 정리 + CUDA 캐시 반환 (torch가 없으면 gc만)"""
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+def create_residency_manager(config: Dict[str, Any], log: Callable[[str], None] = print) -> ResidencyManager:
+    """
+    config의 residency 설정으로 4개 모델(llm / image / tts / whisper)을 등록한 관리자 생성
+
+    GPU 점유량은 각 엔진의 GPU_MEMORY_MB 선언값을 쓰고, residency.models.<name>.gpu_mb로 덮어쓸 수 있습니다.
+    (gpu_mb를 지정하지 않은 엔진은 선언값을 읽기 위해 여기서 모듈을 import)
+    LLM 백엔드가 vllm이 아니면(openai / replay) LLM의 GPU 점유량은 0입니다.
+
+    Args:
+        config: 설정 dict
+        log: 로그 출력 함수
+
+    Returns:
+        ResidencyManager
+    """
+    residency_config = config.get("residency", {}) or {}
+    model_config = residency_config.get("models", {}) or {}
+    models_paths = config.get("models", {}) or {}
+
+    manager = ResidencyManager(
+        gpu_budget_mb=residency_config.get("gpu_budget_mb", 80000),
+        cpu_budget_mb=residency_config.get("cpu_budget_mb"),
+        log=log
+    )
+
+    def options(name: str, declared_mb: Callable[[], float]) -> Dict[str, Any]:
+        entry = model_config.get(name, {}) or {}
+        return {
+            "gpu_mb": entry["gpu_mb"] if "gpu_mb" in entry else declared_mb(),
+            "load_cost_sec": entry.get("load_cost_sec", 30.0),
+            "onload_cost_sec": entry.get("onload_cost_sec", 3.0)
+        }
+
+    # LLM: vLLM은 CPU 오프로드 불가 → 로드 / 언로드만
+    from pipeline import llm as llm_module
+    backend_type = (config.get("llm_backend", {}) or {}).get("type", "vllm")
+    manager.register(ResidentModel(
+        "llm",
+        load=lambda: llm_module.get_llm_engine(config_path="config.yaml"),
+        unload=llm_module.reset_llm_engine,
+        **options("llm", lambda: llm_module.LLMEngine.GPU_MEMORY_MB if backend_type == "vllm" else 0)
+    ))
+
+    def image_module():
+        from pipeline import image
+        return image
+
+    manager.register(ResidentModel(
+        "image",
+        load=lambda: image_module().get_image_generator(),
+        unload=lambda: image_module().reset_image_generator(),
+        offload=lambda: image_module().get_image_generator().offload(),
+        onload=lambda: image_module().get_image_generator().onload(),
+        **options("image", lambda: image_module().ImageGenerator.GPU_MEMORY_MB)
+    ))
+
+    def tts_module():
+        from pipeline import tts
+        return tts
+
+    tts_model_name = (config.get("tts", {}) or {}).get("model", "tts_models/ko/cv/vits")
+    manager.register(ResidentModel(
+        "tts",
+        load=lambda: tts_module().get_tts_engine(model_name=tts_model_name),
+        unload=lambda: tts_module().reset_tts_engine(),
+        offload=lambda: tts_module().get_tts_engine(model_name=tts_model_name).offload(),
+        onload=lambda: tts_module().get_tts_engine(model_name=tts_model_name).onload(),
+        **options("tts", lambda: tts_module().TTSEngine.GPU_MEMORY_MB)
+    ))
+
+    def subtitle_module():
+        from pipeline import subtitle
+        return subtitle
+
+    whisper_model_name = (config.get("whisper", {}) or {}).get("model") or models_paths.get("whisper", "large-v3")
+    manager.register(ResidentModel(
+        "whisper",
+        load=lambda: subtitle_module().get_whisper_model(model_name=whisper_model_name),
+        unload=lambda: subtitle_module().reset_whisper_model(),
+        **options("whisper", lambda: subtitle_module().WHISPER_GPU_MEMORY_MB)
+    ))
+
+    return manager
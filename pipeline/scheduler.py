@@ -0,0 +1,371 @@
+"""
+Phase 스케줄러 모듈
+입출력이 선언된 Phase 그래프(DAG)를 의존성이 준비되는 즉시 실행
+
+- 각 Phase는 inputs(필요한 산출물 이름)와 outputs(만드는 산출물 이름)를 선언
+  (after: 산출물은 받지 않고 먼저 끝나야 하는 Phase, 같은 자원을 쓰는 Phase의 실행 순서 고정용)
+- 모든 inputs가 준비된 Phase부터 스레드 풀에서 동시에 실행
+- resources로 공유 자원(LLM 엔진, GPU 등)별 동시 실행 수를 제한
+- 실행 후 Phase별 시작/종료 시각과 critical path(가장 늦게 끝난 의존 경로)를 기록
+- manifest가 있으면 Phase별 입력 해시/산출물을 기록하고,
+  resume 모드에서는 입력과 출력 파일이 그대로인 Phase를 건너뜀
+- residency가 있으면 Phase 실행 전 필요한 모델을 GPU에 올리고,
+  대기 중인 Phase 순서를 알려 어떤 모델을 내릴지 결정하게 함
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Callable, List, Optional
+
+from utils.run_manifest import RunManifest, hash_value
+from pipeline.residency import ResidencyManager
+
+
+class Phase:
+    """
+    실행 단위 하나
+
+    fn은 inputs 이름을 키워드 인자로 받아 outputs를 반환합니다.
+    outputs가 하나면 값 그대로, 여러 개면 {이름: 값} dict를 반환합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        inputs: Optional[List[str]] = None,
+        outputs: Optional[List[str]] = None,
+        resources: Optional[List[str]] = None,
+        number: Optional[str] = None,
+        files: Optional[List[str]] = None,
+        fingerprint: Any = None,
+        models: Optional[List[str]] = None,
+        after: Optional[List[str]] = None
+    ):
+        """
+        Args:
+            name: Phase 이름 (그래프 내 고유)
+            fn: 실행 함수
+            inputs: 필요한 산출물 이름 리스트
+            outputs: 만드는 산출물 이름 리스트
+            resources: 실행 중 점유하는 자원 이름 리스트
+            number: 로그용 Phase 번호 (예: "8a")
+            files: 출력 파일/디렉토리 경로 (manifest content hash 대상)
+            fingerprint: 입력 해시에 포함할 설정 값 (바뀌면 재실행)
+            models: 실행 중 GPU에 올라가 있어야 하는 모델 이름 (residency 관리용)
+            after: 먼저 끝나야 하는 Phase 이름 (산출물을 받지 않으므로 입력 해시에도 포함 안 됨)
+        """
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs or [])
+        self.outputs = list(outputs or [])
+        self.resources = sorted(resources or [])
+        self.number = number or name
+        self.files = list(files or [])
+        self.fingerprint = fingerprint
+        self.models = list(models or [])
+        self.after = list(after or [])
+
+    def __repr__(self) -> str:
+        return f"Phase({self.name}: {self.inputs} → {self.outputs})"
+
+
+class PhaseScheduler:
+    """
+    의존성 기반 Phase 실행기
+
+    Example:
+        >>> scheduler = PhaseScheduler(resource_limits={"llm": 1, "gpu": 2})
+        >>> scheduler.add(Phase("outline", make_outline, outputs=["outline"], resources=["llm"]))
+        >>> scheduler.add(Phase("hook", make_hook, inputs=["outline"], outputs=["hook_text"], resources=["llm"]))
+        >>> artifacts = scheduler.run()
+    """
+
+    def __init__(
+        self,
+        resource_limits: Optional[Dict[str, int]] = None,
+        max_workers: int = 4,
+        log: Callable[[str], None] = print,
+        manifest: Optional[RunManifest] = None,
+        resume: bool = False,
+        on_phase_done: Optional[Callable[[str], None]] = None,
+        residency: Optional[ResidencyManager] = None,
+        semaphores: Optional[Dict[str, threading.Semaphore]] = None
+    ):
+        """
+        Args:
+            resource_limits: 자원별 동시 실행 수 (없는 자원은 제한 없음)
+            max_workers: 동시에 실행할 최대 Phase 수
+            log: 로그 출력 함수
+            manifest: 실행 manifest (Phase 완료마다 기록)
+            resume: True면 manifest 기록과 입력/출력이 같은 Phase를 건너뜀
+            on_phase_done: Phase 완료(건너뜀 포함)마다 Phase 이름으로 호출 (예: 작업 큐 heartbeat)
+            residency: GPU 모델 상주 관리자 (Phase.models를 실행 전에 GPU로)
+            semaphores: 다른 스케줄러와 공유할 자원별 세마포어 (resource_limits보다 우선, 다중 제목 배치 실행용)
+        """
+        self.resource_limits = dict(resource_limits or {})
+        self.max_workers = max_workers
+        self.log = log
+        self.manifest = manifest
+        self.resume = resume and manifest is not None
+        self.on_phase_done = on_phase_done
+        self.residency = residency
+
+        self.phases: Dict[str, Phase] = {}
+        self.producers: Dict[str, str] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.critical_path: List[str] = []
+        self.skipped: List[str] = []
+        self._queued: List[str] = []
+
+        self._semaphores = {
+            resource: threading.BoundedSemaphore(max(int(limit), 1))
+            for resource, limit in self.resource_limits.items()
+        }
+        self._semaphores.update(semaphores or {})
+        self._lock = threading.Lock()
+
+    def add(self, phase: Phase) -> None:
+        """
+        Phase 등록
+
+        Raises:
+            ValueError: 이름 또는 산출물이 중복된 경우
+        """
+        if phase.name in self.phases:
+            raise ValueError(f"Duplicate phase: {phase.name}")
+        for output in phase.outputs:
+            if output in self.producers:
+                raise ValueError(f"Output '{output}' already produced by phase '{self.producers[output]}'")
+
+        self.phases[phase.name] = phase
+        for output in phase.outputs:
+            self.producers[output] = phase.name
+
+    def dependencies(self, phase: Phase, initial: Dict[str, Any]) -> List[str]:
+        """phase가 기다려야 하는 Phase 이름 리스트 (초기 산출물은 제외)"""
+        deps = []
+        for name in phase.inputs:
+            if name in initial:
+                continue
+            producer = self.producers.get(name)
+            if producer is None:
+                raise ValueError(f"Phase '{phase.name}' needs '{name}', but no phase produces it")
+            if producer not in deps:
+                deps.append(producer)
+        for name in phase.after:
+            if name not in self.phases:
+                raise ValueError(f"Phase '{phase.name}' runs after '{name}', but no such phase exists")
+            if name not in deps:
+                deps.append(name)
+        return deps
+
+    def _validate(self, initial: Dict[str, Any]) -> Dict[str, List[str]]:
+        """의존성 계산 + 순환 검사 (위상 정렬)"""
+        deps = {name: self.dependencies(phase, initial) for name, phase in self.phases.items()}
+
+        remaining = {name: set(d) for name, d in deps.items()}
+        while remaining:
+            ready = [name for name, d in remaining.items() if not d]
+            if not ready:
+                raise ValueError(f"Dependency cycle among phases: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for d in remaining.values():
+                d.difference_update(ready)
+
+        return deps
+
+    def _inputs_hash(self, phase: Phase, artifact_hashes: Dict[str, str]) -> str:
+        """입력 산출물 해시 + 설정 fingerprint → Phase 입력 해시"""
+        return hash_value({
+            "inputs": {name: artifact_hashes[name] for name in phase.inputs},
+            "fingerprint": phase.fingerprint
+        })
+
+    def _run_or_restore(
+        self,
+        phase: Phase,
+        artifacts: Dict[str, Any],
+        inputs_hash: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        resume 시 manifest 기록 재사용, 아니면 실행 후 기록
+
+        Returns:
+            {"outputs": 산출물 dict, "hash": outputs_hash 또는 None, "skipped": bool}
+        """
+        if self.resume:
+            entry = self.manifest.lookup(phase.name, inputs_hash)
+            if entry is not None:
+                self.log(f"⏭ Phase {phase.number} ({phase.name}): inputs and outputs unchanged, skipped")
+                return {"outputs": entry["outputs"], "hash": entry["outputs_hash"], "skipped": True}
+
+        if self.manifest is not None:
+            self.manifest.invalidate(phase.name)
+
+        outputs = self._run_phase(phase, artifacts)
+
+        outputs_hash = None
+        if self.manifest is not None:
+            outputs_hash = self.manifest.record(phase.name, inputs_hash, outputs, phase.files)
+        return {"outputs": outputs, "hash": outputs_hash, "skipped": False}
+
+    def _upcoming_models(self) -> List[str]:
+        """아직 시작하지 않은 Phase들이 쓸 모델 (실행 가능한 Phase 먼저, 등록 순서)"""
+        with self._lock:
+            queued = list(self._queued)
+        return [model for name in queued for model in self.phases[name].models]
+
+    def _run_phase(self, phase: Phase, artifacts: Dict[str, Any]) -> Dict[str, Any]:
+        """자원을 점유한 상태로 Phase 실행 (자원은 이름순으로 획득하여 교착 방지)"""
+        semaphores = [self._semaphores[r] for r in phase.resources if r in self._semaphores]
+        models = phase.models if self.residency is not None else []
+        for semaphore in semaphores:
+            semaphore.acquire()
+        try:
+            started = time.perf_counter()
+            with self._lock:
+                self.timings[phase.name] = {"start": started}
+
+            # 모델 로드/교체 시간도 Phase 소요 시간에 포함
+            if models:
+                self.residency.acquire(models, upcoming=self._upcoming_models())
+            try:
+                result = phase.fn(**{name: artifacts[name] for name in phase.inputs})
+            finally:
+                if models:
+                    self.residency.release(models)
+
+            with self._lock:
+                self.timings[phase.name]["end"] = time.perf_counter()
+        finally:
+            for semaphore in reversed(semaphores):
+                semaphore.release()
+
+        if len(phase.outputs) == 1:
+            return {phase.outputs[0]: result}
+        if not phase.outputs:
+            return {}
+
+        missing = [name for name in phase.outputs if name not in (result or {})]
+        if missing:
+            raise ValueError(f"Phase '{phase.name}' did not return outputs: {missing}")
+        return {name: result[name] for name in phase.outputs}
+
+    def run(self, initial: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        그래프 실행
+
+        Args:
+            initial: 미리 준비된 산출물 (예: 제목)
+
+        Returns:
+            모든 산출물 dict (initial 포함)
+
+        Raises:
+            ValueError: 입력을 만드는 Phase가 없거나 순환 의존이 있는 경우
+            Exception: Phase 실패 시 첫 번째 예외 (아직 시작하지 않은 Phase는 실행하지 않음)
+        """
+        initial = dict(initial or {})
+        deps = self._validate(initial)
+        artifacts = dict(initial)
+        artifact_hashes = {name: hash_value(value) for name, value in initial.items()}
+
+        run_started = time.perf_counter()
+        done: List[str] = []
+        running = {}
+        error: Optional[BaseException] = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="phase") as executor:
+            while len(done) < len(self.phases):
+                if error is None:
+                    for name, phase in self.phases.items():
+                        if name in done or name in running.values():
+                            continue
+                        if all(d in done for d in deps[name]):
+                            inputs_hash = self._inputs_hash(phase, artifact_hashes) if self.manifest else None
+                            running[executor.submit(self._run_or_restore, phase, artifacts, inputs_hash)] = name
+
+                    # 대기 중인 Phase 순서 (residency가 내릴 모델을 고를 때 사용)
+                    pending = [n for n in self.phases if n not in done and n not in running.values()]
+                    with self._lock:
+                        self._queued = sorted(
+                            pending,
+                            key=lambda n: not all(d in done for d in deps[n])
+                        )
+
+                if not running:
+                    break
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        result = future.result()
+                        artifacts.update(result["outputs"])
+                        for output in result["outputs"]:
+                            artifact_hashes[output] = hash_value([result["hash"], output])
+                        if result["skipped"]:
+                            self.skipped.append(name)
+                        done.append(name)
+                        if self.on_phase_done is not None:
+                            self.on_phase_done(name)
+                    except BaseException as e:
+                        self.log(f"✗ Phase '{name}' failed: {e}")
+                        if error is None:
+                            error = e
+
+        if error is not None:
+            raise error
+
+        self.critical_path = self._critical_path(deps)
+        self._log_summary(run_started)
+        return artifacts
+
+    def _critical_path(self, deps: Dict[str, List[str]]) -> List[str]:
+        """가장 늦게 끝난 Phase부터 가장 늦게 끝난 의존 Phase를 거슬러 올라간 경로 (건너뛴 Phase 제외)"""
+        if not self.timings:
+            return []
+
+        current = max(self.timings, key=lambda name: self.timings[name]["end"])
+        path = [current]
+        while True:
+            executed = [name for name in deps[current] if name in self.timings]
+            if not executed:
+                break
+            current = max(executed, key=lambda name: self.timings[name]["end"])
+            path.append(current)
+        return list(reversed(path))
+
+    def summary(self, run_started: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Phase별 시작 오프셋 / 소요 시간 (초, 실행 시작 기준)"""
+        if not self.timings:
+            return {}
+        origin = run_started if run_started is not None else min(t["start"] for t in self.timings.values())
+        return {
+            name: {
+                "start_sec": round(t["start"] - origin, 2),
+                "duration_sec": round(t["end"] - t["start"], 2)
+            }
+            for name, t in self.timings.items()
+        }
+
+    def _log_summary(self, run_started: float) -> None:
+        if self.skipped:
+            self.log(f"Resumed: {len(self.skipped)} phases skipped ({', '.join(self.skipped)})")
+
+        summary = self.summary(run_started)
+        if not summary:
+            return
+        total = max(t["start_sec"] + t["duration_sec"] for t in summary.values())
+        busy = sum(t["duration_sec"] for t in summary.values())
+
+        self.log(f"Phase timeline: {total / 60:.1f} min wall, {busy / 60:.1f} min of phase work")
+        for name in sorted(summary, key=lambda n: summary[n]["start_sec"]):
+            t = summary[name]
+            self.log(f"  {name:<24} +{t['start_sec']:7.1f}s  {t['duration_sec']:7.1f}s")
+
+        path = " → ".join(f"{name} ({summary[name]['duration_sec']:.1f}s)" for name in self.critical_path)
+        self.log(f"Critical path: {path}")
@@ -0,0 +1,315 @@
+"""
+Stage 워커 모듈
+무거운 엔진(TTS / Whisper)을 별도 프로세스에 상주시켜 GIL 경합 없이 Phase를 병렬 실행
+
+- Stage(예: "tts", "whisper")마다 오래 사는 워커 프로세스를 띄우고 모델을 한 번만 로드
+  (엔진 모듈의 싱글톤이 워커 프로세스 안에 남아 작업 간 재사용)
+- 작업은 IPC 큐로 전달: "모듈:함수" 이름 + 인자 (텍스트 / 파일 경로)
+  오디오·자막은 파일로 주고받으므로 큰 배열이 큐를 지나가지 않음
+- 부모 프로세스에서는 Future로 결과를 기다리며, 워커 예외는 traceback과 함께 StageWorkerError로 전달
+- 워커 프로세스가 죽으면 대기 중인 작업을 모두 실패 처리하고 다음 작업에서 새 프로세스를 띄움
+
+CUDA 컨텍스트를 fork로 복제하지 않도록 spawn 방식으로 프로세스를 생성합니다.
+"""
+
+import atexit
+import importlib
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class StageWorkerError(RuntimeError):
+    """워커 프로세스 안에서 작업이 실패했거나 워커가 종료된 경우"""
+
+
+def _resolve(target: str):
+    """'모듈:함수' 문자열 → 함수"""
+    module_name, _, function_name = target.partition(":")
+    if not function_name:
+        raise ValueError(f"target must be 'module:function': {target}")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _worker_main(
+    name: str,
+    jobs: "multiprocessing.Queue",
+    results: "multiprocessing.Queue",
+    warmup: Optional[Tuple[str, Dict[str, Any]]]
+) -> None:
+    """워커 프로세스 본체: 모델 미리 로드 → 작업 반복 실행 (None을 받으면 종료)"""
+    if warmup is not None:
+        target, kwargs = warmup
+        started = time.perf_counter()
+        try:
+            _resolve(target)(**kwargs)
+            print(f"[{name}] worker warmed up in {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            # 로드 실패는 첫 작업에서 다시 드러나므로 워커는 계속 실행
+            print(f"✗ [{name}] warmup failed: {e}")
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+
+        job_id, target, args, kwargs = job
+        started = time.perf_counter()
+        try:
+            result = _resolve(target)(*args, **kwargs)
+            results.put((job_id, True, result, time.perf_counter() - started))
+        except Exception:
+            results.put((job_id, False, traceback.format_exc(), time.perf_counter() - started))
+
+
+class StageWorker:
+    """
+    Stage 하나의 워커 프로세스들 (작업 큐 공유)
+
+    Example:
+        >>> worker = StageWorker("tts", warmup=("pipeline.tts:get_tts_engine", {"model_name": "..."}))
+        >>> audio_path = worker.run("pipeline.tts:generate_tts", text, "out/hook_audio.wav")
+        >>> worker.stop()
+    """
+
+    def __init__(
+        self,
+        name: str,
+        processes: int = 1,
+        warmup: Optional[Tuple[str, Dict[str, Any]]] = None,
+        log=print
+    ):
+        """
+        Args:
+            name: Stage 이름 (로그 / 통계용)
+            processes: 워커 프로세스 수 (프로세스마다 모델을 따로 로드)
+            warmup: 시작 시 호출할 ("모듈:함수", kwargs) - 모델 미리 로드용
+            log: 로그 출력 함수
+        """
+        self.name = name
+        self.processes = max(int(processes), 1)
+        self.warmup = warmup
+        self.log = log
+
+        # 작업 통계
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self.busy_sec = 0.0
+
+        self._context = multiprocessing.get_context("spawn")
+        self._jobs = None
+        self._results = None
+        self._workers: List[Any] = []
+        self._collector: Optional[threading.Thread] = None
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()  # _pending / 통계
+        self._process_lock = threading.Lock()  # 프로세스 시작 / 종료
+        self._stopping = False
+
+    @property
+    def alive(self) -> bool:
+        return any(process.is_alive() for process in self._workers)
+
+    def start(self) -> None:
+        """워커 프로세스 시작 (이미 실행 중이면 무시, 모두 종료된 경우 새로 시작)"""
+        with self._process_lock:
+            if self.alive:
+                return
+            self._stop_processes()
+
+            self._jobs = self._context.Queue()
+            self._results = self._context.Queue()
+            self._stopping = False
+            self._workers = [
+                self._context.Process(
+                    target=_worker_main,
+                    args=(self.name, self._jobs, self._results, self.warmup),
+                    name=f"stage-{self.name}-{i}",
+                    daemon=True
+                )
+                for i in range(self.processes)
+            ]
+            for process in self._workers:
+                process.start()
+
+            self._collector = threading.Thread(
+                target=self._collect, args=(self._results,), name=f"stage-{self.name}-results", daemon=True
+            )
+            self._collector.start()
+            self.log(f"✓ Stage worker '{self.name}' started ({self.processes} process)")
+
+    def _collect(self, results: "multiprocessing.Queue") -> None:
+        """결과 큐 → Future (워커가 모두 죽으면 대기 중인 작업 실패 처리)"""
+        while True:
+            try:
+                job_id, ok, payload, elapsed = results.get(timeout=0.5)
+            except queue.Empty:
+                if not self.alive:
+                    if not self._stopping:
+                        self._fail_pending(f"Stage worker '{self.name}' exited unexpectedly")
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+
+            with self._lock:
+                future = self._pending.pop(job_id, None)
+                self.busy_sec += elapsed
+                if ok:
+                    self.jobs_done += 1
+                else:
+                    self.jobs_failed += 1
+            if future is None:
+                continue
+            if ok:
+                future.set_result(payload)
+            else:
+                future.set_exception(StageWorkerError(f"[{self.name}] job failed in worker:\n{payload}"))
+
+    def _fail_pending(self, message: str) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(StageWorkerError(message))
+
+    def submit(self, target: str, *args, **kwargs) -> Future:
+        """
+        작업 등록 (인자와 반환값은 pickle 가능해야 함 - 텍스트 / 경로 권장)
+
+        Args:
+            target: 워커에서 실행할 "모듈:함수"
+
+        Returns:
+            Future (결과 또는 StageWorkerError)
+        """
+        self.start()
+        future: Future = Future()
+        with self._lock:
+            job_id = next(self._ids)
+            self._pending[job_id] = future
+        self._jobs.put((job_id, target, args, kwargs))
+        return future
+
+    def run(self, target: str, *args, **kwargs) -> Any:
+        """작업 실행 후 결과 반환 (submit().result())"""
+        return self.submit(target, *args, **kwargs).result()
+
+    def _stop_processes(self, timeout: float = 10.0) -> None:
+        self._stopping = True
+        for _ in self._workers:
+            try:
+                self._jobs.put(None)
+            except (OSError, ValueError):
+                pass
+        for process in self._workers:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._workers = []
+        if self._collector is not None:
+            self._collector.join(timeout)
+            self._collector = None
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """실행 중인 작업이 끝나면 워커 종료 (모델 해제)"""
+        with self._process_lock:
+            self._stop_processes(timeout)
+        self._fail_pending(f"Stage worker '{self.name}' stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "alive": self.alive,
+                "jobs_done": self.jobs_done,
+                "jobs_failed": self.jobs_failed,
+                "busy_sec": round(self.busy_sec, 2)
+            }
+
+
+class StageWorkerPool:
+    """Stage 이름 → StageWorker (처음 사용할 때 프로세스 시작)"""
+
+    def __init__(self, workers: Optional[Dict[str, StageWorker]] = None):
+        self.workers: Dict[str, StageWorker] = dict(workers or {})
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.workers
+
+    def run(self, stage: str, target: str, *args, **kwargs) -> Any:
+        """
+        Stage 워커에서 작업 실행
+
+        Raises:
+            KeyError: 등록되지 않은 Stage
+            StageWorkerError: 워커에서 작업이 실패한 경우
+        """
+        return self.workers[stage].run(target, *args, **kwargs)
+
+    def stop(self) -> None:
+        for worker in self.workers.values():
+            worker.stop()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: worker.stats() for name, worker in self.workers.items()}
+
+
+def create_stage_workers(config: Dict[str, Any], log=print) -> StageWorkerPool:
+    """
+    config의 stage_workers 설정으로 TTS / Whisper 워커 풀 생성 (프로세스는 첫 작업에서 시작)
+
+    Args:
+        config: 설정 dict
+        log: 로그 출력 함수
+
+    Returns:
+        StageWorkerPool ("tts" / "whisper" 중 설정된 Stage)
+    """
+    stage_config = config.get("stage_workers", {}) or {}
+    stages = stage_config.get("stages", {"tts": {}, "whisper": {}}) or {}
+
+    # 워커 시작 시 엔진 싱글톤 로드 (반환된 엔진 객체는 워커 안에만 남음)
+    tts_model = (config.get("tts", {}) or {}).get("model")
+    whisper_model = (config.get("whisper", {}) or {}).get("model")
+    warmups = {
+        "tts": ("pipeline.tts:get_tts_engine", {"model_name": tts_model} if tts_model else {}),
+        "whisper": ("pipeline.subtitle:get_whisper_model", {"model_name": whisper_model} if whisper_model else {}),
+    }
+
+    workers = {}
+    for name, options in stages.items():
+        options = options or {}
+        workers[name] = StageWorker(
+            name,
+            processes=options.get("processes", 1),
+            warmup=warmups.get(name) if options.get("warmup", True) else None,
+            log=log
+        )
+    return StageWorkerPool(workers)
+
+
+# 싱글톤 패턴 (상주 서버에서는 작업 간 워커와 모델 재사용)
+_stage_workers: Optional[StageWorkerPool] = None
+
+
+def get_stage_workers(config: Dict[str, Any]) -> StageWorkerPool:
+    """Stage 워커 풀 싱글톤 반환 (프로세스 종료 시 워커도 종료)"""
+    global _stage_workers
+    if _stage_workers is None:
+        _stage_workers = create_stage_workers(config)
+        atexit.register(reset_stage_workers)
+    return _stage_workers
+
+
+def reset_stage_workers() -> None:
+    """워커 프로세스 종료 + 싱글톤 리셋"""
+    global _stage_workers
+    if _stage_workers is not None:
+        _stage_workers.stop()
+        _stage_workers = None
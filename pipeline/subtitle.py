@@ -4,12 +4,14 @@ whisper-ctranslate2를 사용한 고성능 STT
 """
 
 from pathlib import Path
-from whisper_ctranslate2 import Transcriber
 
 
 # 전역 모델 캐싱
 _whisper_model = None
 
+# large-v3 float16 GPU 점유량 추정치 (residency 관리용, CTranslate2 모델은 CPU 오프로드 없이 언로드만)
+WHISPER_GPU_MEMORY_MB = 4000
+
 
 def get_whisper_model(model_name: str = "large-v3", device: str = "cuda"):
     """
@@ -24,6 +26,8 @@ def get_whisper_model(model_name: str = "large-v3", device: str = "cuda"):
     """
     global _whisper_model
     if _whisper_model is None:
+        from whisper_ctranslate2 import Transcriber
+
         print(f"Loading Whisper model: {model_name} on {device}...")
         _whisper_model = Transcriber(
             model_name_or_path=model_name,
@@ -34,6 +38,12 @@ def get_whisper_model(model_name: str = "large-v3", device: str = "cuda"):
     return _whisper_model
 
 
+def reset_whisper_model():
+    """Whisper 모델 리셋 (GPU 메모리 해제)"""
+    global _whisper_model
+    _whisper_model = None
+
+
 def generate_subtitles(
     audio_path: str,
     output_path: str,
@@ -1,13 +1,13 @@
 """
 TTS (Text-to-Speech) 모듈
 Coqui TTS를 사용한 한국어 음성 합성
+
+torch / TTS는 TTSEngine 생성 시점에 import합니다. (split_sentences / merge_audio_files는 가벼움)
 """
 
 from pathlib import Path
-from TTS.api import TTS
 import os
 from typing import Optional
-import torch
 
 
 class TTSEngine:
@@ -15,18 +15,27 @@ class TTSEngine:
     Coqui TTS 기반 음성 합성 엔진
     """
 
+    # VITS GPU 점유량 추정치 (residency 관리용)
+    GPU_MEMORY_MB = 3000
+
     def __init__(
         self,
         model_name: str = "tts_models/ko/cv/vits",
-        device: str = "cuda" if torch.cuda.is_available() else "cpu"
+        device: Optional[str] = None
     ):
         """
         TTS 엔진 초기화
 
         Args:
             model_name: TTS 모델 이름 (한국어 모델 권장)
-            device: 디바이스 (cuda/cpu)
+            device: 디바이스 (cuda/cpu, None이면 CUDA 사용 가능 여부로 결정)
         """
+        import torch
+        from TTS.api import TTS
+
+        if device is None:
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+
         print(f"Loading TTS model: {model_name}")
         print(f"  Device: {device}")
 
@@ -37,6 +46,18 @@ class TTSEngine:
         except Exception as e:
             raise RuntimeError(f"TTS 모델 로드 실패: {model_name}\n오류: {e}")
 
+    def offload(self) -> None:
+        """모델을 CPU로 이동 (GPU 메모리 반환, onload()로 복귀)"""
+        import torch
+
+        self.tts.to("cpu")
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def onload(self) -> None:
+        """오프로드한 모델을 다시 원래 디바이스로"""
+        self.tts.to(self.device)
+
     def synthesize(
         self,
         text: str,
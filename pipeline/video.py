@@ -35,6 +35,40 @@ def get_audio_duration(audio_path: str) -> float:
     return duration
 
 
+def assign_scene_durations(scenes: List[Dict[str, Any]], audio_duration: float) -> List[Dict[str, Any]]:
+    """
+    장면별 표시 시간(duration) 계산
+
+    timestamp는 첫 장면 기준 상대 위치로 보고 다음 장면까지의 간격을 오디오 길이에 맞게 비례 조정합니다.
+    (Part별 세그먼트는 전체 타임라인 기준 timestamp를 그대로 쓸 수 없음)
+    timestamp가 증가하지 않으면 균등 분할합니다.
+
+    Args:
+        scenes: 장면 리스트 (timestamp 포함)
+        audio_duration: 오디오 길이 (초)
+
+    Returns:
+        duration이 채워진 장면 리스트 (원본은 수정하지 않음)
+    """
+    if not scenes:
+        return []
+
+    timestamps = [float(scene.get('timestamp', 0)) for scene in scenes]
+    gaps = [later - earlier for earlier, later in zip(timestamps, timestamps[1:])]
+
+    if gaps and all(gap > 0 for gap in gaps):
+        # 마지막 장면은 평균 간격만큼 표시한 것으로 보고 전체를 오디오 길이에 맞춤
+        weights = gaps + [sum(gaps) / len(gaps)]
+    else:
+        weights = [1.0] * len(scenes)
+
+    total = sum(weights)
+    return [
+        {**scene, 'duration': round(audio_duration * weight / total, 3)}
+        for scene, weight in zip(scenes, weights)
+    ]
+
+
 def compile_video(
     images_dir: str,
     audio_path: str,
@@ -68,8 +102,10 @@ def compile_video(
     audio_duration = get_audio_duration(audio_path)
     print(f"  Audio duration: {audio_duration:.2f}s")
 
-    # Scenes 정보 추출
+    # Scenes 정보 추출 (duration이 없으면 timestamp 간격으로 계산)
     scenes = image_prompts_json["scenes"]
+    if any('duration' not in scene for scene in scenes):
+        scenes = assign_scene_durations(scenes, audio_duration)
     print(f"  Total scenes: {len(scenes)}")
 
     # 이미지 파일 경로 매칭
@@ -88,8 +124,8 @@ def compile_video(
             'duration': scene['duration']
         })
 
-    # FFmpeg concat 파일 생성
-    concat_file = Path(output_path).parent / "images_concat.txt"
+    # FFmpeg concat 파일 생성 (같은 디렉토리에서 세그먼트를 동시에 만들 수 있도록 출력 이름 기준)
+    concat_file = Path(output_path).parent / f"{Path(output_path).stem}_images_concat.txt"
     with open(concat_file, 'w') as f:
         for img in image_files:
             f.write(f"file '{img['path']}'\n")
@@ -211,6 +247,54 @@ def compile_video_simple(
     return output_path
 
 
+def concat_videos(segment_paths: List[str], output_path: str) -> str:
+    """
+    세그먼트 비디오를 재인코딩 없이 이어붙이기 (concat demuxer + stream copy)
+
+    세그먼트는 compile_video로 같은 코덱/해상도/프레임레이트로 만든 것이어야 합니다.
+
+    Args:
+        segment_paths: 세그먼트 비디오 경로 리스트 (재생 순서)
+        output_path: 출력 비디오 파일 경로
+
+    Returns:
+        생성된 비디오 파일 경로
+    """
+    print(f"Concatenating {len(segment_paths)} segments: {output_path}")
+
+    if not segment_paths:
+        raise ValueError("No video segments to concatenate")
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    list_file = Path(output_path).parent / f"{Path(output_path).stem}_segments.txt"
+    with open(list_file, 'w') as f:
+        for segment_path in segment_paths:
+            f.write(f"file '{Path(segment_path).resolve()}'\n")
+
+    cmd = [
+        'ffmpeg',
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', str(list_file),
+        '-c', 'copy',
+        '-movflags', '+faststart',
+        '-y',
+        output_path
+    ]
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+
+    list_file.unlink()
+
+    if result.returncode != 0:
+        print(f"FFmpeg stderr: {result.stderr}")
+        raise RuntimeError(f"FFmpeg failed with code {result.returncode}")
+
+    print(f"✓ Video concatenation complete: {output_path}")
+    return output_path
+
+
 def add_subtitles_to_video(
     video_path: str,
     subtitles_path: str,
@@ -2,6 +2,9 @@
 Phase 2: Hook 생성 프롬프트
 """
 
+# Hook 목표 분량 (자) - 토큰 예산 산정용
+HOOK_TARGET_CHARS = 500
+
 HOOK_PROMPT = """
 당신은 유튜브 오디오 드라마 작가입니다.
 
@@ -109,6 +109,38 @@ HOOK_IMAGES_PROMPT = """
 """
 
 
+# Hook 이미지 프롬프트 JSON 스키마 (vLLM guided decoding용)
+HOOK_IMAGES_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "scenes": {
+            "type": "array",
+            "minItems": 5,
+            "maxItems": 5,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "index": {"type": "integer"},
+                    "part": {"type": "string"},
+                    "text_reference": {"type": "string"},
+                    "timestamp": {"type": "number"},
+                    "duration": {"type": "number"},
+                    "description": {"type": "string"},
+                    "mood": {"type": "string"},
+                    "prompt": {"type": "string"}
+                },
+                "required": [
+                    "index", "part", "text_reference", "timestamp",
+                    "duration", "description", "mood", "prompt"
+                ]
+            }
+        },
+        "total_scenes": {"type": "integer"}
+    },
+    "required": ["scenes", "total_scenes"]
+}
+
+
 def generate_hook_images_prompt(hook_text: str) -> str:
     """
     Hook 이미지 프롬프트 생성 프롬프트를 생성합니다.
@@ -230,6 +230,38 @@ Part 4 (시작 6,030초, 길이 1,870초):
 """
 
 
+# Main 이미지 프롬프트 JSON 스키마 (vLLM guided decoding용)
+MAIN_IMAGES_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "scenes": {
+            "type": "array",
+            "minItems": 15,
+            "maxItems": 15,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "index": {"type": "integer"},
+                    "part": {"type": "string", "enum": ["part1", "part2", "part3", "part4"]},
+                    "position": {"type": "string"},
+                    "text_reference": {"type": "string"},
+                    "timestamp": {"type": "number"},
+                    "description": {"type": "string"},
+                    "mood": {"type": "string"},
+                    "prompt": {"type": "string"}
+                },
+                "required": [
+                    "index", "part", "position", "text_reference",
+                    "timestamp", "description", "mood", "prompt"
+                ]
+            }
+        },
+        "total_scenes": {"type": "integer"}
+    },
+    "required": ["scenes", "total_scenes"]
+}
+
+
 def generate_main_images_prompt(
     part1_summary: str,
     part2_summary: str,
@@ -240,10 +272,10 @@ def generate_main_images_prompt(
     Main 이미지 프롬프트 생성 프롬프트를 생성합니다.
 
     Args:
-        part1_summary (str): Part 1 요약
+        part1_summary (str): Part 1 요약 (create_part_excerpt 발췌)
         part2_summary (str): Part 2 요약
         part3_summary (str): Part 3 요약
-        part4_summary (str): Part 4 전체 텍스트 (마지막은 요약이 아닌 전체)
+        part4_summary (str): Part 4 요약
 
     Returns:
         str: 완성된 프롬프트
@@ -405,6 +405,148 @@ OUTLINE_PROMPT_V2_FINAL = """
 """
 
 
+# Outline JSON 스키마 (vLLM guided decoding용)
+# validate_outline()이 보정하는 필드 구조와 프롬프트의 JSON 예시를 그대로 따름
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+OUTLINE_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "meta": {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string"},
+                "genre": {"type": "string"},
+                "tone": {"type": "string"},
+                "target_emotion": {"type": "string"},
+                "audience_age": {"type": "string"},
+                "duration_minutes": {"type": "integer"},
+                "part_count": {"type": "integer"}
+            },
+            "required": ["title", "genre", "tone", "target_emotion", "audience_age", "duration_minutes", "part_count"]
+        },
+        "consistency_anchors": {"type": "array", "items": {"type": "string"}, "minItems": 4, "maxItems": 4},
+        "global_conflict_arc": {
+            "type": "object",
+            "properties": {
+                "start": {"type": "string"},
+                "rise": {"type": "string"},
+                "peak": {"type": "string"},
+                "fall": {"type": "string"},
+                "end": {"type": "string"}
+            },
+            "required": ["start", "rise", "peak", "fall", "end"]
+        },
+        "emotional_anchors": {"type": "array", "items": {"type": "string"}, "minItems": 4, "maxItems": 4},
+        "characters": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "name": {"type": "string"},
+                    "age": {"type": "integer"},
+                    "role": {"type": "string"},
+                    "archetype": {"type": "string"},
+                    "core_trait": {"type": "string"},
+                    "voice_type": {"type": "string"},
+                    "emotional_arc": {
+                        "type": "object",
+                        "properties": {
+                            "start": {"type": "string"},
+                            "journey": {"type": "string"},
+                            "end": {"type": "string"}
+                        },
+                        "required": ["start", "journey", "end"]
+                    },
+                    "relationships": {"type": "object", "additionalProperties": {"type": "string"}},
+                    "key_motivation": {"type": "string"}
+                },
+                "required": ["id", "name", "age", "role", "voice_type", "emotional_arc", "key_motivation"]
+            }
+        },
+        "story_spine": {"type": "object"},
+        "key_scenes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "scene_id": {"type": "string"},
+                    "part": {"type": "integer"},
+                    "title": {"type": "string"},
+                    "location": {"type": "string"},
+                    "core_action": {"type": "string"}
+                },
+                "required": ["scene_id", "part", "title", "core_action"]
+            }
+        },
+        "thematic_threads": {
+            "type": "object",
+            "properties": {
+                "main_theme": {"type": "string"},
+                "sub_themes": _STRING_LIST,
+                "symbolic_objects": {"type": "object", "additionalProperties": {"type": "string"}},
+                "motifs": _STRING_LIST,
+                "thematic_progression": {"type": "string"}
+            },
+            "required": ["main_theme", "symbolic_objects"]
+        },
+        "narrative_rules": {
+            "type": "object",
+            "properties": {
+                "pov": {"type": "string"},
+                "dialogue_ratio": {"type": "string"},
+                "core_forbidden": _STRING_LIST
+            },
+            "required": ["pov", "core_forbidden"]
+        },
+        "part_breakdown": {
+            "type": "array",
+            "minItems": 4,
+            "maxItems": 4,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "part": {"type": "integer"},
+                    "title": {"type": "string"},
+                    "time_range_minutes": {"type": "array", "items": {"type": "integer"}, "minItems": 2, "maxItems": 2},
+                    "word_count_range": {"type": "array", "items": {"type": "integer"}, "minItems": 2, "maxItems": 2},
+                    "primary_goal": {"type": "string"},
+                    "conflict_intensity": {"type": "integer"},
+                    "must_include": _STRING_LIST,
+                    "must_avoid": _STRING_LIST,
+                    "must_resolve": _STRING_LIST,
+                    "open_threads": _STRING_LIST,
+                    "ending_hook": {"type": "string"},
+                    "key_revelations": _STRING_LIST,
+                    "bridge_to_next": {
+                        "type": "object",
+                        "properties": {
+                            "connector_dialogue": {"type": "string"},
+                            "carry_over_summary": {"type": "string"}
+                        },
+                        "required": ["connector_dialogue", "carry_over_summary"]
+                    }
+                },
+                "required": [
+                    "part", "title", "time_range_minutes", "word_count_range",
+                    "primary_goal", "conflict_intensity", "must_include",
+                    "must_avoid", "must_resolve", "open_threads",
+                    "ending_hook", "key_revelations", "bridge_to_next"
+                ]
+            }
+        },
+        "outline_full": {"type": "string"}
+    },
+    "required": [
+        "meta", "consistency_anchors", "global_conflict_arc", "emotional_anchors",
+        "characters", "story_spine", "key_scenes", "thematic_threads",
+        "narrative_rules", "part_breakdown", "outline_full"
+    ]
+}
+
+
 def generate_outline_prompt(title: str) -> str:
     """
     Outline 생성 프롬프트를 생성합니다. (V2 Final 버전)
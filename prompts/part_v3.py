@@ -3,22 +3,25 @@ Phase 3-6: Part 1-4 생성 프롬프트 V3
 outline_v2_final.json 기반 완전 재설계 + 안정화 로직 강화
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import re
 
 # 금지 요소 (outline과 동일하게 유지)
 from prompts.outline_v2_final import FORBIDDEN_ELEMENTS
 
-PART_PROMPT_V3 = """
-당신은 50~80대 한국 여성을 위한 유튜브 오디오 드라마 대본 작가입니다.
+# ━━ 프롬프트 섹션 ━━
+# 기본 레이아웃(PART_PROMPT_V3)과 prefix cache 레이아웃은 아래 섹션을 순서만 달리해 조립합니다.
+# 규칙 문구는 여기 한 곳에서만 수정하세요.
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_PERSONA = "당신은 50~80대 한국 여성을 위한 유튜브 오디오 드라마 대본 작가입니다."
+
+_TARGET_SECTION = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【작성 대상】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-Part {part_number}: {part_title}
+Part {part_number}: {part_title}"""
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_DESIGN_SECTION = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【설계 문서】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -36,26 +39,22 @@ Part {part_number}: {part_title}
 ⚠️ 위 4가지 기준은 절대 변경 금지입니다. 전 파트에서 동일하게 유지됩니다.
 
 【전체 갈등 곡선 (Global Conflict Arc)】
-{global_conflict_arc}
-
-현재 위치: {current_arc_stage}
+{global_conflict_arc}"""
 
-【감정 고정점 (Emotional Anchors)】
-{emotional_anchors}
+_EMOTIONAL_ANCHORS = """【감정 고정점 (Emotional Anchors)】
+{emotional_anchors}"""
 
-현재 Part의 지배 감정: {current_emotion}
+_EMOTION_RULE = """⚠️ 이 Part는 **{current_emotion}**이 지배해야 합니다. 다른 감정으로 벗어나지 마세요."""
 
-⚠️ 이 Part는 **{current_emotion}**이 지배해야 합니다. 다른 감정으로 벗어나지 마세요.
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_CHARACTERS_SECTION = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【캐릭터 설계】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 {characters}
 
-⚠️ 각 캐릭터의 **핵심 목표(key_motivation)**는 전 파트 동일합니다. 변경 금지.
+⚠️ 각 캐릭터의 **핵심 목표(key_motivation)**는 전 파트 동일합니다. 변경 금지."""
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_PART_GOAL_SECTION = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【이 Part의 스토리 목표】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -63,9 +62,9 @@ Part {part_number}: {part_title}
 
 시간 범위: {time_range_minutes_start}분 ~ {time_range_minutes_end}분
 분량 목표: {word_count_start:,}~{word_count_end:,}자
-갈등 강도: {conflict_intensity}/10
+갈등 강도: {conflict_intensity}/10"""
 
-【이 Part에서 반드시 포함할 요소 (Must Include)】
+_PART_REQUIREMENTS = """【이 Part에서 반드시 포함할 요소 (Must Include)】
 {must_include}
 
 【이 Part에서 반드시 피해야 할 것 (Must Avoid)】
@@ -81,9 +80,9 @@ Part {part_number}: {part_title}
 {key_revelations}
 
 【이 Part의 엔딩 훅】
-{ending_hook}
+{ending_hook}"""
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_THEME_SECTION = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【상징과 테마】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -92,13 +91,14 @@ Part {part_number}: {part_title}
 상징적 오브젝트:
 {symbolic_objects}
 
-⚠️ 상징의 의미는 일관되게 유지하세요. 함부로 변경하지 마세요.
+⚠️ 상징의 의미는 일관되게 유지하세요. 함부로 변경하지 마세요."""
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_PREVIOUS_CONTEXT_SECTION = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 {previous_context}
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# {climax_dialogue_rule}: Part별 대사 규칙 (공통 지시문에서는 빈 문자열)
+_STYLE_SECTION = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【필수 문체 규칙】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -182,17 +182,17 @@ Part {part_number}: {part_title}
 
 시간: "그날 밤", "며칠 후", "다음날 아침"
 공간: "한편", "~로 향했다", "~에 도착했습니다"
-회상: "30년 전, ~였습니다", "그때를 떠올렸어요"
+회상: "30년 전, ~였습니다", "그때를 떠올렸어요\""""
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_FORBIDDEN_SECTION = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【절대 금지 사항 (Core Forbidden)】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 {core_forbidden}
 
-⚠️ 위 금지 사항 위반 시 전체 대본 재작성입니다.
+⚠️ 위 금지 사항 위반 시 전체 대본 재작성입니다."""
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_LOOP_SECTION = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【루프 방지 규칙】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -203,23 +203,23 @@ Part {part_number}: {part_title}
 5. 중국어 단어 사용 절대 금지
 6. 영어 단어는 최소화 (50-80대가 모르는 단어 금지)
 
-⚠️ 중국어가 섞이면 즉시 작성 중단하고 다시 시작하세요.
+⚠️ 중국어가 섞이면 즉시 작성 중단하고 다시 시작하세요."""
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# {length_rule}: 분량 줄 (공통 지시문에서는 빈 문자열, 분량은 Part별 내용에 표시)
+_OUTPUT_SECTION = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【출력 형식】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-- 순수 텍스트만 출력하세요
-- {word_count_start:,}~{word_count_end:,}자 분량
+- 순수 텍스트만 출력하세요{length_rule}
 - JSON 출력 금지
 - 코드블록 금지
 - 설명 금지
 - 중국어 금지
-- 대본 텍스트만 출력
+- 대본 텍스트만 출력"""
 
-{ending_note}
+_LENGTH_RULE = "\n- {word_count_start:,}~{word_count_end:,}자 분량"
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_CHECKLIST_SECTION = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【마지막 체크리스트】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -242,14 +242,284 @@ Part {part_number}: {part_title}
 ✓ Open Threads는 남겨두었는가?
 ✓ Ending Hook으로 다음 Part에 대한 기대감을 심었는가?
 
-지금 바로 Part {part_number} 대본을 작성하세요.
+지금 바로 Part {part_number} 대본을 작성하세요."""
+
+
+def _join_sections(*sections: str) -> str:
+    """섹션 사이에 빈 줄 하나를 두고 이어 붙입니다."""
+    return "\n" + "\n\n".join(sections) + "\n"
+
+
+PART_PROMPT_V3 = _join_sections(
+    _PERSONA,
+    _TARGET_SECTION,
+    _DESIGN_SECTION,
+    "현재 위치: {current_arc_stage}",
+    _EMOTIONAL_ANCHORS,
+    "현재 Part의 지배 감정: {current_emotion}",
+    _EMOTION_RULE,
+    _CHARACTERS_SECTION,
+    _PART_GOAL_SECTION,
+    _PART_REQUIREMENTS,
+    _THEME_SECTION,
+    _PREVIOUS_CONTEXT_SECTION,
+    _STYLE_SECTION,
+    _FORBIDDEN_SECTION,
+    _LOOP_SECTION,
+    _OUTPUT_SECTION.format(length_rule=_LENGTH_RULE),
+    "{ending_note}",
+    _CHECKLIST_SECTION,
+)
+
+
+# ━━ Prefix cache 레이아웃 ━━
+# vLLM automatic prefix caching은 프롬프트 앞부분이 토큰 단위로 동일할 때만 prefill을 재사용합니다.
+# 공통 지시문(모든 제목/Part 동일) → 설계 문서(같은 제목의 Part 1-4 동일) → Part별 내용 순서로 배치합니다.
+# 공통 지시문은 format하지 않고 그대로 쓰므로 치환 자리를 미리 비워 둡니다
+PART_PROMPT_V3_SHARED = _join_sections(
+    _PERSONA,
+    _STYLE_SECTION.format(climax_dialogue_rule=""),
+    _LOOP_SECTION,
+    _OUTPUT_SECTION.format(length_rule=""),
+)
+
+PART_PROMPT_V3_OUTLINE = _join_sections(
+    _DESIGN_SECTION,
+    _EMOTIONAL_ANCHORS,
+    _CHARACTERS_SECTION,
+    _THEME_SECTION,
+    _FORBIDDEN_SECTION,
+)
+
+PART_PROMPT_V3_PART = _join_sections(
+    _TARGET_SECTION,
+    "현재 갈등 위치: {current_arc_stage}",
+    _EMOTION_RULE,
+    _PART_GOAL_SECTION + "{climax_dialogue_rule}",
+    _PART_REQUIREMENTS,
+    _PREVIOUS_CONTEXT_SECTION,
+    "【분량】\n{word_count_start:,}~{word_count_end:,}자 분량의 순수 대본 텍스트",
+    "{ending_note}",
+    _CHECKLIST_SECTION,
+)
+
+
+PART_CONTINUATION_INSTRUCTION = """
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+【이어쓰기】
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Part {part_number} 대본이 {current_length:,}자에서 끊겼습니다. (분량 목표: {word_count_start:,}~{word_count_end:,}자)
+아래 마지막 부분의 바로 다음 문장부터 이어서 약 {missing_chars:,}자를 더 작성하세요.
+
+- 이미 쓴 내용을 반복하거나 요약하지 마세요
+- 아직 다루지 않은 Must Include / Must Resolve 항목을 이어서 진행하세요
+- 이 Part의 엔딩 훅으로 자연스럽게 마무리하세요
+- 순수 대본 텍스트만 출력하세요
+
+【지금까지 작성된 대본 (마지막 부분)】
+"""
+
+PART_SEAM_REPAIR_PROMPT = """
+당신은 한국 시니어 대상 오디오 드라마의 대본 편집자입니다.
+
+드라마 「{title}」의 Part {part_number}은 Part {previous_number}과 동시에 작성되어,
+Part {previous_number}의 실제 마지막 장면을 모른 채 시작했습니다.
+Part {part_number}의 도입부만 다시 써서 Part {previous_number}의 끝에서 자연스럽게 이어지게 하세요.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+【Part {previous_number} 마지막 부분 (수정 금지)】
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{previous_ending}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+【Part {part_number} 도입부 (다시 쓸 부분)】
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{opening}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+【도입부 바로 다음 내용 (수정 금지)】
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{following}
+
+【규칙】
+- 도입부의 사건과 정보는 그대로 두고, 이전 Part 끝의 장소 / 시간 / 인물 상태 / 감정에 맞게 연결만 고치세요
+- 이전 Part의 마지막 장면을 반복하거나 요약하지 마세요
+- 도입부 바로 다음 내용으로 자연스럽게 넘어가도록 마무리하세요
+- 분량은 원래 도입부({opening_length:,}자)와 비슷하게 유지하세요
+- 대사 비율 5~10%, 중국어 혼입 금지
+- 다시 쓴 도입부 대본 텍스트만 출력하세요 (설명 / 제목 / 따옴표 블록 금지)
 """
 
 
+def get_word_count_range(outline_data: Dict[str, Any], part_number: int) -> Tuple[int, int]:
+    """
+    Outline part_breakdown의 Part 분량 목표 (word_count_range)
+
+    Args:
+        outline_data (dict): outline_v2_final.json 데이터
+        part_number (int): Part 번호 (1-4)
+
+    Returns:
+        tuple: (word_count_start, word_count_end), 없으면 (12000, 13000)
+    """
+    for part in outline_data.get("part_breakdown", []):
+        if part.get("part") == part_number:
+            word_count_range = part.get("word_count_range", [12000, 13000])
+            if isinstance(word_count_range, list) and len(word_count_range) >= 2:
+                return word_count_range[0], word_count_range[1]
+            break
+
+    return 12000, 13000
+
+
+def get_part_length_target(part_number: int) -> Tuple[int, int]:
+    """
+    validate_part_text 기준 Part 분량 (최소, 최대)
+
+    Args:
+        part_number (int): Part 번호 (1-4)
+
+    Returns:
+        tuple: (target_min, target_max)
+    """
+    if part_number < 4:
+        return 12000, 13000
+    return 11500, 12500
+
+
+def generate_part_continuation_instruction(
+    part_number: int,
+    outline_data: Dict[str, Any],
+    current_length: int,
+    target_length: Optional[int] = None
+) -> str:
+    """
+    분량이 부족한 Part의 이어쓰기 지시문을 생성합니다.
+
+    LLMEngine.continue_text에서 원래 Part 프롬프트와 기존 대본 마지막 부분 사이에 삽입됩니다.
+    요청 분량은 continue_text의 max_chars와 같은 목표 길이 기준이어야 합니다.
+
+    Args:
+        part_number (int): Part 번호 (1-4)
+        outline_data (dict): outline_v2_final.json 데이터
+        current_length (int): 현재 대본 길이 (자)
+        target_length (int, optional): 이어쓰기 후 목표 길이 (기본: word_count_range[1])
+
+    Returns:
+        str: 이어쓰기 지시문
+    """
+    word_count_start, word_count_end = get_word_count_range(outline_data, part_number)
+    if target_length is None:
+        target_length = word_count_end
+
+    return PART_CONTINUATION_INSTRUCTION.format(
+        part_number=part_number,
+        current_length=current_length,
+        word_count_start=word_count_start,
+        word_count_end=word_count_end,
+        missing_chars=max(target_length - current_length, 0)
+    ).strip()
+
+
+def split_part_opening(
+    part_text: str,
+    max_paragraphs: int = 3,
+    max_chars: int = 1500
+) -> Tuple[str, str]:
+    """
+    Part 대본을 도입부(앞 문단 몇 개)와 나머지로 나눕니다. (seam repair 대상 선택)
+
+    빈 줄로 구분된 문단 기준이며, 빈 줄이 없으면 줄 단위로 나눕니다.
+    첫 문단이 max_chars보다 길면 max_chars 안의 마지막 문장 끝에서 자릅니다.
+
+    Args:
+        part_text (str): Part 대본
+        max_paragraphs (int): 도입부 최대 문단 수
+        max_chars (int): 도입부 최대 길이 (자)
+
+    Returns:
+        tuple: (opening, rest) - opening + rest == part_text
+    """
+    separator = r'\n\s*\n' if re.search(r'\n\s*\n', part_text) else r'\n'
+    boundaries = [match.end() for match in re.finditer(separator, part_text)]
+
+    end = 0
+    for count, boundary in enumerate(boundaries, start=1):
+        if boundary > max_chars or count > max_paragraphs:
+            break
+        end = boundary
+
+    if end == 0:
+        # 첫 문단이 너무 길거나 문단 구분이 없음 → 문장 끝 기준
+        head = part_text[:max_chars]
+        sentence_ends = [match.end() for match in re.finditer(r'[\.?!]["\']?\s+', head)]
+        end = sentence_ends[-1] if sentence_ends else len(head)
+
+    return part_text[:end], part_text[end:]
+
+
+def generate_seam_repair_prompt(
+    part_number: int,
+    outline_data: Dict[str, Any],
+    previous_ending: str,
+    opening: str,
+    following: str
+) -> str:
+    """
+    병렬 생성된 Part의 도입부를 실제 이전 Part 끝에 맞춰 다시 쓰는 프롬프트를 생성합니다.
+
+    Args:
+        part_number (int): Part 번호 (2-4)
+        outline_data (dict): outline_v2_final.json 데이터
+        previous_ending (str): 이전 Part 대본의 마지막 부분
+        opening (str): 다시 쓸 도입부 (split_part_opening 결과)
+        following (str): 도입부 바로 다음 내용 일부
+
+    Returns:
+        str: seam repair 프롬프트
+    """
+    return PART_SEAM_REPAIR_PROMPT.format(
+        title=outline_data.get("meta", {}).get("title", "제목 없음"),
+        part_number=part_number,
+        previous_number=part_number - 1,
+        previous_ending=previous_ending.strip(),
+        opening=opening.strip(),
+        following=following.strip() or "(없음)",
+        opening_length=len(opening.strip())
+    ).strip()
+
+
+def validate_seam_repair(opening: str, repaired: str) -> Tuple[bool, str]:
+    """
+    seam repair 결과 검증 (실패 시 원래 도입부 유지)
+
+    Args:
+        opening (str): 원래 도입부
+        repaired (str): 다시 쓴 도입부
+
+    Returns:
+        tuple: (통과 여부, 실패 사유)
+    """
+    repaired = repaired.strip()
+    if not repaired:
+        return False, "empty"
+
+    ratio = len(repaired) / max(len(opening.strip()), 1)
+    if ratio < 0.5 or ratio > 1.6:
+        return False, f"length ratio {ratio:.2f}"
+
+    if any('\u4e00' <= c <= '\u9fff' for c in repaired):
+        return False, "chinese"
+
+    return True, ""
+
+
 def generate_part_v3_prompt(
     part_number: int,
     outline_data: Dict[str, Any],
-    context: Optional[Dict[str, Any]] = None
+    context: Optional[Dict[str, Any]] = None,
+    prefix_cache_layout: bool = False
 ) -> str:
     """
     Part V3 프롬프트를 생성합니다. (안정화 로직 강화)
@@ -258,6 +528,8 @@ def generate_part_v3_prompt(
         part_number (int): Part 번호 (1-4)
         outline_data (dict): outline_v2_final.json 데이터 (validate_outline 통과한 것)
         context (dict, optional): 이전 Part의 context (Part 2-4에서 사용)
+        prefix_cache_layout (bool): True면 공통 지시문 → 설계 문서 → Part별 내용 순서로 조립
+            (Part 1-4 및 다른 제목 간 vLLM prefix cache 재사용)
 
     Returns:
         str: 완성된 프롬프트
@@ -356,13 +628,7 @@ def generate_part_v3_prompt(
         time_range_start = (part_number-1)*30
         time_range_end = part_number*30
 
-    word_count_range = current_part.get("word_count_range", [12000, 13000])
-    if isinstance(word_count_range, list) and len(word_count_range) >= 2:
-        word_count_start = word_count_range[0]
-        word_count_end = word_count_range[1]
-    else:
-        word_count_start = 12000
-        word_count_end = 13000
+    word_count_start, word_count_end = get_word_count_range(outline_data, part_number)
 
     conflict_intensity = current_part.get("conflict_intensity", 5)
 
@@ -436,7 +702,7 @@ Hook(180초 예고편) 직후 본편이 시작되는 것으로 자연스럽게 
 """
 
     # 12. 프롬프트 조립
-    prompt = PART_PROMPT_V3.format(
+    fields = dict(
         part_number=part_number,
         part_title=part_title,
         title=title,
@@ -469,7 +735,14 @@ Hook(180초 예고편) 직후 본편이 시작되는 것으로 자연스럽게 
         ending_note=ending_note
     )
 
-    return prompt
+    if prefix_cache_layout:
+        return (
+            PART_PROMPT_V3_SHARED
+            + PART_PROMPT_V3_OUTLINE.format(**fields)
+            + PART_PROMPT_V3_PART.format(**fields)
+        )
+
+    return PART_PROMPT_V3.format(**fields)
 
 
 def validate_part_text(part_text: str, part_number: int) -> tuple:
@@ -514,8 +787,7 @@ def validate_part_text(part_text: str, part_number: int) -> tuple:
 
     # 4. 길이 체크
     stats['length'] = total_chars
-    target_min = 12000 if part_number < 4 else 11500
-    target_max = 13000 if part_number < 4 else 12500
+    target_min, target_max = get_part_length_target(part_number)
 
     if total_chars < target_min:
         warnings.append(f"분량이 {total_chars}자로 부족합니다 (최소: {target_min}자)")
@@ -533,3 +805,22 @@ def validate_part_text(part_text: str, part_number: int) -> tuple:
     is_valid = chinese_chars == 0 and dialogue_ratio <= 15 and repetition_ratio <= 15
 
     return is_valid, warnings, stats
+
+
+def score_part_text(part_text: str, part_number: int) -> tuple:
+    """
+    n-best 후보 비교용 Part 점수 (클수록 좋음)
+
+    validate_part_text 기준: 검증 통과 > 경고 수 적음 > 목표 분량에 가까움
+
+    Args:
+        part_text (str): 후보 Part 텍스트
+        part_number (int): Part 번호
+
+    Returns:
+        tuple: 비교 가능한 점수
+    """
+    is_valid, warnings, stats = validate_part_text(part_text, part_number)
+    _, target_max = get_part_length_target(part_number)
+
+    return (is_valid, -len(warnings), min(stats.get('length', 0), target_max))
@@ -0,0 +1,349 @@
+"""
+AutoDrama 상주 서버
+모델(LLM / 이미지 / TTS / Whisper)을 프로세스 시작 시 한 번만 로드해 두고,
+로컬 HTTP(TCP 또는 Unix socket)로 제목 작업을 받아 큐 순서대로 처리
+
+- POST /jobs          {"title": "...", "resume": false} 또는 {"titles": [...]} → 작업 등록
+- GET  /jobs          전체 작업 상태
+- GET  /jobs/<id>     작업 상태 + 산출물 경로 (output_dir / hook_video / main_video / metadata)
+- GET  /health        로드된 모델 / 대기 중인 작업 수
+
+실행:
+    python server.py                       # 127.0.0.1:8765
+    python server.py --socket /tmp/autodrama.sock
+"""
+
+import argparse
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Callable, List, Optional
+
+
+class Job:
+    """제목 하나의 파이프라인 실행 작업"""
+
+    def __init__(self, title: str, resume: bool = False):
+        """
+        Args:
+            title: 드라마 제목
+            resume: run_manifest.json 기준으로 변경되지 않은 Phase 건너뛰기 여부
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.title = title
+        self.resume = resume
+        self.status = "queued"  # queued → running → completed / failed
+        self.created_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.artifacts: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "resume": self.resume,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "artifacts": self.artifacts,
+            "error": self.error
+        }
+
+
+def run_pipeline(title: str, resume: bool = False) -> Dict[str, Any]:
+    """기본 작업 실행 함수: main.main() (모델 싱글톤은 프로세스 안에서 재사용됨)"""
+    from main import main
+    return main(title, resume=resume)
+
+
+class JobRunner:
+    """
+    작업 큐 + 단일 워커 스레드
+
+    모델 싱글톤을 공유하므로 작업은 한 번에 하나씩 실행합니다.
+    (한 작업 안의 Phase 병렬화는 PhaseScheduler가 담당)
+    """
+
+    def __init__(self, run_fn: Callable[[str, bool], Dict[str, Any]] = run_pipeline):
+        """
+        Args:
+            run_fn: (title, resume) → metadata dict 를 반환하는 실행 함수
+        """
+        self.run_fn = run_fn
+        self.jobs: Dict[str, Job] = {}
+        self._order: List[str] = []
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._work, name="job-worker", daemon=True)
+            self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """현재 작업이 끝나면 워커 종료 (대기 중인 작업은 실행하지 않음)"""
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(timeout)
+            self._worker = None
+
+    def submit(self, title: str, resume: bool = False) -> Job:
+        """
+        작업 등록
+
+        Raises:
+            ValueError: 제목이 비어 있는 경우
+        """
+        title = (title or "").strip()
+        if not title:
+            raise ValueError("title is required")
+
+        job = Job(title, resume=resume)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._order.append(job.id)
+        self._queue.put(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return [self.jobs[job_id] for job_id in self._order]
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for job in self.jobs.values() if job.status == "queued")
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            with self._lock:
+                job.status = "running"
+                job.started_at = datetime.now().isoformat()
+            print(f"▶ Job {job.id}: {job.title}")
+
+            try:
+                metadata = self.run_fn(job.title, job.resume) or {}
+                artifacts = {
+                    key: metadata.get(key)
+                    for key in ("output_dir", "hook_video", "main_video")
+                }
+                if metadata.get("output_dir"):
+                    artifacts["metadata"] = os.path.join(metadata["output_dir"], "metadata.json")
+                with self._lock:
+                    job.artifacts = artifacts
+                    job.status = "completed"
+                print(f"✓ Job {job.id} completed: {artifacts.get('main_video')}")
+            except Exception as e:
+                traceback.print_exc()
+                with self._lock:
+                    job.error = f"{type(e).__name__}: {e}"
+                    job.status = "failed"
+                print(f"✗ Job {job.id} failed: {e}")
+            finally:
+                with self._lock:
+                    job.finished_at = datetime.now().isoformat()
+
+
+def warm_up(config: Dict[str, Any]) -> Dict[str, float]:
+    """
+    모델 싱글톤 미리 로드 (이후 모든 작업이 재사용)
+
+    Args:
+        config: 설정 dict
+
+    Returns:
+        {모델 이름: 로드 시간(초)}
+    """
+    from pipeline.llm import get_llm_engine
+    from pipeline.image import get_image_generator
+    from pipeline.tts import get_tts_engine
+    from pipeline.subtitle import get_whisper_model
+
+    models = config.get("models", {}) or {}
+    whisper_model = (config.get("whisper", {}) or {}).get("model") or models.get("whisper", "large-v3")
+    loaders = [
+        ("llm", lambda: get_llm_engine(config_path="config.yaml")),
+        ("image", lambda: get_image_generator()),
+        ("tts", lambda: get_tts_engine(model_name=config["tts"]["model"])),
+        ("whisper", lambda: get_whisper_model(model_name=whisper_model)),
+    ]
+
+    load_times = {}
+    for name, loader in loaders:
+        started = time.perf_counter()
+        loader()
+        load_times[name] = round(time.perf_counter() - started, 1)
+        print(f"✓ {name} model loaded in {load_times[name]}s")
+    return load_times
+
+
+def make_handler(runner: JobRunner, models: Optional[Dict[str, float]] = None):
+    """JobRunner에 연결된 HTTP 요청 핸들러 클래스 생성"""
+
+    class JobHandler(BaseHTTPRequestHandler):
+        def address_string(self) -> str:
+            # Unix socket은 client_address가 문자열
+            if isinstance(self.client_address, tuple):
+                return str(self.client_address[0])
+            return "unix"
+
+        def log_message(self, format, *args):
+            print(f"[server] {self.address_string()} {format % args}")
+
+        def _send_json(self, status: int, payload: Any) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = self.path.rstrip("/")
+            if path == "/health":
+                self._send_json(200, {
+                    "status": "ok",
+                    "models": models or {},
+                    "queued": runner.pending()
+                })
+            elif path == "/jobs":
+                self._send_json(200, {"jobs": [job.to_dict() for job in runner.list()]})
+            elif path.startswith("/jobs/"):
+                job = runner.get(path[len("/jobs/"):])
+                if job is None:
+                    self._send_json(404, {"error": "job not found"})
+                else:
+                    self._send_json(200, job.to_dict())
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/jobs":
+                self._send_json(404, {"error": "not found"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                titles = payload.get("titles") or [payload.get("title")]
+                resume = bool(payload.get("resume", False))
+                jobs = [runner.submit(title, resume=resume) for title in titles]
+            except (ValueError, AttributeError, TypeError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+
+            self._send_json(202, {"jobs": [job.to_dict() for job in jobs]})
+
+    return JobHandler
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket 위의 HTTP 서버 (같은 호스트의 클라이언트만 접근)"""
+
+    daemon_threads = True
+
+
+def create_server(
+    runner: JobRunner,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+    models: Optional[Dict[str, float]] = None
+) -> socketserver.BaseServer:
+    """
+    HTTP 서버 생성 (serve_forever() 호출 전)
+
+    Args:
+        runner: 작업 실행기
+        host: TCP 바인드 주소
+        port: TCP 포트 (0이면 임의 포트)
+        socket_path: 지정 시 TCP 대신 Unix socket 사용
+        models: /health에 표시할 로드된 모델 정보
+
+    Returns:
+        서버 인스턴스
+    """
+    handler = make_handler(runner, models)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        return UnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+    warmup: bool = True
+) -> None:
+    """
+    모델 로드 → 작업 워커 시작 → HTTP 서버 실행 (Ctrl+C로 종료)
+
+    Args:
+        host: TCP 바인드 주소
+        port: TCP 포트
+        socket_path: 지정 시 Unix socket 사용
+        warmup: 시작 시 모델 미리 로드 여부 (False면 첫 작업에서 로드)
+    """
+    from main import load_config
+
+    config = load_config()
+    models = warm_up(config) if warmup else {}
+
+    runner = JobRunner()
+    runner.start()
+
+    server = create_server(runner, host=host, port=port, socket_path=socket_path, models=models)
+    address = socket_path or f"http://{host}:{server.server_address[1]}"
+    print(f"✓ AutoDrama server listening on {address}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        runner.stop(timeout=0)
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AutoDrama 상주 서버 (모델을 한 번만 로드)")
+    parser.add_argument("--host", default=None, help="TCP 바인드 주소 (기본: config server.host)")
+    parser.add_argument("--port", type=int, default=None, help="TCP 포트 (기본: config server.port)")
+    parser.add_argument("--socket", default=None, help="Unix socket 경로 (지정 시 TCP 대신 사용)")
+    parser.add_argument("--no-warmup", action="store_true", help="시작 시 모델을 미리 로드하지 않음")
+    args = parser.parse_args()
+
+    import yaml
+    server_config = {}
+    if os.path.exists("config.yaml"):
+        with open("config.yaml", "r", encoding="utf-8") as f:
+            server_config = (yaml.safe_load(f) or {}).get("server", {}) or {}
+
+    serve(
+        host=args.host or server_config.get("host", "127.0.0.1"),
+        port=args.port if args.port is not None else server_config.get("port", 8765),
+        socket_path=args.socket or server_config.get("socket"),
+        warmup=not args.no_warmup and server_config.get("warmup", True)
+    )
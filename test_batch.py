@@ -0,0 +1,209 @@
+"""
+다중 제목 배치 실행 테스트 스크립트 (GPU 불필요)
+BatchingBackend 요청 병합 / window 만료 / 오류 전달 + run_batch의 Phase 단위 동시 진행과 리포트
+/ 배치 중 LLM GPU 고정(residency가 LLM을 내리지 않음) 검증
+
+실행: python test_batch.py  (또는 pytest test_batch.py)
+"""
+
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from batch import read_titles, run_batch
+from pipeline.llm import LLMEngine
+from pipeline.llm_backends import BatchingBackend, Completion, LLMBackend
+from pipeline.residency import ResidencyManager, ResidentModel
+
+
+class CountingBackend(LLMBackend):
+    """generate_many 호출마다 프롬프트 목록을 기록하는 가짜 백엔드"""
+
+    name = "counting"
+
+    def __init__(self, delay_sec: float = 0.0, fail: bool = False):
+        super().__init__(model_id="counting")
+        self.calls = []
+        self.delay_sec = delay_sec
+        self.fail = fail
+
+    def generate_many(self, prompts, params_list, phases=None):
+        self.calls.append(list(prompts))
+        time.sleep(self.delay_sec)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return [
+            [Completion(f"응답: {prompt} " + "내용입니다. " * 10, prompt_tokens=10, output_tokens=20,
+                        finish_reason="stop", ttft_sec=0.0, latency_sec=0.1)]
+            for prompt in prompts
+        ]
+
+
+def _call_concurrently(fn, args_list):
+    results = [None] * len(args_list)
+    errors = [None] * len(args_list)
+
+    def worker(i):
+        try:
+            results[i] = fn(*args_list[i])
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(args_list))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results, errors
+
+
+def test_concurrent_requests_merge_into_one_batch():
+    inner = CountingBackend()
+    backend = BatchingBackend(inner, window_sec=5.0, active=3)
+
+    results, errors = _call_concurrently(
+        lambda prompt: backend.generate_many([prompt], [{}])[0][0].text,
+        [(f"제목{i}",) for i in range(3)]
+    )
+    assert errors == [None] * 3
+    assert len(inner.calls) == 1 and sorted(inner.calls[0]) == ["제목0", "제목1", "제목2"]
+    assert [text.split()[1] for text in results] == ["제목0", "제목1", "제목2"]
+    assert backend.batches[0]["requests"] == 3
+
+
+def test_window_flushes_partial_batch_and_max_batch():
+    inner = CountingBackend()
+    backend = BatchingBackend(inner, window_sec=0.05, active=4)
+    started = time.perf_counter()
+    assert backend.generate_many(["혼자"], [{}])[0][0].text.startswith("응답: 혼자")
+    assert 0.04 <= time.perf_counter() - started < 2
+
+    # max_batch 초과분은 다음 배치로
+    inner = CountingBackend(delay_sec=0.05)
+    backend = BatchingBackend(inner, window_sec=5.0, max_batch=2, active=3)
+    _, errors = _call_concurrently(lambda p: backend.generate_many([p], [{}]), [("a",), ("b",), ("c",)])
+    assert errors == [None] * 3
+    assert sorted(len(call) for call in inner.calls) == [1, 2]
+
+
+def test_backend_error_reaches_every_caller():
+    backend = BatchingBackend(CountingBackend(fail=True), window_sec=5.0, active=2)
+    _, errors = _call_concurrently(lambda p: backend.generate_many([p], [{}]), [("a",), ("b",)])
+    assert all(isinstance(e, RuntimeError) for e in errors)
+
+
+def test_run_batch_advances_titles_in_lockstep():
+    """제목 3개의 Outline → Hook → Parts 호출이 Phase마다 하나의 배치로 생성됨"""
+    inner = CountingBackend(delay_sec=0.01)
+    engine = LLMEngine(config_path="__missing__.yaml", backend=inner)
+    engine.config['llm_streaming'] = {'enabled': True}  # 스트리밍 호출도 배치에 합류
+
+    def fake_title(title, resume, semaphores, residency):
+        if title == "실패":
+            engine.call_llm_text(f"{title} outline", "outline", label="outline")
+            raise ValueError("outline invalid")
+        for phase in ["outline", "hook", "parts"]:
+            engine.call_llm_text(f"{title} {phase}", phase, label=phase)
+        # 공유 세마포어는 제목 간 같은 객체
+        assert set(semaphores) == {"gpu", "ffmpeg"}
+        return {"output_dir": f"/out/{title}", "main_video": f"/out/{title}/main_video.mp4"}
+
+    config = {"batch": {"window_sec": 2.0}, "scheduler": {"resources": {"llm": 1, "gpu": 2, "ffmpeg": 2}}}
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = str(Path(tmp) / "batch_report.json")
+        report = run_batch(["A", "B", "실패"], config, run_fn=fake_title, engine=engine, report_path=report_path)
+
+        assert [sorted(call) for call in inner.calls] == [
+            ["A outline", "B outline", "실패 outline"],
+            ["A hook", "B hook"],
+            ["A parts", "B parts"],
+        ]
+        assert report["completed"] == 2 and report["failed"] == 1
+        assert report["titles"][2]["error"] == "ValueError: outline invalid"
+        assert report["llm_batches"]["count"] == 3 and report["llm_batches"]["max_prompts"] == 3
+        assert report["llm_output_tokens"] == 20 * 7
+        assert report["aggregate_tok_per_sec"] > 0
+        assert all(result["latency_sec"] > 0 for result in report["titles"])
+
+        saved = json.loads(Path(report_path).read_text(encoding="utf-8"))
+        assert saved["titles"][0]["main_video"] == "/out/A/main_video.mp4"
+        assert Path(tmp, "batch_report.llm_calls.jsonl").exists()
+
+    # 배치 종료 후 원래 백엔드로 복구
+    assert engine.backend is inner
+
+
+def test_run_batch_pins_llm_in_residency():
+    """자리가 부족해도 배치 중에는 LLM 대신 다른 모델을 내리고, LLM은 배치가 끝난 뒤에만 언로드"""
+    inner = CountingBackend()
+    engine = LLMEngine(config_path="__missing__.yaml", backend=inner)
+    log = []
+
+    def fake_model(name, gpu_mb):
+        return ResidentModel(
+            name, gpu_mb,
+            load=lambda: log.append(f"load:{name}"),
+            unload=lambda: log.append(f"unload:{name}")
+        )
+
+    residency = ResidencyManager(gpu_budget_mb=60000, log=lambda message: None)
+    for name, gpu_mb in [("llm", 44000), ("image", 10000), ("tts", 10000)]:
+        residency.register(fake_model(name, gpu_mb))
+
+    def fake_title(title, resume, semaphores, shared_residency):
+        assert shared_residency is residency
+        for models in (["llm"], ["image"], ["tts"], ["llm"]):
+            shared_residency.acquire(models, upcoming=["image", "tts"])
+            if models == ["llm"]:
+                engine.call_llm_text(f"{title} {len(log)}", "outline", label="outline")
+                # 배치 백엔드가 그대로 유지됨 (LLM이 닫히고 새 엔진이 만들어지지 않음)
+                assert isinstance(engine.backend, BatchingBackend)
+            shared_residency.release(models)
+        return {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = run_batch(
+            ["A", "B"], {"batch": {"window_sec": 0.05}}, run_fn=fake_title, engine=engine,
+            report_path=str(Path(tmp) / "batch_report.json"), residency=residency
+        )
+    assert report["completed"] == 2
+    # LLM은 한 번만 로드, 마지막 로드 이후(배치 종료 시 unload_all)에만 언로드
+    last_load = max(i for i, entry in enumerate(log) if entry.startswith("load:"))
+    assert log.count("load:llm") == 1 and log.count("unload:llm") == 1 and log.index("unload:llm") > last_load
+    assert "unload:image" in log[:last_load]  # 자리가 부족하면 image / tts가 번갈아 내려감
+    assert report["llm_telemetry"]["outline"]["calls"] == 4
+
+    # LLM을 고정하면 다른 모델이 들어갈 자리가 없는 설정은 시작 전에 거부
+    small = ResidencyManager(gpu_budget_mb=50000, log=lambda message: None)
+    small.register(fake_model("llm", 44000))
+    small.register(fake_model("image", 10000))
+    try:
+        run_batch(["A"], {}, run_fn=fake_title, engine=engine, residency=small)
+        assert False, "ValueError expected"
+    except ValueError as e:
+        assert "image" in str(e)
+    assert engine.backend is inner and small.models["llm"].state == "unloaded"
+
+
+def test_read_titles():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "titles.txt"
+        path.write_text('할머니의 비밀 일기장\n\n"따옴표 제목"\n{"title": "객체 제목", "priority": 1}\n', encoding="utf-8")
+        assert read_titles(str(path)) == ["할머니의 비밀 일기장", "따옴표 제목", "객체 제목"]
+
+
+if __name__ == "__main__":
+    tests = [
+        test_concurrent_requests_merge_into_one_batch,
+        test_window_flushes_partial_batch_and_max_batch,
+        test_backend_error_reaches_every_caller,
+        test_run_batch_advances_titles_in_lockstep,
+        test_run_batch_pins_llm_in_residency,
+        test_read_titles,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
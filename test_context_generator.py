@@ -0,0 +1,59 @@
+"""
+Context generator 테스트 스크립트 (GPU 불필요)
+Part 발췌(create_part_excerpt) 시작~결말 보존 + Main 이미지 프롬프트 context 한도 검증
+
+실행: python test_context_generator.py  (또는 pytest test_context_generator.py)
+"""
+
+from pipeline.llm import TokenBudgetPlanner
+from pipeline.llm_backends import APPROX_CHARS_PER_TOKEN
+from prompts.main_images import generate_main_images_prompt
+from utils.context_generator import create_part_excerpt
+
+
+def _count_tokens(text: str) -> int:
+    return int(len(text) / APPROX_CHARS_PER_TOKEN) + 1
+
+
+def _part_text(part_number: int, sentences: int = 500) -> str:
+    """Part 하나 분량(약 1.2만 자)의 대본"""
+    return " ".join(
+        f"Part {part_number}의 {i}번째 장면에서 민서는 할머니의 일기장을 조용히 넘겨 보았습니다."
+        for i in range(1, sentences + 1)
+    )
+
+
+def test_part_excerpt_keeps_start_and_end():
+    text = " ".join(f"{i}번째 문장입니다." for i in range(1, 501))
+    excerpt = create_part_excerpt(text, max_chars=300)
+    assert len(excerpt) <= 300
+    assert excerpt.startswith("1번째 문장입니다.") and "번째" in excerpt.split()[-2]
+    assert int(excerpt.split()[-2].replace("번째", "")) > 400
+    assert create_part_excerpt("짧은 대본.", max_chars=300) == "짧은 대본."
+    assert create_part_excerpt("") == ""
+
+
+def test_main_images_prompt_fits_context():
+    parts = [_part_text(n) for n in range(1, 5)]
+    planner = TokenBudgetPlanner(max_model_len=12288, count_tokens=_count_tokens)
+
+    # Part 4개 원문은 context 한도 초과, Part별 발췌는 출력 토큰(Outline 설정 7000)까지 확보
+    try:
+        planner.plan(generate_main_images_prompt(*parts), 7000, label="main_images")
+        assert False, "ValueError expected"
+    except ValueError:
+        pass
+    excerpts = [create_part_excerpt(text) for text in parts]
+    assert all(len(excerpt) <= 1500 and excerpt.split(".")[0] in text for excerpt, text in zip(excerpts, parts))
+    assert planner.plan(generate_main_images_prompt(*excerpts), 7000, label="main_images") >= 4096
+
+
+if __name__ == "__main__":
+    tests = [
+        test_part_excerpt_keeps_start_and_end,
+        test_main_images_prompt_fits_context,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
@@ -0,0 +1,269 @@
+"""
+Dry-run 모드 테스트 스크립트 (GPU 불필요)
+stub 엔진 출력(PNG / WAV / 자막 / LLM 응답 검증 통과) + Part 프롬프트 레이아웃(기본 / prefix cache) 섹션 공유 + main(dry_run=True, profile=True) 전체 Phase 실행
++ 스트리밍 모드(Part 1-4 → parts_merge → main_video 이어붙이기) replay 백엔드 실행 + 타이밍 비교 검증
+
+FFmpeg 호출은 명령만 기록하고 결과 파일을 만드는 가짜 subprocess.run으로 대체합니다.
+(실제 FFmpeg으로 실행: python main.py "제목" --dry-run)
+
+실행: python test_dry_run.py  (또는 pytest test_dry_run.py)
+"""
+
+import copy
+import json
+import subprocess
+import tempfile
+import wave
+from collections import Counter
+from pathlib import Path
+
+import main as pipeline_main
+import pipeline.dry_run as dry_run
+from pipeline.dry_run import (
+    StubLLMBackend, StubImageGenerator, StubTranscriber, StubTTSEngine,
+    compare_timings, format_timing_table, wav_duration
+)
+from pipeline.llm import llm_engine_loaded
+from pipeline.llm_backends import RecordingBackend, ReplayBackend
+from prompts.outline_v2_final import generate_outline_prompt, validate_outline
+from prompts.part_v3 import (
+    PART_PROMPT_V3_SHARED, generate_part_v3_prompt, generate_seam_repair_prompt, get_part_length_target,
+    split_part_opening, validate_part_text, validate_seam_repair
+)
+from prompts.hook_images import generate_hook_images_prompt
+from prompts.main_images import generate_main_images_prompt
+from utils.context_generator import create_part_excerpt
+
+
+def test_stub_media_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        scenes = [{"index": 0, "prompt": "a"}, {"index": 1, "prompt": "b"}]
+        paths = StubImageGenerator(width=8, height=4).generate_from_json(scenes, tmp)
+        assert [Path(path).name for path in paths] == ["scene_000.png", "scene_001.png"]
+        data = Path(paths[0]).read_bytes()
+        assert data.startswith(b"\x89PNG\r\n\x1a\n") and data[16:24] == (8).to_bytes(4, "big") + (4).to_bytes(4, "big")
+        # 같은 프롬프트 → 같은 이미지
+        again = StubImageGenerator(width=8, height=4).generate_from_json(scenes[:1], f"{tmp}/again")
+        assert Path(again[0]).read_bytes() == data
+
+        audio = StubTTSEngine(chars_per_sec=100, sample_rate=8000).synthesize("가" * 250, f"{tmp}/a.wav")
+        assert abs(wav_duration(audio) - 2.5) < 0.01
+
+        segments, info = StubTranscriber(segment_sec=1.0).transcribe(audio)
+        assert [(s.start, s.end) for s in segments] == [(0.0, 1.0), (1.0, 2.0), (2.0, 2.5)]
+        assert info.language == "ko"
+
+
+def test_stub_llm_responses_pass_validation():
+    backend = StubLLMBackend()
+    outline = validate_outline(json.loads(backend.respond(generate_outline_prompt("할머니의 비밀 일기장"), "outline")))
+    assert outline["meta"]["title"] == "할머니의 비밀 일기장" and len(outline["part_breakdown"]) == 4
+
+    parts = []
+    for part_number in range(1, 5):
+        text = backend.respond(generate_part_v3_prompt(part_number, outline), "parts")
+        is_valid, warnings, stats = validate_part_text(text, part_number)
+        assert is_valid and not warnings, warnings
+        assert stats["length"] >= get_part_length_target(part_number)[0]
+        parts.append(text)
+
+    # 같은 프롬프트 → 같은 응답
+    assert backend.respond(generate_part_v3_prompt(1, outline), "parts") == parts[0]
+
+    opening, rest = split_part_opening(parts[1])
+    seam_prompt = generate_seam_repair_prompt(2, outline, parts[0][-1200:], opening, rest[:600])
+    assert validate_seam_repair(opening, backend.respond(seam_prompt, "seam_repair")) == (True, "")
+
+    hook_images = json.loads(backend.respond(generate_hook_images_prompt("훅 대본"), "outline"))
+    assert hook_images["total_scenes"] == 5 and all("duration" in scene for scene in hook_images["scenes"])
+
+    main_images = json.loads(backend.respond(
+        generate_main_images_prompt(*[create_part_excerpt(text) for text in parts]), "outline"
+    ))
+    assert [scene["part"] for scene in main_images["scenes"]].count("part4") == 3
+
+    completion = backend.generate_many(["x"], [{"n": 2}], phases=["hook"])[0]
+    assert len(completion) == 2 and completion[0].finish_reason == "stop"
+
+
+def test_part_prompt_layouts_share_sections():
+    backend = StubLLMBackend()
+    outline = validate_outline(json.loads(backend.respond(generate_outline_prompt("할머니의 비밀 일기장"), "outline")))
+    prefixes = set()
+    for part_number in range(1, 5):
+        classic = generate_part_v3_prompt(part_number, outline)
+        layout = generate_part_v3_prompt(part_number, outline, prefix_cache_layout=True)
+        # 같은 섹션 상수로 조립 → 규칙 문구는 동일, 레이아웃별 위치/분량 안내 줄만 다름
+        classic_only = Counter(classic.splitlines()) - Counter(layout.splitlines())
+        layout_only = Counter(layout.splitlines()) - Counter(classic.splitlines())
+        assert [line.split(":")[0] for line in classic_only][:2] == ["현재 위치", "현재 Part의 지배 감정"]
+        assert len(classic_only) == 3 and list(classic_only)[2].endswith("자 분량")
+        assert len(layout_only) == 3 and "【분량】" in layout_only
+        # Part 1-4 모두 공통 지시문 + 설계 문서까지 동일한 prefix
+        assert layout.startswith(PART_PROMPT_V3_SHARED)
+        prefixes.add(layout[:layout.index("【작성 대상】")])
+    assert len(prefixes) == 1
+
+
+def _fake_ffmpeg(calls):
+    """ffprobe → WAV 길이, 오디오 concat → WAV 병합, 영상 → 빈 파일 (concat 입력은 run.concats에 기록)"""
+    class Result:
+        returncode = 0
+        stderr = ""
+        stdout = ""
+
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        result = Result()
+        if cmd[0] == "ffprobe":
+            result.stdout = json.dumps({"format": {"duration": str(wav_duration(cmd[-1]))}})
+            return result
+        output = cmd[-2] if cmd[-1] == "-y" else cmd[-1]
+        if "concat" in cmd:
+            listing = Path(cmd[cmd.index("-i") + 1]).read_text()
+            inputs = [line.split("'")[1] for line in listing.splitlines() if line.startswith("file ")]
+            run.concats.append((output, inputs))
+        if output.endswith(".wav"):
+            with wave.open(output, "wb") as merged:
+                for i, path in enumerate(inputs):
+                    with wave.open(path) as chunk:
+                        if i == 0:
+                            merged.setparams(chunk.getparams())
+                        merged.writeframes(chunk.readframes(chunk.getnframes()))
+        else:
+            Path(output).write_bytes(b"")
+        return result
+    run.concats = []  # (출력, concat 입력 순서)
+    return run
+
+
+def _run_dry_pipeline(base_dir: str, ffmpeg, llm_backend=None, **sections) -> dict:
+    """
+    main(dry_run=True, profile=True) 실행
+
+    ffmpeg: subprocess.run 대신 쓸 가짜 (_fake_ffmpeg), llm_backend: StubLLMBackend 대신 쓸 백엔드 생성 함수, sections: config 섹션 덮어쓰기
+    """
+    original = (subprocess.run, dry_run.check_ffmpeg, pipeline_main.load_config, dry_run.StubLLMBackend)
+    try:
+        config = original[2]()
+        config["dry_run"] = dict(config.get("dry_run", {}) or {}, base_dir=base_dir)
+        config["logging"] = {"file": None, "level": "ERROR"}
+        config.update(sections)
+        pipeline_main.load_config = lambda config_path="config.yaml": config
+        subprocess.run = ffmpeg
+        dry_run.check_ffmpeg = lambda: None
+        if llm_backend is not None:
+            dry_run.StubLLMBackend = llm_backend
+        return pipeline_main.main("할머니의 비밀 일기장", dry_run=True, profile=True)
+    finally:
+        subprocess.run, dry_run.check_ffmpeg, pipeline_main.load_config, dry_run.StubLLMBackend = original
+
+
+def test_dry_run_pipeline_runs_every_phase():
+    calls = []
+    with tempfile.TemporaryDirectory() as tmp:
+        metadata = _run_dry_pipeline(tmp, _fake_ffmpeg(calls))
+
+        base = Path(metadata["output_dir"])
+        assert base.parent == Path(tmp) and metadata["dry_run"] is True
+        timings = json.loads(Path(metadata["dry_run_timings"]).read_text(encoding="utf-8"))
+        assert set(timings["phases"]) == set(metadata["phase_timings"])
+        assert {"outline", "parts", "main_images_prompts", "hook_video", "main_video"} <= set(timings["phases"])
+        assert timings["critical_path"][-1] == "main_video"
+        # Hook은 단독 Phase → Part 생성은 Hook 이미지 프롬프트가 끝난 뒤 시작 (ms 반올림 허용)
+        phases = timings["phases"]
+        assert phases["parts"]["start_sec"] >= sum(phases["hook_images_prompts"].values()) - 0.001
+
+        # 실제 Phase 코드가 만든 산출물 (기본 설정: main_full 전체를 한 번에 TTS)
+        assert len(list((base / "main" / "images").glob("scene_*.png"))) == 15
+        assert (base / "main" / "main_subtitles.srt").read_text(encoding="utf-8").startswith("1\n00:00:00,000 --> ")
+        assert json.loads((base / "metadata.json").read_text(encoding="utf-8"))["dry_run"] is True
+        video_calls = [cmd for cmd in calls if cmd[0] == "ffmpeg" and "-vf" in cmd]
+        assert len(video_calls) == 2  # hook + main
+
+        # --profile: Phase별 collapsed stack + 요약
+        profile = json.loads(Path(metadata["profile"]).read_text(encoding="utf-8"))
+        assert Path(metadata["profile"]).parent == base
+        assert {"1", "8a", "9a", "10a", "10b"} <= set(profile["phases"])
+        assert all(row["completed"] for row in profile["phases"].values())
+        assert Path(profile["collapsed"]["10a"]).exists()
+
+    # 실행 후 stub 싱글톤 제거
+    assert not llm_engine_loaded()
+
+
+def test_streaming_media_replays_parts_into_main_video():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = f"{tmp}/fixtures.jsonl"
+        streaming = {"enabled": True}
+        # ReplayBackend는 max_tokens를 넘는 응답을 자르므로 stub Part 대본(약 9천 토큰)이 들어가게 설정
+        llm = copy.deepcopy(pipeline_main.load_config()["llm"])
+        llm["parts"]["max_tokens"] = 10000
+
+        # 1) stub 응답을 replay fixture로 기록
+        recorded = _run_dry_pipeline(
+            f"{tmp}/record", _fake_ffmpeg([]), streaming_media=streaming, llm=llm,
+            llm_backend=lambda **kwargs: RecordingBackend(StubLLMBackend(**kwargs), fixtures)
+        )
+
+        # 2) 같은 실행을 ReplayBackend로 재생 (fixture에 없는 프롬프트면 KeyError)
+        calls = []
+        ffmpeg = _fake_ffmpeg(calls)
+        metadata = _run_dry_pipeline(
+            f"{tmp}/replay", ffmpeg, streaming_media=streaming, llm=llm,
+            llm_backend=lambda **kwargs: ReplayBackend(fixtures)
+        )
+        base = Path(metadata["output_dir"])
+
+        # Part별 Phase → parts_merge → Part 세그먼트 영상 → main_video 이어붙이기
+        phases = metadata["phase_timings"]
+        assert {"part1", "part2", "part3", "part4", "parts_merge", "main_video"} <= set(phases)
+        assert "parts" not in phases and "main_tts" not in phases
+        assert set(phases) == set(recorded["phase_timings"])
+
+        parts = [(base / "main" / f"part{n}.txt").read_text(encoding="utf-8") for n in range(1, 5)]
+        assert (base / "main" / "main_full.txt").read_text(encoding="utf-8") == "\n\n".join(parts)
+        assert parts == [
+            (Path(recorded["output_dir"]) / "main" / f"part{n}.txt").read_text(encoding="utf-8") for n in range(1, 5)
+        ]
+        for n in range(1, 5):
+            assert (base / "main" / f"part{n}_subtitles.srt").exists()
+
+        video_calls = [cmd for cmd in calls if cmd[0] == "ffmpeg" and "-vf" in cmd]
+        assert len(video_calls) == 5  # hook + part1-4 세그먼트
+        # 세그먼트는 Part 순서대로 한 번만 이어붙임 (stream copy)
+        video_concats = [(output, inputs) for output, inputs in ffmpeg.concats if output.endswith("main_video.mp4")]
+        assert [output for output, _ in video_concats] == [metadata["main_video"]]
+        assert video_concats[0][1] == [
+            str((base / "main" / f"part{n}_video.mp4").resolve()) for n in range(1, 5)
+        ]
+
+    assert not llm_engine_loaded()
+
+
+def test_timing_table_and_regressions():
+    current = {"outline": {"start_sec": 0.0, "duration_sec": 0.2}, "main_video": {"start_sec": 0.2, "duration_sec": 2.0}}
+    baseline = {"outline": {"start_sec": 0.0, "duration_sec": 0.1}, "main_video": {"start_sec": 0.1, "duration_sec": 1.0}}
+
+    # outline은 2배지만 0.1초 차이 → 잡음으로 무시
+    assert compare_timings(current, baseline, ratio=1.5, min_sec=0.5) == ["main_video: 1.000s → 2.000s (x2.0)"]
+    assert compare_timings(baseline, baseline) == []
+
+    table = format_timing_table(current, critical_path=["main_video"])
+    assert "main_video" in table and table.splitlines()[3].endswith("*")
+    assert "2.200s" in table  # wall
+
+
+if __name__ == "__main__":
+    tests = [
+        test_stub_media_files,
+        test_stub_llm_responses_pass_validation,
+        test_part_prompt_layouts_share_sections,
+        test_dry_run_pipeline_runs_every_phase,
+        test_streaming_media_replays_parts_into_main_video,
+        test_timing_table_and_regressions,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
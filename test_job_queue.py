@@ -0,0 +1,194 @@
+"""
+SQLite 작업 큐 테스트 스크립트 (GPU 불필요)
+우선순위 / stage별 동시 임대 상한 / 임대 만료 후 재등록 + resume / 실행 중 임대 만료 시 중단 + 결과 폐기
+/ 실패 재시도 / JSONL 일괄 등록 검증
+
+실행: python test_job_queue.py  (또는 pytest test_job_queue.py)
+"""
+
+import contextlib
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from utils.job_queue import JobQueue, run_worker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _make_queue(tmp, **kwargs):
+    clock = FakeClock()
+    queue = JobQueue(str(Path(tmp) / "jobs.sqlite3"), clock=clock, **kwargs)
+    return queue, clock
+
+
+def test_priority_order():
+    """priority가 높은 작업부터, 같으면 등록 순서대로 임대"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue, _ = _make_queue(tmp)
+        low = queue.enqueue("낮음", priority=0)
+        first = queue.enqueue("높음 1", priority=5)
+        second = queue.enqueue("높음 2", priority=5)
+
+        assert [queue.lease("w")["id"] for _ in range(3)] == [first, second, low]
+        assert queue.lease("w") is None
+        queue.close()
+
+
+def test_stage_limits():
+    """stage별 동시 임대 수 상한 (다른 stage 작업은 계속 임대)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue, _ = _make_queue(tmp, stage_limits={"pipeline": 1})
+        a = queue.enqueue("A", priority=9)
+        queue.enqueue("B", priority=9)
+        c = queue.enqueue("C", stage="media")
+
+        assert queue.lease("w1")["id"] == a
+        assert queue.lease("w2")["id"] == c  # pipeline은 상한 → media 작업
+        assert queue.lease("w3") is None
+
+        queue.complete(a, "w1", {"main_video": "a.mp4"})
+        assert queue.lease("w3")["title"] == "B"
+        assert queue.get(a)["result"] == {"main_video": "a.mp4"}
+        queue.close()
+
+
+def test_expired_lease_is_requeued_and_resumed():
+    """heartbeat가 끊긴 작업은 다시 queued → 다음 워커가 resume=True로 이어서 실행"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue, clock = _make_queue(tmp, lease_sec=60)
+        job_id = queue.enqueue("죽은 워커의 제목")
+
+        job = queue.lease("dead-worker")
+        assert queue.heartbeat(job_id, "dead-worker", last_phase="parts")
+        clock.now += 61  # heartbeat 중단
+
+        calls = []
+
+        def fake_main(title, resume=False, on_phase_done=None):
+            calls.append((title, resume))
+            on_phase_done("main_video")
+            return {"output_dir": "/out", "main_video": "/out/main/main_video.mp4"}
+
+        assert run_worker(queue, "new-worker", fake_main, max_jobs=5) == 1
+        assert calls == [("죽은 워커의 제목", True)]
+
+        done = queue.get(job_id)
+        assert done["status"] == "completed" and done["attempts"] == 2
+        assert done["last_phase"] == "main_video"
+        assert done["result"]["main_video"] == "/out/main/main_video.mp4"
+
+        # 만료된 임대의 원래 워커는 더 이상 기록할 수 없음
+        assert not queue.heartbeat(job_id, "dead-worker")
+        assert not queue.complete(job_id, "dead-worker")
+        queue.close()
+
+
+def test_lease_lost_mid_job_stops_and_discards_result():
+    """실행 중 임대가 만료되어 다른 워커에 넘어가면 다음 Phase 경계에서 중단, 완료 / 실패로 기록하지 않음"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue, clock = _make_queue(tmp, lease_sec=60)
+        job_id = queue.enqueue("느린 제목")
+        phases = []
+
+        def slow_main(title, resume=False, on_phase_done=None):
+            for phase in ("outline", "hook", "parts", "main_video"):
+                phases.append(phase)
+                if phase == "hook":
+                    # Phase가 임대 시간보다 오래 걸려 만료 → 다른 워커가 재임대
+                    clock.now += 61
+                    assert queue.requeue_expired() == 1
+                    assert queue.lease("other-worker")["id"] == job_id
+                on_phase_done(phase)
+            return {"main_video": "/out/main/main_video.mp4"}
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            assert run_worker(queue, "slow-worker", slow_main, max_jobs=1) == 1
+        assert phases == ["outline", "hook"]
+        assert "lease lost, result discarded" in output.getvalue() and "completed" not in output.getvalue()
+
+        job = queue.get(job_id)
+        assert job["status"] == "leased" and job["worker_id"] == "other-worker"
+        assert job["result"] is None and job["error"] is None and job["last_phase"] == "outline"
+
+        # Phase 경계 없이 끝난 경우에도 complete 실패 → 결과 폐기
+        assert queue.complete(job_id, "other-worker")
+        def last_phase_main(title, resume=False, on_phase_done=None):
+            clock.now += 61
+            queue.requeue_expired()
+            queue.lease("third-worker")
+            return {"main_video": "/out/main/main_video.mp4"}
+
+        job_id = queue.enqueue("마지막 Phase에서 만료")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            run_worker(queue, "slow-worker", last_phase_main, max_jobs=1)
+        assert "lease lost, result discarded" in output.getvalue()
+        assert queue.get(job_id)["status"] == "leased" and queue.get(job_id)["worker_id"] == "third-worker"
+        queue.close()
+
+
+def test_fail_retries_until_max_attempts():
+    with tempfile.TemporaryDirectory() as tmp:
+        queue, _ = _make_queue(tmp)
+        job_id = queue.enqueue("계속 실패", max_attempts=2)
+
+        def broken_main(title, resume=False, on_phase_done=None):
+            raise RuntimeError("boom")
+
+        assert run_worker(queue, "w", broken_main, max_jobs=5) == 2
+        job = queue.get(job_id)
+        assert job["status"] == "failed" and job["attempts"] == 2
+        assert "boom" in job["error"]
+        assert queue.stats() == {"pipeline": {"failed": 1}}
+        queue.close()
+
+
+def test_import_jsonl():
+    """JSONL 일괄 등록 (객체 / 문자열 줄, 잘못된 줄이 있으면 전체 거부)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue, _ = _make_queue(tmp)
+        path = Path(tmp) / "titles.jsonl"
+        path.write_text("\n".join([
+            json.dumps({"title": "첫 제목", "priority": 3, "genre": "가족"}, ensure_ascii=False),
+            "",
+            json.dumps("두 번째 제목", ensure_ascii=False),
+        ]), encoding="utf-8")
+
+        job_ids = queue.import_jsonl(str(path), priority=1)
+        jobs = [queue.get(job_id) for job_id in job_ids]
+        assert [(job["title"], job["priority"]) for job in jobs] == [("첫 제목", 3), ("두 번째 제목", 1)]
+        assert jobs[0]["payload"] == {"genre": "가족"}
+
+        bad = Path(tmp) / "bad.jsonl"
+        bad.write_text('{"title": "정상"}\n{"priority": 1}\n', encoding="utf-8")
+        try:
+            queue.import_jsonl(str(bad))
+            assert False, "ValueError expected"
+        except ValueError as e:
+            assert "bad.jsonl:2" in str(e)
+        assert len(queue.list()) == 2
+        queue.close()
+
+
+if __name__ == "__main__":
+    tests = [
+        test_priority_order,
+        test_stage_limits,
+        test_expired_lease_is_requeued_and_resumed,
+        test_lease_lost_mid_job_stops_and_discards_result,
+        test_fail_retries_until_max_attempts,
+        test_import_jsonl,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
@@ -0,0 +1,157 @@
+"""
+JSON 복구 단독 테스트 스크립트
+utils/json_repair.py 회귀 테스트 (LLM 불필요, CPU에서 실행)
+
+실제 LLM 출력에서 자주 나오는 손상 패턴을 corpus로 모아
+repair_json 후 json.loads가 성공하고 기대 값과 일치하는지 확인합니다.
+
+실행:
+    python test_json_repair.py
+    python -m pytest test_json_repair.py
+"""
+
+import json
+from utils.json_repair import repair_json
+
+
+# (이름, 손상된 출력, 기대 결과, 반드시 적용되어야 할 복구 항목)
+CORPUS = [
+    (
+        "trailing_comma_object",
+        '{"title": "할머니의 비밀", "genre": "가족드라마",}',
+        {"title": "할머니의 비밀", "genre": "가족드라마"},
+        ["trailing_comma"],
+    ),
+    (
+        "trailing_comma_array_multiline",
+        '{\n  "consistency_anchors": [\n    "기준 1",\n    "기준 2",\n  ],\n  "part_count": 4,\n}',
+        {"consistency_anchors": ["기준 1", "기준 2"], "part_count": 4},
+        ["trailing_comma"],
+    ),
+    (
+        "inner_quote_dialogue",
+        '{"dialogue_highlight": "그녀는 "괜찮아요"라고 말했다", "part": 1}',
+        {"dialogue_highlight": "그녀는 \"괜찮아요\"라고 말했다", "part": 1},
+        ["inner_quote"],
+    ),
+    (
+        "inner_quote_followed_by_comma",
+        '{"text_reference": "민서가 "잠깐만요", 하고 불렀다", "index": 0}',
+        {"text_reference": "민서가 \"잠깐만요\", 하고 불렀다", "index": 0},
+        ["inner_quote"],
+    ),
+    (
+        "raw_newline_in_string",
+        '{"outline_full": "첫 문단입니다.\n\n둘째 문단입니다."}',
+        {"outline_full": "첫 문단입니다.\n\n둘째 문단입니다."},
+        ["control_char"],
+    ),
+    (
+        "truncated_inside_string",
+        '{"meta": {"title": "반지"}, "outline_full": "비 오는 밤, 할머니는 오래된 반지를',
+        {"meta": {"title": "반지"}, "outline_full": "비 오는 밤, 할머니는 오래된 반지를"},
+        ["close_string", "close_brackets"],
+    ),
+    (
+        "truncated_after_key",
+        '{"scenes": [{"index": 0, "prompt": "Korean woman"}], "total_scenes":',
+        {"scenes": [{"index": 0, "prompt": "Korean woman"}], "total_scenes": ""},
+        ["close_brackets"],
+    ),
+    (
+        "truncated_mid_array_element",
+        '{"scenes": [{"index": 0, "mood": "sad"}, {"index": 1, "mo',
+        {"scenes": [{"index": 0, "mood": "sad"}, {"index": 1}]},
+        ["truncate_partial", "close_brackets"],
+    ),
+    (
+        "truncated_dangling_key",
+        '{"part_breakdown": [{"part": 1, "title": "발견"}], "outline_fu',
+        {"part_breakdown": [{"part": 1, "title": "발견"}]},
+        ["truncate_partial", "close_brackets"],
+    ),
+    (
+        "bracket_mismatch",
+        '{"must_include": ["화해 장면", "고백"}, "part": 4}',
+        {"must_include": ["화해 장면", "고백"], "part": 4},
+        ["bracket_mismatch"],
+    ),
+    (
+        "trailing_text_after_object",
+        '{"a": [1, 2,]}\n이상으로 JSON 출력을 마칩니다.',
+        {"a": [1, 2]},
+        ["trailing_comma"],
+    ),
+    (
+        "escaped_quote_kept",
+        '{"prompt": "woman saying \\"hello\\"", "tags": ["a",]}',
+        {"prompt": "woman saying \"hello\"", "tags": ["a"]},
+        ["trailing_comma"],
+    ),
+]
+
+# 복구가 필요 없는 정상 JSON은 그대로 통과해야 함
+VALID_CORPUS = [
+    '{"a": 1, "b": [true, false, null], "c": {"d": "e, f"}}',
+    '{"text": "콜론: 과 콤마, 그리고 괄호 } ] 를 포함한 문자열"}',
+]
+
+
+def test_corpus_repairs():
+    """corpus 전체 복구 + 기대 값 일치"""
+    for name, broken, expected, expected_repairs in CORPUS:
+        repaired, repairs = repair_json(broken)
+        assert json.loads(repaired) == expected, f"{name}: {repaired}"
+        for repair in expected_repairs:
+            assert repair in repairs, f"{name}: expected {repair}, got {repairs}"
+
+
+def test_corpus_is_actually_broken():
+    """corpus 항목은 복구 없이 json.loads가 실패해야 함 (corpus 자체 검증)"""
+    for name, broken, _, _ in CORPUS:
+        try:
+            json.loads(broken)
+        except json.JSONDecodeError:
+            continue
+        raise AssertionError(f"{name}: corpus entry is valid JSON")
+
+
+def test_valid_json_untouched():
+    """정상 JSON은 복구 항목 없이 그대로 반환"""
+    for text in VALID_CORPUS:
+        repaired, repairs = repair_json(text)
+        assert repairs == [], f"{text}: {repairs}"
+        assert json.loads(repaired) == json.loads(text)
+
+
+def test_no_json_start():
+    """'{'가 없으면 원문 그대로"""
+    repaired, repairs = repair_json("JSON을 생성할 수 없습니다")
+    assert repaired == "JSON을 생성할 수 없습니다"
+    assert repairs == []
+
+
+if __name__ == "__main__":
+    tests = [
+        test_corpus_repairs,
+        test_corpus_is_actually_broken,
+        test_valid_json_untouched,
+        test_no_json_start,
+    ]
+
+    print("=" * 60)
+    print("JSON Repair Test")
+    print("=" * 60)
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  ✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  ✗ {test.__name__}: {e}")
+
+    print()
+    print(f"{len(CORPUS)} corpus cases, {len(tests) - failed}/{len(tests)} tests passed")
+    exit(1 if failed else 0)
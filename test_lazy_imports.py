@@ -0,0 +1,45 @@
+"""
+지연 import 테스트 스크립트 (GPU 불필요)
+오케스트레이션 모듈 import 시 무거운 엔진 모듈(torch 등)이 로드되지 않는지 + import 시간 예산 검증
+
+실행: python test_lazy_imports.py  (또는 pytest test_lazy_imports.py)
+"""
+
+import subprocess
+import sys
+
+from bench_import_time import HEAVY_MODULES, measure_import, parse_importtime
+
+
+def test_orchestration_modules_do_not_import_engines():
+    """main / server / 작업 큐 / 엔진 래퍼 모듈 import만으로는 torch·diffusers·TTS·whisper·vllm 미로드"""
+    for module in ["main", "server", "utils.job_queue", "pipeline.image", "pipeline.tts", "pipeline.subtitle"]:
+        assert measure_import(module)["heavy"] == [], module
+
+
+def test_main_import_within_budget():
+    """main import 누적 시간이 넉넉한 예산(1초) 이내 (3회 중 최솟값)"""
+    best_ms = min(measure_import("main")["cumulative_ms"] for _ in range(3))
+    assert 0 < best_ms < 1000, best_ms
+
+
+def test_cli_help_does_not_load_engines():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", "--help"],
+        capture_output=True, text=True
+    )
+    assert result.returncode == 0
+    loaded = {name.split(".")[0] for name, _, _ in parse_importtime(result.stderr)}
+    assert not loaded & set(HEAVY_MODULES)
+
+
+if __name__ == "__main__":
+    tests = [
+        test_orchestration_modules_do_not_import_engines,
+        test_main_import_within_budget,
+        test_cli_help_does_not_load_engines,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
@@ -0,0 +1,185 @@
+"""
+LLM 백엔드 테스트 스크립트 (GPU 불필요)
+ReplayBackend / RecordingBackend + LLMEngine 재시도/스트리밍 로직 검증
+
+실행: python test_llm_backends.py  (또는 pytest test_llm_backends.py)
+"""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline.llm import LLMEngine, LLMTelemetry
+from pipeline.llm_backends import Completion, ReplayBackend, RecordingBackend, prompt_key
+
+
+OUTLINE_JSON = json.dumps({"title": "테스트", "characters": [{"name": "민서 {주인공}"}]}, ensure_ascii=False)
+CHINESE_TEXT = "그녀는 말했다. 我们一起去吧这个地方很好 그리고 웃었다."
+PART_TEXT = "비 오는 밤이었습니다. 민서는 창밖을 바라보며 조용히 숨을 골랐어요. " * 20
+
+
+def _write_fixtures(path: Path, fixtures: list) -> str:
+    with open(path, 'w', encoding='utf-8') as f:
+        for fixture in fixtures:
+            f.write(json.dumps(fixture, ensure_ascii=False) + "\n")
+    return str(path)
+
+
+def _make_engine(backend, streaming: bool = False) -> LLMEngine:
+    engine = LLMEngine(config_path="__missing__.yaml", backend=backend)
+    engine.config['llm_streaming'] = {'enabled': streaming}
+    return engine
+
+
+def test_replay_exact_and_pattern():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = _write_fixtures(Path(tmp) / "fixtures.jsonl", [
+            {"prompt_sha256": prompt_key("정확한 프롬프트"), "texts": ["정확"]},
+            {"match": "Part 2", "texts": ["후보1", "후보2"]},
+        ])
+        backend = ReplayBackend(fixtures)
+
+        assert backend.generate("정확한 프롬프트", {})[0].text == "정확"
+        candidates = backend.generate("지금 바로 Part 2 대본을 작성하세요.", {"n": 3})
+        assert [c.text for c in candidates] == ["후보1", "후보2", "후보1"]
+
+        try:
+            backend.generate("기록 없음", {})
+            assert False, "KeyError expected"
+        except KeyError:
+            pass
+
+
+def test_replay_latency_and_truncation():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = _write_fixtures(Path(tmp) / "fixtures.jsonl", [{"match": "", "texts": [PART_TEXT]}])
+        backend = ReplayBackend(fixtures, ttft_sec=0.05, tokens_per_sec=5000)
+
+        started = time.perf_counter()
+        completion = backend.generate("아무 프롬프트", {"max_tokens": 10000})[0]
+        elapsed = time.perf_counter() - started
+        assert completion.finish_reason == "stop"
+        assert elapsed >= 0.05 + completion.output_tokens / 5000 * 0.9
+
+        truncated = backend.generate("아무 프롬프트", {"max_tokens": 20})[0]
+        assert truncated.finish_reason == "length"
+        assert len(truncated.text) < len(PART_TEXT)
+
+        snapshots = list(backend.stream("아무 프롬프트", {"max_tokens": 10000}))
+        assert snapshots[-1].text == PART_TEXT
+        assert snapshots[-1].finish_reason == "stop"
+        assert all(s.finish_reason is None for s in snapshots[:-1])
+
+
+def test_recording_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        source = ReplayBackend(_write_fixtures(Path(tmp) / "source.jsonl", [{"match": "", "texts": ["기록될 응답"]}]))
+        record_path = Path(tmp) / "recorded.jsonl"
+        recorder = RecordingBackend(source, str(record_path))
+
+        recorder.generate("프롬프트 A", {})
+        list(recorder.stream("프롬프트 B", {}))
+
+        replay = ReplayBackend(str(record_path))
+        assert replay.generate("프롬프트 A", {})[0].text == "기록될 응답"
+        assert replay.generate("프롬프트 B", {})[0].text == "기록될 응답"
+
+
+def test_engine_json_retry_on_chinese():
+    with tempfile.TemporaryDirectory() as tmp:
+        # n-best 후보 중 중국어 후보는 버리고 정상 JSON 후보 선택
+        fixtures = _write_fixtures(Path(tmp) / "fixtures.jsonl", [
+            {"match": "개요", "texts": [CHINESE_TEXT, "결과: " + OUTLINE_JSON + " 끝"]},
+        ])
+        engine = _make_engine(ReplayBackend(fixtures))
+
+        result = engine.call_llm("개요를 JSON으로 작성하세요", phase="outline", n_candidates=2, label="outline")
+        assert result["characters"][0]["name"] == "민서 {주인공}"
+        assert engine.json_phase_stats["outline"]["attempts"] == 1
+
+
+def test_engine_stream_aborts_on_chinese():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = _write_fixtures(Path(tmp) / "fixtures.jsonl", [
+            {"match": "중국어", "texts": [CHINESE_TEXT * 10]},
+            {"match": "대본", "texts": [PART_TEXT]},
+        ])
+        engine = _make_engine(ReplayBackend(fixtures, stream_chunk_chars=8), streaming=True)
+
+        text, reason = engine.generate_stream("중국어 섞인 대본", {"max_tokens": 4096})
+        assert reason == "chinese"
+        assert len(text) < len(CHINESE_TEXT * 10)
+
+        text = engine.call_llm_text("대본을 작성하세요", "parts", label="part1")
+        assert text == PART_TEXT
+        assert engine.prefix_cache_stats["part1"]["requests"] == 1
+
+
+def test_engine_telemetry():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = _write_fixtures(Path(tmp) / "fixtures.jsonl", [
+            {"match": "중국어", "texts": [CHINESE_TEXT]},
+            {"match": "대본", "texts": [PART_TEXT]},
+        ])
+        engine = _make_engine(ReplayBackend(fixtures, ttft_sec=0.02, tokens_per_sec=20000))
+
+        # 배치: 재시도마다 레코드 1개 + 중국어 거절 사유
+        engine.call_llm_text("중국어 섞인 대본", "parts", label="part1")
+        records = engine.telemetry.records
+        assert [(r["attempt"], r["rejected"]) for r in records] == [(0, "chinese"), (1, "chinese")]
+        assert records[0]["ttft_sec"] == 0.02
+        assert records[0]["output_tokens"] > 0 and records[0]["decode_tok_per_sec"] > 0
+
+        # 스트리밍: TTFT는 호출 측에서 측정
+        engine.config['llm_streaming'] = {'enabled': True}
+        engine.call_llm_text("대본을 작성하세요", "hook", label="hook")
+        stream_record = engine.telemetry.records[-1]
+        assert stream_record["mode"] == "stream"
+        assert stream_record["ttft_sec"] >= 0.02
+        assert stream_record["finish_reason"] == "stop" and stream_record["rejected"] is None
+
+        summary = engine.telemetry.summary()
+        assert summary["parts"]["calls"] == 2
+        assert summary["parts"]["retries"] == 1
+        assert summary["parts"]["rejections"] == {"chinese": 2}
+        assert summary["hook"]["finish_reasons"] == {"stop": 1}
+
+        calls_path = Path(tmp) / "llm_calls.jsonl"
+        engine.telemetry.write_jsonl(str(calls_path))
+        assert len(calls_path.read_text(encoding='utf-8').splitlines()) == 3
+
+        history_path = Path(tmp) / "history.jsonl"
+        engine.telemetry.append_history(str(history_path), {"title": "A"})
+        engine.telemetry.append_history(str(history_path), {"title": "B"})
+        runs = [json.loads(line) for line in history_path.read_text(encoding='utf-8').splitlines()]
+        assert [run["title"] for run in runs] == ["A", "B"]
+        assert runs[0]["phases"]["parts"]["rejections"] == {"chinese": 2}
+        # 상주 프로세스에서 다음 제목을 위해 실행별 통계 초기화
+        engine.reset_run_stats()
+        assert engine.telemetry.records == [] and engine.telemetry.summary() == {}
+        assert engine.json_phase_stats == {} and engine.prefix_cache_stats == {}
+
+
+def test_telemetry_truncated_json_is_length():
+    telemetry = LLMTelemetry()
+    telemetry.record("outline", "outline", 0, [Completion("{\"a\": ", 100, 50, finish_reason="length")], 1.0, mode="batch")
+    telemetry.reject("outline", "json")
+    assert telemetry.records[0]["rejected"] == "length"
+    assert telemetry.summary()["outline"]["rejections"] == {"length": 1}
+
+
+if __name__ == "__main__":
+    tests = [
+        test_replay_exact_and_pattern,
+        test_replay_latency_and_truncation,
+        test_recording_round_trip,
+        test_engine_json_retry_on_chinese,
+        test_engine_stream_aborts_on_chinese,
+        test_engine_telemetry,
+        test_telemetry_truncated_json_is_length,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
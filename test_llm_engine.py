@@ -0,0 +1,367 @@
+"""
+LLMEngine 핵심 로직 테스트 스크립트 (GPU 불필요, replay 백엔드)
+배치 생성 순서 / 배치 재시도 / 응답 캐시 LRU·opt-out / 스트리밍 조기 중단 / guided decoding 스키마 전달·fallback / 이어쓰기 분량 상한 / 토큰 예산 산정·프롬프트 초과 거절
+
+실행: python test_llm_engine.py  (또는 pytest test_llm_engine.py)
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from pipeline.llm import LLMEngine, ResponseCache, StreamMonitor, TokenBudgetPlanner
+from pipeline.llm_backends import ReplayBackend
+from prompts.part_v3 import generate_part_continuation_instruction, get_word_count_range
+
+
+OUTLINE_JSON = json.dumps({"title": "테스트", "characters": [{"name": "민서"}]}, ensure_ascii=False)
+CHINESE_TEXT = "그녀는 말했다. 我们一起去吧这个地方很好 그리고 웃었다."
+
+
+class RecordedCallsBackend(ReplayBackend):
+    """ReplayBackend + 백엔드 호출(프롬프트 / 파라미터) 기록"""
+
+    def __init__(self, fixtures_path: str, **kwargs):
+        super().__init__(fixtures_path, **kwargs)
+        self.calls = []
+
+    def generate_many(self, prompts, params_list, phases=None):
+        self.calls.append({"prompts": list(prompts), "params": [dict(p) for p in params_list]})
+        return super().generate_many(prompts, params_list, phases=phases)
+
+    def stream(self, prompt, params, phase=None):
+        self.calls.append({"prompts": [prompt], "params": [dict(params)], "stream": True})
+        return super().stream(prompt, params, phase=phase)
+
+
+def _write_fixtures(path: Path, fixtures: list) -> str:
+    with open(path, 'w', encoding='utf-8') as f:
+        for fixture in fixtures:
+            f.write(json.dumps(fixture, ensure_ascii=False) + "\n")
+    return str(path)
+
+
+def _make_engine(backend, **config) -> LLMEngine:
+    engine = LLMEngine(config_path="__missing__.yaml", backend=backend)
+    engine.config.update(config)
+    return engine
+
+
+def test_generate_many_single_batch_in_input_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = _write_fixtures(Path(tmp) / "fixtures.jsonl", [
+            {"match": f"프롬프트 {i}", "texts": [f"응답 {i}"]} for i in range(5)
+        ])
+        backend = RecordedCallsBackend(fixtures)
+        engine = _make_engine(backend)
+
+        prompts = [f"프롬프트 {i}" for i in (3, 0, 4, 1, 2)]
+        params = [{"max_tokens": 100 + i, "temperature": 0.1 * i} for i in range(5)]
+        assert engine.generate_many(prompts, params) == [f"응답 {i}" for i in (3, 0, 4, 1, 2)]
+
+        # 한 번의 백엔드 호출, 프롬프트별 파라미터 유지
+        assert len(backend.calls) == 1
+        assert backend.calls[0]["prompts"] == prompts
+        assert [p["max_tokens"] for p in backend.calls[0]["params"]] == [100, 101, 102, 103, 104]
+
+        assert engine.generate_many([], []) == []
+        try:
+            engine.generate_many(prompts, params[:2])
+            assert False, "ValueError expected"
+        except ValueError:
+            pass
+
+
+def test_batch_retries_only_failed_prompts():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = _write_fixtures(Path(tmp) / "fixtures.jsonl", [
+            {"match": "중국어", "texts": [CHINESE_TEXT]},
+            {"match": "개요", "texts": [OUTLINE_JSON]},
+            {"match": "대본", "texts": ["대본입니다."]},
+        ])
+        backend = RecordedCallsBackend(fixtures)
+        engine = _make_engine(backend)
+
+        # JSON: 실패한 프롬프트만 다음 배치로 재시도, 끝까지 실패하면 RuntimeError
+        try:
+            engine.call_llm_many(["개요 A", "중국어 개요", "개요 B"], "outline", max_retry=2)
+            assert False, "RuntimeError expected"
+        except RuntimeError as e:
+            assert "#1 outline" in str(e)
+        assert [call["prompts"] for call in backend.calls] == [["개요 A", "중국어 개요", "개요 B"], ["중국어 개요"]]
+
+        # 텍스트: 재시도가 남지 않으면 마지막 결과 반환 (입력 순서 유지)
+        backend.calls.clear()
+        results = engine.call_llm_text_many(["대본 1", "중국어 대본", "대본 2"], "parts", max_retry=2)
+        assert results == ["대본입니다.", CHINESE_TEXT, "대본입니다."]
+        assert [call["prompts"] for call in backend.calls] == [["대본 1", "중국어 대본", "대본 2"], ["중국어 대본"]]
+        rejected = [r["label"] for r in engine.telemetry.records if r["rejected"] and r["phase"] == "parts"]
+        assert rejected == ["parts#1", "parts#1"]
+
+
+def test_response_cache_lru_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(tmp, max_size_mb=0.001)  # 약 1KB
+        text = "가" * 150  # 항목 하나 약 460B
+        for key in ("a", "b"):
+            cache.put(key, [text])
+        assert cache.get("a") == [text]  # a 사용 → b가 가장 오래됨
+
+        cache.put("c", [text])
+        assert cache.get("b") is None
+        assert cache.get("a") == [text] and cache.get("c") == [text]
+        assert cache.stats()["entries"] == 2 and cache.stats()["hits"] == 3
+
+        # 재시작 후에도 사용 순서(mtime) 유지
+        reopened = ResponseCache(tmp, max_size_mb=0.001)
+        assert set(reopened._index) == {"a", "c"}
+
+        cache.discard("a")
+        assert cache.get("a") is None and not (Path(tmp) / "a.json").exists()
+
+        # 키는 프롬프트 / 파라미터 / 모델 ID가 모두 같을 때만 같음
+        key = ResponseCache.make_key("p", {"seed": 1}, "m")
+        assert key == ResponseCache.make_key("p", {"seed": 1}, "m")
+        assert key != ResponseCache.make_key("p", {"seed": 2}, "m")
+        assert key != ResponseCache.make_key("p", {"seed": 1}, "other")
+
+
+def test_engine_cache_hits_and_opt_out():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = _write_fixtures(Path(tmp) / "fixtures.jsonl", [
+            {"match": f"프롬프트 {i}", "texts": [f"응답 {i}"]} for i in range(3)
+        ])
+        backend = RecordedCallsBackend(fixtures)
+
+        # 기본 설정(캐시 꺼짐)은 매번 생성
+        engine = _make_engine(backend)
+        assert engine.response_cache is None and engine.cache_stats() is None
+        engine.generate_many(["프롬프트 0"], [{}])
+        engine.generate_many(["프롬프트 0"], [{}])
+        assert len(backend.calls) == 2
+
+        config_path = Path(tmp) / "config.yaml"
+        config_path.write_text(json.dumps({
+            "models": {"llm": "replay"},
+            "llm": {},
+            "llm_cache": {"enabled": True, "dir": f"{tmp}/cache", "seed": 42}
+        }), encoding="utf-8")
+        engine = LLMEngine(config_path=str(config_path), backend=backend)
+        backend.calls.clear()
+
+        # 캐시에 있는 프롬프트는 빼고 나머지만 배치 생성, 결과는 입력 순서
+        engine.generate_many(["프롬프트 1"], [{}])
+        assert engine.generate_many(["프롬프트 0", "프롬프트 1", "프롬프트 2"], [{}, {}, {}]) == ["응답 0", "응답 1", "응답 2"]
+        assert [call["prompts"] for call in backend.calls] == [["프롬프트 1"], ["프롬프트 0", "프롬프트 2"]]
+        assert engine.cache_stats()["hits"] == 1
+        assert [r["mode"] for r in engine.telemetry.records].count("cached") == 1
+
+        # use_cache=False: 조회 / 저장 모두 생략
+        backend.calls.clear()
+        engine.generate_many(["프롬프트 1"], [{}], use_cache=False)
+        assert len(backend.calls) == 1 and engine.cache_stats()["hits"] == 1
+
+        # 검증 실패 응답 제거 → 다음 호출은 다시 생성
+        engine.discard_cached("프롬프트 1", {})
+        engine.generate_many(["프롬프트 1"], [{}])
+        assert len(backend.calls) == 2
+
+
+def test_stream_monitor_statuses():
+    monitor = StreamMonitor(chinese_threshold=5)
+    assert monitor.feed("평범한 한국어 문장입니다. 我们") == StreamMonitor.CONTINUE
+    assert monitor.feed("一起去吧") == StreamMonitor.CHINESE  # 누적 6자 > 5
+
+    # JSON 모드: 첫 최상위 객체가 닫히면 종료 (문자열 안 괄호는 무시)
+    monitor = StreamMonitor(json_mode=True)
+    assert monitor.feed('결과: {"a": "}{", ') == StreamMonitor.CONTINUE
+    assert monitor.feed('"b": [1, 2]} 이후 설명') == StreamMonitor.JSON_CLOSED
+    assert (monitor.json_start, monitor.json_end) == (4, 28)
+
+    # 여는 괄호 없이 닫는 괄호 / '{' 없이 긴 서두 → 손상
+    assert StreamMonitor(json_mode=True).feed('}') == StreamMonitor.INVALID_JSON
+    monitor = StreamMonitor(json_mode=True, max_json_preamble_chars=10)
+    assert monitor.feed("설명부터 ") == StreamMonitor.CONTINUE
+    assert monitor.feed("길게 늘어놓는 서두입니다") == StreamMonitor.INVALID_JSON
+
+    # 텍스트 모드는 JSON 검사 안 함
+    assert StreamMonitor().feed("}") == StreamMonitor.CONTINUE
+
+
+def test_stream_abort_and_retry():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = _write_fixtures(Path(tmp) / "fixtures.jsonl", [
+            {"match": "깨진", "texts": ["}" + OUTLINE_JSON]},
+            {"match": "서두", "texts": ["모델이 설명을 길게 늘어놓습니다. " * 20 + OUTLINE_JSON]},
+            {"match": "개요", "texts": [OUTLINE_JSON + "\n\n중복 출력 " + "가" * 500]},
+        ])
+        backend = RecordedCallsBackend(fixtures, stream_chunk_chars=8)
+        engine = _make_engine(backend, llm_streaming={"enabled": True})
+
+        # 첫 객체가 닫히는 즉시 종료 (뒤의 중복 출력은 받지 않음)
+        text, reason = engine.generate_stream("개요", {}, json_mode=True)
+        assert reason == "json_closed" and text == OUTLINE_JSON
+
+        text, reason = engine.generate_stream("깨진 개요", {}, json_mode=True)
+        assert reason == "invalid_json" and len(text) <= 8
+
+        text, reason = engine.generate_stream("서두가 긴 개요", {}, json_mode=True)
+        assert reason == "invalid_json" and len(text) < 250
+
+        # call_llm: 손상된 스트림은 대기 없이 재시도, 재시도마다 거절 사유 기록
+        try:
+            engine.call_llm("깨진 개요", "outline", max_retry=2)
+            assert False, "RuntimeError expected"
+        except RuntimeError:
+            pass
+        assert [r["rejected"] for r in engine.telemetry.records if r["label"] == "outline"] == ["json", "json"]
+        assert engine.json_phase_stats["outline"]["failures"] == 1
+
+        # 스트리밍을 끄면 배치 생성으로 돌아감
+        engine.config["llm_streaming"] = {"enabled": False}
+        backend.calls.clear()
+        assert engine.call_llm("개요", "outline")["title"] == "테스트"
+        assert "stream" not in backend.calls[0]
+
+
+def test_guided_schema_and_fallback():
+    schema = {"type": "object", "properties": {"title": {"type": "string"}}, "required": ["title"]}
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = _write_fixtures(Path(tmp) / "fixtures.jsonl", [
+            {"match": "잘린", "texts": ['{"title": "테스트", "characters": [{"name": "민서"']},
+            {"match": "개요", "texts": ["설명: " + OUTLINE_JSON]},
+        ])
+        backend = RecordedCallsBackend(fixtures)
+
+        # 기본 설정(guided 꺼짐): 스키마를 보내지 않고 프롬프트 + JSON 추출로 처리
+        engine = _make_engine(backend)
+        assert engine.call_llm("개요", "outline", json_schema=schema)["title"] == "테스트"
+        engine.call_llm_many(["개요 A", "개요 B"], "outline", json_schemas=[schema, schema])
+        assert all(params.get("json_schema") is None for call in backend.calls for params in call["params"])
+        assert engine.json_phase_stats["outline"]["guided"] is False
+
+        # guided 켜짐: 스키마가 있는 호출에만 전달
+        engine = _make_engine(backend, llm_guided_decoding={"enabled": True})
+        backend.calls.clear()
+        engine.call_llm("개요", "outline", json_schema=schema)
+        engine.call_llm("개요", "outline", label="plain")
+        engine.call_llm_many(["개요 A", "개요 B"], "outline", json_schemas=[schema, None])
+        sent = [params.get("json_schema") for call in backend.calls for params in call["params"]]
+        assert sent == [schema, None, schema, None]
+        assert engine.json_phase_stats["outline"]["guided"] is True
+        assert engine.json_phase_stats["plain"]["guided"] is False
+
+        # 스키마를 따르다 max_tokens에서 잘린 출력 → 재생성 없이 로컬 복구
+        result = engine.call_llm("잘린 개요", "outline", json_schema=schema, label="truncated")
+        assert result["characters"] == [{"name": "민서"}]
+        assert engine.json_phase_stats["truncated"]["attempts"] == 1
+        assert engine.json_phase_stats["truncated"]["repairs"]
+
+
+def test_continue_text_stops_at_word_count_end():
+    outline = {"part_breakdown": [{"part": 1, "word_count_range": [1000, 1200]}]}
+    word_count_start, word_count_end = get_word_count_range(outline, 1)
+    existing = "민서는 창밖을 바라보았습니다. " * 40
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = _write_fixtures(Path(tmp) / "fixtures.jsonl", [
+            {"match": "【이어쓰기】", "texts": ["빗소리가 점점 커졌어요. " * 60]},
+        ])
+        backend = RecordedCallsBackend(fixtures)
+        engine = _make_engine(backend)
+
+        # 지시문의 요청 분량 = continue_text 상한 (word_count_range[1]) - 현재 길이
+        instruction = generate_part_continuation_instruction(1, outline, len(existing), word_count_end)
+        assert f"약 {word_count_end - len(existing):,}자" in instruction
+        assert generate_part_continuation_instruction(1, outline, len(existing)) == instruction
+
+        continuation = engine.continue_text("Part 1 프롬프트", existing, instruction, max_chars=word_count_end)
+        assert word_count_end - 15 < len(existing + continuation) <= word_count_end
+        assert continuation.startswith("빗소리가") and continuation.endswith("커졌어요.")
+        assert backend.calls[0]["prompts"][0].endswith(existing[-1500:])
+
+        # 이미 상한 이상 → 호출 없이 빈 문자열
+        assert engine.continue_text("Part 1 프롬프트", existing * 3, instruction, max_chars=word_count_end) == ""
+        assert len(backend.calls) == 1
+
+
+def test_token_budget_planner_sizing():
+    planner = TokenBudgetPlanner(
+        max_model_len=1000, count_tokens=len, chars_per_token=2.0, safety_margin=1.5, min_output_tokens=100
+    )
+    # 목표 분량 → 400자 / 2.0 × 1.5 + 1
+    assert planner.plan("x" * 100, 4096, target_chars=400) == 301
+    assert planner.plan("x" * 100, 4096, target_chars=400, chars_per_token=4.0) == 151
+    # 목표 분량 없음 → phase 설정값, 최소 출력 토큰 보장
+    assert planner.plan("x" * 100, 500) == 500
+    assert planner.plan("x", 10) == 100
+    # context 한도 (1000 - 700)
+    assert planner.plan("x" * 700, 4096, target_chars=4000) == 300
+    assert [d["available_tokens"] for d in planner.decisions] == [900, 900, 900, 999, 300]
+
+    try:
+        planner.plan("x" * 950, 100, label="part1")
+        assert False, "ValueError expected"
+    except ValueError as e:
+        assert str(e).startswith("[part1] Prompt too long: 950 tokens")
+    assert len(planner.decisions) == 5
+
+    planner.reset()
+    assert planner.decisions == []
+
+
+def test_prompt_too_long_is_rejected_in_telemetry():
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = _write_fixtures(Path(tmp) / "fixtures.jsonl", [
+            {"match": "개요", "texts": [OUTLINE_JSON]},
+            {"match": "대본", "texts": ["대본입니다."]},
+        ])
+        backend = RecordedCallsBackend(fixtures)
+        config_path = Path(tmp) / "config.yaml"
+        config_path.write_text(json.dumps({
+            "models": {"llm": "replay"},
+            "llm": {},
+            "llm_cache": {"enabled": True, "dir": f"{tmp}/cache"},
+            "llm_budget": {"enabled": True, "min_output_tokens": 64}
+        }), encoding="utf-8")
+        engine = LLMEngine(config_path=str(config_path), backend=backend, max_model_len=2000)
+
+        # 목표 분량 기준 max_tokens로 생성
+        assert engine.call_llm_text("대본 프롬프트", "parts", target_chars=700) == "대본입니다."
+        assert backend.calls[0]["params"][0]["max_tokens"] == engine.budget_planner.estimate_tokens(700)
+
+        # 너무 긴 프롬프트 → 생성 없이 거절 기록 + JSON 단계 실패 집계 후 ValueError
+        try:
+            engine.call_llm("개요 " + "가" * 3000, "outline")
+            assert False, "ValueError expected"
+        except ValueError:
+            pass
+        assert len(backend.calls) == 1
+        record = engine.telemetry.records[-1]
+        assert (record["label"], record["mode"], record["rejected"]) == ("outline", "rejected", "prompt_too_long")
+        assert engine.telemetry.summary()["outline"]["rejections"] == {"prompt_too_long": 1}
+        assert engine.json_phase_stats["outline"]["failures"] == 1
+
+        # 실행별 통계 초기화 (planner 결정 기록 / 캐시 hit·miss, 캐시 항목은 유지)
+        assert engine.budget_decisions() and engine.cache_stats()["misses"] == 1
+        engine.reset_run_stats()
+        assert engine.budget_decisions() == [] and engine.telemetry.records == []
+        assert engine.cache_stats()["misses"] == 0 and engine.cache_stats()["entries"] == 1
+
+
+if __name__ == "__main__":
+    tests = [
+        test_generate_many_single_batch_in_input_order,
+        test_batch_retries_only_failed_prompts,
+        test_response_cache_lru_eviction,
+        test_engine_cache_hits_and_opt_out,
+        test_stream_monitor_statuses,
+        test_stream_abort_and_retry,
+        test_guided_schema_and_fallback,
+        test_continue_text_stops_at_word_count_end,
+        test_token_budget_planner_sizing,
+        test_prompt_too_long_is_rejected_in_telemetry,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
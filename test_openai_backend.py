@@ -0,0 +1,223 @@
+"""
+OpenAI 호환 백엔드 테스트 스크립트 (GPU 불필요)
+로컬 stub 서버로 연결 재사용 / phase별 동시성 제한 / SSE 스트리밍 / 재요청 / LLMEngine 재시도 검증
+
+실행: python test_openai_backend.py  (또는 pytest test_openai_backend.py)
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pipeline.llm import LLMEngine
+from pipeline.llm_backends import OpenAIBackend
+
+
+NORMAL_TEXT = "비 오는 밤이었습니다. 민서는 조용히 창밖을 바라보았어요."
+CHINESE_TEXT = "그녀는 말했다. 我们一起去吧这个地方很好非常好 그리고 웃었다." * 5
+
+
+class StubState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.inflight = 0
+        self.max_inflight = 0
+        self.failed_once = set()
+        self.bodies = []
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """/v1/completions (일반 + SSE) 와 /tokenize 를 흉내 내는 stub"""
+
+    protocol_version = "HTTP/1.1"
+    state: StubState = None
+
+    def setup(self):
+        super().setup()
+        with self.state.lock:
+            self.state.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])).decode('utf-8'))
+        state = self.state
+
+        if self.path == "/tokenize":
+            self._send_json(200, {"count": len(body["prompt"]) // 2, "tokens": []})
+            return
+
+        prompt = body["prompt"]
+        with state.lock:
+            state.requests += 1
+            state.bodies.append(body)
+            if "FAIL_ONCE" in prompt and prompt not in state.failed_once:
+                state.failed_once.add(prompt)
+                fail = True
+            else:
+                fail = False
+        if fail:
+            self._send_json(503, {"error": "overloaded"})
+            return
+
+        with state.lock:
+            state.inflight += 1
+            state.max_inflight = max(state.max_inflight, state.inflight)
+        try:
+            time.sleep(0.05)
+            text = CHINESE_TEXT if "중국어" in prompt and body.get("seed") == 0 else NORMAL_TEXT
+
+            if not body.get("stream"):
+                choices = [{"index": i, "text": text, "finish_reason": "stop"} for i in range(body.get("n", 1))]
+                self._send_json(200, {
+                    "choices": choices,
+                    "usage": {"prompt_tokens": len(prompt) // 2, "completion_tokens": len(text) * len(choices)}
+                })
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for i in range(0, len(text), 4):
+                    event = {"choices": [{"index": 0, "text": text[i:i + 4], "finish_reason": None}]}
+                    self._write_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode('utf-8'))
+                    time.sleep(0.002)
+                usage = {"prompt_tokens": len(prompt) // 2, "completion_tokens": len(text)}
+                final = {"choices": [{"index": 0, "text": "", "finish_reason": "stop"}], "usage": usage}
+                self._write_chunk(f"data: {json.dumps(final)}\n\n".encode('utf-8'))
+                self._write_chunk(b"data: [DONE]\n\n")
+                self._write_chunk(b"")
+            except (BrokenPipeError, ConnectionResetError):
+                # 클라이언트 조기 종료 (abort)
+                self.close_connection = True
+        finally:
+            with state.lock:
+                state.inflight -= 1
+
+
+def _start_stub():
+    state = StubState()
+    handler = type("Handler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def _backend(server, **kwargs) -> OpenAIBackend:
+    host, port = server.server_address
+    return OpenAIBackend(base_url=f"http://{host}:{port}/v1", model="stub", **kwargs)
+
+
+def test_generate_reuses_connections():
+    server, state = _start_stub()
+    try:
+        backend = _backend(server, pool_size=2)
+        for _ in range(5):
+            completions = backend.generate("프롬프트", {"n": 2, "json_schema": {"type": "object"}})
+            assert [c.text for c in completions] == [NORMAL_TEXT, NORMAL_TEXT]
+        assert state.requests == 5
+        assert state.connections == 1
+        assert backend.pool.created == 1
+        assert state.bodies[0]["guided_json"] == {"type": "object"}
+        assert state.bodies[0]["top_k"] == 40
+        assert backend.count_tokens("가나다라") == 2
+    finally:
+        server.shutdown()
+
+
+def test_phase_concurrency_limits():
+    server, state = _start_stub()
+    try:
+        backend = _backend(server, pool_size=8, phase_concurrency={"outline": 1, "parts": 3})
+
+        backend.generate_many([f"개요 {i}" for i in range(4)], [{}] * 4, phases=["outline"] * 4)
+        assert state.max_inflight == 1
+
+        state.max_inflight = 0
+        backend.generate_many([f"대본 {i}" for i in range(6)], [{}] * 6, phases=["parts"] * 6)
+        assert 1 < state.max_inflight <= 3
+    finally:
+        server.shutdown()
+
+
+def test_retry_on_503():
+    server, state = _start_stub()
+    try:
+        backend = _backend(server)
+        assert backend.generate("FAIL_ONCE 프롬프트", {})[0].text == NORMAL_TEXT
+        assert state.requests == 2
+    finally:
+        server.shutdown()
+
+
+def test_sse_stream_and_abort():
+    server, state = _start_stub()
+    try:
+        backend = _backend(server)
+
+        snapshots = list(backend.stream("프롬프트", {}))
+        assert snapshots[-1].text == NORMAL_TEXT
+        assert snapshots[-1].finish_reason == "stop"
+        assert snapshots[-1].output_tokens == len(NORMAL_TEXT)
+
+        # 조기 종료 시 연결은 풀에 반납되지 않고 버려짐 → 다음 요청은 새 연결
+        stream = backend.stream("프롬프트", {})
+        next(stream)
+        stream.close()
+        assert backend.pool._idle.qsize() == 0
+        backend.generate("프롬프트", {})
+        assert backend.pool.created == 2
+    finally:
+        server.shutdown()
+
+
+def test_engine_retries_chinese_through_backend():
+    server, state = _start_stub()
+    try:
+        engine = LLMEngine(config_path="__missing__.yaml", backend=_backend(server))
+        engine.seed = 0
+
+        # seed 0 → 중국어 응답 → seed 1로 재시도
+        assert engine.call_llm_text("중국어 대본", "parts", label="part1") == NORMAL_TEXT
+        assert [body["seed"] for body in state.bodies] == [0, 1]
+
+        # 스트리밍: 중국어 감지 즉시 연결을 끊고 재시도
+        engine.config['llm_streaming'] = {'enabled': True}
+        state.bodies.clear()
+        assert engine.call_llm_text("중국어 대본 (스트리밍)", "parts", label="part2") == NORMAL_TEXT
+        assert [body["seed"] for body in state.bodies] == [0, 1]
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    tests = [
+        test_generate_reuses_connections,
+        test_phase_concurrency_limits,
+        test_retry_on_503,
+        test_sse_stream_and_abort,
+        test_engine_retries_chinese_through_backend,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
@@ -0,0 +1,138 @@
+"""
+Phase별 프로파일러 테스트 스크립트 (GPU 불필요)
+동시 Phase 샘플 분리 / model·subprocess·wait·python 분류 / PhaseLogger 연동 / collapsed stack·요약 저장 검증
+
+실행: python test_profiler.py  (또는 pytest test_profiler.py)
+"""
+
+import json
+import logging
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from utils.logger import PhaseLogger
+from utils.profiler import PhaseProfiler, format_profile_table, profiling_settings
+
+
+def busy_loop(seconds: float) -> int:
+    total, deadline = 0, time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        total = (total + 1) % 1000003
+    return total
+
+
+# 모델 라이브러리 안에서 도는 연산 (모듈 이름으로 분류되므로 이름만 torch 하위 모듈로 지정)
+_model_namespace = {"__name__": "torch.nn.modules.fake", "busy_loop": busy_loop}
+exec("def forward(seconds):\n    return busy_loop(seconds)\n", _model_namespace)
+model_forward = _model_namespace["forward"]
+
+
+def run_phase(profiler: PhaseProfiler, number: str, work) -> None:
+    profiler.begin(number, f"Phase {number}")
+    work()
+    profiler.end(number)
+
+
+def test_concurrent_phases_are_classified_separately():
+    profiler = PhaseProfiler(interval_ms=5)
+    profiler.start()
+    phases = {
+        "python": lambda: busy_loop(0.4),
+        "subprocess": lambda: subprocess.run([sys.executable, "-c", "import time; time.sleep(0.4)"], check=True),
+        "wait": lambda: threading.Event().wait(0.4),
+        "model": lambda: model_forward(0.4),
+    }
+    threads = [
+        threading.Thread(target=run_phase, args=(profiler, number, work))
+        for number, work in phases.items()
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    profiler.stop()
+
+    summary = profiler.summary()
+    assert set(summary) == set(phases)
+    for number, row in summary.items():
+        assert row["completed"] and row["samples"] > 10, row
+        # 각 Phase의 샘플은 해당 분류가 대부분
+        assert row["breakdown"][number] > 80, (number, row["breakdown"])
+        assert row["rss_peak_mb"] >= row["rss_start_mb"] > 0
+
+    # Phase 스레드 CPU 시간: 대기 Phase는 거의 0, 자식 프로세스 CPU는 프로세스 전체 값
+    assert summary["wait"]["cpu_sec"] < 0.1
+    assert summary["python"]["cpu_sec"] > 0
+    assert summary["subprocess"]["children_cpu_sec"] > 0
+
+
+def test_phase_logger_records_profile_and_writes_files():
+    logger = logging.getLogger("test_profiler")
+    logger.handlers.clear()
+    logger.addHandler(logging.NullHandler())
+    profiler = PhaseProfiler(interval_ms=5)
+    phase_logger = PhaseLogger(logger, profiler=profiler)
+    profiler.start()
+    try:
+        phase_logger.start_phase("8a", "Hook TTS Generation")
+        busy_loop(0.2)
+        phase_logger.end_phase("8a", "Hook TTS Generation")
+
+        # end_phase 없이 끝난 Phase (예외) → stop()에서 실패로 마감
+        phase_logger.start_phase("9a", "Hook Subtitle Generation")
+        busy_loop(0.05)
+    finally:
+        profiler.stop()
+
+    # 프로파일러 없는 PhaseLogger는 기존과 동일
+    PhaseLogger(logger).start_phase(1, "Outline")
+
+    summary = profiler.summary()
+    assert summary["8a"]["completed"] and summary["8a"]["cpu_sec"] > 0
+    assert not summary["9a"]["completed"] and summary["9a"]["cpu_sec"] is None
+    table = format_profile_table(summary)
+    assert table.splitlines()[2].startswith("8a") and table.splitlines()[3].endswith("!")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        summary_path = profiler.write(tmp)
+        data = json.loads(Path(summary_path).read_text(encoding="utf-8"))
+        assert set(data["phases"]) == {"8a", "9a"} and data["interval_ms"] == 5
+
+        # collapsed stack: "바깥;...;안쪽 샘플수", 안쪽 프레임은 측정한 함수
+        lines = Path(data["collapsed"]["8a"]).read_text(encoding="utf-8").splitlines()
+        assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == data["phases"]["8a"]["samples"]
+        assert any(line.rsplit(" ", 1)[0].endswith(f"{__name__}:busy_loop") for line in lines)
+        all_lines = Path(data["collapsed"]["all"]).read_text(encoding="utf-8").splitlines()
+        assert {line.split(";")[0] for line in all_lines} == {
+            "phase 8a Hook TTS Generation", "phase 9a Hook Subtitle Generation"
+        }
+
+
+def test_profiling_settings_defaults():
+    assert profiling_settings({}) == {"enabled": False, "interval_ms": 10, "max_depth": 128}
+    assert profiling_settings({"profiling": {"enabled": True}})["enabled"] is True
+
+    profiler = PhaseProfiler(max_depth=3)
+    assert profiler.end(1) is None  # begin 없이 end
+    stack = profiler._stack(sys._getframe())  # 안쪽 3개 프레임만
+    assert len(stack) <= 3 and stack[-1] == (__name__, "test_profiling_settings_defaults")
+    assert profiler.classify([("main", "f"), ("concurrent.futures._base", "result"), ("threading", "wait")]) == "wait"
+    assert profiler.classify([("pipeline.video", "compile_video"), ("subprocess", "run"), ("selectors", "select")]) == "subprocess"
+    assert profiler.classify([("pipeline.tts", "synthesize"), ("TTS.api", "tts"), ("threading", "wait")]) == "model"
+    assert profiler.classify([("threading", "wait"), ("pipeline.video", "build_command")]) == "python"
+
+
+if __name__ == "__main__":
+    tests = [
+        test_concurrent_phases_are_classified_separately,
+        test_phase_logger_records_profile_and_writes_files,
+        test_profiling_settings_defaults,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
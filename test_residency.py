@@ -0,0 +1,326 @@
+"""
+GPU 모델 상주 관리 테스트 스크립트 (GPU 불필요)
+가짜 엔진(가상 GPU 점유량)으로 예산 준수 / 오프로드·언로드 선택 / 사용 중 모델 보호 / 스케줄러 연동
+/ lock 밖 로드·언로드·실패 복구 / 언로드 hook / LLM 엔진 명시적 종료 검증
+
+실행: python test_residency.py  (또는 pytest test_residency.py)
+"""
+
+import threading
+import time
+
+from pipeline.residency import ResidencyManager, ResidentModel
+from pipeline.scheduler import Phase, PhaseScheduler
+
+
+class FakeGPU:
+    """가짜 엔진들의 GPU 점유량 합계와 최대치를 기록"""
+
+    def __init__(self):
+        self.used_mb = 0
+        self.peak_mb = 0
+        self.log = []
+        self._lock = threading.Lock()
+
+    def model(self, name, gpu_mb, offloadable=True, load_cost_sec=30.0, onload_cost_sec=3.0):
+        def move(action, delta):
+            def fn():
+                with self._lock:
+                    self.used_mb += delta
+                    self.peak_mb = max(self.peak_mb, self.used_mb)
+                    self.log.append(f"{action}:{name}")
+            return fn
+
+        return ResidentModel(
+            name, gpu_mb,
+            load=move("load", gpu_mb),
+            unload=move("unload", -gpu_mb),
+            offload=move("offload", -gpu_mb) if offloadable else None,
+            onload=move("onload", gpu_mb) if offloadable else None,
+            load_cost_sec=load_cost_sec,
+            onload_cost_sec=onload_cost_sec
+        )
+
+
+def _manager(gpu, budget_mb, cpu_budget_mb=None):
+    manager = ResidencyManager(gpu_budget_mb=budget_mb, cpu_budget_mb=cpu_budget_mb, log=lambda message: None)
+    manager.register(gpu.model("llm", 40000, offloadable=False, load_cost_sec=120))
+    manager.register(gpu.model("image", 8000, load_cost_sec=25))
+    manager.register(gpu.model("tts", 3000, load_cost_sec=8, onload_cost_sec=1))
+    manager.register(gpu.model("whisper", 4000, offloadable=False, load_cost_sec=15))
+    return manager
+
+
+def _use(manager, name, upcoming):
+    manager.acquire([name], upcoming=upcoming)
+    manager.release([name])
+
+
+def test_models_stay_resident_when_budget_allows():
+    gpu = FakeGPU()
+    manager = _manager(gpu, budget_mb=80000)
+    for name in ["llm", "image", "tts", "whisper", "llm", "image"]:
+        _use(manager, name, upcoming=[])
+
+    assert gpu.log == ["load:llm", "load:image", "load:tts", "load:whisper"]
+    assert manager.summary()["states"] == {"llm": "gpu", "image": "gpu", "tts": "gpu", "whisper": "gpu"}
+
+
+def test_evicts_cheapest_to_reload_and_never_exceeds_budget():
+    """다시 안 쓰일 모델은 언로드, 곧 다시 쓰일 LLM(재로드 비용 큼)은 유지"""
+    gpu = FakeGPU()
+    manager = _manager(gpu, budget_mb=52000)
+
+    _use(manager, "llm", upcoming=["image", "llm"])
+    _use(manager, "image", upcoming=["llm", "tts", "whisper"])
+    # tts: 여유 4000 → 들어감
+    _use(manager, "tts", upcoming=["whisper", "llm"])
+    assert manager.models["llm"].state == "gpu"
+
+    # whisper(4000): 여유 1000 → image(다시 안 쓰임)를 언로드, llm/tts는 유지
+    _use(manager, "whisper", upcoming=["llm", "tts"])
+    assert "unload:image" in gpu.log and "unload:llm" not in gpu.log
+    assert manager.models["llm"].state == "gpu"
+    assert gpu.peak_mb <= 52000
+
+
+def test_offloads_to_cpu_when_reused_later():
+    """곧 다시 쓰일 오프로드 가능 모델은 언로드 대신 CPU로 (CPU 예산 초과 시 언로드)"""
+    gpu = FakeGPU()
+    manager = _manager(gpu, budget_mb=48000, cpu_budget_mb=10000)
+
+    _use(manager, "image", upcoming=["llm", "image"])
+    _use(manager, "llm", upcoming=["image"])
+    assert gpu.log == ["load:image", "load:llm"]
+
+    # 여유 0 → image(CPU 복귀 3초)와 llm(재로드 120초, 두 번째) 중 image를 CPU로
+    _use(manager, "tts", upcoming=["image", "llm"])
+    assert gpu.log[-2:] == ["offload:image", "load:tts"]
+    assert manager.models["image"].state == "cpu"
+
+    _use(manager, "image", upcoming=[])  # CPU → GPU (재로드 아님), llm/tts 중 하나 내림
+    assert "onload:image" in gpu.log
+    assert gpu.log.count("load:image") == 1
+    assert gpu.peak_mb <= 48000
+
+    manager.unload_all()
+    assert gpu.used_mb == 0
+
+
+def test_in_use_model_is_never_evicted():
+    """다른 Phase가 사용 중인 모델은 내리지 않고 끝날 때까지 대기"""
+    gpu = FakeGPU()
+    manager = _manager(gpu, budget_mb=44000)
+    manager.acquire(["llm"])
+
+    acquired = threading.Event()
+
+    def image_phase():
+        manager.acquire(["image"])
+        acquired.set()
+        manager.release(["image"])
+
+    thread = threading.Thread(target=image_phase)
+    thread.start()
+    time.sleep(0.05)
+    assert not acquired.is_set()
+    assert manager.models["llm"].state == "gpu"
+
+    manager.release(["llm"])
+    thread.join(timeout=2)
+    assert acquired.is_set()
+    assert gpu.log == ["load:llm", "unload:llm", "load:image"]
+
+    try:
+        manager.acquire(["llm", "image"])
+        assert False, "ValueError expected"
+    except ValueError:
+        pass
+
+
+def test_scheduler_passes_upcoming_phases():
+    """스케줄러가 대기 중 Phase의 모델 순서를 넘겨, 곧 쓰일 모델을 남기고 끝난 모델을 내림"""
+    gpu = FakeGPU()
+    manager = _manager(gpu, budget_mb=50000)
+    scheduler = PhaseScheduler(log=lambda message: None, residency=manager, max_workers=1)
+
+    scheduler.add(Phase("outline", lambda: "o", outputs=["outline"], models=["llm"]))
+    scheduler.add(Phase("hook_images", lambda outline: "hi", inputs=["outline"], outputs=["hook_images"], models=["image"]))
+    scheduler.add(Phase("parts", lambda hook_images: "p", inputs=["hook_images"], outputs=["parts"], models=["llm"]))
+    scheduler.add(Phase("tts", lambda parts: "a", inputs=["parts"], outputs=["audio"], models=["tts"]))
+    scheduler.add(Phase("subtitles", lambda audio: "s", inputs=["audio"], outputs=["subtitle"], models=["whisper"]))
+    scheduler.add(Phase("review", lambda subtitle: "r", inputs=["subtitle"], outputs=["review"], models=["llm"]))
+    scheduler.run()
+
+    # tts 시점: llm(40000) + image(8000) → 여유 2000, review에서 다시 쓰일 LLM 대신 끝난 image를 언로드
+    assert gpu.log.count("load:llm") == 1
+    assert "unload:image" in gpu.log and "unload:llm" not in gpu.log
+    assert gpu.peak_mb <= 50000
+
+
+def test_load_runs_outside_manager_lock():
+    """느린 load 중에도 이미 올라간 모델은 사용 가능, 같은 모델 요청은 로드 완료까지 대기 (중복 로드 없음)"""
+    gpu = FakeGPU()
+    manager = _manager(gpu, budget_mb=80000)
+    _use(manager, "tts", upcoming=[])
+
+    loading, finish = threading.Event(), threading.Event()
+    load_llm = manager.models["llm"].load
+
+    def slow_load():
+        loading.set()
+        finish.wait(2)
+        load_llm()
+
+    manager.models["llm"].load = slow_load
+    first = threading.Thread(target=_use, args=(manager, "llm", []))
+    first.start()
+    assert loading.wait(2)
+
+    # 로드 중: 자리는 예약됨, 다른 모델 acquire / release는 막히지 않음
+    assert manager.models["llm"].loading and manager.gpu_used_mb() == 43000
+    _use(manager, "tts", upcoming=[])
+
+    second_done = threading.Event()
+    second = threading.Thread(target=lambda: (_use(manager, "llm", []), second_done.set()))
+    second.start()
+    time.sleep(0.05)
+    assert not second_done.is_set()
+
+    finish.set()
+    first.join(timeout=2)
+    second.join(timeout=2)
+    assert second_done.is_set()
+    assert gpu.log == ["load:tts", "load:llm"]
+    assert manager.models["llm"].state == "gpu" and not manager.models["llm"].loading
+    assert manager.models["llm"].in_use == 0
+
+
+def test_eviction_runs_outside_manager_lock():
+    """느린 언로드(vLLM 종료 등) 중에도 다른 모델 acquire / release 가능, 내리는 중인 모델 요청은 완료 후 재로드"""
+    gpu = FakeGPU()
+    manager = _manager(gpu, budget_mb=48000)
+    _use(manager, "llm", upcoming=[])
+    _use(manager, "tts", upcoming=[])
+
+    unloading, finish = threading.Event(), threading.Event()
+    unload_llm = manager.models["llm"].unload
+
+    def slow_unload():
+        unloading.set()
+        finish.wait(2)
+        unload_llm()
+
+    manager.models["llm"].unload = slow_unload
+    image = threading.Thread(target=_use, args=(manager, "image", []))
+    image.start()
+    assert unloading.wait(2)
+
+    # 언로드 중: 내리는 동작이 예약되어 있고, GPU에 있는 tts는 막힘 없이 사용 가능
+    assert manager.models["llm"].unloading == "unload" and manager.models["image"].loading
+    _use(manager, "tts", upcoming=[])
+
+    llm_done = threading.Event()
+    llm = threading.Thread(target=lambda: (_use(manager, "llm", []), llm_done.set()))
+    llm.start()
+    time.sleep(0.05)
+    assert not llm_done.is_set()
+
+    finish.set()
+    image.join(timeout=2)
+    llm.join(timeout=2)
+    assert llm_done.is_set()
+    assert gpu.log[:4] == ["load:llm", "load:tts", "unload:llm", "load:image"]
+    assert gpu.log.count("load:llm") == 2 and gpu.peak_mb <= 48000
+    assert all(m.unloading is None and not m.loading and m.in_use == 0 for m in manager.models.values())
+    assert manager.gpu_used_mb() <= 48000
+
+
+def test_failed_load_releases_reservation():
+    gpu = FakeGPU()
+    manager = _manager(gpu, budget_mb=80000)
+    load_image = manager.models["image"].load
+
+    def broken_load():
+        raise RuntimeError("CUDA out of memory")
+
+    manager.models["image"].load = broken_load
+    try:
+        manager.acquire(["tts", "image"])
+        assert False, "RuntimeError expected"
+    except RuntimeError:
+        pass
+
+    # 먼저 올라간 tts는 GPU에 남고, 사용 표시 / 예약은 모두 취소
+    assert {name: (m.state, m.in_use, m.loading) for name, m in manager.models.items() if name in ("tts", "image")} == {
+        "tts": ("gpu", 0, False), "image": ("unloaded", 0, False)
+    }
+    assert manager.gpu_used_mb() == 3000
+
+    manager.models["image"].load = load_image
+    _use(manager, "image", upcoming=[])
+    assert gpu.log == ["load:tts", "load:image"]
+
+
+def test_unload_hook_runs_before_unload():
+    """LLM 통계 보존용: 모델이 아직 로드된 상태에서 hook 호출, 제거 후에는 호출 안 됨"""
+    gpu = FakeGPU()
+    manager = _manager(gpu, budget_mb=44000)
+    states = []
+
+    def hook():
+        states.append(manager.models["llm"].state)
+
+    manager.add_unload_hook("llm", hook)
+    _use(manager, "llm", upcoming=[])
+    _use(manager, "image", upcoming=["llm"])  # llm 언로드
+    assert states == ["gpu"] and gpu.log[-2:] == ["unload:llm", "load:image"]
+
+    manager.remove_unload_hook("llm", hook)
+    manager.remove_unload_hook("llm", hook)
+    _use(manager, "llm", upcoming=[])
+    manager.unload_all()
+    assert states == ["gpu"]
+
+
+def test_reset_llm_engine_closes_backend():
+    """LLM 언로드: 싱글톤 참조만 끊지 않고 백엔드를 명시적으로 종료"""
+    import pipeline.llm as llm_module
+    from pipeline.llm_backends import LLMBackend
+
+    class ClosingBackend(LLMBackend):
+        name = "fake"
+        closed = 0
+
+        def close(self):
+            ClosingBackend.closed += 1
+
+    engine = llm_module.LLMEngine(config_path="__missing__.yaml", backend=ClosingBackend())
+    telemetry = engine.telemetry
+    llm_module._llm_engine = engine
+    llm_module.reset_llm_engine()
+    assert ClosingBackend.closed == 1 and not llm_module.llm_engine_loaded()
+    # 보존해 둔 엔진 참조의 통계는 종료 후에도 읽을 수 있음
+    assert engine.telemetry is telemetry and engine.telemetry.summary() == {}
+
+    llm_module.reset_llm_engine()  # 로드되지 않은 상태에서는 아무것도 안 함
+    assert ClosingBackend.closed == 1
+
+
+if __name__ == "__main__":
+    tests = [
+        test_models_stay_resident_when_budget_allows,
+        test_evicts_cheapest_to_reload_and_never_exceeds_budget,
+        test_offloads_to_cpu_when_reused_later,
+        test_in_use_model_is_never_evicted,
+        test_scheduler_passes_upcoming_phases,
+        test_load_runs_outside_manager_lock,
+        test_eviction_runs_outside_manager_lock,
+        test_failed_load_releases_reservation,
+        test_unload_hook_runs_before_unload,
+        test_reset_llm_engine_closes_backend,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
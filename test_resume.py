@@ -0,0 +1,144 @@
+"""
+실행 manifest + resume 테스트 스크립트 (GPU 불필요)
+입력/출력 해시 기반 Phase 건너뛰기와 하위 Phase 무효화 검증
+
+실행: python test_resume.py  (또는 pytest test_resume.py)
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from pipeline.scheduler import Phase, PhaseScheduler
+from utils.file_utils import save_text
+from utils.run_manifest import RunManifest
+
+
+class FakePipeline:
+    """outline → script → audio → video (파일을 쓰는 가짜 Phase)"""
+
+    def __init__(self, base: Path):
+        self.base = base
+        self.calls = []
+        self.script_suffix = ""
+        self.fail_video = False
+
+    def build(self, resume: bool, audio_config: str = "vits") -> PhaseScheduler:
+        base = self.base
+        scheduler = PhaseScheduler(log=lambda message: None, manifest=RunManifest(str(base)), resume=resume)
+
+        def outline(title):
+            self.calls.append("outline")
+            data = {"title": title, "parts": 4}
+            save_text(str(data), f"{base}/outline.txt")
+            return data
+
+        def script(outline_data):
+            self.calls.append("script")
+            text = f"{outline_data['title']} 대본{self.script_suffix}"
+            save_text(text, f"{base}/script.txt")
+            return text
+
+        def audio(script_text):
+            self.calls.append("audio")
+            save_text(f"AUDIO[{script_text}]", f"{base}/audio.wav")
+            return f"{base}/audio.wav"
+
+        def video(audio_path):
+            self.calls.append("video")
+            if self.fail_video:
+                raise RuntimeError("ffmpeg 실패")
+            save_text("VIDEO", f"{base}/video.mp4")
+            return f"{base}/video.mp4"
+
+        scheduler.add(Phase("outline", outline, inputs=["title"], outputs=["outline_data"], files=[f"{base}/outline.txt"]))
+        scheduler.add(Phase("script", script, inputs=["outline_data"], outputs=["script_text"], files=[f"{base}/script.txt"]))
+        scheduler.add(Phase("audio", audio, inputs=["script_text"], outputs=["audio_path"],
+                            files=[f"{base}/audio.wav"], fingerprint=audio_config))
+        scheduler.add(Phase("video", video, inputs=["audio_path"], outputs=["video_path"], files=[f"{base}/video.mp4"]))
+        return scheduler
+
+    def run(self, resume: bool, **kwargs):
+        self.calls = []
+        scheduler = self.build(resume, **kwargs)
+        artifacts = scheduler.run(initial={"title": "제목"})
+        return scheduler, artifacts
+
+
+def test_resume_skips_unchanged_phases():
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = FakePipeline(Path(tmp))
+        _, first = pipeline.run(resume=False)
+        assert pipeline.calls == ["outline", "script", "audio", "video"]
+        assert (Path(tmp) / "run_manifest.json").exists()
+
+        scheduler, resumed = pipeline.run(resume=True)
+        assert pipeline.calls == []
+        assert scheduler.skipped == ["outline", "script", "audio", "video"]
+        assert resumed == first
+
+        # resume 없이 실행하면 모두 재실행
+        pipeline.run(resume=False)
+        assert pipeline.calls == ["outline", "script", "audio", "video"]
+
+
+def test_changed_output_file_reruns_phase_only():
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = FakePipeline(Path(tmp))
+        pipeline.run(resume=False)
+
+        # 오디오 파일 손상 → audio만 재실행 (같은 내용 재생성 → video는 그대로)
+        audio = Path(tmp) / "audio.wav"
+        audio.write_text("broken!", encoding='utf-8')
+        pipeline.run(resume=True)
+        assert pipeline.calls == ["audio"]
+
+        # 파일 삭제도 무효화
+        os.remove(Path(tmp) / "video.mp4")
+        pipeline.run(resume=True)
+        assert pipeline.calls == ["video"]
+
+
+def test_changed_output_invalidates_downstream():
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = FakePipeline(Path(tmp))
+        pipeline.run(resume=False)
+
+        # 대본 파일이 바뀌어 script 재실행 → 다른 대본 → audio, video도 재실행
+        (Path(tmp) / "script.txt").write_text("수정됨", encoding='utf-8')
+        pipeline.script_suffix = " (v2)"
+        _, artifacts = pipeline.run(resume=True)
+        assert pipeline.calls == ["script", "audio", "video"]
+        assert artifacts["script_text"].endswith("(v2)")
+
+        # 설정 fingerprint 변경 → 해당 Phase부터 재실행
+        pipeline.run(resume=True, audio_config="xtts")
+        assert pipeline.calls == ["audio"]
+
+
+def test_resume_after_failure():
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = FakePipeline(Path(tmp))
+        pipeline.fail_video = True
+        try:
+            pipeline.run(resume=False)
+            assert False, "RuntimeError expected"
+        except RuntimeError:
+            pass
+
+        pipeline.fail_video = False
+        pipeline.run(resume=True)
+        assert pipeline.calls == ["video"]
+
+
+if __name__ == "__main__":
+    tests = [
+        test_resume_skips_unchanged_phases,
+        test_changed_output_file_reruns_phase_only,
+        test_changed_output_invalidates_downstream,
+        test_resume_after_failure,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
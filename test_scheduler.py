@@ -0,0 +1,164 @@
+"""
+Phase 스케줄러 테스트 스크립트 (GPU 불필요)
+의존성 순서 / 동시 실행 / 자원별 동시성 제한 / 실행 순서 고정(after) / critical path / 실패 처리 검증
+
+실행: python test_scheduler.py  (또는 pytest test_scheduler.py)
+"""
+
+import threading
+import time
+
+from pipeline.scheduler import Phase, PhaseScheduler
+
+
+class Tracker:
+    """자원별 동시 실행 수 기록"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+        self.order = []
+
+    def phase(self, name: str, seconds: float, resource: str = "cpu", result=None):
+        def run(**inputs):
+            with self.lock:
+                self.order.append(name)
+                self.active[resource] = self.active.get(resource, 0) + 1
+                self.peak[resource] = max(self.peak.get(resource, 0), self.active[resource])
+            time.sleep(seconds)
+            with self.lock:
+                self.active[resource] -= 1
+            return result if result is not None else f"{name}({','.join(sorted(inputs))})"
+        return run
+
+
+def test_dependency_order_and_overlap():
+    tracker = Tracker()
+    scheduler = PhaseScheduler(log=lambda message: None)
+    scheduler.add(Phase("outline", tracker.phase("outline", 0.02), outputs=["outline"]))
+    scheduler.add(Phase("parts", tracker.phase("parts", 0.2), inputs=["outline"], outputs=["parts"]))
+    scheduler.add(Phase("hook_media", tracker.phase("hook_media", 0.05), inputs=["outline"], outputs=["hook_video"]))
+    scheduler.add(Phase("main_media", tracker.phase("main_media", 0.05), inputs=["parts"], outputs=["main_video"]))
+
+    started = time.perf_counter()
+    artifacts = scheduler.run(initial={"title": "제목"})
+    elapsed = time.perf_counter() - started
+
+    assert tracker.order[0] == "outline"
+    assert tracker.order.index("main_media") > tracker.order.index("parts")
+    assert artifacts["main_video"] == "main_media(parts)"
+    assert artifacts["title"] == "제목"
+    # hook_media는 parts와 겹쳐서 실행 → 순차 합계(0.32s)보다 짧음
+    assert elapsed < 0.31
+    assert scheduler.critical_path == ["outline", "parts", "main_media"]
+
+
+def test_resource_limits():
+    tracker = Tracker()
+    scheduler = PhaseScheduler(resource_limits={"gpu": 1}, max_workers=4, log=lambda message: None)
+    for i in range(3):
+        scheduler.add(Phase(f"gpu{i}", tracker.phase(f"gpu{i}", 0.03, "gpu"), outputs=[f"g{i}"], resources=["gpu"]))
+        scheduler.add(Phase(f"cpu{i}", tracker.phase(f"cpu{i}", 0.03, "cpu"), outputs=[f"c{i}"], resources=["cpu"]))
+
+    scheduler.run()
+    assert tracker.peak["gpu"] == 1
+    assert tracker.peak["cpu"] > 1
+
+
+def test_multiple_outputs():
+    completed = []
+    scheduler = PhaseScheduler(log=lambda message: None, on_phase_done=completed.append)
+    scheduler.add(Phase("hook", lambda: {"hook_text": "훅", "part1_text": "파트1"}, outputs=["hook_text", "part1_text"]))
+    scheduler.add(Phase("join", lambda hook_text, part1_text: hook_text + part1_text,
+                        inputs=["hook_text", "part1_text"], outputs=["joined"]))
+    assert scheduler.run()["joined"] == "훅파트1"
+    assert completed == ["hook", "join"]
+
+
+def test_graph_errors():
+    scheduler = PhaseScheduler(log=lambda message: None)
+    scheduler.add(Phase("a", lambda b: b, inputs=["b"], outputs=["a"]))
+    try:
+        scheduler.run()
+        assert False, "ValueError expected (missing producer)"
+    except ValueError as e:
+        assert "no phase produces" in str(e)
+
+    scheduler.add(Phase("b", lambda a: a, inputs=["a"], outputs=["b"]))
+    try:
+        scheduler.run()
+        assert False, "ValueError expected (cycle)"
+    except ValueError as e:
+        assert "cycle" in str(e)
+
+    try:
+        scheduler.add(Phase("c", lambda: 1, outputs=["a"]))
+        assert False, "ValueError expected (duplicate output)"
+    except ValueError:
+        pass
+
+
+def test_after_orders_phases_sharing_a_resource():
+    """짧은 Hook 쪽 LLM Phase가 먼저 → 긴 Parts 디코딩 중에 Hook TTS가 진행 (after는 산출물을 받지 않음)"""
+    tracker = Tracker()
+    scheduler = PhaseScheduler(resource_limits={"llm": 1}, log=lambda message: None)
+    scheduler.add(Phase("outline", tracker.phase("outline", 0.01, "llm"), outputs=["outline"], resources=["llm"]))
+    scheduler.add(Phase("hook", tracker.phase("hook", 0.02, "llm"), inputs=["outline"], outputs=["hook_text"], resources=["llm"]))
+    scheduler.add(Phase("hook_images_prompts", tracker.phase("hook_images_prompts", 0.02, "llm"),
+                        inputs=["hook_text"], outputs=["hook_images_data"], resources=["llm"]))
+    scheduler.add(Phase("parts", tracker.phase("parts", 0.3, "llm"), inputs=["outline"], outputs=["parts"],
+                        resources=["llm"], after=["hook_images_prompts"]))
+    scheduler.add(Phase("hook_tts", tracker.phase("hook_tts", 0.02, "tts"), inputs=["hook_text"], outputs=["hook_audio"],
+                        resources=["tts"]))
+    artifacts = scheduler.run()
+
+    timings = scheduler.timings
+    assert timings["parts"]["start"] >= timings["hook_images_prompts"]["end"]
+    assert timings["hook_tts"]["end"] < timings["parts"]["end"]
+    assert artifacts["parts"] == "parts(outline)"
+    assert scheduler.dependencies(scheduler.phases["parts"], {}) == ["outline", "hook_images_prompts"]
+
+    scheduler = PhaseScheduler(log=lambda message: None)
+    scheduler.add(Phase("parts", lambda: "x", outputs=["parts"], after=["missing"]))
+    try:
+        scheduler.run()
+        assert False, "ValueError expected"
+    except ValueError as e:
+        assert "missing" in str(e)
+
+
+def test_failure_stops_dependents():
+    tracker = Tracker()
+
+    def broken():
+        raise RuntimeError("TTS 실패")
+
+    scheduler = PhaseScheduler(log=lambda message: None)
+    scheduler.add(Phase("tts", broken, outputs=["audio"]))
+    scheduler.add(Phase("subtitles", tracker.phase("subtitles", 0.0), inputs=["audio"], outputs=["srt"]))
+    scheduler.add(Phase("images", tracker.phase("images", 0.05), outputs=["images"]))
+
+    try:
+        scheduler.run()
+        assert False, "RuntimeError expected"
+    except RuntimeError as e:
+        assert "TTS" in str(e)
+    assert "subtitles" not in tracker.order
+    # 이미 실행 중이던 Phase는 끝까지 실행
+    assert "images" in scheduler.timings and "end" in scheduler.timings["images"]
+
+
+if __name__ == "__main__":
+    tests = [
+        test_dependency_order_and_overlap,
+        test_resource_limits,
+        test_multiple_outputs,
+        test_graph_errors,
+        test_after_orders_phases_sharing_a_resource,
+        test_failure_stops_dependents,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
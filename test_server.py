@@ -0,0 +1,177 @@
+"""
+상주 서버 테스트 스크립트 (GPU 불필요)
+가짜 실행 함수로 작업 큐 순서 / 상태 / 산출물 경로 / 실패 처리 / Unix socket API 검증
+
+실행: python test_server.py  (또는 pytest test_server.py)
+"""
+
+import http.client
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from server import JobRunner, create_server
+
+
+class FakePipeline:
+    """제목별 가짜 산출물을 반환하고 실행 순서를 기록 ("실패"가 들어간 제목은 예외)"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, title, resume):
+        with self._lock:
+            self.calls.append((title, resume))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        if "실패" in title:
+            raise RuntimeError("pipeline exploded")
+        return {
+            "output_dir": f"/out/{title}",
+            "hook_video": f"/out/{title}/hook/hook_video.mp4",
+            "main_video": f"/out/{title}/main/main_video.mp4"
+        }
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path):
+        super().__init__("localhost")
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+def request(conn_factory, method, path, payload=None):
+    conn = conn_factory()
+    body = json.dumps(payload).encode("utf-8") if payload is not None else None
+    headers = {"Content-Type": "application/json"} if body else {}
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    data = json.loads(response.read())
+    conn.close()
+    return response.status, data
+
+
+def wait_for(conn_factory, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        _, job = request(conn_factory, "GET", f"/jobs/{job_id}")
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.02)
+    raise TimeoutError(job_id)
+
+
+def start_server(runner, **kwargs):
+    server = create_server(runner, port=0, models={"llm": 1.0}, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def test_jobs_run_in_order_one_at_a_time():
+    """여러 제목을 등록하면 큐 순서대로 하나씩 실행하고 산출물 경로를 보고"""
+    pipeline = FakePipeline()
+    runner = JobRunner(run_fn=pipeline)
+    runner.start()
+    server = start_server(runner)
+    port = server.server_address[1]
+    conn_factory = lambda: http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+
+    try:
+        status, data = request(conn_factory, "POST", "/jobs", {"titles": ["첫째", "둘째", "셋째"], "resume": True})
+        assert status == 202
+        job_ids = [job["id"] for job in data["jobs"]]
+
+        jobs = [wait_for(conn_factory, job_id) for job_id in job_ids]
+        assert [job["status"] for job in jobs] == ["completed"] * 3
+        assert pipeline.calls == [("첫째", True), ("둘째", True), ("셋째", True)]
+        assert pipeline.max_running == 1
+        assert jobs[1]["artifacts"]["main_video"] == "/out/둘째/main/main_video.mp4"
+        assert jobs[1]["artifacts"]["metadata"] == os.path.join("/out/둘째", "metadata.json")
+
+        _, health = request(conn_factory, "GET", "/health")
+        assert health["status"] == "ok" and health["queued"] == 0 and "llm" in health["models"]
+
+        _, listing = request(conn_factory, "GET", "/jobs")
+        assert [job["id"] for job in listing["jobs"]] == job_ids
+    finally:
+        server.shutdown()
+        server.server_close()
+        runner.stop(timeout=5)
+
+
+def test_failed_job_does_not_stop_queue():
+    """실패한 작업은 오류를 기록하고 다음 작업은 계속 실행"""
+    pipeline = FakePipeline(delay=0)
+    runner = JobRunner(run_fn=pipeline)
+    runner.start()
+    server = start_server(runner)
+    port = server.server_address[1]
+    conn_factory = lambda: http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+
+    try:
+        _, failed = request(conn_factory, "POST", "/jobs", {"title": "실패하는 제목"})
+        _, ok = request(conn_factory, "POST", "/jobs", {"title": "정상 제목"})
+
+        failed_job = wait_for(conn_factory, failed["jobs"][0]["id"])
+        ok_job = wait_for(conn_factory, ok["jobs"][0]["id"])
+        assert failed_job["status"] == "failed"
+        assert "pipeline exploded" in failed_job["error"]
+        assert ok_job["status"] == "completed"
+
+        status, _ = request(conn_factory, "POST", "/jobs", {"title": "  "})
+        assert status == 400
+        status, _ = request(conn_factory, "GET", "/jobs/unknown")
+        assert status == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+        runner.stop(timeout=5)
+
+
+def test_unix_socket_api():
+    """Unix socket으로 같은 API 제공"""
+    pipeline = FakePipeline(delay=0)
+    runner = JobRunner(run_fn=pipeline)
+    runner.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, "autodrama.sock")
+        server = start_server(runner, socket_path=socket_path)
+        conn_factory = lambda: UnixHTTPConnection(socket_path)
+
+        try:
+            status, data = request(conn_factory, "POST", "/jobs", {"title": "소켓 제목"})
+            assert status == 202
+            job = wait_for(conn_factory, data["jobs"][0]["id"])
+            assert job["status"] == "completed"
+            assert job["artifacts"]["output_dir"] == "/out/소켓 제목"
+        finally:
+            server.shutdown()
+            server.server_close()
+            runner.stop(timeout=5)
+
+
+if __name__ == "__main__":
+    tests = [
+        test_jobs_run_in_order_one_at_a_time,
+        test_failed_job_does_not_stop_queue,
+        test_unix_socket_api,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
@@ -0,0 +1,167 @@
+"""
+병렬(speculative) Part 생성 테스트 스크립트 (GPU 불필요)
+Outline 연결 정보 context / 도입부 분할 / seam repair 검증 / Part 1-4 단일 배치 + 이음새 수정 Phase 검증
+
+실행: python test_speculative_parts.py  (또는 pytest test_speculative_parts.py)
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+import main as pipeline_main
+from prompts.part_v3 import split_part_opening, validate_seam_repair
+from utils.context_generator import create_bridge_context
+from utils.logger import PhaseLogger, setup_logger
+
+
+OUTLINE = {
+    "meta": {"title": "할머니의 비밀 일기장"},
+    "part_breakdown": [
+        {
+            "part": n,
+            "primary_goal": f"Part {n} 목표",
+            "must_include": [f"Part {n} 필수 요소"],
+            "must_resolve": [f"Part {n} 해결"],
+            "open_threads": [f"Part {n} 미해결"],
+            "ending_hook": f"Part {n} 엔딩 훅",
+            "key_revelations": [f"Part {n} 공개 정보"],
+            "word_count_range": [12000, 13000],
+            "bridge_to_next": {
+                "connector_dialogue": "없음" if n == 4 else f"\"Part {n} 연결 대사\"",
+                "carry_over_summary": f"Part {n + 1}로 이어질 요소"
+            }
+        }
+        for n in range(1, 5)
+    ]
+}
+
+
+class FakeLLM:
+    """call_llm_text_many 호출을 기록하는 가짜 LLM 엔진"""
+
+    class Telemetry:
+        def __init__(self):
+            self.rejections = []
+
+        def reject(self, label, cause):
+            self.rejections.append((label, cause))
+
+    def __init__(self):
+        self.batches = []
+        self.telemetry = self.Telemetry()
+        self.prefix_cache_stats = {}
+
+    def call_llm_text_many(self, prompts, phases, labels=None, **kwargs):
+        self.batches.append((phases, labels, prompts))
+        if phases == "parts":
+            # Part 1은 실제 이전 Part 끝이 되므로 확인용 마지막 문장을 붙임
+            return [
+                "Part 1 대본입니다. " * 700 + "마지막 장면입니다." if label == "part1" else
+                f"Part {label[-1]} 초안 도입부, 이전 Part와 무관하게 시작합니다.\n\n" + "본문 문장입니다. " * 800
+                for label in labels
+            ]
+        # seam repair: part2 / part4는 정상, part3은 너무 짧음
+        repaired = {
+            "part2_seam": "이전 장면에서 이어지는 Part 2 새 도입부입니다.",
+            "part3_seam": "짧음",
+            "part4_seam": "이전 장면에서 이어지는 Part 4 새 도입부입니다."
+        }
+        return [repaired[label] for label in labels]
+
+    def continue_text(self, *args, **kwargs):
+        return ""
+
+
+def test_bridge_context_from_outline():
+    context = create_bridge_context(1, OUTLINE)
+    assert context["ending_sentence"] == "\"Part 1 연결 대사\""
+    assert "Part 2로 이어질 요소" in context["summary"] and "Part 1 공개 정보" in context["summary"]
+    assert context["next_must_address"] == ["Part 2 필수 요소"]
+    assert context["resolved_points"] == ["Part 1 해결"]
+
+    # 연결 대사가 "없음"이면 엔딩 훅으로 대체
+    outline = json.loads(json.dumps(OUTLINE))
+    outline["part_breakdown"][1]["bridge_to_next"]["connector_dialogue"] = "없음"
+    assert create_bridge_context(2, outline)["ending_sentence"] == "Part 2 엔딩 훅"
+
+
+def test_split_part_opening():
+    text = "첫 문단.\n\n둘째 문단.\n\n셋째 문단.\n\n넷째 문단."
+    opening, rest = split_part_opening(text, max_paragraphs=2)
+    assert opening == "첫 문단.\n\n둘째 문단.\n\n"
+    assert opening + rest == text
+
+    # 문단 구분 없이 긴 대본 → max_chars 안의 문장 끝에서 자름
+    long_text = "짧은 문장입니다. " * 100
+    opening, rest = split_part_opening(long_text, max_chars=50)
+    assert len(opening) <= 50 and opening.rstrip().endswith(".")
+    assert opening + rest == long_text
+
+
+def test_validate_seam_repair():
+    opening = "원래 도입부 문장입니다. " * 5
+    assert validate_seam_repair(opening, "다시 쓴 도입부 문장입니다. " * 5) == (True, "")
+    assert not validate_seam_repair(opening, "")[0]
+    assert validate_seam_repair(opening, "짧음")[1].startswith("length ratio")
+    assert validate_seam_repair(opening, "다시 쓴 도입부 文章 문장입니다. " * 5) == (False, "chinese")
+
+
+def test_speculative_phase_batches_parts_and_repairs_seams():
+    """Part 1-4는 한 배치로 생성, 이음새 수정도 한 배치 (검증 실패한 Part는 원래 도입부 유지)"""
+    fake = FakeLLM()
+    original_get_llm_engine = pipeline_main.get_llm_engine
+    pipeline_main.get_llm_engine = lambda config_path="config.yaml": fake
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            dirs = {name: str(Path(tmp) / name) for name in ["hook", "hook_images", "main", "main_images"]}
+            dirs["base"] = tmp
+            for path in dirs.values():
+                Path(path).mkdir(parents=True, exist_ok=True)
+
+            config = pipeline_main.load_config()
+            config["speculative_parts"] = {"enabled": True, "seam_paragraphs": 1}
+            config["streaming_media"] = {"enabled": True}
+            phase_logger = PhaseLogger(setup_logger(name="test_speculative_parts", level="ERROR"))
+            scheduler = pipeline_main.build_pipeline("제목", config, dirs, phase_logger)
+
+            parts = scheduler.phases["parts"]
+            assert parts.outputs == [f"part{n}_script" for n in range(1, 5)]
+            assert "part2" not in scheduler.phases  # Part별 순차 Phase 대신 단일 Phase
+            assert parts.inputs == ["outline_data"] and parts.after == ["hook_images_prompts"]
+
+            result = parts.fn(outline_data=OUTLINE)
+
+            assert [(phases, labels) for phases, labels, _ in fake.batches] == [
+                ("parts", ["part1", "part2", "part3", "part4"]),
+                ("seam_repair", ["part2_seam", "part3_seam", "part4_seam"]),
+            ]
+            # Part 2 프롬프트는 실제 Part 1 대신 Outline 연결 대사에서 이어짐
+            assert "Part 1 연결 대사" in fake.batches[0][2][1]
+            # seam 프롬프트에는 실제 이전 Part 끝이 들어감
+            assert "마지막 장면입니다." in fake.batches[1][2][0]
+
+            assert result["part2_script"].startswith("이전 장면에서 이어지는 Part 2 새 도입부입니다.\n\n본문")
+            assert result["part3_script"].startswith("Part 3 초안 도입부")
+            assert result["part4_script"].startswith("이전 장면에서 이어지는 Part 4")
+            assert [label for label, _ in fake.telemetry.rejections if label.endswith("_seam")] == ["part3_seam"]
+
+            assert Path(dirs["main"], "part2.txt").read_text(encoding="utf-8") == result["part2_script"]
+            report = json.loads(Path(dirs["main"], "seam_repairs.json").read_text(encoding="utf-8"))
+            assert [entry["accepted"] for entry in report] == [True, False, True]
+            assert Path(dirs["main"], "part1_bridge_context.json").exists()
+    finally:
+        pipeline_main.get_llm_engine = original_get_llm_engine
+
+
+if __name__ == "__main__":
+    tests = [
+        test_bridge_context_from_outline,
+        test_split_part_opening,
+        test_validate_seam_repair,
+        test_speculative_phase_batches_parts_and_repairs_seams,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
@@ -0,0 +1,131 @@
+"""
+Stage 워커(프로세스 격리) 테스트 스크립트 (GPU 불필요)
+워커 안 모델 재사용 / 작업 예외 전달 / 워커 비정상 종료 후 재시작 / Stage 간 동시 실행 검증
+
+실행: python test_stage_workers.py  (또는 pytest test_stage_workers.py)
+"""
+
+import os
+import time
+
+from pipeline.stage_workers import StageWorker, StageWorkerError, StageWorkerPool, create_stage_workers
+
+
+# 워커 프로세스에서 "test_stage_workers:함수"로 불리는 작업들 (spawn이 import할 수 있도록 모듈 최상위)
+_model_loads = 0
+
+
+def load_model() -> None:
+    global _model_loads
+    _model_loads += 1
+
+
+def use_model(text: str):
+    """모델 로드 횟수 / 프로세스 id / 입력 반환"""
+    if _model_loads == 0:
+        load_model()
+    return _model_loads, os.getpid(), text
+
+
+def fail_job(message: str):
+    raise ValueError(message)
+
+
+def crash_job():
+    os._exit(3)
+
+
+def sleep_job(seconds: float):
+    started = time.time()
+    time.sleep(seconds)
+    return started, time.time()
+
+
+def _quiet(message: str) -> None:
+    pass
+
+
+def test_worker_keeps_model_loaded_between_jobs():
+    worker = StageWorker("tts", warmup=("test_stage_workers:load_model", {}), log=_quiet)
+    try:
+        first = worker.run("test_stage_workers:use_model", "hook")
+        second = worker.run("test_stage_workers:use_model", text="main")
+        # warm-up에서 한 번만 로드되고, 작업은 부모와 다른 프로세스에서 실행
+        assert first[0] == second[0] == 1
+        assert first[1] == second[1] != os.getpid()
+        assert second[2] == "main"
+        assert worker.stats()["jobs_done"] == 2
+    finally:
+        worker.stop()
+    assert not worker.alive
+
+
+def test_job_exception_raises_with_traceback():
+    worker = StageWorker("whisper", log=_quiet)
+    try:
+        try:
+            worker.run("test_stage_workers:fail_job", "model missing")
+            assert False, "StageWorkerError expected"
+        except StageWorkerError as e:
+            assert "ValueError: model missing" in str(e)
+        # 실패 후에도 워커는 계속 사용 가능
+        assert worker.run("test_stage_workers:use_model", "ok")[2] == "ok"
+        assert worker.stats()["jobs_failed"] == 1
+    finally:
+        worker.stop()
+
+
+def test_crashed_worker_fails_pending_and_restarts():
+    worker = StageWorker("tts", log=_quiet)
+    try:
+        first_pid = worker.run("test_stage_workers:use_model", "before")[1]
+        try:
+            worker.submit("test_stage_workers:crash_job").result(timeout=30)
+            assert False, "StageWorkerError expected"
+        except StageWorkerError as e:
+            assert "exited unexpectedly" in str(e)
+
+        # 다음 작업에서 새 프로세스 시작
+        _, pid, text = worker.run("test_stage_workers:use_model", "after")
+        assert text == "after" and pid != first_pid
+    finally:
+        worker.stop()
+
+
+def test_stages_run_concurrently_and_pool_config():
+    config = {
+        "tts": {"model": "tts_models/test"},
+        "stage_workers": {"stages": {"tts": {"warmup": False}, "whisper": {"warmup": False}}}
+    }
+    pool = create_stage_workers(config, log=_quiet)
+    assert "tts" in pool and "whisper" in pool and "image" not in pool
+    assert pool.workers["tts"].warmup is None
+
+    # warm-up 설정: 엔진 싱글톤 로드 함수 + config의 모델 이름
+    warm = create_stage_workers({"tts": {"model": "tts_models/test"}}, log=_quiet)
+    assert warm.workers["tts"].warmup == ("pipeline.tts:get_tts_engine", {"model_name": "tts_models/test"})
+
+    try:
+        # 프로세스 시작 비용을 측정에서 제외
+        for name in ("tts", "whisper"):
+            pool.run(name, "test_stage_workers:sleep_job", 0)
+        futures = [pool.workers[name].submit("test_stage_workers:sleep_job", 0.5) for name in ("tts", "whisper")]
+        (tts_start, tts_end), (whisper_start, whisper_end) = [future.result(timeout=30) for future in futures]
+        assert tts_start < whisper_end and whisper_start < tts_end
+        assert set(pool.stats()) == {"tts", "whisper"}
+    finally:
+        pool.stop()
+    assert isinstance(StageWorkerPool().stats(), dict)
+
+
+if __name__ == "__main__":
+    tests = [
+        test_worker_keeps_model_loaded_between_jobs,
+        test_job_exception_raises_with_traceback,
+        test_crashed_worker_fails_pending_and_restarts,
+        test_stages_run_concurrently_and_pool_config,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
@@ -0,0 +1,87 @@
+"""
+Part별 세그먼트 영상 테스트 스크립트 (GPU/FFmpeg 불필요)
+장면 표시 시간 배분과 stream copy 이어붙이기 명령 검증
+
+실행: python test_video_segments.py  (또는 pytest test_video_segments.py)
+"""
+
+import tempfile
+from pathlib import Path
+
+import pipeline.video as video
+from pipeline.video import assign_scene_durations, concat_videos
+
+
+def test_scene_durations_follow_timestamp_gaps():
+    """Part 중간부터 시작하는 timestamp도 세그먼트 오디오 길이에 맞게 비례 배분"""
+    scenes = [
+        {"index": 4, "timestamp": 2100},
+        {"index": 5, "timestamp": 2200},
+        {"index": 6, "timestamp": 2500},
+    ]
+    result = assign_scene_durations(scenes, audio_duration=60.0)
+
+    # 간격 100, 300 + 마지막 장면은 평균 간격 200 → 1:3:2
+    assert [scene["duration"] for scene in result] == [10.0, 30.0, 20.0]
+    assert "duration" not in scenes[0]
+
+
+def test_scene_durations_fallback_to_even_split():
+    """timestamp가 증가하지 않으면 균등 분할"""
+    scenes = [{"index": 0, "timestamp": 0}, {"index": 1, "timestamp": 0}, {"index": 2, "timestamp": 0}, {"index": 3}]
+    result = assign_scene_durations(scenes, audio_duration=60.0)
+
+    assert [scene["duration"] for scene in result] == [15.0, 15.0, 15.0, 15.0]
+    assert assign_scene_durations([], 10.0) == []
+
+
+def test_concat_videos_uses_stream_copy():
+    """세그먼트 순서대로 concat 리스트 작성 + 재인코딩 없이 복사"""
+    calls = []
+
+    class Result:
+        returncode = 0
+        stderr = ""
+
+    def fake_run(cmd, **kwargs):
+        list_file = cmd[cmd.index("-i") + 1]
+        calls.append((cmd, Path(list_file).read_text()))
+        return Result()
+
+    original_run = video.subprocess.run
+    video.subprocess.run = fake_run
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            segments = [f"{tmp}/part{n}_video.mp4" for n in range(1, 5)]
+            output = concat_videos(segments, f"{tmp}/main_video.mp4")
+
+            assert output == f"{tmp}/main_video.mp4"
+            assert list(Path(tmp).iterdir()) == []  # 리스트 파일 정리
+    finally:
+        video.subprocess.run = original_run
+
+    cmd, listing = calls[0]
+    assert cmd[cmd.index("-c") + 1] == "copy"
+    assert "-vf" not in cmd
+    assert [line.split("/")[-1] for line in listing.splitlines()] == [f"part{n}_video.mp4'" for n in range(1, 5)]
+
+
+def test_concat_videos_requires_segments():
+    try:
+        concat_videos([], "/tmp/main_video.mp4")
+        assert False, "ValueError expected"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    tests = [
+        test_scene_durations_follow_timestamp_gaps,
+        test_scene_durations_fallback_to_even_split,
+        test_concat_videos_uses_stream_copy,
+        test_concat_videos_requires_segments,
+    ]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tests passed")
@@ -78,6 +78,89 @@ def create_part_context(
     return context
 
 
+def create_bridge_context(
+    part_number: int,
+    outline_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    이전 Part 대본 없이 Outline만으로 다음 Part로 전달할 context를 생성합니다. (병렬 Part 생성용)
+
+    create_part_context와 같은 필드를 채우되, 대본 대신 현재 Part의
+    bridge_to_next(carry_over_summary / connector_dialogue)와 ending_hook을 사용합니다.
+
+    Args:
+        part_number (int): 현재 Part 번호 (1-3)
+        outline_data (dict): outline_v2_final.json 데이터
+
+    Returns:
+        dict: 다음 Part로 전달할 context
+    """
+    part_breakdown = outline_data.get("part_breakdown", [])
+    current_part = next((part for part in part_breakdown if part.get("part") == part_number), {})
+    next_part = next((part for part in part_breakdown if part.get("part") == part_number + 1), {})
+
+    bridge = current_part.get("bridge_to_next", {}) or {}
+    ending_hook = current_part.get("ending_hook", "")
+
+    # 1. Summary: Part 목표 + 핵심 사실 + 다음 Part로 이어질 요소 (최대 350자)
+    summary_items = [current_part.get("primary_goal", "")]
+    summary_items += current_part.get("key_revelations", [])
+    summary_items += [bridge.get("carry_over_summary", ""), ending_hook]
+    summary = " ".join(item.strip() for item in summary_items if item and item.strip())[:350]
+
+    # 2. Ending sentence: 연결 대사 (없으면 엔딩 훅)
+    connector = (bridge.get("connector_dialogue", "") or "").strip()
+    ending_sentence = connector if connector and connector != "없음" else ending_hook
+
+    return {
+        "summary": summary or "요약 없음",
+        "character_updates": {},
+        "open_threads": current_part.get("open_threads", [])[:5],
+        "resolved_points": current_part.get("must_resolve", []),
+        "next_must_address": next_part.get("must_include", []),
+        "ending_sentence": ending_sentence.strip()
+    }
+
+
+def create_part_excerpt(part_text: str, max_chars: int = 1500) -> str:
+    """
+    Part 대본 전체에서 고르게 뽑은 문장 발췌를 생성합니다. (Main 이미지 장면 선택용)
+
+    Part 대본 4개를 그대로 넣으면 프롬프트가 max_model_len을 넘으므로,
+    시작 / 중간 / 결말 장면이 모두 남도록 같은 간격으로 문장을 골라 원래 순서대로 이어붙입니다.
+
+    Args:
+        part_text (str): Part 대본 텍스트
+        max_chars (int): 최대 길이
+
+    Returns:
+        str: 발췌 텍스트 (대본이 max_chars 이하면 원문 그대로)
+    """
+    text = (part_text or "").strip()
+    if len(text) <= max_chars:
+        return text
+
+    sentences = [s.strip() for s in re.split(r'(?<=[\.?!])\s+', text) if s.strip()]
+    if not sentences:
+        return text[:max_chars]
+
+    # 평균 문장 길이로 뽑을 문장 수를 정하고 같은 간격으로 선택 (첫 / 마지막 문장 포함)
+    average = sum(len(s) + 1 for s in sentences) / len(sentences)
+    count = max(min(int(max_chars / average), len(sentences)), 1)
+    if count == 1:
+        indices = [0]
+    else:
+        step = (len(sentences) - 1) / (count - 1)
+        indices = sorted({round(i * step) for i in range(count)})
+
+    excerpt = ""
+    for index in indices:
+        if len(excerpt) + len(sentences[index]) + 1 > max_chars:
+            break
+        excerpt += sentences[index] + " "
+    return excerpt.strip() or text[:max_chars]
+
+
 def _extract_summary(text: str, max_length: int = 350) -> str:
     """
     대본에서 핵심 요약을 추출합니다.
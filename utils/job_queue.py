@@ -0,0 +1,546 @@
+"""
+SQLite 기반 영구 작업 큐
+제목 작업을 우선순위 순으로 워커에 임대(lease)하고, 상태를 DB에 기록하여 프로세스가 죽어도 복구
+
+- enqueue / lease / heartbeat / complete / fail
+- priority가 높은 작업부터, 같으면 먼저 등록된 작업부터 임대
+- stage별 동시 임대 수 상한 (stage_limits)
+- heartbeat가 끊겨 임대가 만료된 작업은 다시 queued로 돌려 다음 워커가 --resume으로 이어서 실행
+  (마지막으로 완료된 Phase는 last_phase에 기록, 실제 건너뛰기는 run_manifest.json 기준)
+
+CLI:
+    python -m utils.job_queue import titles.jsonl   # {"title": "...", "priority": 0} 한 줄에 하나
+    python -m utils.job_queue stats
+    python -m utils.job_queue work --worker-id gpu0
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional
+
+
+DEFAULT_STAGE = "pipeline"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    stage TEXT NOT NULL DEFAULT 'pipeline',
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    worker_id TEXT,
+    lease_expires_at REAL,
+    last_phase TEXT,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, stage, priority DESC, id);
+"""
+
+
+class LeaseLost(RuntimeError):
+    """임대가 만료되어 작업이 다른 워커에 넘어간 경우 (실행 중단, 결과는 기록하지 않음)"""
+
+
+class JobQueue:
+    """
+    SQLite 작업 큐 (여러 워커 프로세스가 같은 DB 파일을 공유)
+
+    작업 상태: queued → leased → completed / failed
+    (leased 상태에서 fail(retry=True) 또는 임대 만료 시 max_attempts 전까지 queued로 복귀)
+
+    Example:
+        >>> queue = JobQueue("jobs.sqlite3", stage_limits={"pipeline": 1})
+        >>> queue.enqueue("할머니의 비밀 일기장", priority=10)
+        >>> job = queue.lease("gpu0")
+        >>> queue.heartbeat(job["id"], "gpu0", last_phase="outline")
+        >>> queue.complete(job["id"], "gpu0", {"main_video": "..."})
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        lease_sec: float = 600,
+        stage_limits: Optional[Dict[str, int]] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            lease_sec: 임대 유효 시간 (heartbeat마다 연장)
+            stage_limits: stage별 동시 임대 수 상한 (없는 stage는 제한 없음)
+            clock: 현재 시각 함수 (테스트용)
+        """
+        self.db_path = str(db_path)
+        self.lease_sec = lease_sec
+        self.stage_limits = dict(stage_limits or {})
+        self.clock = clock
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _transaction(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """BEGIN IMMEDIATE 트랜잭션 (다른 프로세스의 동시 임대와 직렬화)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    @staticmethod
+    def _to_dict(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"] or "{}")
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def enqueue(
+        self,
+        title: str,
+        priority: int = 0,
+        stage: str = DEFAULT_STAGE,
+        payload: Optional[Dict[str, Any]] = None,
+        max_attempts: int = 3
+    ) -> int:
+        """
+        작업 등록
+
+        Args:
+            title: 드라마 제목
+            priority: 우선순위 (클수록 먼저)
+            stage: 작업 stage (stage_limits 적용 단위)
+            payload: 추가 정보 (JSON 직렬화 가능)
+            max_attempts: 최대 시도 횟수
+
+        Returns:
+            작업 ID
+
+        Raises:
+            ValueError: 제목이 비어 있는 경우
+        """
+        return self.enqueue_many([{
+            "title": title,
+            "priority": priority,
+            "stage": stage,
+            "payload": payload,
+            "max_attempts": max_attempts
+        }])[0]
+
+    def enqueue_many(self, items: List[Dict[str, Any]]) -> List[int]:
+        """
+        여러 작업을 하나의 트랜잭션으로 등록
+
+        Args:
+            items: {"title", "priority"?, "stage"?, "payload"?, "max_attempts"?} 리스트
+
+        Returns:
+            작업 ID 리스트
+        """
+        for item in items:
+            if not str(item.get("title") or "").strip():
+                raise ValueError(f"title is required: {item}")
+
+        def insert(conn):
+            now = self.clock()
+            ids = []
+            for item in items:
+                cursor = conn.execute(
+                    "INSERT INTO jobs (title, payload, stage, priority, max_attempts, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        str(item["title"]).strip(),
+                        json.dumps(item.get("payload") or {}, ensure_ascii=False),
+                        item.get("stage") or DEFAULT_STAGE,
+                        int(item.get("priority") or 0),
+                        int(item.get("max_attempts") or 3),
+                        now, now
+                    )
+                )
+                ids.append(cursor.lastrowid)
+            return ids
+
+        return self._transaction(insert)
+
+    def _requeue_expired(self, conn: sqlite3.Connection) -> int:
+        """만료된 임대 → queued (시도 횟수를 다 쓴 작업은 failed)"""
+        now = self.clock()
+        expired = conn.execute(
+            "SELECT id, attempts, max_attempts, worker_id FROM jobs WHERE status = 'leased' AND lease_expires_at < ?",
+            (now,)
+        ).fetchall()
+        for row in expired:
+            exhausted = row["attempts"] >= row["max_attempts"]
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = NULL, lease_expires_at = NULL, error = ?, updated_at = ? "
+                "WHERE id = ?",
+                (
+                    "failed" if exhausted else "queued",
+                    f"lease expired (worker {row['worker_id']})",
+                    now,
+                    row["id"]
+                )
+            )
+        return len(expired)
+
+    def requeue_expired(self) -> int:
+        """
+        heartbeat가 끊긴(워커가 죽은) 작업을 다시 대기열로
+
+        Returns:
+            처리한 작업 수
+        """
+        return self._transaction(self._requeue_expired)
+
+    def lease(self, worker_id: str, stages: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        다음 작업 임대
+
+        Args:
+            worker_id: 워커 ID
+            stages: 임대할 stage 목록 (None이면 전체)
+
+        Returns:
+            작업 dict (attempts는 이번 시도 포함), 없거나 모든 stage가 상한이면 None
+        """
+        def take(conn):
+            self._requeue_expired(conn)
+
+            leased = {
+                row["stage"]: row["count"]
+                for row in conn.execute(
+                    "SELECT stage, COUNT(*) AS count FROM jobs WHERE status = 'leased' GROUP BY stage"
+                )
+            }
+            blocked = [
+                stage for stage, limit in self.stage_limits.items()
+                if leased.get(stage, 0) >= int(limit)
+            ]
+
+            query = "SELECT * FROM jobs WHERE status = 'queued'"
+            params: List[Any] = []
+            if stages is not None:
+                query += f" AND stage IN ({', '.join('?' * len(stages))})"
+                params.extend(stages)
+            if blocked:
+                query += f" AND stage NOT IN ({', '.join('?' * len(blocked))})"
+                params.extend(blocked)
+            query += " ORDER BY priority DESC, id ASC LIMIT 1"
+
+            row = conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+
+            now = self.clock()
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', attempts = attempts + 1, worker_id = ?, "
+                "lease_expires_at = ?, error = NULL, updated_at = ? WHERE id = ?",
+                (worker_id, now + self.lease_sec, now, row["id"])
+            )
+            return self._to_dict(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+        return self._transaction(take)
+
+    def heartbeat(self, job_id: int, worker_id: str, last_phase: Optional[str] = None) -> bool:
+        """
+        임대 연장 (+ 마지막으로 완료된 Phase 기록)
+
+        Returns:
+            False면 임대를 잃은 것 (만료 후 다른 워커에 넘어감) → 작업 중단 필요
+        """
+        def extend(conn):
+            now = self.clock()
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, last_phase = COALESCE(?, last_phase), updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND worker_id = ?",
+                (now + self.lease_sec, last_phase, now, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(extend)
+
+    def complete(self, job_id: int, worker_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        작업 완료
+
+        Returns:
+            False면 임대를 이미 잃은 경우 (기록하지 않음)
+        """
+        def finish(conn):
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'completed', result = ?, lease_expires_at = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND worker_id = ?",
+                (json.dumps(result or {}, ensure_ascii=False, default=str), self.clock(), job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(finish)
+
+    def fail(self, job_id: int, worker_id: str, error: str, retry: bool = True) -> Optional[str]:
+        """
+        작업 실패 기록
+
+        Args:
+            retry: True면 시도 횟수가 남아 있을 때 다시 queued로
+
+        Returns:
+            변경된 상태 ("queued" / "failed"), 임대를 이미 잃었으면 None
+        """
+        def record(conn):
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = 'leased' AND worker_id = ?",
+                (job_id, worker_id)
+            ).fetchone()
+            if row is None:
+                return None
+            status = "queued" if retry and row["attempts"] < row["max_attempts"] else "failed"
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, worker_id = NULL, lease_expires_at = NULL, updated_at = ? "
+                "WHERE id = ?",
+                (status, error, self.clock(), job_id)
+            )
+            return status
+
+        return self._transaction(record)
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._to_dict(self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def list(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """작업 목록 (우선순위 → 등록 순)"""
+        query = "SELECT * FROM jobs"
+        params: List[Any] = []
+        if status is not None:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY priority DESC, id ASC"
+        with self._lock:
+            return [self._to_dict(row) for row in self._conn.execute(query, params)]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """stage별 상태별 작업 수"""
+        with self._lock:
+            rows = self._conn.execute("SELECT stage, status, COUNT(*) AS count FROM jobs GROUP BY stage, status").fetchall()
+        stats: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            stats.setdefault(row["stage"], {})[row["status"]] = row["count"]
+        return stats
+
+    def import_jsonl(self, path: str, priority: int = 0, stage: str = DEFAULT_STAGE) -> List[int]:
+        """
+        JSONL 파일에서 제목 일괄 등록
+
+        한 줄에 {"title": "...", "priority"?: int, "stage"?: str} 또는 JSON 문자열 하나.
+        빈 줄은 무시하며, 지정되지 않은 priority/stage는 인자 값을 사용합니다.
+
+        Returns:
+            등록된 작업 ID 리스트
+
+        Raises:
+            ValueError: 잘못된 줄이 있는 경우 (아무것도 등록하지 않음)
+        """
+        items = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{path}:{line_number}: invalid JSON ({e})")
+                if isinstance(record, str):
+                    record = {"title": record}
+                if not isinstance(record, dict) or not str(record.get("title") or "").strip():
+                    raise ValueError(f"{path}:{line_number}: missing title")
+                items.append({
+                    "title": record["title"],
+                    "priority": record.get("priority", priority),
+                    "stage": record.get("stage", stage),
+                    "payload": {key: value for key, value in record.items() if key not in ("title", "priority", "stage")}
+                })
+        return self.enqueue_many(items) if items else []
+
+
+def run_worker(
+    queue: JobQueue,
+    worker_id: str,
+    run_fn: Callable[..., Dict[str, Any]],
+    stages: Optional[List[str]] = None,
+    heartbeat_sec: float = 30,
+    poll_sec: float = 5,
+    stop_event: Optional[threading.Event] = None,
+    max_jobs: Optional[int] = None
+) -> int:
+    """
+    작업 큐 워커 루프
+
+    작업을 임대하여 run_fn(title, resume=..., on_phase_done=...)으로 실행합니다.
+    두 번째 시도부터는 resume=True로 실행하여 이전 워커가 완료한 Phase를 건너뜁니다.
+    실행 중에는 heartbeat_sec마다, 그리고 Phase가 끝날 때마다 임대를 연장합니다.
+    임대를 잃으면(만료 후 다른 워커가 임대) 다음 Phase 경계에서 LeaseLost로 실행을 중단하고,
+    같은 출력 디렉토리에 두 워커가 동시에 쓰지 않도록 결과 / 실패를 기록하지 않습니다.
+
+    Args:
+        queue: 작업 큐
+        worker_id: 워커 ID
+        run_fn: 파이프라인 실행 함수 (main.main과 같은 시그니처)
+        stages: 처리할 stage 목록 (None이면 전체)
+        heartbeat_sec: heartbeat 간격 (lease_sec보다 충분히 짧게)
+        poll_sec: 대기열이 비었을 때 재확인 간격
+        stop_event: 설정되면 현재 작업 후 종료
+        max_jobs: 처리할 최대 작업 수 (None이면 무제한)
+
+    Returns:
+        처리한 작업 수
+    """
+    stop_event = stop_event or threading.Event()
+    processed = 0
+
+    while not stop_event.is_set() and (max_jobs is None or processed < max_jobs):
+        job = queue.lease(worker_id, stages=stages)
+        if job is None:
+            if max_jobs is not None:
+                break
+            stop_event.wait(poll_sec)
+            continue
+
+        resume = job["attempts"] > 1
+        print(f"▶ Job {job['id']} (attempt {job['attempts']}/{job['max_attempts']}): {job['title']}"
+              + (f" (resume after {job['last_phase']})" if resume and job["last_phase"] else ""))
+
+        finished = threading.Event()
+        lost = threading.Event()
+
+        def keep_alive():
+            while not finished.wait(heartbeat_sec):
+                if not queue.heartbeat(job["id"], worker_id):
+                    print(f"⚠ Job {job['id']}: lease lost, stopping at the next phase")
+                    lost.set()
+                    return
+
+        def on_phase_done(phase: str) -> None:
+            # 임대를 잃은 뒤에는 새 Phase를 시작하지 않음 (스케줄러가 예외를 받으면 남은 Phase를 실행하지 않음)
+            if lost.is_set() or not queue.heartbeat(job["id"], worker_id, last_phase=phase):
+                lost.set()
+                raise LeaseLost(f"job {job['id']} lease lost after phase '{phase}'")
+
+        heartbeat_thread = threading.Thread(target=keep_alive, name=f"heartbeat-{job['id']}", daemon=True)
+        heartbeat_thread.start()
+
+        try:
+            metadata = run_fn(job["title"], resume=resume, on_phase_done=on_phase_done) or {}
+            if queue.complete(job["id"], worker_id, {
+                key: metadata.get(key)
+                for key in ("output_dir", "hook_video", "main_video")
+            }):
+                print(f"✓ Job {job['id']} completed")
+            else:
+                print(f"⚠ Job {job['id']}: lease lost, result discarded")
+        except Exception as e:
+            status = None if lost.is_set() else queue.fail(job["id"], worker_id, f"{type(e).__name__}: {e}")
+            if status is None:
+                print(f"⚠ Job {job['id']}: lease lost, result discarded ({e})")
+            else:
+                print(f"✗ Job {job['id']} failed ({status}): {e}")
+        finally:
+            finished.set()
+            heartbeat_thread.join()
+
+        processed += 1
+
+    return processed
+
+
+def create_queue(config: Dict[str, Any]) -> JobQueue:
+    """config의 job_queue 설정으로 JobQueue 생성"""
+    queue_config = config.get("job_queue", {}) or {}
+    return JobQueue(
+        queue_config.get("db_path", "./job_queue.sqlite3"),
+        lease_sec=queue_config.get("lease_sec", 600),
+        stage_limits=queue_config.get("stage_limits", {})
+    )
+
+
+if __name__ == "__main__":
+    import yaml
+
+    parser = argparse.ArgumentParser(description="AutoDrama 작업 큐")
+    parser.add_argument("--config", default="config.yaml", help="설정 파일 경로")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="JSONL 파일에서 제목 일괄 등록")
+    import_parser.add_argument("path", help='한 줄에 {"title": "...", "priority": 0}')
+    import_parser.add_argument("--priority", type=int, default=0, help="priority가 없는 줄의 기본 우선순위")
+    import_parser.add_argument("--stage", default=DEFAULT_STAGE, help="stage가 없는 줄의 기본 stage")
+
+    subparsers.add_parser("stats", help="stage별 상태별 작업 수")
+
+    list_parser = subparsers.add_parser("list", help="작업 목록")
+    list_parser.add_argument("--status", default=None, help="queued / leased / completed / failed")
+
+    work_parser = subparsers.add_parser("work", help="워커 실행 (main.main으로 작업 처리)")
+    work_parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    work_parser.add_argument("--stage", action="append", default=None, help="처리할 stage (여러 번 지정 가능)")
+    work_parser.add_argument("--max-jobs", type=int, default=None, help="처리 후 종료할 작업 수")
+
+    args = parser.parse_args()
+
+    config = {}
+    if os.path.exists(args.config):
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    queue = create_queue(config)
+
+    if args.command == "import":
+        job_ids = queue.import_jsonl(args.path, priority=args.priority, stage=args.stage)
+        print(f"✓ Imported {len(job_ids)} jobs into {queue.db_path}")
+    elif args.command == "stats":
+        print(json.dumps(queue.stats(), ensure_ascii=False, indent=2))
+    elif args.command == "list":
+        for job in queue.list(args.status):
+            print(f"{job['id']:>6}  {job['status']:<9}  p{job['priority']:<3}  {job['stage']:<10}  "
+                  f"{job['attempts']}/{job['max_attempts']}  {job['last_phase'] or '-':<20}  {job['title']}")
+    elif args.command == "work":
+        from main import main as run_pipeline
+
+        queue_config = config.get("job_queue", {}) or {}
+        try:
+            count = run_worker(
+                queue,
+                args.worker_id,
+                run_pipeline,
+                stages=args.stage,
+                heartbeat_sec=queue_config.get("heartbeat_sec", 30),
+                poll_sec=queue_config.get("poll_sec", 5),
+                max_jobs=args.max_jobs
+            )
+            print(f"✓ Worker {args.worker_id} processed {count} jobs")
+        except KeyboardInterrupt:
+            print(f"\nWorker {args.worker_id} stopped (leased job will be requeued after lease expiry)")
@@ -0,0 +1,202 @@
+"""
+LLM JSON 출력 로컬 복구 유틸리티
+
+json.loads 실패 시 재생성(7000 토큰) 전에 결정적(deterministic) 복구를 시도합니다.
+
+복구 항목:
+- trailing_comma: 닫는 괄호 앞의 불필요한 콤마 제거
+- inner_quote: 한국어 대사 등 문자열 내부의 이스케이프 안 된 큰따옴표 → \\"
+- control_char: 문자열 내부의 줄바꿈/탭 등 제어 문자 이스케이프
+- bracket_mismatch: 잘못된 닫는 괄호 교정
+- close_string: max_tokens 절단으로 열린 채 끝난 문자열 닫기
+- truncate_partial: 절단된 마지막 불완전 항목 제거
+- close_brackets: 절단으로 닫히지 않은 괄호 닫기
+"""
+
+import json
+from typing import List, Optional, Tuple
+
+
+# 절단 복구 시 되돌아가 볼 최대 콤마 위치 수
+MAX_CUT_BACKTRACK = 8
+
+_CONTROL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t', '\b': '\\b', '\f': '\\f'}
+
+
+def _next_non_space(text: str, pos: int) -> Tuple[int, str]:
+    """pos 이후 첫 번째 공백이 아닌 문자 (없으면 (len, ''))"""
+    while pos < len(text) and text[pos] in ' \t\r\n':
+        pos += 1
+    return pos, (text[pos] if pos < len(text) else '')
+
+
+def _is_string_end(text: str, pos: int, container: Optional[str]) -> bool:
+    """
+    text[pos-1]의 큰따옴표가 문자열 종료인지 판단
+
+    종료 따옴표 뒤에는 ':' / ',' / '}' / ']' 또는 텍스트 끝만 올 수 있습니다.
+    ',' 뒤에는 다음 항목의 시작(객체: 키 문자열, 배열: 값)이 와야 합니다.
+    """
+    pos, c = _next_non_space(text, pos)
+    if c == '' or c in ':}]':
+        return True
+    if c != ',':
+        return False
+
+    _, after = _next_non_space(text, pos + 1)
+    if after == '':
+        return True
+    if container == '{':
+        return after in '"}'
+    return after in '"{[]-0123456789tfn'
+
+
+def _close(chars: List[str], stack: List[str]) -> str:
+    """불완전한 꼬리(공백, 콤마, 값 없는 키)를 정리하고 열린 괄호를 닫음"""
+    body = ''.join(chars).rstrip()
+    if body.endswith(','):
+        body = body[:-1].rstrip()
+    if body.endswith(':'):
+        body += ' ""'
+    if body.endswith('\\'):
+        body = body[:-1]
+
+    closers = ''.join('}' if opener == '{' else ']' for opener in reversed(stack))
+    return body + closers
+
+
+def _is_valid(candidate: str) -> bool:
+    try:
+        json.loads(candidate)
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+def repair_json(text: str) -> Tuple[str, List[str]]:
+    """
+    손상된 JSON 문자열을 결정적으로 복구합니다.
+
+    첫 '{'부터 첫 최상위 객체가 닫힐 때까지(또는 텍스트 끝까지) 문자열 상태를
+    추적하며 한 번에 스캔하고, 절단된 경우 괄호를 닫습니다.
+
+    Args:
+        text: 복구할 JSON 후보 문자열
+
+    Returns:
+        (복구된 JSON 문자열, 적용된 복구 항목 리스트)
+        복구가 불가능해도 최선의 결과를 반환하므로 호출 측에서 json.loads로 확인해야 합니다.
+
+    Example:
+        >>> repair_json('{"a": [1, 2,], }')
+        ('{"a": [1, 2] }', ['trailing_comma'])
+    """
+    repairs: List[str] = []
+
+    def fired(name: str) -> None:
+        if name not in repairs:
+            repairs.append(name)
+
+    start = text.find('{')
+    if start == -1:
+        return text, repairs
+
+    chars: List[str] = []
+    stack: List[str] = []
+    # 절단 복구용: 구조 콤마 직전 위치와 그 시점의 괄호 스택
+    cut_points: List[Tuple[int, List[str]]] = []
+    in_string = False
+    escape = False
+    closed = False
+
+    i = start
+    while i < len(text):
+        c = text[i]
+
+        if in_string:
+            if escape:
+                chars.append(c)
+                escape = False
+            elif c == '\\':
+                chars.append(c)
+                escape = True
+            elif c == '"':
+                if _is_string_end(text, i + 1, stack[-1] if stack else None):
+                    in_string = False
+                    chars.append(c)
+                else:
+                    chars.extend('\\"')
+                    fired('inner_quote')
+            elif c in _CONTROL_ESCAPES:
+                chars.extend(_CONTROL_ESCAPES[c])
+                fired('control_char')
+            elif ord(c) < 0x20:
+                chars.extend(f'\\u{ord(c):04x}')
+                fired('control_char')
+            else:
+                chars.append(c)
+
+        elif c == '"':
+            in_string = True
+            chars.append(c)
+
+        elif c in '{[':
+            stack.append(c)
+            chars.append(c)
+
+        elif c in '}]':
+            if not stack:
+                break
+
+            # 닫는 괄호 앞 trailing comma 제거
+            j = len(chars) - 1
+            while j >= 0 and chars[j] in ' \t\r\n':
+                j -= 1
+            if j >= 0 and chars[j] == ',':
+                del chars[j]
+                fired('trailing_comma')
+
+            expected = '}' if stack[-1] == '{' else ']'
+            if c != expected:
+                fired('bracket_mismatch')
+            stack.pop()
+            chars.append(expected)
+
+            if not stack:
+                closed = True
+                break
+
+        elif c == ',':
+            cut_points.append((len(chars), list(stack)))
+            chars.append(c)
+
+        else:
+            chars.append(c)
+
+        i += 1
+
+    if closed:
+        return ''.join(chars), repairs
+
+    # ━━ 절단된 출력 (max_tokens 도달) ━━
+    if in_string:
+        if escape:
+            chars.pop()
+        chars.append('"')
+        fired('close_string')
+
+    candidate = _close(chars, stack)
+    if _is_valid(candidate):
+        fired('close_brackets')
+        return candidate, repairs
+
+    # 마지막 불완전 항목을 버리고 직전 콤마 위치에서 닫기
+    for cut, cut_stack in reversed(cut_points[-MAX_CUT_BACKTRACK:]):
+        truncated = _close(chars[:cut], cut_stack)
+        if _is_valid(truncated):
+            fired('truncate_partial')
+            fired('close_brackets')
+            return truncated, repairs
+
+    fired('close_brackets')
+    return candidate, repairs
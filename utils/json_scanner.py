@@ -0,0 +1,122 @@
+"""
+문자열 상태를 추적하는 증분 JSON 객체 스캐너
+
+LLM 출력에서 첫 번째 최상위 JSON 객체의 경계를 찾습니다.
+- 문자열 값 안의 '{' / '}' 는 세지 않음 (이스케이프 포함)
+- 스트리밍 중 chunk 단위로 feed 가능 (이미 본 텍스트를 다시 스캔하지 않음)
+- 정규식으로 의미 있는 문자('{', '}', '"', '\\')로만 점프하여 긴 문자열 값을 빠르게 건너뜀
+"""
+
+import re
+from typing import Optional
+
+
+# 객체 시작 전: 여는/닫는 괄호만 의미 있음
+_BEFORE_START = re.compile(r'[{}]')
+# 객체 내부, 문자열 밖: 괄호와 문자열 시작
+_STRUCTURAL = re.compile(r'[{}"]')
+# 문자열 내부: 종료 따옴표와 이스케이프
+_IN_STRING = re.compile(r'["\\]')
+
+
+class JsonObjectScanner:
+    """
+    첫 번째 최상위 JSON 객체의 시작/종료 위치를 증분 계산
+
+    Example:
+        >>> scanner = JsonObjectScanner()
+        >>> scanner.feed('결과: {"a": "}')
+        >>> scanner.feed('", "b": {}} 이후 텍스트')
+        23
+        >>> scanner.start, scanner.end, scanner.end_byte
+        (4, 23, 27)
+    """
+
+    def __init__(self):
+        self.start: Optional[int] = None      # '{' 위치 (문자 단위, 누적)
+        self.end: Optional[int] = None        # 닫는 '}' 다음 위치 (문자 단위, 누적)
+        self.end_byte: Optional[int] = None   # 닫는 '}' 다음 위치 (UTF-8 바이트 단위, 누적)
+        self.stray_close = False              # '{' 이전에 '}'가 나온 경우
+        self.position = 0                     # 지금까지 feed된 문자 수
+        self.byte_position = 0                # 지금까지 feed된 UTF-8 바이트 수
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def closed(self) -> bool:
+        """첫 최상위 객체가 닫혔는지 여부"""
+        return self.end is not None
+
+    def feed(self, chunk: str) -> Optional[int]:
+        """
+        텍스트 조각을 스캔합니다.
+
+        Args:
+            chunk: 새로 들어온 텍스트 조각
+
+        Returns:
+            객체가 닫혔으면 종료 위치(문자 단위 누적 offset), 아니면 None
+        """
+        if self.end is not None:
+            return self.end
+
+        i = 0
+        n = len(chunk)
+
+        # 이전 chunk가 이스케이프 문자('\\')로 끝난 경우
+        if self._escape and n:
+            self._escape = False
+            i = 1
+
+        while i < n:
+            if self._in_string:
+                match = _IN_STRING.search(chunk, i)
+                if match is None:
+                    break
+                i = match.end()
+                if match.group() == '\\':
+                    if i >= n:
+                        self._escape = True
+                        break
+                    i += 1
+                else:
+                    self._in_string = False
+                continue
+
+            if self.start is None:
+                match = _BEFORE_START.search(chunk, i)
+                if match is None:
+                    break
+                if match.group() == '}':
+                    self.stray_close = True
+                    i = match.end()
+                    continue
+                self.start = self.position + match.start()
+                self._depth = 1
+                i = match.end()
+                continue
+
+            match = _STRUCTURAL.search(chunk, i)
+            if match is None:
+                break
+            c = match.group()
+            i = match.end()
+
+            if c == '"':
+                self._in_string = True
+            elif c == '{':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = self.position + i
+                    self.end_byte = self.byte_position + len(chunk[:i].encode('utf-8'))
+                    self.position += n
+                    self.byte_position += len(chunk.encode('utf-8'))
+                    return self.end
+
+        self.position += n
+        self.byte_position += len(chunk.encode('utf-8'))
+        return None
@@ -4,9 +4,10 @@
 
 import logging
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 
 def setup_logger(
@@ -70,23 +71,46 @@ def setup_logger(
 class PhaseLogger:
     """
     Phase별 로깅을 위한 유틸리티 클래스
+
+    현재 Phase는 스레드별로 관리되므로, 여러 Phase가 동시에 실행되어도
+    각 로그에는 해당 스레드가 실행 중인 Phase 번호가 붙습니다.
+    profiler를 넘기면 start_phase / end_phase 구간마다 CPU 시간, 최대 RSS, 스택 샘플을 기록합니다.
     """
 
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, profiler=None):
         """
         Args:
             logger (logging.Logger): 사용할 로거
+            profiler (Optional[PhaseProfiler]): Phase별 프로파일러 (기본값: None, 측정 안 함)
         """
         self.logger = logger
-        self.current_phase: Optional[int] = None
-        self.phase_start_time: Optional[datetime] = None
+        self.profiler = profiler
+        self._local = threading.local()
+
+    @property
+    def current_phase(self) -> Optional[Union[int, str]]:
+        """현재 스레드가 실행 중인 Phase 번호"""
+        return getattr(self._local, "phase", None)
+
+    @current_phase.setter
+    def current_phase(self, value: Optional[Union[int, str]]) -> None:
+        self._local.phase = value
+
+    @property
+    def phase_start_time(self) -> Optional[datetime]:
+        """현재 스레드 Phase의 시작 시각"""
+        return getattr(self._local, "start_time", None)
 
-    def start_phase(self, phase_number: int, phase_name: str) -> None:
+    @phase_start_time.setter
+    def phase_start_time(self, value: Optional[datetime]) -> None:
+        self._local.start_time = value
+
+    def start_phase(self, phase_number: Union[int, str], phase_name: str) -> None:
         """
         Phase 시작을 로깅합니다.
 
         Args:
-            phase_number (int): Phase 번호
+            phase_number (Union[int, str]): Phase 번호 (예: 1, "8a")
             phase_name (str): Phase 이름
 
         Example:
@@ -102,12 +126,15 @@ class PhaseLogger:
         self.logger.info(f"Phase {phase_number}: {phase_name}")
         self.logger.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
-    def end_phase(self, phase_number: int, phase_name: str) -> None:
+        if self.profiler is not None:
+            self.profiler.begin(phase_number, phase_name)
+
+    def end_phase(self, phase_number: Union[int, str], phase_name: str) -> None:
         """
         Phase 종료를 로깅하고 소요 시간을 출력합니다.
 
         Args:
-            phase_number (int): Phase 번호
+            phase_number (Union[int, str]): Phase 번호 (예: 1, "8a")
             phase_name (str): Phase 이름
 
         Example:
@@ -121,6 +148,14 @@ class PhaseLogger:
         else:
             self.logger.info(f"Phase {phase_number} completed")
 
+        if self.profiler is not None:
+            profile = self.profiler.end(phase_number)
+            if profile is not None:
+                self.logger.info(
+                    f"Phase {phase_number} profile: cpu {profile['cpu_sec']}s, "
+                    f"peak RSS {profile['rss_peak_mb']} MB, {profile['breakdown']}"
+                )
+
         self.current_phase = None
         self.phase_start_time = None
 
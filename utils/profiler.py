@@ -0,0 +1,327 @@
+"""
+Phase별 프로파일러
+PhaseLogger.start_phase / end_phase 구간마다 CPU 시간, 최대 RSS, 스택 샘플링 프로파일을 기록합니다.
+
+- CPU 시간: Phase 스레드의 CPU 시간(time.thread_time) + 구간 중 종료된 자식 프로세스(FFmpeg 등)의 CPU 시간
+- RSS: 샘플링 스레드가 주기마다 읽은 프로세스 RSS의 최댓값
+- 스택 샘플링: 주기마다 sys._current_frames()로 Phase를 실행 중인 스레드의 스택을 수집
+  (cProfile은 스레드별 / 프로세스당 하나만 활성화할 수 있어 동시에 실행되는 Phase를 나눠 측정할 수 없음)
+
+샘플은 스택 모양으로 분류합니다.
+- model: 모델 라이브러리(vllm / torch / TTS / ctranslate2 등) 안
+- subprocess: subprocess 대기 (FFmpeg / ffprobe)
+- wait: 잠금 / 큐 / Future 대기 (Stage 워커 프로세스, 다른 Phase 결과 대기 등)
+- python: 그 외 파이프라인 Python 코드
+
+결과는 metadata.json 옆에 저장합니다.
+- profile/phase_<번호>.collapsed: Phase별 collapsed stack (flamegraph.pl / speedscope 입력)
+- profile/all.collapsed: 전체 Phase (Phase 이름이 최상위 프레임)
+- profile_summary.json: Phase별 요약 (표는 로그에도 출력)
+"""
+
+import resource
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from utils.file_utils import save_json
+
+
+# profiling 설정 기본값
+PROFILING_DEFAULTS = {
+    "enabled": False,
+    "interval_ms": 10,
+    "max_depth": 128
+}
+
+# 이 모듈(또는 하위 모듈) 안의 샘플은 모델 연산으로 분류
+MODEL_MODULES = (
+    "vllm", "torch", "transformers", "diffusers", "TTS", "whisper_ctranslate2",
+    "faster_whisper", "ctranslate2"
+)
+
+# 스택 맨 위가 이 모듈이면 대기로 분류
+WAIT_MODULES = ("threading", "queue", "concurrent.futures", "multiprocessing", "selectors")
+
+CATEGORIES = ("model", "subprocess", "wait", "python")
+
+
+def profiling_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """config의 profiling 섹션 + 기본값"""
+    return {**PROFILING_DEFAULTS, **(config.get("profiling", {}) or {})}
+
+
+def _in_modules(module: str, prefixes: Tuple[str, ...]) -> bool:
+    return any(module == prefix or module.startswith(prefix + ".") for prefix in prefixes)
+
+
+def _read_rss_bytes() -> int:
+    """현재 프로세스 RSS (/proc이 없으면 지금까지의 최댓값으로 대체)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, IndexError, ValueError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS는 바이트, Linux는 KB 단위
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _children_cpu_sec() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class PhaseProfiler:
+    """
+    Phase별 CPU 시간 / 최대 RSS / 스택 샘플 수집기
+
+    Phase는 시작한 스레드 단위로 추적하므로 동시에 실행되는 Phase도 샘플이 섞이지 않습니다.
+    RSS와 자식 프로세스 CPU 시간은 프로세스 전체 값이라 겹쳐 실행된 Phase에는 같은 값이 함께 잡힙니다.
+    """
+
+    def __init__(
+        self,
+        interval_ms: float = 10,
+        max_depth: int = 128,
+        model_modules: Tuple[str, ...] = MODEL_MODULES
+    ):
+        """
+        Args:
+            interval_ms: 샘플링 주기 (ms)
+            max_depth: 수집할 최대 스택 깊이 (맨 위 프레임부터)
+            model_modules: 모델 연산으로 분류할 모듈 이름 접두사
+        """
+        self.interval = interval_ms / 1000
+        self.max_depth = max_depth
+        self.model_modules = tuple(model_modules)
+
+        self._lock = threading.Lock()
+        self._active: Dict[int, Dict[str, Any]] = {}  # 스레드 id → 실행 중인 Phase
+        self.phases: Dict[str, Dict[str, Any]] = {}  # Phase 번호 → 기록 (시작 순서)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """샘플링 스레드 시작"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="phase-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """샘플링 중지 (end_phase 없이 끝난 Phase는 실패로 마감)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            for record in self._active.values():
+                self._close(record, completed=False)
+            self._active.clear()
+
+    def begin(self, phase_number: Union[int, str], phase_name: str) -> None:
+        """
+        현재 스레드에서 Phase 측정 시작
+
+        Args:
+            phase_number: Phase 번호 (예: 1, "8a")
+            phase_name: Phase 이름
+        """
+        rss = _read_rss_bytes()
+        record = {
+            "number": str(phase_number),
+            "name": phase_name,
+            "thread_id": threading.get_ident(),
+            "wall_start": time.perf_counter(),
+            "cpu_start": time.thread_time(),
+            "children_cpu_start": _children_cpu_sec(),
+            "rss_start": rss,
+            "rss_peak": rss,
+            "stacks": Counter(),
+            "categories": Counter()
+        }
+        with self._lock:
+            self._active[record["thread_id"]] = record
+            self.phases[record["number"]] = record
+
+    def end(self, phase_number: Union[int, str]) -> Optional[Dict[str, Any]]:
+        """
+        현재 스레드의 Phase 측정 종료
+
+        Returns:
+            Phase 요약 (begin 없이 호출되면 None)
+        """
+        with self._lock:
+            record = self._active.get(threading.get_ident())
+            if record is None or record["number"] != str(phase_number):
+                return None
+            del self._active[record["thread_id"]]
+            record["rss_peak"] = max(record["rss_peak"], _read_rss_bytes())
+            self._close(record, completed=True)
+        return self.summarize(record)
+
+    def _close(self, record: Dict[str, Any], completed: bool) -> None:
+        record["wall_sec"] = time.perf_counter() - record["wall_start"]
+        # thread_time은 Phase를 시작한 스레드에서만 의미가 있음
+        record["cpu_sec"] = time.thread_time() - record["cpu_start"] if completed else None
+        record["children_cpu_sec"] = _children_cpu_sec() - record["children_cpu_start"]
+        record["completed"] = completed
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        """실행 중인 Phase 스레드의 스택과 프로세스 RSS를 한 번 수집"""
+        with self._lock:
+            if not self._active:
+                return
+            frames = sys._current_frames()
+            rss = _read_rss_bytes()
+            for thread_id, record in self._active.items():
+                record["rss_peak"] = max(record["rss_peak"], rss)
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = self._stack(frame)
+                record["stacks"][";".join(f"{module}:{function}" for module, function in stack)] += 1
+                record["categories"][self.classify(stack)] += 1
+
+    def _stack(self, frame) -> List[Tuple[str, str]]:
+        """(모듈, 함수) 목록, 바깥 프레임부터"""
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", "?")
+            stack.append((module, getattr(code, "co_qualname", code.co_name)))
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def classify(self, stack: List[Tuple[str, str]]) -> str:
+        """
+        스택 하나를 model / subprocess / wait / python 중 하나로 분류
+
+        모델 라이브러리가 스택 어디에든 있으면 model, subprocess 모듈이 있으면 subprocess,
+        맨 위 프레임이 잠금 / 큐 / Future 대기면 wait, 나머지는 python
+        """
+        modules = [module for module, _ in stack]
+        if any(_in_modules(module, self.model_modules) for module in modules):
+            return "model"
+        if any(_in_modules(module, ("subprocess",)) for module in modules):
+            return "subprocess"
+        if modules and _in_modules(modules[-1], WAIT_MODULES):
+            return "wait"
+        return "python"
+
+    def summarize(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Phase 기록 하나의 요약 (시간 초 단위, RSS MB 단위, 분류는 샘플 비율 %)"""
+        samples = sum(record["categories"].values())
+        wall = record.get("wall_sec")
+        cpu = record.get("cpu_sec")
+        return {
+            "number": record["number"],
+            "name": record["name"],
+            "completed": record.get("completed", False),
+            "wall_sec": round(wall, 3) if wall is not None else None,
+            "cpu_sec": round(cpu, 3) if cpu is not None else None,
+            "cpu_ratio": round(cpu / wall, 2) if cpu is not None and wall else None,
+            "children_cpu_sec": round(record.get("children_cpu_sec", 0.0), 3),
+            "rss_start_mb": round(record["rss_start"] / 2**20, 1),
+            "rss_peak_mb": round(record["rss_peak"] / 2**20, 1),
+            "samples": samples,
+            "breakdown": {
+                category: round(100 * record["categories"][category] / samples, 1) if samples else 0.0
+                for category in CATEGORIES
+            }
+        }
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """완료(또는 실패)한 Phase별 요약 (시작 순서)"""
+        with self._lock:
+            records = [record for record in self.phases.values() if "wall_sec" in record]
+        return {record["number"]: self.summarize(record) for record in records}
+
+    def collapsed(self, phase_number: Optional[Union[int, str]] = None) -> str:
+        """
+        collapsed stack 텍스트 ("바깥;...;안쪽 샘플수" 한 줄씩)
+
+        Args:
+            phase_number: Phase 번호 (None이면 전체 Phase, Phase 번호와 이름이 최상위 프레임)
+        """
+        with self._lock:
+            if phase_number is not None:
+                stacks = Counter(self.phases[str(phase_number)]["stacks"])
+            else:
+                stacks = Counter()
+                for record in self.phases.values():
+                    root = f"phase {record['number']} {record['name']}".replace(";", ",")
+                    for stack, count in record["stacks"].items():
+                        stacks[f"{root};{stack}"] += count
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+    def write(self, base_dir: str) -> str:
+        """
+        collapsed stack 파일(profile/)과 profile_summary.json 저장
+
+        Args:
+            base_dir: 출력 디렉토리 (metadata.json과 같은 곳)
+
+        Returns:
+            profile_summary.json 경로
+        """
+        profile_dir = Path(base_dir) / "profile"
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        summary = self.summary()
+        files = {}
+        for number in summary:
+            path = profile_dir / f"phase_{number}.collapsed"
+            path.write_text(self.collapsed(number), encoding="utf-8")
+            files[number] = str(path)
+        (profile_dir / "all.collapsed").write_text(self.collapsed(), encoding="utf-8")
+
+        summary_path = str(Path(base_dir) / "profile_summary.json")
+        save_json({
+            "created_at": datetime.now().isoformat(),
+            "interval_ms": round(self.interval * 1000, 3),
+            "phases": summary,
+            "collapsed": {"all": str(profile_dir / "all.collapsed"), **files}
+        }, summary_path)
+        return summary_path
+
+
+def format_profile_table(summary: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Phase별 프로파일 요약 표
+
+    Args:
+        summary: PhaseProfiler.summary() 결과
+
+    Returns:
+        여러 줄 문자열 (실패로 끝난 Phase는 ! 표시)
+    """
+    width = max([len(number) for number in summary] + [5])
+    header = (
+        f"{'phase':<{width}}  {'wall':>8}  {'cpu':>8}  {'child':>8}  {'rss':>8}  "
+        + "  ".join(f"{category:>10}" for category in CATEGORIES)
+    )
+    lines = [header, "-" * len(header)]
+    for number, row in summary.items():
+        cpu = f"{row['cpu_sec']:.2f}s" if row["cpu_sec"] is not None else "-"
+        mark = "" if row["completed"] else " !"
+        lines.append(
+            f"{number:<{width}}  {row['wall_sec']:>7.2f}s  {cpu:>8}  {row['children_cpu_sec']:>7.2f}s  "
+            f"{row['rss_peak_mb']:>6.0f}MB  "
+            + "  ".join(f"{row['breakdown'][category]:>9.1f}%" for category in CATEGORIES)
+            + mark
+        )
+    return "\n".join(lines)
@@ -0,0 +1,189 @@
+"""
+실행 manifest 유틸리티
+Phase별 입력 해시 / 산출물 값 / 출력 파일 content hash를 출력 디렉토리에 기록하여
+재실행(--resume) 시 변경되지 않은 Phase를 건너뛰는 데 사용
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+MANIFEST_FILENAME = "run_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def hash_value(value: Any) -> str:
+    """
+    JSON 직렬화 가능한 값의 sha256
+
+    Args:
+        value: 해시할 값 (dict 키 순서 무관)
+
+    Returns:
+        16진수 해시 문자열
+    """
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def hash_file(filepath: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    파일 content sha256 (대용량 파일은 chunk 단위로 읽음)
+
+    Args:
+        filepath: 파일 경로
+        chunk_size: 한 번에 읽을 바이트 수
+
+    Returns:
+        16진수 해시 문자열
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _expand_files(paths: List[str]) -> List[Path]:
+    """파일/디렉토리 경로 → 파일 목록 (디렉토리는 하위 파일 전체, 정렬)"""
+    files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.is_file()))
+        else:
+            files.append(path)
+    return files
+
+
+class RunManifest:
+    """
+    출력 디렉토리의 run_manifest.json
+
+    Phase마다 다음을 기록합니다.
+    - inputs_hash: 입력 산출물 해시 + 설정 fingerprint
+    - outputs: 산출물 값 (건너뛸 때 그대로 복원)
+    - outputs_hash: 산출물 값 + 출력 파일 content hash (하위 Phase 입력 해시에 사용)
+    - files: 출력 파일별 {size, mtime_ns, sha256}
+
+    파일 검증은 size/mtime이 같으면 기록된 해시를 신뢰하고, mtime이 바뀐 경우에만 다시 해시합니다.
+    """
+
+    def __init__(self, base_dir: str):
+        """
+        Args:
+            base_dir: 출력 디렉토리 (create_output_dirs의 base)
+        """
+        self.path = Path(base_dir) / MANIFEST_FILENAME
+        self.data: Dict[str, Any] = {"version": MANIFEST_VERSION, "phases": {}}
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.data = data
+                else:
+                    print(f"⚠ Manifest version mismatch ({data.get('version')}), ignoring {self.path}")
+            except (OSError, ValueError) as e:
+                print(f"⚠ Failed to load manifest {self.path}: {e}")
+
+    @property
+    def phases(self) -> Dict[str, Dict[str, Any]]:
+        return self.data["phases"]
+
+    def lookup(self, phase: str, inputs_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        재사용 가능한 Phase 기록 조회
+
+        Args:
+            phase: Phase 이름
+            inputs_hash: 현재 입력 해시
+
+        Returns:
+            입력 해시가 같고 모든 출력 파일이 기록과 같으면 기록 dict, 아니면 None
+        """
+        with self._lock:
+            entry = self.phases.get(phase)
+        if entry is None or entry.get("inputs_hash") != inputs_hash:
+            return None
+
+        for filepath, recorded in entry.get("files", {}).items():
+            if not self._file_matches(filepath, recorded):
+                return None
+        return entry
+
+    def _file_matches(self, filepath: str, recorded: Dict[str, Any]) -> bool:
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return False
+        if stat.st_size != recorded.get("size"):
+            return False
+        if stat.st_mtime_ns == recorded.get("mtime_ns"):
+            return True
+        return hash_file(filepath) == recorded.get("sha256")
+
+    def record(
+        self,
+        phase: str,
+        inputs_hash: str,
+        outputs: Dict[str, Any],
+        file_paths: Optional[List[str]] = None
+    ) -> str:
+        """
+        Phase 완료 기록 + 즉시 저장 (이후 Phase가 실패해도 여기까지는 재사용 가능)
+
+        Args:
+            phase: Phase 이름
+            inputs_hash: 입력 해시
+            outputs: 산출물 {이름: 값} (JSON 직렬화 가능해야 함)
+            file_paths: 출력 파일/디렉토리 경로 리스트
+
+        Returns:
+            outputs_hash
+        """
+        files = {}
+        for filepath in _expand_files(file_paths or []):
+            stat = filepath.stat()
+            files[str(filepath)] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": hash_file(str(filepath))
+            }
+
+        outputs_hash = hash_value({
+            "outputs": outputs,
+            "files": {path: info["sha256"] for path, info in files.items()}
+        })
+
+        with self._lock:
+            self.phases[phase] = {
+                "inputs_hash": inputs_hash,
+                "outputs_hash": outputs_hash,
+                "outputs": outputs,
+                "files": files,
+                "completed_at": datetime.now().isoformat()
+            }
+            self._save()
+        return outputs_hash
+
+    def invalidate(self, phase: str) -> None:
+        """Phase 기록 삭제 (재실행 시작 시 호출 → 중간에 실패하면 다음 resume에서도 재실행)"""
+        with self._lock:
+            if self.phases.pop(phase, None) is not None:
+                self._save()
+
+    def _save(self) -> None:
+        """원자적 쓰기 (tmp 파일 → replace)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)